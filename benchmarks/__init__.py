@@ -0,0 +1,65 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Micro benchmarks of the library, run without XBee hardware.
+
+Run each of them from the root of the repository, for example::
+
+    python -m benchmarks.decode
+
+To compare with a previous version, check it out and run the same module.
+"""
+import time
+
+# The device modules import each other: load them in the order the library
+# does, so benchmarks may import any module first.
+import digi.xbee.filesystem  # noqa: F401
+import digi.xbee.devices  # noqa: F401
+
+
+def measure(func, number, repeat=5):
+    """
+    Runs the given function several times and returns the best mean time of
+    a call.
+
+    Args:
+        func (Function): Function to measure, without arguments.
+        number (Integer): Number of calls of each measure.
+        repeat (Integer, optional): Number of measures.
+
+    Returns:
+        Float: Seconds per call of the fastest measure.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(name, seconds, unit="us"):
+    """
+    Prints the result of a benchmark.
+
+    Args:
+        name (String): What was measured.
+        seconds (Float): The measured time in seconds.
+        unit (String, optional): `s`, `ms` or `us`.
+    """
+    scale = {"s": 1, "ms": 1e3, "us": 1e6}[unit]
+    print("%-50s %10.2f %s" % (name, seconds * scale, unit))
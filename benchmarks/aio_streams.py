@@ -0,0 +1,178 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to echo 200 KB through an asyncio stream of a Cellular XBee simulated
+behind a pty (5 ms uplink per frame, 40 ms transmit status latency), with
+one frame and with the adaptive window of frames waiting for their status,
+and to echo 1 KB through 20 concurrent connections.
+
+Requires a POSIX pty.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+import tty
+
+from benchmarks import report
+from digi.xbee import aio
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.status import TransmitStatus
+from digi.xbee.packets import factory
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.raw import TXStatusPacket
+from digi.xbee.packets.socket import SocketReceivePacket
+from digi.xbee.serial import FrameBuffer
+
+from tests.fakes import at_responder
+from tests.test_aio import CELLULAR_VALUES
+from tests.test_xsocket import socket_responder
+
+UPLINK = 0.005
+LATENCY = 0.04
+DATA = bytes(range(256)) * 800
+CONNECTIONS = 20
+
+
+class PtyModem(object):
+    """
+    Cellular XBee behind a pty that echoes the data sent through its sockets.
+    """
+
+    def __init__(self):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.__at = at_responder(CELLULAR_VALUES)
+        self.__socket = socket_responder()
+        self.__uplink_end = 0
+        # Pending writes as (date, sequence, packet)
+        self.__writes = []
+        self.__seq = itertools.count()
+        self.__cond = threading.Condition()
+        self.__running = True
+        self.__threads = [threading.Thread(target=target, daemon=True)
+                          for target in (self.__read, self.__write)]
+        for thread in self.__threads:
+            thread.start()
+
+    def close(self):
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify()
+        os.close(self.slave)
+        for thread in self.__threads:
+            thread.join(1)
+        os.close(self.master)
+
+    def __schedule(self, date, packet):
+        with self.__cond:
+            heapq.heappush(self.__writes, (date, next(self.__seq), packet))
+            self.__cond.notify()
+
+    def __read(self):
+        frames = FrameBuffer()
+        while True:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            frames.feed(data, OperatingMode.API_MODE)
+            while frames:
+                self.__answer(factory.build_frame(frames.pop()))
+
+    def __answer(self, packet):
+        now = time.monotonic()
+        if packet.get_frame_type() != ApiFrameType.SOCKET_SEND:
+            responses = self.__socket(packet) \
+                if packet.get_frame_type() not in (
+                    ApiFrameType.AT_COMMAND, ApiFrameType.AT_COMMAND_QUEUE) \
+                else self.__at(packet)
+            for response in responses or ():
+                self.__schedule(now, response)
+            return
+        self.__uplink_end = max(now, self.__uplink_end) + UPLINK
+        status_date = self.__uplink_end + LATENCY
+        self.__schedule(status_date, TXStatusPacket(packet.frame_id,
+                                                    TransmitStatus.SUCCESS))
+        self.__schedule(status_date, SocketReceivePacket(
+            0, packet.socket_id, packet.payload))
+
+    def __write(self):
+        while True:
+            with self.__cond:
+                while self.__running and (
+                        not self.__writes
+                        or self.__writes[0][0] > time.monotonic()):
+                    self.__cond.wait(self.__writes[0][0] - time.monotonic()
+                                     if self.__writes else None)
+                if not self.__running:
+                    return
+                packet = heapq.heappop(self.__writes)[2]
+            try:
+                os.write(self.master, packet.output())
+            except OSError:
+                return
+
+
+async def echo(xbee, data):
+    reader, writer = await aio.open_connection(xbee, "192.168.1.1", 7)
+    writer.write(data)
+    received = await reader.readexactly(len(data))
+    writer.close()
+    assert received == data
+
+
+async def run(modem, window, max_window):
+    # The transport has no public setting for its window.
+    aio._SocketTransport._SEND_WINDOW = window
+    aio._SocketTransport._MAX_SEND_WINDOW = max_window
+    label = "window %d" % window if window == max_window else "adaptive window"
+    threads = threading.active_count()
+    xbee = aio.AsyncXBeeDevice(modem.port, 115200)
+    await xbee.open()
+    try:
+        start = time.perf_counter()
+        await echo(xbee, DATA)
+        report("echo %d KB, %s" % (len(DATA) // 1024, label),
+               time.perf_counter() - start, unit="s")
+
+        start = time.perf_counter()
+        await asyncio.gather(*[echo(xbee, DATA[:1024])
+                               for _ in range(CONNECTIONS)])
+        report("echo 1 KB, %d connections, %s" % (CONNECTIONS, label),
+               time.perf_counter() - start, unit="s")
+        print("  %d threads started" % (threading.active_count() - threads))
+    finally:
+        await xbee.close()
+
+
+def main():
+    defaults = (aio._SocketTransport._SEND_WINDOW,
+                aio._SocketTransport._MAX_SEND_WINDOW)
+    for windows in ((1, 1), defaults):
+        modem = PtyModem()
+        try:
+            asyncio.run(run(modem, *windows))
+        finally:
+            modem.close()
+    aio._SocketTransport._SEND_WINDOW, aio._SocketTransport._MAX_SEND_WINDOW = \
+        defaults
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to read 3 parameters from 40 remote nodes with a 50 ms round trip,
+with XBeeNetwork.bulk_get_parameters() and with one get_parameter() after
+another.
+"""
+import time
+
+from benchmarks import report
+from benchmarks.network_registry import populate
+from digi.xbee.devices import ZigBeeDevice
+
+from tests.fakes import FakeInterface, at_responder
+
+RTT = 0.05
+NUM_NODES = 40
+COMMANDS = ["NI", "VR", "DB"]
+SERIAL_READS = 20
+
+
+def main():
+    iface = FakeInterface(at_responder({"NI": b"NODE", "VR": b"\x10\x09",
+                                        "DB": b"\x28"}), delay=RTT)
+    xbee = ZigBeeDevice(comm_iface=iface)
+    xbee.open()
+    try:
+        nodes = populate(xbee, NUM_NODES)
+        network = xbee.get_network()
+        for concurrency in (1, 4, 16):
+            start = time.perf_counter()
+            network.bulk_get_parameters(nodes, COMMANDS,
+                                        concurrency=concurrency)
+            report("bulk_get_parameters, %d reads, concurrency %d"
+                   % (NUM_NODES * len(COMMANDS), concurrency),
+                   time.perf_counter() - start, unit="s")
+
+        start = time.perf_counter()
+        for idx in range(SERIAL_READS):
+            nodes[idx].get_parameter("NI")
+        report("get_parameter, %d serial reads" % SERIAL_READS,
+               time.perf_counter() - start, unit="s")
+    finally:
+        xbee.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to build packets from received frames with the packet factory.
+"""
+from benchmarks import measure, report
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+from digi.xbee.models.status import ATCommandStatus, TransmitStatus
+from digi.xbee.packets import factory
+from digi.xbee.packets.common import ATCommResponsePacket, ReceivePacket, \
+    TransmitStatusPacket
+
+X64 = XBee64BitAddress.from_hex_string("0013A20040AAAAAA")
+X16 = XBee16BitAddress.from_hex_string("1234")
+
+FRAMES = (
+    ("AT command response", ATCommResponsePacket(
+        1, "NI", ATCommandStatus.OK, comm_value=bytearray(b"node")).output()),
+    ("Receive packet", ReceivePacket(
+        X64, X16, 0, rf_data=bytearray(64)).output()),
+    ("Transmit status", TransmitStatusPacket(
+        1, X16, 0, TransmitStatus.SUCCESS).output()),
+)
+
+
+def main():
+    for name, frame in FRAMES:
+        report(name, measure(lambda: factory.build_frame(frame), 20000))
+    report("Mean of the frames above", sum(
+        measure(lambda: factory.build_frame(frame), 20000)
+        for _name, frame in FRAMES) / len(FRAMES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to read the device information of a local XBee with a 20 ms AT command
+round trip, batched by read_device_info() and with one get_parameter() after
+another.
+"""
+from benchmarks import measure, report
+from digi.xbee.devices import ZigBeeDevice
+
+from tests.fakes import FakeInterface, at_responder
+
+RTT = 0.02
+VALUES = {"HV": b"\x42", "VR": b"\x10\x09", "SH": b"\x00\x13\xA2\x00",
+          "SL": b"\x40\xAA\xAA\xAA", "NI": b"LOCAL", "MY": b"\x00\x00",
+          "CE": b"\x01", "SM": b"\x00"}
+
+
+def main():
+    xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder(VALUES),
+                                                 delay=RTT))
+    xbee.open()
+    try:
+        report("read_device_info",
+               measure(xbee.read_device_info, 5), unit="s")
+        report("get_parameter x %d" % len(VALUES),
+               measure(lambda: [xbee.get_parameter(param)
+                                for param in VALUES], 5), unit="s")
+    finally:
+        xbee.close()
+
+
+if __name__ == "__main__":
+    main()
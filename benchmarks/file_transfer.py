@@ -0,0 +1,178 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to put and get a 20 KB file to and from a simulated remote XBee 100 ms
+away that takes 5 ms to run each file system command, waiting for each block
+response and with the default transfer window, and with 5% of the block
+frames lost.
+"""
+import heapq
+import itertools
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks import report
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice
+from digi.xbee.filesystem import FileSystemManager
+from digi.xbee.models.filesystem import CloseFileCmdResponse, FSCmdType, \
+    OpenFileCmdResponse, ReadFileCmdResponse, WriteFileCmdResponse
+from digi.xbee.models.options import FileOpenRequestOption
+from digi.xbee.models.status import FSCommandStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.filesystem import RemoteFSResponsePacket
+
+from tests.fakes import LOCAL_INFO, FakeInterface, at_responder
+from tests.test_network import x64, x16
+
+LATENCY = 0.1
+COMMAND_TIME = 0.005
+DATA = os.urandom(20 * 1024)
+# Zigbee firmware with file system API support.
+INFO = LOCAL_INFO[:2] + (0x100D,) + LOCAL_INFO[3:]
+VALUES = {"HV": b"\x42", "VR": b"\x10\x0D", "NP": b"\x01\x00"}
+
+
+class RemoteFileSystem(object):
+    """
+    File system of a remote XBee that runs one command after another and
+    answers after the network latency, losing the given ratio of the block
+    frames.
+    """
+
+    def __init__(self, iface, loss=0):
+        self.iface = iface
+        self.loss = loss
+        self.files = {}
+        self.__at = at_responder(VALUES)
+        self.__random = random.Random(1)
+        self.__open = {}
+        self.__fids = itertools.count(1)
+        self.__busy_until = 0
+        # Pending responses as (date, sequence, packet)
+        self.__responses = []
+        self.__seq = itertools.count()
+        self.__cond = threading.Condition()
+        self.__running = True
+        self.__thread = threading.Thread(target=self.__answer, daemon=True)
+        self.__thread.start()
+
+    def close(self):
+        with self.__cond:
+            self.__running = False
+            self.__cond.notify()
+        self.__thread.join(1)
+
+    def __call__(self, packet):
+        if packet.get_frame_type() != ApiFrameType.REMOTE_FILE_SYSTEM_REQUEST:
+            return self.__at(packet)
+        cmd = packet.command
+        if (cmd.type in (FSCmdType.FILE_READ, FSCmdType.FILE_WRITE)
+                and self.__random.random() < self.loss):
+            return None
+        start = max(time.monotonic() + LATENCY, self.__busy_until)
+        self.__busy_until = start + COMMAND_TIME
+        response = RemoteFSResponsePacket(
+            packet.frame_id, packet.x64bit_dest_addr, self.__run(cmd), 0)
+        with self.__cond:
+            heapq.heappush(self.__responses, (self.__busy_until + LATENCY,
+                                              next(self.__seq), response))
+            self.__cond.notify()
+        return None
+
+    def __run(self, cmd):
+        if cmd.type == FSCmdType.FILE_OPEN:
+            content = self.files.setdefault(cmd.name, bytearray())
+            if cmd.options & FileOpenRequestOption.TRUNCATE:
+                content.clear()
+            fid = next(self.__fids)
+            self.__open[fid] = content
+            # Files opened to write report an unknown size.
+            return OpenFileCmdResponse(
+                FSCommandStatus.SUCCESS, fid=fid,
+                size=0xFFFFFFFF if cmd.options & FileOpenRequestOption.WRITE
+                else len(content))
+        if cmd.type == FSCmdType.FILE_CLOSE:
+            self.__open.pop(cmd.fs_id, None)
+            return CloseFileCmdResponse(FSCommandStatus.SUCCESS)
+        content = self.__open[cmd.fs_id]
+        if cmd.type == FSCmdType.FILE_READ:
+            return ReadFileCmdResponse(
+                FSCommandStatus.SUCCESS, fid=cmd.fs_id, offset=cmd.offset,
+                data=content[cmd.offset:cmd.offset + cmd.size])
+        # A block may arrive before the previous one was written.
+        content.extend(bytearray(max(0, cmd.offset - len(content))))
+        content[cmd.offset:cmd.offset + len(cmd.data)] = cmd.data
+        return WriteFileCmdResponse(FSCommandStatus.SUCCESS, fid=cmd.fs_id,
+                                    actual_offset=cmd.offset + len(cmd.data))
+
+    def __answer(self):
+        while True:
+            with self.__cond:
+                while self.__running and (
+                        not self.__responses
+                        or self.__responses[0][0] > time.monotonic()):
+                    self.__cond.wait(self.__responses[0][0] - time.monotonic()
+                                     if self.__responses else None)
+                if not self.__running:
+                    return
+                response = heapq.heappop(self.__responses)[2]
+            self.iface.inject(response)
+
+
+def transfer(window, loss=0):
+    iface = FakeInterface(info=INFO)
+    remote_fs = RemoteFileSystem(iface, loss=loss)
+    iface.responder = remote_fs
+    xbee = ZigBeeDevice(comm_iface=iface)
+    xbee.open()
+    src = tempfile.NamedTemporaryFile(delete=False)
+    dest = src.name + ".get"
+    try:
+        src.write(DATA)
+        src.close()
+        manager = FileSystemManager(RemoteZigBeeDevice(xbee, x64(0), x16(0)))
+        manager.transfer_window = window
+        name = "%d KB, window %d%s" % (len(DATA) // 1024, window,
+                                       ", %d%% loss" % (loss * 100)
+                                       if loss else "")
+
+        start = time.perf_counter()
+        manager.put_file(src.name, "/flash/file", overwrite=True)
+        report("put_file " + name, time.perf_counter() - start, unit="s")
+        assert remote_fs.files["/flash/file"] == DATA
+
+        start = time.perf_counter()
+        manager.get_file("/flash/file", dest)
+        report("get_file " + name, time.perf_counter() - start, unit="s")
+        with open(dest, "rb") as dest_file:
+            assert dest_file.read() == DATA
+    finally:
+        xbee.close()
+        remote_fs.close()
+        for path in (src.name, dest):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main():
+    transfer(1)
+    transfer(FileSystemManager.DEFAULT_TRANSFER_WINDOW)
+    transfer(FileSystemManager.DEFAULT_TRANSFER_WINDOW, loss=0.05)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to look up a node of the network by its 64-bit address, and to add an
+already known node, as done for every received frame, with networks of
+different sizes.
+"""
+from benchmarks import measure, report
+from digi.xbee.devices import NetworkEventReason, RemoteZigBeeDevice, \
+    ZigBeeDevice
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+
+from tests.fakes import FakeInterface, at_responder
+
+
+def populate(xbee, num_nodes):
+    """
+    Adds the given number of remote nodes to the network of a local XBee.
+
+    Args:
+        xbee (:class:`.ZigBeeDevice`): The local XBee.
+        num_nodes (Integer): Number of nodes to add.
+
+    Returns:
+        List: The added :class:`.RemoteZigBeeDevice`.
+    """
+    network = xbee.get_network()
+    nodes = []
+    for idx in range(num_nodes):
+        nodes.append(network._add_remote(RemoteZigBeeDevice(
+            xbee, XBee64BitAddress.from_hex_string("0013A200%08X" % idx),
+            XBee16BitAddress.from_hex_string("%04X" % (idx % 0xFFF0)),
+            node_id="NODE%d" % idx), NetworkEventReason.MANUAL))
+    return nodes
+
+
+def main():
+    for num_nodes in (10, 100, 1000, 10000):
+        xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({})))
+        xbee.open()
+        try:
+            network = xbee.get_network()
+            last = populate(xbee, num_nodes)[-1]
+            x64 = last.get_64bit_addr()
+            # A new object for a known node, as created for received frames.
+            known = RemoteZigBeeDevice(xbee, x64)
+            report("%5d nodes: get_device_by_64" % num_nodes,
+                   measure(lambda: network.get_device_by_64(x64), 2000))
+            report("%5d nodes: _add_remote (known node)" % num_nodes,
+                   measure(lambda: network._add_remote(
+                       known, NetworkEventReason.RECEIVED_MSG), 2000))
+        finally:
+            xbee.close()
+
+
+if __name__ == "__main__":
+    main()
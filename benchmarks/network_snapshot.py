@@ -0,0 +1,67 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Size of a network snapshot and time to save and load it, with 500 nodes and
+500 connections.
+"""
+import os
+import tempfile
+
+from benchmarks import measure, report
+from benchmarks.network_registry import populate
+from digi.xbee.devices import Connection, LinkQuality, ZigBeeDevice
+
+from tests.fakes import FakeInterface, at_responder
+
+NUM_NODES = 500
+
+
+def open_local():
+    """
+    Returns a new open local XBee.
+    """
+    xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({})))
+    xbee.open()
+    return xbee
+
+
+def main():
+    xbee = open_local()
+    other = open_local()
+    try:
+        network = xbee.get_network()
+        nodes = populate(xbee, NUM_NODES)
+        for idx, node in enumerate(nodes):
+            network._add_connection(Connection(
+                node, nodes[(idx + 1) % NUM_NODES], lq_a2b=LinkQuality(lq=200),
+                lq_b2a=LinkQuality(lq=180)))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "network.snap")
+            report("Save", measure(lambda: network.save_snapshot(path), 10),
+                   unit="ms")
+            print("%-50s %10.1f KB" % ("Snapshot size",
+                                       os.path.getsize(path) / 1024))
+
+            def load():
+                other.get_network().clear()
+                other.get_network().load_snapshot(path)
+
+            report("Load", measure(load, 10), unit="ms")
+    finally:
+        xbee.close()
+        other.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to serialize, compare and hash transmit packets, and to unescape their
+escaped frames.
+"""
+from benchmarks import measure, report
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+from digi.xbee.packets.base import XBeeAPIPacket
+from digi.xbee.packets.common import TransmitPacket
+
+X64 = XBee64BitAddress.from_hex_string("0013A20040AAAAAA")
+X16 = XBee16BitAddress.from_hex_string("1234")
+
+
+def main():
+    for size in (100, 255):
+        # Every fourth byte must be escaped.
+        data = bytearray(b"\x7Eabc" * (size // 4) + b"a" * (size % 4))
+        packet = TransmitPacket(1, X64, X16, 0, 0, rf_data=data)
+        other = TransmitPacket(1, X64, X16, 0, 0, rf_data=bytearray(data))
+        escaped = packet.output(escaped=True)
+        report("%d-byte payload: output" % size,
+               measure(packet.output, 20000))
+        report("%d-byte payload: output (escaped)" % size,
+               measure(lambda: packet.output(escaped=True), 20000))
+        report("%d-byte payload: eq" % size,
+               measure(lambda: packet == other, 20000))
+        report("%d-byte payload: hash" % size,
+               measure(lambda: hash(packet), 20000))
+        report("%d-byte payload: unescape" % size,
+               measure(lambda: XBeeAPIPacket.unescape_data(escaped), 20000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+AT frames sent and time to poll VR, NI and DB from a local XBee with a 5 ms
+AT command round trip, with and without a parameter cache.
+"""
+import time
+
+from benchmarks import report
+from digi.xbee.devices import ZigBeeDevice, ATParameterCache
+
+from tests.fakes import FakeInterface, at_responder
+
+RTT = 0.005
+ROUNDS = 100
+PARAMETERS = ["VR", "NI", "DB"]
+
+
+def poll(cache):
+    iface = FakeInterface(at_responder({"VR": b"\x10\x09", "NI": b"NODE",
+                                        "DB": b"\x28"}), delay=RTT)
+    xbee = ZigBeeDevice(comm_iface=iface)
+    xbee.open()
+    try:
+        xbee.set_parameter_cache(cache)
+        iface.sent.clear()
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            for param in PARAMETERS:
+                xbee.get_parameter(param)
+        elapsed = time.perf_counter() - start
+    finally:
+        xbee.close()
+
+    name = "%d reads, %s" % (ROUNDS * len(PARAMETERS),
+                             "cache" if cache else "no cache")
+    report(name, elapsed, unit="s")
+    print("  %d AT frames sent%s" % (
+        len(iface.sent),
+        ", hit rate %.2f" % cache.hit_rate if cache else ""))
+
+
+def main():
+    poll(None)
+    poll(ATParameterCache())
+
+
+if __name__ == "__main__":
+    main()
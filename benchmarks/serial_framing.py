@@ -0,0 +1,90 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to read API frames from a serial port with
+:meth:`.XBeeSerialPort.wait_for_frame`, replaying a stream of frames through
+a pseudo terminal. Requires a POSIX system.
+"""
+import os
+import threading
+import time
+import tty
+
+from benchmarks import report
+from digi.xbee.models.address import XBee16BitAddress, XBee64BitAddress
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.status import ATCommandStatus, TransmitStatus
+from digi.xbee.packets.common import ATCommResponsePacket, ReceivePacket, \
+    TransmitStatusPacket
+from digi.xbee.serial import XBeeSerialPort
+
+NUM_FRAMES = 10000
+
+# Frames with bytes to escape: 0x7E frame ID, 0x11 and 0x13 in the data.
+PACKETS = (
+    ATCommResponsePacket(0x7E, "NI", ATCommandStatus.OK,
+                         comm_value=bytearray(b"NODE")),
+    ReceivePacket(XBee64BitAddress.from_hex_string("0013A20040AAAAAA"),
+                  XBee16BitAddress.from_hex_string("1234"), 0,
+                  rf_data=bytearray(b"\x11\x13" * 20)),
+    TransmitStatusPacket(1, XBee16BitAddress.from_hex_string("1234"), 0,
+                         TransmitStatus.SUCCESS),
+)
+
+
+def replay(operating_mode):
+    """
+    Writes the frames to a pseudo terminal and reads them from the serial
+    port on the other end.
+
+    Args:
+        operating_mode (:class:`.OperatingMode`): The API mode.
+
+    Returns:
+        Float: Seconds per frame read.
+    """
+    escaped = operating_mode == OperatingMode.ESCAPED_API_MODE
+    stream = b"".join(bytes(PACKETS[idx % len(PACKETS)].output(escaped=escaped))
+                      for idx in range(NUM_FRAMES))
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    port = XBeeSerialPort(115200, os.ttyname(slave))
+    port.open()
+    try:
+        writer = threading.Thread(target=os.write, args=(master, stream))
+        start = time.perf_counter()
+        writer.start()
+        read = 0
+        while read < NUM_FRAMES:
+            if port.wait_for_frame(operating_mode) is None:
+                raise RuntimeError("Only %d frames read" % read)
+            read += 1
+        elapsed = time.perf_counter() - start
+        writer.join()
+    finally:
+        port.close()
+        os.close(master)
+        os.close(slave)
+    return elapsed / NUM_FRAMES
+
+
+def main():
+    report("Read frame (API mode)", replay(OperatingMode.API_MODE))
+    report("Read frame (escaped API mode)",
+           replay(OperatingMode.ESCAPED_API_MODE))
+
+
+if __name__ == "__main__":
+    main()
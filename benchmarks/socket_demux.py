@@ -0,0 +1,92 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to deliver 4000 SocketReceive frames to 200 connected sockets and read
+them back, and to drain 2000 frames spread over 199 sockets with a single
+XBeeSocketSelector loop.
+"""
+import time
+
+from benchmarks import report
+from digi.xbee import xsocket
+from digi.xbee.devices import CellularDevice
+from digi.xbee.packets.socket import SocketReceivePacket
+
+from tests.fakes import FakeInterface
+from tests.test_xsocket import CELLULAR_INFO, socket_responder
+
+NUM_SOCKETS = 200
+NUM_FRAMES = 4000
+SELECT_SOCKETS = 199
+SELECT_FRAMES = 2000
+PAYLOAD = b"0123456789"
+
+
+def connect(xbee, num_sockets):
+    socks = []
+    for _ in range(num_sockets):
+        sock = xsocket.socket(xbee)
+        sock.connect(("192.168.1.1", 80))
+        sock.settimeout(5)
+        socks.append(sock)
+    return socks
+
+
+def inject(iface, num_sockets, num_frames):
+    for idx in range(num_frames):
+        iface.inject(SocketReceivePacket(0, idx % num_sockets, PAYLOAD))
+
+
+def deliver(iface, socks):
+    start = time.perf_counter()
+    inject(iface, len(socks), NUM_FRAMES)
+    expected = len(PAYLOAD) * NUM_FRAMES // len(socks)
+    for sock in socks:
+        received = 0
+        while received < expected:
+            received += len(sock.recv(expected - received))
+    report("%d frames to %d sockets, recv()" % (NUM_FRAMES, len(socks)),
+           time.perf_counter() - start, unit="s")
+
+
+def drain(iface, socks):
+    selector = xsocket.XBeeSocketSelector()
+    for sock in socks:
+        selector.register(sock, xsocket.EVENT_READ)
+    start = time.perf_counter()
+    inject(iface, len(socks), SELECT_FRAMES)
+    remaining = len(PAYLOAD) * SELECT_FRAMES
+    while remaining:
+        for key, _ in selector.select(timeout=5):
+            remaining -= len(key.fileobj.recv(4096))
+    report("%d frames from %d sockets, select() loop"
+           % (SELECT_FRAMES, len(socks)),
+           time.perf_counter() - start, unit="s")
+    selector.close()
+
+
+def main():
+    iface = FakeInterface(socket_responder(), info=CELLULAR_INFO)
+    xbee = CellularDevice(comm_iface=iface)
+    xbee.open()
+    try:
+        socks = connect(xbee, NUM_SOCKETS)
+        deliver(iface, socks)
+        drain(iface, socks[:SELECT_SOCKETS])
+    finally:
+        xbee.close()
+
+
+if __name__ == "__main__":
+    main()
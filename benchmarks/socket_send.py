@@ -0,0 +1,64 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+"""
+Time to send 90 KB through a socket of a simulated Cellular modem (10 ms
+uplink per frame, 40 ms transmit status latency, 8 buffers), waiting for the
+status of every frame before sending the next one and with the adaptive
+send window.
+"""
+import time
+
+from benchmarks import report
+from digi.xbee import xsocket
+from digi.xbee.devices import CellularDevice
+
+from tests.fakes import FakeInterface
+from tests.test_xsocket import CELLULAR_INFO, SimulatedModem
+
+DATA = bytes(range(256)) * 360
+
+
+def send(window=None):
+    iface = FakeInterface(info=CELLULAR_INFO)
+    modem = SimulatedModem(iface, uplink=0.01, latency=0.04, buffers=8)
+    iface.responder = modem
+    xbee = CellularDevice(comm_iface=iface)
+    xbee.open()
+    try:
+        sock = xsocket.socket(xbee)
+        sock.connect(("192.168.1.1", 80))
+        if window:
+            sock.set_send_window(window, max_size=window)
+        start = time.perf_counter()
+        sock.sendall(DATA)
+        elapsed = time.perf_counter() - start
+        assert modem.received == DATA
+    finally:
+        xbee.close()
+
+    report("sendall %d KB, %s" % (len(DATA) // 1024,
+                                  "window %d" % window if window
+                                  else "adaptive window"),
+           elapsed, unit="s")
+    print("  final window %d, %d frames rejected"
+          % (sock.get_send_window(), modem.no_buffers))
+
+
+def main():
+    send(window=1)
+    send()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1771 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""
+asyncio version of the local and remote XBee devices.
+
+:class:`.AsyncXBeeDevice` reads from the serial port through an asyncio
+transport registered in the running event loop, so no thread is created per
+device. Synchronous operations are coroutines and received frames are exposed
+as asynchronous iterators.
+
+For Cellular devices, :func:`.open_connection` and :func:`.start_server`
+provide TCP connections over the XBee sockets as :class:`asyncio.StreamReader`
+and :class:`asyncio.StreamWriter` pairs.
+
+This module requires Python 3.6 or later, as it uses asynchronous generators.
+It is not imported by the rest of the library, which keeps working on older
+versions.
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+
+import serial
+
+from digi.xbee.devices import AbstractXBeeDevice, XBeeDevice
+from digi.xbee.exception import XBeeException, TimeoutException, \
+    InvalidOperatingModeException, XBeeSocketException
+from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
+from digi.xbee.models.atcomm import ATStringCommand
+from digi.xbee.models.message import XBeeMessage
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.options import TransmitOptions, RemoteATCmdOptions
+from digi.xbee.models.protocol import XBeeProtocol, Role, IPProtocol
+from digi.xbee.models.status import TransmitStatus, SocketState, \
+    SocketStatus
+from digi.xbee.packets import factory
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.common import ATCommPacket, ATCommQueuePacket, \
+    RemoteATCommandPacket
+from digi.xbee.packets.socket import SocketCreatePacket, \
+    SocketConnectPacket, SocketSendPacket, SocketClosePacket, \
+    SocketBindListenPacket
+from digi.xbee.reader import PendingRequests
+from digi.xbee.sender import FrameIdAllocator
+from digi.xbee.serial import XBeeSerialPort, FlowControl, FrameBuffer
+from digi.xbee.util import utils
+from digi.xbee.xsocket import _SendWindow
+
+
+class _FrameProtocol(asyncio.Protocol):
+    """
+    asyncio protocol that splits the bytes read from the serial port into API
+    frames and hands them to the device.
+    """
+
+    def __init__(self, xbee):
+        """
+        Class constructor. Instantiates a new :class:`._FrameProtocol` object.
+
+        Args:
+            xbee (:class:`.AsyncXBeeDevice`): The device to notify.
+        """
+        self.__xbee = xbee
+        self.__frames = FrameBuffer()
+
+    def data_received(self, data):
+        if self.__frames.feed(data, self.__xbee.operating_mode):
+            while self.__frames:
+                self.__xbee._frame_received(self.__frames.pop())
+
+    def connection_lost(self, exc):
+        self.__frames.clear()
+        self.__xbee._connection_lost(exc)
+
+
+class AsyncXBeeDevice:
+    """
+    This class represents a local XBee used from asyncio code.
+
+    The serial port is read by the event loop, so all the coroutines of this
+    class must be awaited from the loop that opened the device. The XBee must
+    be working in API or API escaped mode.
+    """
+
+    _DEFAULT_TIMEOUT_SYNC_OPERATIONS = 4
+    """
+    Default timeout (seconds) of the synchronous operations.
+    """
+
+    _QUEUE_MAX_SIZE = 50
+    """
+    Maximum number of frames kept for each reader (:meth:`.read_data` and
+    every frame iterator). The oldest frame is dropped when it is full.
+    """
+
+    __ND_EXTRA_TIME = 1
+    """
+    Time (seconds) added to the node discovery time to wait for the last
+    responses.
+    """
+
+    _log = logging.getLogger(__name__)
+    """
+    Logger.
+    """
+
+    def __init__(self, port, baud_rate, data_bits=serial.EIGHTBITS,
+                 stop_bits=serial.STOPBITS_ONE, parity=serial.PARITY_NONE,
+                 flow_control=FlowControl.NONE,
+                 operating_mode=OperatingMode.API_MODE,
+                 sync_ops_timeout=_DEFAULT_TIMEOUT_SYNC_OPERATIONS):
+        """
+        Class constructor. Instantiates a new :class:`.AsyncXBeeDevice` with
+        the provided parameters.
+
+        Args:
+            port (String): Serial port name, for example '/dev/ttyUSB0'.
+            baud_rate (Integer): Serial port baud rate.
+            data_bits (Integer, optional, default=8): Serial data bits.
+            stop_bits (Float, optional, default=1): Serial stop bits.
+            parity (Char, optional, default=`N`): Parity.
+            flow_control (:class:`.FlowControl`, optional,
+                default=`FlowControl.NONE`): Flow control.
+            operating_mode (:class:`.OperatingMode`, optional,
+                default=`OperatingMode.API_MODE`): API mode of the XBee.
+            sync_ops_timeout (Integer, optional): Timeout (seconds) of the
+                synchronous operations.
+
+        Raises:
+            InvalidOperatingModeException: If `operating_mode` is not API or
+                API escaped.
+
+        .. seealso::
+           | :class:`.XBeeSerialPort`
+        """
+        if operating_mode not in (OperatingMode.API_MODE,
+                                  OperatingMode.ESCAPED_API_MODE):
+            raise InvalidOperatingModeException(op_mode=operating_mode)
+
+        self.__serial_port = XBeeSerialPort(
+            baud_rate, port, data_bits=data_bits, stop_bits=stop_bits,
+            parity=parity, flow_control=flow_control, timeout=0)
+        self.__operating_mode = operating_mode
+        self.__timeout = sync_ops_timeout
+
+        self.__read_transport = None
+        self.__write_transport = None
+
+        self.__pending_requests = PendingRequests()
+        self.__frame_ids = FrameIdAllocator()
+        self.__frame_id_released = None
+        self.__data_queue = None
+        self.__subscribers = set()
+        # Socket ID -> handler of the socket frames.
+        self.__sockets = {}
+
+        self._64bit_addr = None
+        self._16bit_addr = None
+        self._node_id = None
+        self._hardware_version = None
+        self._firmware_version = None
+        self._protocol = None
+
+        self.__remotes = {}
+
+    def __str__(self):
+        node_id = "" if self._node_id is None else self._node_id
+        return "%s - %s" % (self._64bit_addr, node_id)
+
+    async def open(self):
+        """
+        Opens the serial port, starts reading it from the running event loop
+        and reads the device information.
+
+        Only available in platforms where the event loop can watch serial
+        ports (POSIX).
+
+        Raises:
+            XBeeException: If the device is already open.
+            TimeoutException: If the XBee does not answer.
+            ATCommandException: If an AT command response is not valid.
+        """
+        if self.is_open():
+            raise XBeeException("XBee device already open.")
+
+        loop = asyncio.get_event_loop()
+        self.__serial_port.open()
+        self.__data_queue = asyncio.Queue(maxsize=self._QUEUE_MAX_SIZE)
+        self.__frame_id_released = asyncio.Event()
+        try:
+            self.__read_transport, _ = await loop.connect_read_pipe(
+                lambda: _FrameProtocol(self), self.__serial_port)
+            self.__write_transport, _ = await loop.connect_write_pipe(
+                asyncio.Protocol, self.__serial_port)
+            await self.read_device_info()
+        except BaseException:
+            await self.close()
+            raise
+
+        self._log.info("%s opened", self.__serial_port)
+
+    async def close(self):
+        """
+        Stops reading the serial port and closes it. Pending operations and
+        frame iterators finish.
+        """
+        if self.__read_transport is not None:
+            self.__read_transport.close()
+            self.__read_transport = None
+        if self.__write_transport is not None:
+            self.__write_transport.close()
+            self.__write_transport = None
+        if self.__serial_port.is_open:
+            self.__serial_port.close()
+            self._log.info("%s closed", self.__serial_port)
+
+        for queue in self.__subscribers:
+            self.__put_nowait(queue, None)
+
+    def is_open(self):
+        """
+        Returns whether this device is open.
+
+        Returns:
+            Boolean: `True` if the device is open, `False` otherwise.
+        """
+        return self.__read_transport is not None
+
+    @property
+    def operating_mode(self):
+        """
+        Returns the operating mode of this XBee.
+
+        Returns:
+            :class:`.OperatingMode`: The operating mode.
+        """
+        return self.__operating_mode
+
+    @property
+    def serial_port(self):
+        """
+        Returns the serial port of this XBee.
+
+        Returns:
+            :class:`.XBeeSerialPort`: The serial port.
+        """
+        return self.__serial_port
+
+    def get_sync_ops_timeout(self):
+        """
+        Returns the timeout of the synchronous operations.
+
+        Returns:
+            Integer: The timeout in seconds.
+        """
+        return self.__timeout
+
+    def set_sync_ops_timeout(self, sync_ops_timeout):
+        """
+        Sets the timeout of the synchronous operations.
+
+        Args:
+            sync_ops_timeout (Integer): The new timeout in seconds.
+        """
+        self.__timeout = sync_ops_timeout
+
+    def get_64bit_addr(self):
+        """
+        Returns the 64-bit address of this XBee.
+
+        Returns:
+            :class:`.XBee64BitAddress`: The 64-bit address.
+        """
+        return self._64bit_addr
+
+    def get_16bit_addr(self):
+        """
+        Returns the 16-bit address of this XBee.
+
+        Returns:
+            :class:`.XBee16BitAddress`: The 16-bit address.
+        """
+        return self._16bit_addr
+
+    def get_node_id(self):
+        """
+        Returns the node identifier of this XBee.
+
+        Returns:
+            String: The node identifier.
+        """
+        return self._node_id
+
+    def get_hardware_version(self):
+        """
+        Returns the hardware version of this XBee.
+
+        Returns:
+            :class:`.HardwareVersion`: The hardware version.
+        """
+        return self._hardware_version
+
+    def get_firmware_version(self):
+        """
+        Returns the firmware version of this XBee.
+
+        Returns:
+            Bytearray: The firmware version.
+        """
+        return self._firmware_version
+
+    def get_protocol(self):
+        """
+        Returns the protocol of this XBee.
+
+        Returns:
+            :class:`.XBeeProtocol`: The protocol.
+        """
+        return self._protocol
+
+    def is_remote(self):
+        """
+        Returns whether this is a remote device.
+
+        Returns:
+            Boolean: `False`, this is a local device.
+        """
+        return False
+
+    def get_frame_id_allocator(self):
+        """
+        Returns the frame ID allocator of this XBee.
+
+        Returns:
+            :class:`.FrameIdAllocator`: The frame ID allocator.
+        """
+        return self.__frame_ids
+
+    async def read_device_info(self):
+        """
+        Reads the hardware and firmware versions, addresses and node
+        identifier of this XBee.
+
+        Raises:
+            TimeoutException: If a response is not received in time.
+            ATCommandException: If an AT command response is not valid.
+        """
+        steps = AbstractXBeeDevice._update_device_info(self)
+        try:
+            param = next(steps)
+            while True:
+                param = steps.send(await self.get_parameter(param))
+        except StopIteration:
+            pass
+
+    async def get_next_frame_id(self):
+        """
+        Returns the next frame ID not in flight, waiting for one to be released
+        if all of them are in use.
+
+        Returns:
+            Integer: The frame ID.
+
+        Raises:
+            TimeoutException: If no frame ID is released in time.
+        """
+        deadline = time.monotonic() + self.__timeout
+        while True:
+            try:
+                return self.__frame_ids.allocate(block=False)
+            except XBeeException:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(
+                    message="No frame ID released in the configured "
+                            "timeout.")
+            # Wait until a frame ID is released or the first lease expires.
+            next_exp = self.__frame_ids.next_expiration
+            if next_exp is not None:
+                remaining = min(remaining, next_exp)
+            self.__frame_id_released.clear()
+            try:
+                await asyncio.wait_for(self.__frame_id_released.wait(),
+                                       remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def send_packet(self, packet):
+        """
+        Writes the provided packet to the serial port without waiting for any
+        response.
+
+        Args:
+            packet (:class:`.XBeePacket`): The packet to send.
+
+        Raises:
+            XBeeException: If the device is not open.
+        """
+        if self.__write_transport is None:
+            raise XBeeException("XBee device's communication interface "
+                                "closed.")
+        self.__write_transport.write(
+            bytes(packet.output(
+                escaped=self.__operating_mode
+                == OperatingMode.ESCAPED_API_MODE)))
+
+    async def send_packet_sync_and_get_response(self, packet, timeout=None):
+        """
+        Sends the provided packet and waits for its response.
+
+        Args:
+            packet (:class:`.XBeePacket`): The packet to send.
+            timeout (Float, optional): Time to wait for the response. If not
+                provided, the configured timeout is used.
+
+        Returns:
+            :class:`.XBeePacket`: The response packet.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            XBeeException: If the device is not open.
+        """
+        future = self.__pending_requests.add(packet)
+        frame_id = packet.frame_id if packet.needs_id() else 0
+        self.__frame_ids.hold(frame_id)
+        try:
+            self.send_packet(packet)
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                self.__timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(
+                message="Response not received in the configured timeout.")
+        finally:
+            self.__pending_requests.remove(packet, future)
+            self.__release_frame_id(frame_id, quarantine=not future.done())
+
+    def __release_frame_id(self, frame_id, quarantine=False):
+        """
+        Releases the provided frame ID and wakes up the coroutines waiting for
+        a free one.
+
+        Args:
+            frame_id (Integer): The frame ID to release.
+            quarantine (Boolean, optional, default=`False`): `True` to keep
+                it in flight until its late response is received.
+        """
+        self.__frame_ids.release(frame_id, quarantine=quarantine)
+        if not quarantine and self.__frame_id_released is not None:
+            self.__frame_id_released.set()
+
+    async def get_parameter(self, parameter):
+        """
+        Returns the value of the provided parameter.
+
+        Args:
+            parameter (String): The AT command of the parameter.
+
+        Returns:
+            Bytearray: The parameter value.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        response = await self._send_at_command(parameter)
+        return response.command_value
+
+    async def set_parameter(self, parameter, value, apply=True):
+        """
+        Sets the value of the provided parameter.
+
+        Args:
+            parameter (String): The AT command of the parameter.
+            value (Bytearray): The new value.
+            apply (Boolean, optional, default=`True`): `True` to apply the
+                change immediately, `False` to queue it until changes are
+                applied.
+
+        Raises:
+            ValueError: If `value` is `None`.
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        if value is None:
+            raise ValueError("Value of the parameter cannot be None.")
+        await self._send_at_command(parameter, value, apply=apply)
+
+    async def execute_command(self, parameter):
+        """
+        Executes the provided command.
+
+        Args:
+            parameter (String): The AT command to execute.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        await self._send_at_command(parameter)
+
+    async def apply_changes(self):
+        """
+        Applies the queued parameter changes.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        await self.execute_command(ATStringCommand.AC.command)
+
+    async def _send_at_command(self, parameter, value=None, apply=True):
+        """
+        Sends the provided AT command and checks its response.
+
+        Args:
+            parameter (String): The AT command.
+            value (Bytearray, optional): The parameter value, if any.
+            apply (Boolean, optional, default=`True`): `True` to apply it
+                immediately.
+
+        Returns:
+            :class:`.ATCommResponsePacket`: The response packet.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        frame_id = await self.get_next_frame_id()
+        if apply:
+            packet = ATCommPacket(frame_id, parameter, parameter=value)
+        else:
+            packet = ATCommQueuePacket(frame_id, parameter, parameter=value)
+        response = await self.send_packet_sync_and_get_response(packet)
+        AbstractXBeeDevice._check_at_status(response.status)
+        return response
+
+    async def send_data(self, remote_xbee_device, data,
+                        transmit_options=TransmitOptions.NONE.value):
+        """
+        Sends data to a remote XBee and waits for its transmit status.
+
+        Args:
+            remote_xbee_device (:class:`.AsyncRemoteXBeeDevice`): The remote
+                XBee to send data to.
+            data (String or Bytearray): The data to send.
+            transmit_options (Integer, optional): Bitfield of
+                :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeePacket`: The transmit status packet.
+
+        Raises:
+            ValueError: If `remote_xbee_device` or `data` is `None`.
+            TimeoutException: If the transmit status is not received in time.
+            TransmitException: If the transmit status is not OK.
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        return await self.__send_data(
+            remote_xbee_device.get_64bit_addr(),
+            remote_xbee_device.get_16bit_addr(), data, transmit_options)
+
+    async def send_data_broadcast(self, data,
+                                  transmit_options=TransmitOptions.NONE.value):
+        """
+        Sends data to all the XBee nodes of the network and waits for its
+        transmit status.
+
+        Args:
+            data (String or Bytearray): The data to send.
+            transmit_options (Integer, optional): Bitfield of
+                :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeePacket`: The transmit status packet.
+
+        Raises:
+            ValueError: If `data` is `None`.
+            TimeoutException: If the transmit status is not received in time.
+            TransmitException: If the transmit status is not OK.
+        """
+        return await self.__send_data(
+            XBee64BitAddress.BROADCAST_ADDRESS,
+            XBee16BitAddress.UNKNOWN_ADDRESS, data, transmit_options)
+
+    async def __send_data(self, x64addr, x16addr, data, transmit_options):
+        """
+        Sends data to the provided addresses and waits for its transmit
+        status.
+
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): Destination 64-bit address.
+            x16addr (:class:`.XBee16BitAddress`): Destination 16-bit address.
+            data (String or Bytearray): The data to send.
+            transmit_options (Integer): Bitfield of :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeePacket`: The transmit status packet.
+
+        Raises:
+            ValueError: If `data` is `None`.
+            TimeoutException: If the transmit status is not received in time.
+            TransmitException: If the transmit status is not OK.
+        """
+        if data is None:
+            raise ValueError("Data cannot be None")
+        if isinstance(data, str):
+            data = data.encode("utf8")
+
+        packet = XBeeDevice._build_transmit_packet(
+            self._protocol, await self.get_next_frame_id(), x64addr, x16addr,
+            data, transmit_options)
+        response = await self.send_packet_sync_and_get_response(packet)
+        AbstractXBeeDevice._check_transmit_status(response.transmit_status)
+        return response
+
+    async def read_data(self, timeout=None):
+        """
+        Returns the next data message received by this XBee.
+
+        Args:
+            timeout (Float, optional): Maximum time to wait for a message.
+                `None` to wait forever.
+
+        Returns:
+            :class:`.XBeeMessage`: The received message.
+
+        Raises:
+            TimeoutException: If no message is received in time.
+            XBeeException: If the device is not open or it is closed while
+                waiting.
+        """
+        if not self.is_open():
+            raise XBeeException("XBee device's communication interface "
+                                "closed.")
+        try:
+            packet = await asyncio.wait_for(self.__data_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(message="No data received in the "
+                                           "configured timeout.")
+        if packet is None:
+            raise XBeeException("XBee device's communication interface "
+                                "closed.")
+
+        x64addr = getattr(packet, "x64bit_source_addr", None)
+        x16addr = getattr(packet, "x16bit_source_addr", None)
+        remote = self.__get_remote(x64addr, x16addr)
+        return XBeeMessage(packet.rf_data, remote, time.time(),
+                           broadcast=packet.is_broadcast())
+
+    async def frames(self, frame_type=None):
+        """
+        Asynchronous iterator over the frames received by this XBee from the
+        moment the iteration starts until the device is closed.
+
+        Example:
+            async for packet in xbee.frames(ApiFrameType.RECEIVE_PACKET):
+                ...
+
+        Args:
+            frame_type (:class:`.ApiFrameType`, optional): Type of the frames
+                to return, `None` for all of them.
+
+        Returns:
+            Asynchronous iterator of :class:`.XBeeAPIPacket`.
+        """
+        queue = asyncio.Queue(maxsize=self._QUEUE_MAX_SIZE)
+        self.__subscribers.add(queue)
+        try:
+            while self.is_open():
+                packet = await queue.get()
+                if packet is None:
+                    return
+                if frame_type is None or packet.get_frame_type() == frame_type:
+                    yield packet
+        finally:
+            self.__subscribers.discard(queue)
+
+    async def discover_devices(self, timeout=None):
+        """
+        Performs a node discovery and returns the remote devices that answer.
+
+        Args:
+            timeout (Float, optional): Time to wait for answers. If not
+                provided, the discovery time of the XBee (`NT`) is used.
+
+        Returns:
+            List: :class:`.AsyncRemoteXBeeDevice` found.
+
+        Raises:
+            TimeoutException: If a response is not received in time.
+            ATCommandException: If an AT command response is not valid.
+        """
+        if timeout is None:
+            n_time = await self.get_parameter(ATStringCommand.NT.command)
+            timeout = utils.bytes_to_int(n_time) / 10 + self.__ND_EXTRA_TIME
+
+        queue = asyncio.Queue()
+        self.__subscribers.add(queue)
+        found = []
+        frame_id = 0
+        finished = False
+        try:
+            frame_id = await self.get_next_frame_id()
+            self.__frame_ids.hold(frame_id)
+            self.send_packet(ATCommPacket(frame_id,
+                                          ATStringCommand.ND.command))
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    packet = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if packet is None:
+                    break
+                if (packet.get_frame_type() != ApiFrameType.AT_COMMAND_RESPONSE
+                        or packet.frame_id != frame_id
+                        or packet.command.upper() != ATStringCommand.ND.command):
+                    continue
+                AbstractXBeeDevice._check_at_status(packet.status)
+                if not packet.command_value:
+                    # End of the discovery.
+                    finished = True
+                    break
+                found.append(self.__add_discovered(packet.command_value))
+        finally:
+            self.__subscribers.discard(queue)
+            self.__release_frame_id(frame_id, quarantine=not finished)
+
+        return found
+
+    def get_remote_devices(self):
+        """
+        Returns the remote devices known by this XBee (discovered or sending
+        data to it).
+
+        Returns:
+            List: :class:`.AsyncRemoteXBeeDevice` known.
+        """
+        return list(self.__remotes.values())
+
+    def _frame_received(self, raw_frame):
+        """
+        Dispatches a frame read from the serial port. Called by the protocol.
+
+        Args:
+            raw_frame (Bytearray): The unescaped frame.
+        """
+        try:
+            packet = factory.build_frame(raw_frame, self.__operating_mode)
+        except XBeeException as exc:
+            self._log.error("Error processing packet '%s': %s",
+                            utils.hex_to_string(raw_frame), str(exc))
+            return
+
+        self.__pending_requests.resolve(packet)
+        if packet.needs_id() and packet.frame_id:
+            self.__frame_ids.response_received(packet.frame_id)
+            self.__frame_id_released.set()
+
+        if packet.get_frame_type() in (ApiFrameType.RECEIVE_PACKET,
+                                       ApiFrameType.RX_64,
+                                       ApiFrameType.RX_16):
+            self.__put_nowait(self.__data_queue, packet)
+        elif packet.get_frame_type() in (ApiFrameType.SOCKET_RECEIVE,
+                                         ApiFrameType.SOCKET_STATE,
+                                         ApiFrameType.SOCKET_NEW_IPV4_CLIENT):
+            handler = self.__sockets.get(packet.socket_id)
+            if handler is not None:
+                handler(packet)
+
+        for queue in self.__subscribers:
+            self.__put_nowait(queue, packet)
+
+    def _connection_lost(self, exc):
+        """
+        Called by the protocol when the serial port stops being readable.
+
+        Args:
+            exc (Exception): The error, `None` if the port was closed.
+        """
+        if exc is not None:
+            self._log.error("%s lost: %s", self.__serial_port, str(exc))
+        self.__read_transport = None
+        self.__put_nowait(self.__data_queue, None)
+        for queue in self.__subscribers:
+            self.__put_nowait(queue, None)
+        for handler in list(self.__sockets.values()):
+            handler(None)
+
+    def _add_socket(self, socket_id, handler):
+        """
+        Routes the socket frames (received data, state and new clients) of
+        the given socket to a handler.
+
+        Args:
+            socket_id (Integer): The socket ID.
+            handler (Function): Receives each frame of the socket, and `None`
+                when the serial port is closed.
+        """
+        self.__sockets[socket_id] = handler
+
+    def _del_socket(self, socket_id):
+        """
+        Stops routing the frames of the given socket.
+
+        Args:
+            socket_id (Integer): The socket ID.
+        """
+        self.__sockets.pop(socket_id, None)
+
+    @staticmethod
+    def __put_nowait(queue, item):
+        """
+        Adds an item to the provided queue, dropping the oldest one if it is
+        full.
+
+        Args:
+            queue (:class:`asyncio.Queue`): The queue.
+            item: The item to add.
+        """
+        if queue is None:
+            return
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    def __get_remote(self, x64addr, x16addr):
+        """
+        Returns the known remote device with the provided addresses, creating
+        it if it does not exist.
+
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address, if any.
+            x16addr (:class:`.XBee16BitAddress`): 16-bit address, if any.
+
+        Returns:
+            :class:`.AsyncRemoteXBeeDevice`: The remote device.
+        """
+        key = x64addr if XBee64BitAddress.is_known_node_addr(x64addr) \
+            else x16addr
+        remote = self.__remotes.get(key)
+        if remote is None:
+            remote = AsyncRemoteXBeeDevice(self, x64bit_addr=x64addr,
+                                           x16bit_addr=x16addr)
+            self.__remotes[key] = remote
+        elif XBee16BitAddress.is_known_node_addr(x16addr):
+            remote._16bit_addr = x16addr
+
+        return remote
+
+    def __add_discovered(self, data):
+        """
+        Creates or updates the remote device described by an `ND` response.
+
+        Args:
+            data (Bytearray): The `ND` response value.
+
+        Returns:
+            :class:`.AsyncRemoteXBeeDevice`: The remote device.
+        """
+        x16addr = XBee16BitAddress(data[0:2])
+        x64addr = XBee64BitAddress(data[2:10])
+        # 802.15.4 adds a byte between the 64-bit address and the node ID.
+        start = 11 if self._protocol == XBeeProtocol.RAW_802_15_4 else 10
+        end = data.index(0x00, start)
+        remote = self.__get_remote(x64addr, x16addr)
+        remote._node_id = data[start:end].decode()
+        if (self._protocol != XBeeProtocol.RAW_802_15_4
+                and len(data) > end + 3):
+            # Parent address (2 bytes) and role.
+            remote._role = Role.get(data[end + 3])
+
+        return remote
+
+
+class AsyncRemoteXBeeDevice:
+    """
+    This class represents a remote XBee reached through an
+    :class:`.AsyncXBeeDevice`.
+    """
+
+    def __init__(self, local_xbee, x64bit_addr=None, x16bit_addr=None,
+                 node_id=None):
+        """
+        Class constructor. Instantiates a new :class:`.AsyncRemoteXBeeDevice`
+        with the provided parameters.
+
+        Args:
+            local_xbee (:class:`.AsyncXBeeDevice`): The local XBee used to
+                communicate with the remote one.
+            x64bit_addr (:class:`.XBee64BitAddress`, optional): 64-bit
+                address.
+            x16bit_addr (:class:`.XBee16BitAddress`, optional): 16-bit
+                address.
+            node_id (String, optional): Node identifier.
+        """
+        self.__local = local_xbee
+        self._64bit_addr = x64bit_addr
+        self._16bit_addr = x16bit_addr
+        self._node_id = node_id
+        self._role = Role.UNKNOWN
+
+    def __str__(self):
+        node_id = "" if self._node_id is None else self._node_id
+        return "%s - %s" % (self._64bit_addr, node_id)
+
+    def get_local_xbee_device(self):
+        """
+        Returns the local XBee used to communicate with this remote.
+
+        Returns:
+            :class:`.AsyncXBeeDevice`: The local XBee.
+        """
+        return self.__local
+
+    def get_64bit_addr(self):
+        """
+        Returns the 64-bit address of this XBee.
+
+        Returns:
+            :class:`.XBee64BitAddress`: The 64-bit address.
+        """
+        return self._64bit_addr
+
+    def get_16bit_addr(self):
+        """
+        Returns the 16-bit address of this XBee.
+
+        Returns:
+            :class:`.XBee16BitAddress`: The 16-bit address.
+        """
+        return self._16bit_addr
+
+    def get_node_id(self):
+        """
+        Returns the node identifier of this XBee.
+
+        Returns:
+            String: The node identifier.
+        """
+        return self._node_id
+
+    def get_role(self):
+        """
+        Returns the role of this XBee.
+
+        Returns:
+            :class:`.Role`: The role.
+        """
+        return self._role
+
+    def is_remote(self):
+        """
+        Returns whether this is a remote device.
+
+        Returns:
+            Boolean: `True`, this is a remote device.
+        """
+        return True
+
+    async def get_parameter(self, parameter):
+        """
+        Returns the value of the provided parameter.
+
+        Args:
+            parameter (String): The AT command of the parameter.
+
+        Returns:
+            Bytearray: The parameter value.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        response = await self._send_at_command(parameter)
+        return response.command_value
+
+    async def set_parameter(self, parameter, value, apply=True):
+        """
+        Sets the value of the provided parameter.
+
+        Args:
+            parameter (String): The AT command of the parameter.
+            value (Bytearray): The new value.
+            apply (Boolean, optional, default=`True`): `True` to apply the
+                change immediately.
+
+        Raises:
+            ValueError: If `value` is `None`.
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        if value is None:
+            raise ValueError("Value of the parameter cannot be None.")
+        await self._send_at_command(parameter, value, apply=apply)
+
+    async def execute_command(self, parameter):
+        """
+        Executes the provided command.
+
+        Args:
+            parameter (String): The AT command to execute.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        await self._send_at_command(parameter)
+
+    async def send_data(self, data,
+                        transmit_options=TransmitOptions.NONE.value):
+        """
+        Sends data to this XBee and waits for its transmit status.
+
+        Args:
+            data (String or Bytearray): The data to send.
+            transmit_options (Integer, optional): Bitfield of
+                :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeePacket`: The transmit status packet.
+
+        Raises:
+            TimeoutException: If the transmit status is not received in time.
+            TransmitException: If the transmit status is not OK.
+        """
+        return await self.__local.send_data(
+            self, data, transmit_options=transmit_options)
+
+    async def _send_at_command(self, parameter, value=None, apply=True):
+        """
+        Sends the provided remote AT command and checks its response.
+
+        Args:
+            parameter (String): The AT command.
+            value (Bytearray, optional): The parameter value, if any.
+            apply (Boolean, optional, default=`True`): `True` to apply it
+                immediately.
+
+        Returns:
+            :class:`.RemoteATCommandResponsePacket`: The response packet.
+
+        Raises:
+            TimeoutException: If the response is not received in time.
+            ATCommandException: If the response is not valid.
+        """
+        x64addr = self._64bit_addr
+        x16addr = self._16bit_addr
+        if not XBee64BitAddress.is_known_node_addr(x64addr):
+            x64addr = XBee64BitAddress.UNKNOWN_ADDRESS
+        if not XBee16BitAddress.is_known_node_addr(x16addr):
+            x16addr = XBee16BitAddress.UNKNOWN_ADDRESS
+
+        options = RemoteATCmdOptions.APPLY_CHANGES.value if apply \
+            else RemoteATCmdOptions.NONE.value
+        packet = RemoteATCommandPacket(
+            await self.__local.get_next_frame_id(), x64addr, x16addr, options,
+            parameter, parameter=value)
+        response = await self.__local.send_packet_sync_and_get_response(
+            packet)
+        AbstractXBeeDevice._check_at_status(response.status)
+        if XBee16BitAddress.is_known_node_addr(response.x16bit_source_addr):
+            self._16bit_addr = response.x16bit_source_addr
+        return response
+
+
+def _check_socket_response(response):
+    """
+    Checks the status of the provided socket response.
+
+    Args:
+        response (:class:`.XBeeAPIPacket`): The response packet.
+
+    Raises:
+        XBeeSocketException: If the status is not `SUCCESS`.
+    """
+    if response.status != SocketStatus.SUCCESS:
+        raise XBeeSocketException(status=response.status)
+
+
+def _current_task():
+    """
+    Returns the task running in the current event loop.
+
+    Returns:
+        :class:`asyncio.Task`: The running task, `None` if there is none.
+    """
+    if sys.version_info < (3, 7):
+        return asyncio.Task.current_task()
+    return asyncio.current_task()
+
+
+class _SocketTransport(asyncio.Transport):
+    """
+    asyncio transport of a connected TCP socket of a Cellular XBee.
+
+    Written data is sent in :class:`.SocketSendPacket` frames, keeping a
+    window of them waiting for their transmit status. The window adapts to
+    the status latency and buffer errors as in :meth:`.socket.send`. Data is
+    only removed from the write buffer when the XBee confirms it was sent, so
+    the write flow control (:meth:`asyncio.StreamWriter.drain`) follows the
+    XBee.
+    """
+
+    _MAX_PAYLOAD_BYTES = 1500
+    """
+    Maximum number of bytes sent in each frame.
+    """
+
+    _SEND_WINDOW = 4
+    """
+    Initial number of frames waiting for their transmit status.
+    """
+
+    _MAX_SEND_WINDOW = 8
+    """
+    Maximum number of frames waiting for their transmit status.
+    """
+
+    _MAX_SEND_RETRIES = 5
+    """
+    Maximum number of times a frame rejected for lack of buffers is sent.
+    """
+
+    _HIGH_WATER = 64 * 1024
+    """
+    Default write buffer size from which the protocol is paused.
+    """
+
+    def __init__(self, xbee, socket_id, address, connected=False):
+        """
+        Class constructor. Instantiates a new :class:`._SocketTransport` and
+        starts receiving the frames of the socket.
+
+        Args:
+            xbee (:class:`.AsyncXBeeDevice`): The Cellular XBee.
+            socket_id (Integer): The socket ID.
+            address (Tuple): The `(host, port)` pair of the remote end.
+            connected (Boolean, optional): `True` if the socket is already
+                connected, such as the clients accepted by a listening
+                socket, `False` to wait for its connection state.
+        """
+        super().__init__({"peername": address, "socket_id": socket_id})
+        self.__xbee = xbee
+        self.__socket_id = socket_id
+        self.__loop = asyncio.get_event_loop()
+        self.__protocol = None
+        self.__state = self.__loop.create_future()
+        if connected:
+            self.__state.set_result(SocketState.CONNECTED)
+        # Frames received while there is no protocol or reading is paused.
+        self.__pending = deque()
+        self.__reading = True
+        self.__buffer = bytearray()
+        self.__in_flight = 0
+        self.__send_task = None
+        self.__window = _SendWindow(self._SEND_WINDOW, self._MAX_SEND_WINDOW)
+        self.__high_water = self._HIGH_WATER
+        self.__low_water = self._HIGH_WATER // 4
+        self.__writing_paused = False
+        self.__closing = False
+        self.__closed = False
+
+        xbee._add_socket(socket_id, self.__frame_received)
+
+    async def _wait_connected(self, timeout):
+        """
+        Waits for the socket to be connected.
+
+        Args:
+            timeout (Float): Maximum time to wait in seconds.
+
+        Raises:
+            TimeoutException: If the socket state is not received in time.
+            XBeeSocketException: If the connection failed.
+        """
+        try:
+            state = await asyncio.wait_for(asyncio.shield(self.__state),
+                                           timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException(
+                message="Timeout waiting for the socket connection")
+        if state != SocketState.CONNECTED:
+            raise XBeeSocketException(status=state)
+
+    def get_protocol(self):
+        return self.__protocol
+
+    def set_protocol(self, protocol):
+        first = self.__protocol is None
+        self.__protocol = protocol
+        if first:
+            protocol.connection_made(self)
+            self.__deliver()
+
+    def is_closing(self):
+        return self.__closing or self.__closed
+
+    def close(self):
+        if self.__closing or self.__closed:
+            return
+        self.__closing = True
+        # The socket is closed once all the written data is sent.
+        if self.__send_task is None:
+            self.__send_task = self.__loop.create_task(self.__close_socket())
+
+    def abort(self):
+        self.__abort(None)
+
+    def is_reading(self):
+        return self.__reading and not self.__closed
+
+    def pause_reading(self):
+        # The XBee cannot be told to stop receiving: received data is kept
+        # until reading is resumed.
+        self.__reading = False
+
+    def resume_reading(self):
+        if self.__reading:
+            return
+        self.__reading = True
+        self.__loop.call_soon(self.__deliver)
+
+    def set_write_buffer_limits(self, high=None, low=None):
+        if high is None:
+            high = self._HIGH_WATER if low is None else 4 * low
+        if low is None:
+            low = high // 4
+        if not high >= low >= 0:
+            raise ValueError("high (%r) must be >= low (%r) must be >= 0"
+                             % (high, low))
+        self.__high_water = high
+        self.__low_water = low
+        self.__check_pause()
+
+    def get_write_buffer_limits(self):
+        return self.__low_water, self.__high_water
+
+    def get_write_buffer_size(self):
+        """
+        Returns the number of written bytes not confirmed by the XBee yet,
+        including the ones waiting for their transmit status.
+        """
+        return len(self.__buffer) + self.__in_flight
+
+    def write(self, data):
+        if not data:
+            return
+        if self.__closing or self.__closed:
+            AsyncXBeeDevice._log.warning(
+                "Data written to closed socket %d discarded", self.__socket_id)
+            return
+        self.__buffer += data
+        if self.__send_task is None:
+            self.__send_task = self.__loop.create_task(self.__send_loop())
+        self.__check_pause()
+
+    def can_write_eof(self):
+        return False
+
+    def write_eof(self):
+        raise NotImplementedError("XBee sockets do not support half-close")
+
+    def __frame_received(self, packet):
+        """
+        Handles a frame of the socket.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The frame, `None` if the serial
+                port was closed.
+        """
+        if packet is None:
+            self.__connection_lost(
+                XBeeException("XBee device's communication interface "
+                              "closed."))
+            return
+        if (packet.get_frame_type() == ApiFrameType.SOCKET_STATE
+                and not self.__state.done()):
+            self.__state.set_result(packet.state)
+            return
+        self.__pending.append(packet)
+        self.__deliver()
+
+    def __deliver(self):
+        """
+        Hands the received frames to the protocol while it is reading.
+        """
+        while (self.__pending and self.__protocol is not None
+               and self.__reading and not self.__closed):
+            packet = self.__pending.popleft()
+            if packet.get_frame_type() == ApiFrameType.SOCKET_RECEIVE:
+                self.__protocol.data_received(bytes(packet.payload))
+            elif packet.get_frame_type() == ApiFrameType.SOCKET_STATE:
+                # The XBee closed the socket.
+                self.__closing = True
+                if packet.state == SocketState.TRANSPORT_CLOSED:
+                    self.__protocol.eof_received()
+                    self.__connection_lost(None)
+                else:
+                    self.__connection_lost(
+                        XBeeSocketException(status=packet.state))
+
+    def __check_pause(self):
+        """
+        Pauses or resumes the writing of the protocol depending on the write
+        buffer size.
+        """
+        if self.__protocol is None:
+            return
+        size = self.get_write_buffer_size()
+        if not self.__writing_paused and size > self.__high_water:
+            self.__writing_paused = True
+            self.__protocol.pause_writing()
+        elif self.__writing_paused and size <= self.__low_water:
+            self.__writing_paused = False
+            self.__protocol.resume_writing()
+
+    async def __send_chunk(self, chunk):
+        """
+        Sends a chunk of data and waits for its transmit status.
+
+        Args:
+            chunk (Bytes): The data to send.
+
+        Returns:
+            :class:`.TransmitStatus`: The transmit status if it is not
+                successful, `None` otherwise.
+        """
+        frame_id = await self.__xbee.get_next_frame_id()
+        start = time.monotonic()
+        response = await self.__xbee.send_packet_sync_and_get_response(
+            SocketSendPacket(frame_id, self.__socket_id, chunk))
+        if response.transmit_status != TransmitStatus.SUCCESS:
+            return response.transmit_status
+        self.__window.delivered(time.monotonic() - start)
+        return None
+
+    async def __send_loop(self):
+        """
+        Sends the write buffer, keeping a window of frames waiting for their
+        transmit status, and closes the socket when requested.
+
+        A frame rejected for lack of buffers is sent again if no later frame
+        was accepted, so the data is never reordered; otherwise the
+        connection is lost. No frame is sent while a frame waiting in the
+        window was rejected, as it could be accepted before the rejected one
+        is sent again.
+        """
+        # Frames waiting for their status as (chunk, task). Tasks start in
+        # order, so frames are written to the XBee in order.
+        in_flight = deque()
+        retries = 0
+        try:
+            while self.__buffer or in_flight:
+                while (self.__buffer and len(in_flight) < self.__window.size
+                       and not self.__any_rejected(in_flight)):
+                    chunk = bytes(self.__buffer[:self._MAX_PAYLOAD_BYTES])
+                    del self.__buffer[:self._MAX_PAYLOAD_BYTES]
+                    self.__in_flight += len(chunk)
+                    in_flight.append(
+                        (chunk, self.__loop.create_task(
+                            self.__send_chunk(chunk))))
+
+                chunk, task = in_flight.popleft()
+                status = await task
+                if status is None:
+                    self.__in_flight -= len(chunk)
+                    retries = 0
+                    self.__check_pause()
+                    continue
+
+                if (status not in (TransmitStatus.NO_BUFFERS,
+                                   TransmitStatus.RESOURCE_ERROR)
+                        or retries >= self._MAX_SEND_RETRIES):
+                    raise XBeeSocketException(status=status)
+                statuses = [await later for _, later in in_flight]
+                if None in statuses:
+                    raise XBeeSocketException(status=status)
+                # Nothing was accepted: send it again with a smaller window.
+                self.__buffer[0:0] = chunk + b"".join(
+                    later_chunk for later_chunk, _ in in_flight)
+                self.__in_flight = 0
+                in_flight.clear()
+                self.__window.congested()
+                retries += 1
+                await asyncio.sleep(self.__window.min_rtt or 0)
+        except asyncio.CancelledError:
+            for _, task in in_flight:
+                task.cancel()
+            raise
+        except Exception as exc:
+            for _, task in in_flight:
+                task.cancel()
+            self.__abort(exc)
+            return
+        finally:
+            self.__send_task = None
+
+        if self.__closing and not self.__closed:
+            self.__send_task = self.__loop.create_task(self.__close_socket())
+
+    @staticmethod
+    def __any_rejected(in_flight):
+        """
+        Returns whether the transmit status of any frame waiting in the
+        window was already received and is not successful.
+
+        Args:
+            in_flight (Iterable): Frames waiting as (chunk, task).
+
+        Returns:
+            Boolean: `True` if any frame was rejected, `False` otherwise.
+        """
+        return any(task.done() and not task.cancelled()
+                   and (task.exception() is not None
+                        or task.result() is not None)
+                   for _, task in in_flight)
+
+    def __abort(self, exc):
+        """
+        Closes the socket without sending the pending data and notifies the
+        protocol.
+
+        Args:
+            exc (Exception): The error, `None` if the socket was aborted.
+        """
+        if self.__closed:
+            return
+        self.__closing = True
+        self.__buffer.clear()
+        try:
+            # Frame ID 0: the close response is not needed.
+            self.__xbee.send_packet(SocketClosePacket(0, self.__socket_id))
+        except XBeeException:
+            pass
+        self.__connection_lost(exc)
+
+    async def __close_socket(self):
+        """
+        Closes the socket in the XBee and notifies the protocol.
+        """
+        try:
+            frame_id = await self.__xbee.get_next_frame_id()
+            response = await self.__xbee.send_packet_sync_and_get_response(
+                SocketClosePacket(frame_id, self.__socket_id))
+            _check_socket_response(response)
+        except XBeeException as exc:
+            AsyncXBeeDevice._log.warning("Error closing socket %d: %s",
+                                         self.__socket_id, str(exc))
+        finally:
+            self.__send_task = None
+            self.__connection_lost(None)
+
+    def __connection_lost(self, exc):
+        """
+        Stops receiving the frames of the socket and notifies the protocol.
+
+        Args:
+            exc (Exception): The error, `None` if the socket was closed.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        self.__closing = True
+        self.__xbee._del_socket(self.__socket_id)
+        if (self.__send_task is not None
+                and self.__send_task is not _current_task()):
+            self.__send_task.cancel()
+        if not self.__state.done():
+            self.__state.set_result(SocketState.TRANSPORT_CLOSED)
+        if self.__protocol is not None:
+            self.__loop.call_soon(self.__protocol.connection_lost, exc)
+
+
+class AsyncXBeeSocketServer:
+    """
+    This class represents a TCP server listening in a socket of a Cellular
+    XBee, created with :func:`.start_server`.
+    """
+
+    def __init__(self, xbee, socket_id, port, client_connected_cb, limit):
+        """
+        Class constructor. Instantiates a new :class:`.AsyncXBeeSocketServer`
+        and starts accepting clients.
+
+        Args:
+            xbee (:class:`.AsyncXBeeDevice`): The Cellular XBee.
+            socket_id (Integer): The ID of the listening socket.
+            port (Integer): The listening port.
+            client_connected_cb (Function): Called (or scheduled, if it is a
+                coroutine function) with a `(reader, writer)` pair for each
+                client.
+            limit (Integer): Buffer size limit of the stream readers.
+        """
+        self.__xbee = xbee
+        self.__socket_id = socket_id
+        self.__port = port
+        self.__client_connected_cb = client_connected_cb
+        self.__limit = limit
+        self.__closed = asyncio.get_event_loop().create_future()
+
+        xbee._add_socket(socket_id, self.__frame_received)
+
+    @property
+    def port(self):
+        """
+        Returns the listening port.
+
+        Returns:
+            Integer: The port.
+        """
+        return self.__port
+
+    def is_serving(self):
+        """
+        Returns whether the server is accepting clients.
+
+        Returns:
+            Boolean: `True` if it is accepting clients, `False` otherwise.
+        """
+        return not self.__closed.done()
+
+    def close(self):
+        """
+        Stops accepting clients and closes the listening socket. Connected
+        clients are not closed.
+        """
+        if self.__closed.done():
+            return
+        self.__xbee._del_socket(self.__socket_id)
+        self.__closed.set_result(None)
+        try:
+            self.__xbee.send_packet(SocketClosePacket(0, self.__socket_id))
+        except XBeeException:
+            pass
+
+    async def wait_closed(self):
+        """
+        Waits until the server is closed.
+        """
+        await asyncio.shield(self.__closed)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        await self.wait_closed()
+
+    def __frame_received(self, packet):
+        """
+        Handles a frame of the listening socket.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The frame, `None` if the serial
+                port was closed.
+        """
+        if packet is None:
+            self.close()
+            return
+        if packet.get_frame_type() == ApiFrameType.SOCKET_STATE:
+            # The listener was closed by the XBee.
+            self.close()
+            return
+        if packet.get_frame_type() != ApiFrameType.SOCKET_NEW_IPV4_CLIENT:
+            return
+
+        transport = _SocketTransport(
+            self.__xbee, packet.client_socket_id,
+            (str(packet.remote_address), packet.remote_port), connected=True)
+        reader = asyncio.StreamReader(limit=self.__limit)
+        transport.set_protocol(
+            asyncio.StreamReaderProtocol(reader, self.__client_connected_cb))
+
+
+def _check_cellular(xbee):
+    """
+    Checks that the provided XBee is a Cellular one.
+
+    Args:
+        xbee (:class:`.AsyncXBeeDevice`): The XBee.
+
+    Raises:
+        XBeeException: If the XBee is not open.
+        ValueError: If the XBee is not a Cellular device.
+    """
+    if not xbee.is_open():
+        raise XBeeException("XBee device must be open")
+    if xbee.get_protocol() not in (XBeeProtocol.CELLULAR,
+                                   XBeeProtocol.CELLULAR_NBIOT):
+        raise ValueError("XBee device must be a Cellular device")
+
+
+async def _create_socket(xbee):
+    """
+    Creates a TCP socket in the provided XBee.
+
+    Args:
+        xbee (:class:`.AsyncXBeeDevice`): The Cellular XBee.
+
+    Returns:
+        Integer: The socket ID.
+
+    Raises:
+        TimeoutException: If the response is not received in time.
+        XBeeSocketException: If the socket cannot be created.
+    """
+    frame_id = await xbee.get_next_frame_id()
+    response = await xbee.send_packet_sync_and_get_response(
+        SocketCreatePacket(frame_id, IPProtocol.TCP))
+    _check_socket_response(response)
+    return response.socket_id
+
+
+async def create_connection(xbee, protocol_factory, host, port,
+                            timeout=None):
+    """
+    Connects a TCP socket of the provided Cellular XBee to the given address,
+    like :meth:`asyncio.loop.create_connection`.
+
+    Args:
+        xbee (:class:`.AsyncXBeeDevice`): The open Cellular XBee.
+        protocol_factory (Function): Returns the :class:`asyncio.Protocol`
+            of the connection.
+        host (String): Domain name or IPv4 of the remote end.
+        port (Integer): Port of the remote end.
+        timeout (Float, optional): Time to wait for each response and for the
+            connection. If not provided, the timeout of the synchronous
+            operations of the XBee is used.
+
+    Returns:
+        Tuple: `(transport, protocol)` pair.
+
+    Raises:
+        ValueError: If the XBee is not a Cellular device or `port` is not
+            valid.
+        XBeeException: If the XBee is not open.
+        TimeoutException: If a response or the connection is not received in
+            time.
+        XBeeSocketException: If the socket cannot be created or connected.
+    """
+    _check_cellular(xbee)
+    if port < 1 or port > 65535:
+        raise ValueError("Port number must be between 1 and 65535")
+    if timeout is None:
+        timeout = xbee.get_sync_ops_timeout()
+
+    socket_id = await _create_socket(xbee)
+    transport = _SocketTransport(xbee, socket_id, (str(host), port))
+    try:
+        frame_id = await xbee.get_next_frame_id()
+        response = await xbee.send_packet_sync_and_get_response(
+            SocketConnectPacket(frame_id, socket_id, port,
+                                SocketConnectPacket.DEST_ADDRESS_STRING,
+                                str(host)),
+            timeout=timeout)
+        _check_socket_response(response)
+        await transport._wait_connected(timeout)
+    except BaseException:
+        transport.abort()
+        raise
+
+    protocol = protocol_factory()
+    transport.set_protocol(protocol)
+    return transport, protocol
+
+
+async def open_connection(xbee, host, port, limit=2 ** 16, timeout=None):
+    """
+    Connects a TCP socket of the provided Cellular XBee to the given address
+    and returns its streams, like :func:`asyncio.open_connection`.
+
+    Example:
+        reader, writer = await open_connection(xbee, "example.com", 80)
+        writer.write(b"GET / HTTP/1.0\\r\\n\\r\\n")
+        await writer.drain()
+        data = await reader.read()
+
+    Args:
+        xbee (:class:`.AsyncXBeeDevice`): The open Cellular XBee.
+        host (String): Domain name or IPv4 of the remote end.
+        port (Integer): Port of the remote end.
+        limit (Integer, optional): Buffer size limit of the reader.
+        timeout (Float, optional): Time to wait for each response and for the
+            connection. If not provided, the timeout of the synchronous
+            operations of the XBee is used.
+
+    Returns:
+        Tuple: `(reader, writer)` pair of :class:`asyncio.StreamReader` and
+            :class:`asyncio.StreamWriter`.
+
+    Raises:
+        ValueError: If the XBee is not a Cellular device or `port` is not
+            valid.
+        XBeeException: If the XBee is not open.
+        TimeoutException: If a response or the connection is not received in
+            time.
+        XBeeSocketException: If the socket cannot be created or connected.
+
+    .. seealso::
+       | :func:`.create_connection`
+    """
+    loop = asyncio.get_event_loop()
+    reader = asyncio.StreamReader(limit=limit)
+    protocol = asyncio.StreamReaderProtocol(reader)
+    transport, _ = await create_connection(xbee, lambda: protocol, host, port,
+                                           timeout=timeout)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return reader, writer
+
+
+async def start_server(client_connected_cb, xbee, port, limit=2 ** 16):
+    """
+    Starts a TCP server listening in a socket of the provided Cellular XBee,
+    like :func:`asyncio.start_server`.
+
+    Args:
+        client_connected_cb (Function): Called with a `(reader, writer)` pair
+            for each client. If it is a coroutine function, it is scheduled
+            as a task.
+        xbee (:class:`.AsyncXBeeDevice`): The open Cellular XBee.
+        port (Integer): The port to listen in.
+        limit (Integer, optional): Buffer size limit of the readers.
+
+    Returns:
+        :class:`.AsyncXBeeSocketServer`: The server.
+
+    Raises:
+        ValueError: If the XBee is not a Cellular device or `port` is not
+            valid.
+        XBeeException: If the XBee is not open.
+        TimeoutException: If a response is not received in time.
+        XBeeSocketException: If the socket cannot be created or bound.
+    """
+    _check_cellular(xbee)
+    if port < 1 or port > 65535:
+        raise ValueError("Port number must be between 1 and 65535")
+
+    socket_id = await _create_socket(xbee)
+    try:
+        frame_id = await xbee.get_next_frame_id()
+        response = await xbee.send_packet_sync_and_get_response(
+            SocketBindListenPacket(frame_id, socket_id, port))
+        _check_socket_response(response)
+    except BaseException:
+        xbee.send_packet(SocketClosePacket(0, socket_id))
+        raise
+
+    return AsyncXBeeSocketServer(xbee, socket_id, port, client_connected_cb,
+                                 limit)
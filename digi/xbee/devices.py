@@ -13,9 +13,15 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 from abc import ABCMeta, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import logging
 from enum import Enum, unique
+import heapq
 from ipaddress import IPv4Address
+import itertools
+import os
+import struct
 import threading
 import time
 from queue import Queue, Empty
@@ -24,7 +30,7 @@ from digi.xbee import serial
 from digi.xbee.filesystem import FileSystemManager
 from digi.xbee.packets.cellular import TXSMSPacket
 from digi.xbee.models.accesspoint import AccessPoint, WiFiEncryptionType
-from digi.xbee.models.atcomm import ATCommandResponse, ATCommand, ATStringCommand
+from digi.xbee.models.atcomm import ATCommandResponse, ATCommand, ATStringCommand, ATParameterClass
 from digi.xbee.models.hw import HardwareVersion
 from digi.xbee.models.mode import OperatingMode, APIOutputMode, IPAddressingMode, NeighborDiscoveryMode, APIOutputModeBit
 from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress, XBeeIMEIAddress
@@ -44,7 +50,7 @@ from digi.xbee.packets.network import TXIPv4Packet
 from digi.xbee.packets.raw import TX64Packet, TX16Packet
 from digi.xbee.packets.relay import UserDataRelayPacket
 from digi.xbee.packets.zigbee import RegisterJoiningDevicePacket, RegisterDeviceStatusPacket, CreateSourceRoutePacket
-from digi.xbee.sender import PacketSender
+from digi.xbee.sender import PacketSender, FrameIdAllocator, TransmitPipeline
 from digi.xbee.util import utils
 from digi.xbee.exception import XBeeException, TimeoutException, InvalidOperatingModeException, \
     ATCommandException, OperationNotSupportedException, TransmitException
@@ -60,6 +66,221 @@ _ERROR_INCOMPATIBLE_PROTOCOL = "Error reading device information: Your module se
                                "Check if you are using the appropriate device class."
 
 
+class ATParameterCache(object):
+    """
+    This class represents a cache of the AT parameter values read from an XBee.
+
+    Every parameter belongs to a class (:class:`.ATParameterClass`) with its own time to live.
+    By default immutable parameters never expire, configuration parameters expire after
+    :attr:`.ATParameterCache.DEFAULT_CONFIG_TTL` seconds, and volatile parameters are not cached.
+    Parameters not classified are considered volatile.
+
+    Cached values are discarded when their parameter is set, when settings are restored (``RE``)
+    or the XBee is reset (``FR`` or a reset modem status).
+
+    .. seealso::
+       | :meth:`.AbstractXBeeDevice.set_parameter_cache`
+    """
+
+    DEFAULT_CONFIG_TTL = 300
+    """
+    Default time (in seconds) configuration parameters are cached.
+    """
+
+    _DEFAULT_CLASSES = dict(
+        [(cmd.command, ATParameterClass.IMMUTABLE)
+         for cmd in (ATStringCommand.HV, ATStringCommand.VR, ATStringCommand.SH, ATStringCommand.SL,
+                     ATStringCommand.DD, ATStringCommand.R_QUESTION, ATStringCommand.PERCENT_C)]
+        + [(cmd.command, ATParameterClass.CONFIG)
+           for cmd in (ATStringCommand.AO, ATStringCommand.AP, ATStringCommand.AR, ATStringCommand.BD,
+                       ATStringCommand.BR, ATStringCommand.C0, ATStringCommand.CE, ATStringCommand.CM,
+                       ATStringCommand.DH, ATStringCommand.DL, ATStringCommand.D0, ATStringCommand.D1,
+                       ATStringCommand.D2, ATStringCommand.D3, ATStringCommand.D4, ATStringCommand.D5,
+                       ATStringCommand.D6, ATStringCommand.D7, ATStringCommand.D8, ATStringCommand.D9,
+                       ATStringCommand.EE, ATStringCommand.EO, ATStringCommand.GW, ATStringCommand.IC,
+                       ATStringCommand.ID, ATStringCommand.IR, ATStringCommand.JV, ATStringCommand.MA,
+                       ATStringCommand.MK, ATStringCommand.NB, ATStringCommand.NI, ATStringCommand.NO,
+                       ATStringCommand.NP, ATStringCommand.NT, ATStringCommand.P0, ATStringCommand.P1,
+                       ATStringCommand.P2, ATStringCommand.P3, ATStringCommand.P4, ATStringCommand.P5,
+                       ATStringCommand.P6, ATStringCommand.P7, ATStringCommand.P8, ATStringCommand.P9,
+                       ATStringCommand.PL, ATStringCommand.RR, ATStringCommand.SB, ATStringCommand.SC,
+                       ATStringCommand.SD, ATStringCommand.SM, ATStringCommand.SN, ATStringCommand.SO,
+                       ATStringCommand.SP, ATStringCommand.ST)])
+
+    def __init__(self, ttls=None):
+        """
+        Class constructor. Instantiates a new :class:`.ATParameterCache` object.
+
+        Args:
+            ttls (Dictionary, optional): :class:`.ATParameterClass` -> time in seconds its
+                parameters are cached, ``None`` to never expire, 0 to not cache them. Classes not
+                included use their default time.
+        """
+        self.__ttls = {
+            ATParameterClass.IMMUTABLE: None,
+            ATParameterClass.CONFIG: self.__class__.DEFAULT_CONFIG_TTL,
+            ATParameterClass.VOLATILE: 0,
+        }
+        if ttls:
+            self.__ttls.update(ttls)
+
+        self.__classes = dict(self.__class__._DEFAULT_CLASSES)
+        # Parameter -> (value, expiration time or None)
+        self.__values = {}
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__values)
+
+    def get_class(self, parameter):
+        """
+        Returns the class of the provided parameter.
+
+        Args:
+            parameter (String): The AT parameter.
+
+        Returns:
+            :class:`.ATParameterClass`: The parameter class.
+        """
+        return self.__classes.get(parameter.upper(), ATParameterClass.VOLATILE)
+
+    def set_class(self, parameter, param_class):
+        """
+        Changes the class of the provided parameter, discarding its cached value.
+
+        Args:
+            parameter (String): The AT parameter.
+            param_class (:class:`.ATParameterClass`): The new parameter class.
+        """
+        parameter = parameter.upper()
+        with self.__lock:
+            self.__classes[parameter] = param_class
+            self.__values.pop(parameter, None)
+
+    def get(self, parameter):
+        """
+        Returns the cached value of the provided parameter.
+
+        Args:
+            parameter (String): The AT parameter.
+
+        Returns:
+            Bytearray: A copy of the cached value, ``None`` if it is not cached or has expired.
+        """
+        parameter = parameter.upper()
+        if self.__ttls.get(self.get_class(parameter)) == 0:
+            return None
+
+        with self.__lock:
+            entry = self.__values.get(parameter)
+            if entry and entry[1] is not None and entry[1] <= time.monotonic():
+                del self.__values[parameter]
+                entry = None
+            if not entry:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            return bytearray(entry[0])
+
+    def put(self, parameter, value):
+        """
+        Caches the value of the provided parameter, if its class is cacheable.
+
+        Args:
+            parameter (String): The AT parameter.
+            value (Bytearray): The parameter value.
+        """
+        parameter = parameter.upper()
+        ttl = self.__ttls.get(self.get_class(parameter))
+        if ttl == 0 or value is None:
+            return
+
+        with self.__lock:
+            self.__values[parameter] = (bytearray(value),
+                                        time.monotonic() + ttl if ttl is not None else None)
+
+    def invalidate(self, parameter=None):
+        """
+        Discards the cached value of the provided parameter, or all of them.
+
+        Args:
+            parameter (String, optional): The AT parameter, ``None`` for all.
+        """
+        with self.__lock:
+            if parameter is None:
+                self.__values.clear()
+            else:
+                self.__values.pop(parameter.upper(), None)
+
+    def clear(self):
+        """
+        Discards all cached values and resets the statistics.
+        """
+        with self.__lock:
+            self.__values.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def _command_executed(self, command, is_set):
+        """
+        Discards the cached values changed by the provided AT command.
+
+        Args:
+            command (String): The executed AT command.
+            is_set (Boolean): ``True`` if the command sets a value, ``False`` otherwise.
+        """
+        command = command.upper()
+        if command in (ATStringCommand.RE.command, ATStringCommand.FR.command):
+            self._reset()
+        elif is_set:
+            self.invalidate(command)
+
+    def _reset(self):
+        """
+        Discards the cached values of all parameters but the immutable ones, after the XBee
+        is reset or its settings are restored.
+        """
+        with self.__lock:
+            for parameter in list(self.__values):
+                if self.get_class(parameter) != ATParameterClass.IMMUTABLE:
+                    del self.__values[parameter]
+
+    @property
+    def hits(self):
+        """
+        Returns the number of lookups of cacheable parameters that found a valid value.
+
+        Returns:
+            Integer: Number of cache hits.
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        Returns the number of lookups of cacheable parameters that did not find a valid value.
+
+        Returns:
+            Integer: Number of cache misses.
+        """
+        return self.__misses
+
+    @property
+    def hit_rate(self):
+        """
+        Returns the ratio of lookups of cacheable parameters that found a valid value.
+
+        Returns:
+            Float: Hit rate between 0 and 1, 0 if there were no lookups.
+        """
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0
+
+
 class AbstractXBeeDevice(object):
     """
     This class provides common functionality for all XBee devices.
@@ -76,11 +297,23 @@ class AbstractXBeeDevice(object):
     The Bluetooth Low Energy API username.
     """
 
+    # Maximum number of AT commands of a batch waiting for their response at the same time
+    __AT_BATCH_SIZE = 32
+
     _log = logging.getLogger(__name__)
     """
     Logger.
     """
 
+    _registry = None
+    """
+    Node registry of the network that contains the XBee, if any.
+    """
+
+    __x64bit_addr = None
+    __x16bit_addr = None
+    __node_id = None
+
     def __init__(self, local_xbee_device=None, serial_port=None, sync_ops_timeout=_DEFAULT_TIMEOUT_SYNC_OPERATIONS,
                  comm_iface=None):
         """
@@ -103,11 +336,12 @@ class AbstractXBeeDevice(object):
         if (serial_port, comm_iface).count(None) != 1:
             raise XBeeException("Either ``serial_port`` or ``comm_iface`` must be ``None`` (and only one of them)")
 
-        self.__current_frame_id = 0x00
+        self._frame_id_allocator = FrameIdAllocator()
 
         self._16bit_addr = None
         self._64bit_addr = None
         self._apply_changes_flag = True
+        self._parameter_cache = None
 
         self._is_open = False
         self._operating_mode = None
@@ -167,6 +401,48 @@ class AbstractXBeeDevice(object):
     def __hash__(self):
         return hash((23, self.get_64bit_addr()))
 
+    @property
+    def _64bit_addr(self):
+        """
+        The 64-bit address of the XBee. Setting it updates the network node registry.
+        """
+        return self.__x64bit_addr
+
+    @_64bit_addr.setter
+    def _64bit_addr(self, x64bit_addr):
+        old = self.__x64bit_addr
+        self.__x64bit_addr = x64bit_addr
+        if self._registry is not None and old != x64bit_addr:
+            self._registry.reindex(self, _NodeRegistry.X64, old, x64bit_addr)
+
+    @property
+    def _16bit_addr(self):
+        """
+        The 16-bit address of the XBee. Setting it updates the network node registry.
+        """
+        return self.__x16bit_addr
+
+    @_16bit_addr.setter
+    def _16bit_addr(self, x16bit_addr):
+        old = self.__x16bit_addr
+        self.__x16bit_addr = x16bit_addr
+        if self._registry is not None and old != x16bit_addr:
+            self._registry.reindex(self, _NodeRegistry.X16, old, x16bit_addr)
+
+    @property
+    def _node_id(self):
+        """
+        The node identifier of the XBee. Setting it updates the network node registry.
+        """
+        return self.__node_id
+
+    @_node_id.setter
+    def _node_id(self, node_id):
+        old = self.__node_id
+        self.__node_id = node_id
+        if self._registry is not None and old != node_id:
+            self._registry.reindex(self, _NodeRegistry.NI, old, node_id)
+
     def __str__(self):
         node_id = "" if self.get_node_id() is None else self.get_node_id()
         return "%s - %s" % (self.get_64bit_addr(), node_id)
@@ -247,13 +523,25 @@ class AbstractXBeeDevice(object):
             InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
                 method only checks the cached value of the operating mode.
             ATCommandException: if the response is not as expected.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice.set_parameter_cache`
         """
+        cache = self._parameter_cache
+        if cache is not None and parameter_value is None and parameter:
+            value = cache.get(parameter)
+            if value is not None:
+                return value
+
         value = self.__send_parameter(parameter, parameter_value=parameter_value)
 
         # Check if the response is None, if so throw an exception (maybe it was a write-only parameter).
         if value is None:
             raise OperationNotSupportedException(message="Could not get the %s value." % parameter)
 
+        if cache is not None and parameter_value is None:
+            cache.put(parameter, value)
+
         return value
 
     def set_parameter(self, parameter, value):
@@ -310,6 +598,108 @@ class AbstractXBeeDevice(object):
         """
         self.__send_parameter(parameter, parameter_value=value)
 
+    def get_parameters(self, parameters):
+        """
+        Returns the values of the provided parameters.
+
+        The AT commands are sent back-to-back without waiting for the response of the previous
+        ones, so reading several parameters takes about the time of a single read.
+
+        Args:
+            parameters (List): List of parameters (String) to get.
+
+        Returns:
+            Dictionary: Parameter (String) -> value (Bytearray), in the same order as ``parameters``.
+
+        Raises:
+            ValueError: if any parameter is ``None`` or does not contain exactly 2 characters.
+            TimeoutException: if any response is not received before the read timeout expires.
+            XBeeException: if the XBee device's communication interface is closed.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            ATCommandException: if any response is not as expected.
+            OperationNotSupportedException: if any parameter has no value (maybe it is write-only).
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice.get_parameter`
+           | :meth:`.AbstractXBeeDevice.set_parameters`
+        """
+        cache = self._parameter_cache
+        values = {}
+        if cache is not None:
+            for param in parameters:
+                value = cache.get(param) if param else None
+                if value is not None:
+                    values[param] = value
+
+        to_read = [param for param in parameters if param not in values]
+        responses = self._send_at_commands([ATCommand(param) for param in to_read])
+
+        for param, response in zip(to_read, responses):
+            self._check_at_cmd_response_is_valid(response)
+            if response.response is None:
+                raise OperationNotSupportedException(message="Could not get the %s value." % param)
+            values[param] = response.response
+            if cache is not None:
+                cache.put(param, response.response)
+
+        return {param: values[param] for param in parameters}
+
+    def set_parameters(self, parameters, apply=True, write=False, progress_callback=None):
+        """
+        Sets the values of the provided parameters.
+
+        The AT commands are queued and sent back-to-back without waiting for the response of the
+        previous ones. Once all of them succeed, changes are written to the non-volatile memory
+        (``WR``) if ``write`` is ``True``, and applied (``AC``) if ``apply`` is ``True``, with a
+        single final batch. If any command fails, changes are neither written nor applied.
+
+        Args:
+            parameters (Dictionary or List): Parameter (String) -> value (Bytearray) to set, or a
+                list of (parameter, value) tuples to keep their order.
+            apply (Boolean, optional, default=`True`): ``True`` to apply the changes, ``False`` to
+                leave them queued.
+            write (Boolean, optional, default=`False`): ``True`` to write the changes to the
+                non-volatile memory.
+            progress_callback (Function, optional): function called every time a parameter is
+                set, receiving the number of parameters set so far and the total number of them.
+
+        Raises:
+            ValueError: if any parameter is ``None`` or does not contain exactly 2 characters, or
+                any value is ``None``.
+            TimeoutException: if any response is not received before the read timeout expires.
+            XBeeException: if the XBee device's communication interface is closed.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            ATCommandException: if any response is not as expected.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice.set_parameter`
+           | :meth:`.AbstractXBeeDevice.get_parameters`
+        """
+        if isinstance(parameters, dict):
+            parameters = parameters.items()
+        commands = []
+        for param, value in parameters:
+            if value is None:
+                raise ValueError("Value of the parameter cannot be None.")
+            commands.append(ATCommand(param, parameter=value))
+
+        for response in self._send_at_commands(commands, queued=True, progress_callback=progress_callback):
+            self._check_at_cmd_response_is_valid(response)
+
+        if self._parameter_cache is not None:
+            for command in commands:
+                self._parameter_cache._command_executed(command.command, True)
+
+        commands = []
+        if write:
+            commands.append(ATCommand(ATStringCommand.WR.command))
+        if apply:
+            commands.append(ATCommand(ATStringCommand.AC.command))
+        for response in self._send_at_commands(commands, queued=True):
+            self._check_at_cmd_response_is_valid(response)
+
     def __send_parameter(self, parameter, parameter_value=None):
         """
         Sends the given AT parameter to this XBee device with an optional
@@ -338,6 +728,11 @@ class AbstractXBeeDevice(object):
 
         self._check_at_cmd_response_is_valid(response)
 
+        # Discard the cached values changed by the command here, the packet sender hook might
+        # run later or not know this node
+        if self._parameter_cache is not None:
+            self._parameter_cache._command_executed(parameter, parameter_value is not None)
+
         return response.response
 
     def _check_at_cmd_response_is_valid(self, response):
@@ -352,10 +747,26 @@ class AbstractXBeeDevice(object):
             ATCommandException: if ``response`` is ``None`` or
                                 if ``response.response != OK``.
         """
-        if response is None or not isinstance(response, ATCommandResponse) or response.status is None:
+        if response is None or not isinstance(response, ATCommandResponse):
+            raise ATCommandException()
+        self._check_at_status(response.status)
+
+    @staticmethod
+    def _check_at_status(status):
+        """
+        Checks the status of an AT command response throwing an
+        :class:`.ATCommandException` if it is not OK.
+
+        Args:
+            status (:class:`.ATCommandStatus`): The status to check.
+
+        Raises:
+            ATCommandException: if ``status`` is ``None`` or not OK.
+        """
+        if status is None:
             raise ATCommandException()
-        elif response.status != ATCommandStatus.OK:
-            raise ATCommandException(cmd_status=response.status)
+        if status != ATCommandStatus.OK:
+            raise ATCommandException(cmd_status=status)
 
     def _send_at_command(self, command):
         """
@@ -417,6 +828,100 @@ class AbstractXBeeDevice(object):
 
         return response
 
+    def _send_at_commands(self, commands, queued=False, progress_callback=None):
+        """
+        Sends the given AT commands back-to-back and waits for all their answers or until the
+        configured receive timeout expires.
+
+        Responses are matched with their commands whatever the order they are received in. At most
+        a fixed number of commands are waiting for their response at the same time.
+
+        Args:
+            commands (List): List of :class:`.ATCommand` to send.
+            queued (Boolean, optional, default=`False`): ``True`` to queue the changes without
+                applying them, ``False`` to apply them if the apply changes flag is enabled.
+            progress_callback (Function, optional): function called, in order, every time the
+                response of a command is received, receiving the number of responses received so
+                far and the total number of commands.
+
+        Returns:
+            List: :class:`.ATCommandResponse` of each command, in the same order.
+
+        Raises:
+            ValueError: if any parameter is ``None`` or does not contain exactly 2 characters.
+            TimeoutException: if any response is not received in the configured timeout.
+            InvalidOperatingModeException: if the operating mode is different than ``API`` or ``ESCAPED_API_MODE``.
+            XBeeException: if the XBee device's communication interface is closed.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice._send_at_command`
+        """
+        for command in commands:
+            if command.command is None or len(command.command) != 2:
+                raise ValueError("Parameter must contain exactly 2 characters.")
+
+        operating_mode = self._get_operating_mode()
+        if operating_mode != OperatingMode.API_MODE and operating_mode != OperatingMode.ESCAPED_API_MODE:
+            raise InvalidOperatingModeException(op_mode=operating_mode)
+
+        local = self._local_xbee_device if self.is_remote() else self
+        listener = local._packet_listener
+        frame_ids = self._get_frame_id_allocator()
+        apply = not queued and self.is_apply_changes_enabled()
+
+        responses = []
+        batch_size = self.__class__.__AT_BATCH_SIZE
+        for i in range(0, len(commands), batch_size):
+            pending = []
+            try:
+                for command in commands[i:i + batch_size]:
+                    if (not self.is_remote() and command.parameter
+                            and command.command.upper() == ATStringCommand.AP.command
+                            and not self._packet_sender.is_op_mode_valid(command.parameter)):
+                        pending.append((command, None, None))
+                        continue
+
+                    if self.is_remote():
+                        remote_16bit_addr = self.get_16bit_addr()
+                        if remote_16bit_addr is None:
+                            remote_16bit_addr = XBee16BitAddress.UNKNOWN_ADDRESS
+                        packet = RemoteATCommandPacket(
+                            self._get_next_frame_id(), self.get_64bit_addr(), remote_16bit_addr,
+                            RemoteATCmdOptions.APPLY_CHANGES.value if apply else RemoteATCmdOptions.NONE.value,
+                            command.command, parameter=command.parameter)
+                    elif apply:
+                        packet = ATCommPacket(self._get_next_frame_id(), command.command,
+                                              parameter=command.parameter)
+                    else:
+                        packet = ATCommQueuePacket(self._get_next_frame_id(), command.command,
+                                                   parameter=command.parameter)
+
+                    future = listener.add_pending_request(packet)
+                    frame_ids.hold(packet.frame_id)
+                    pending.append((command, packet, future))
+                    local._send_packet(packet)
+
+                deadline = time.monotonic() + self._timeout
+                for command, packet, future in pending:
+                    if not future:
+                        responses.append(ATCommandResponse(command, status=None))
+                    else:
+                        try:
+                            answer_packet = future.result(timeout=max(0, deadline - time.monotonic()))
+                        except FutureTimeoutError:
+                            raise TimeoutException(message="Response not received in the configured timeout.")
+                        responses.append(ATCommandResponse(command, response=answer_packet.command_value,
+                                                           status=answer_packet.status))
+                    if progress_callback is not None:
+                        progress_callback(len(responses), len(commands))
+            finally:
+                for _, packet, future in pending:
+                    if future:
+                        listener.del_pending_request(packet, future)
+                        frame_ids.release(packet.frame_id, quarantine=not future.done())
+
+        return responses
+
     def apply_changes(self):
         """
         Applies changes via ``AC`` command.
@@ -516,53 +1021,22 @@ class AbstractXBeeDevice(object):
         updated = False
 
         try:
-            # Hardware version:
-            if init or self._hardware_version is None:
-                hw_version = HardwareVersion.get(
-                    self.get_parameter(ATStringCommand.HV.command)[0])
-                if self._hardware_version != hw_version:
-                    updated = True
-                    self._hardware_version = hw_version
-            # Firmware version:
-            if init or self._firmware_version is None:
-                fw_version = self.get_parameter(ATStringCommand.VR.command)
-                if self._firmware_version != fw_version:
-                    updated = True
-                    self._firmware_version = fw_version
+            values = self.__prefetch_device_info(init)
 
-            # Protocol:
-            self._protocol = self.determine_protocol(
-                self._hardware_version.code, self._firmware_version)
+            def get_value(param):
+                return values[param] if param in values else self.get_parameter(param)
 
-            # 64-bit address:
-            if init or not XBee64BitAddress.is_known_node_addr(self._64bit_addr):
-                sh = self.get_parameter(ATStringCommand.SH.command)
-                sl = self.get_parameter(ATStringCommand.SL.command)
-                x64bit_addr = XBee64BitAddress(sh + sl)
-                if self._64bit_addr != x64bit_addr:
-                    self._64bit_addr = x64bit_addr
-                    updated = True
-            # Node ID:
-            if init or not self._node_id:
-                node_id = self.get_parameter(ATStringCommand.NI.command).decode()
-                if self._node_id != node_id:
-                    self._node_id = node_id
-                    updated = True
-            # 16-bit address:
-            if (self._protocol in [XBeeProtocol.ZIGBEE, XBeeProtocol.RAW_802_15_4, XBeeProtocol.XTEND,
-                                   XBeeProtocol.SMART_ENERGY, XBeeProtocol.ZNET]
-                    and (init or not XBee16BitAddress.is_known_node_addr(self._16bit_addr))):
-                x16bit_addr = XBee16BitAddress(self.get_parameter(ATStringCommand.MY.command))
-                if self._16bit_addr != x16bit_addr:
-                    self._16bit_addr = x16bit_addr
-                    updated = True
-            elif not self._16bit_addr:
-                # For protocols that do not support a 16 bit address, set it to unknown
-                self._16bit_addr = XBee16BitAddress.UNKNOWN_ADDRESS
+            steps = self._update_device_info(self, init=init)
+            try:
+                param = next(steps)
+                while True:
+                    param = steps.send(get_value(param))
+            except StopIteration as exc:
+                updated = exc.value
 
             # Role:
             if init or self._role is None or self._role == Role.UNKNOWN:
-                role = self._determine_role()
+                role = self._determine_role(values=values)
                 if self._role != role:
                     self._role = role
                     updated = True
@@ -581,6 +1055,123 @@ class AbstractXBeeDevice(object):
         finally:
             self._initializing = False
 
+    @staticmethod
+    def _update_device_info(xbee, init=True):
+        """
+        Updates the hardware and firmware versions, protocol, addresses and
+        node identifier of the provided XBee from the values of its AT
+        parameters.
+
+        This is a generator, so the same logic serves blocking and asyncio
+        devices: it yields the name of each parameter it needs, and the caller
+        sends back its value. When it finishes, it returns (``StopIteration``
+        value) whether any of the attributes changed.
+
+        Args:
+            xbee (:class:`.AbstractXBeeDevice` or :class:`.AsyncXBeeDevice`):
+                The XBee to update.
+            init (Boolean, optional, default=`True`): If ``False`` only not
+                initialized attributes are read, all if ``True``.
+
+        Yields:
+            String: The AT parameter to read.
+        """
+        updated = False
+
+        # Hardware version:
+        if init or xbee._hardware_version is None:
+            hw_version = HardwareVersion.get((yield ATStringCommand.HV.command)[0])
+            if xbee._hardware_version != hw_version:
+                updated = True
+                xbee._hardware_version = hw_version
+        # Firmware version:
+        if init or xbee._firmware_version is None:
+            fw_version = yield ATStringCommand.VR.command
+            if xbee._firmware_version != fw_version:
+                updated = True
+                xbee._firmware_version = fw_version
+
+        # Protocol:
+        br_value = None
+        if xbee._hardware_version.code in (HardwareVersion.SX.code,
+                                           HardwareVersion.SX_PRO.code,
+                                           HardwareVersion.XB8X.code):
+            br_value = (yield ATStringCommand.BR.command)[0]
+        xbee._protocol = XBeeProtocol.determine_protocol(
+            xbee._hardware_version.code, xbee._firmware_version, br_value=br_value)
+
+        # 64-bit address:
+        if init or not XBee64BitAddress.is_known_node_addr(xbee._64bit_addr):
+            sh = yield ATStringCommand.SH.command
+            sl = yield ATStringCommand.SL.command
+            x64bit_addr = XBee64BitAddress(sh + sl)
+            if xbee._64bit_addr != x64bit_addr:
+                xbee._64bit_addr = x64bit_addr
+                updated = True
+        # Node ID:
+        if init or not xbee._node_id:
+            node_id = (yield ATStringCommand.NI.command).decode()
+            if xbee._node_id != node_id:
+                xbee._node_id = node_id
+                updated = True
+        # 16-bit address:
+        if (xbee._protocol in [XBeeProtocol.ZIGBEE, XBeeProtocol.RAW_802_15_4, XBeeProtocol.XTEND,
+                               XBeeProtocol.SMART_ENERGY, XBeeProtocol.ZNET]
+                and (init or not XBee16BitAddress.is_known_node_addr(xbee._16bit_addr))):
+            x16bit_addr = XBee16BitAddress((yield ATStringCommand.MY.command))
+            if xbee._16bit_addr != x16bit_addr:
+                xbee._16bit_addr = x16bit_addr
+                updated = True
+        elif not xbee._16bit_addr:
+            # For protocols that do not support a 16 bit address, set it to unknown
+            xbee._16bit_addr = XBee16BitAddress.UNKNOWN_ADDRESS
+
+        return updated
+
+    def __prefetch_device_info(self, init):
+        """
+        Reads with a single batch of AT commands the parameters that
+        :meth:`.AbstractXBeeDevice._read_device_info` needs.
+
+        Parameters that some protocols do not support (``MY``, ``CE``, ``SM``) are requested
+        anyway, and those that fail are not included in the result, so they are read again
+        only if they are really needed.
+
+        Args:
+            init (Boolean): ``False`` to only read not initialized parameters, ``True`` to read all.
+
+        Returns:
+            Dictionary: Parameter (String) -> value (Bytearray) of the successfully read parameters.
+
+        Raises:
+            TimeoutException: if any response is not received before the read timeout expires.
+            XBeeException: if the XBee device's communication interface is closed.
+        """
+        params = []
+        if init or self._hardware_version is None:
+            params.append(ATStringCommand.HV.command)
+        if init or self._firmware_version is None:
+            params.append(ATStringCommand.VR.command)
+        if init or not XBee64BitAddress.is_known_node_addr(self._64bit_addr):
+            params.extend((ATStringCommand.SH.command, ATStringCommand.SL.command))
+        if init or not self._node_id:
+            params.append(ATStringCommand.NI.command)
+        if init or not XBee16BitAddress.is_known_node_addr(self._16bit_addr):
+            params.append(ATStringCommand.MY.command)
+        if init or self._role is None or self._role == Role.UNKNOWN:
+            params.extend((ATStringCommand.CE.command, ATStringCommand.SM.command))
+        if len(params) < 2:
+            return {}
+
+        responses = self._send_at_commands([ATCommand(param) for param in params])
+        values = {param: response.response for param, response in zip(params, responses)
+                  if response.status == ATCommandStatus.OK and response.response is not None}
+        if self._parameter_cache is not None:
+            for param, value in values.items():
+                self._parameter_cache.put(param, value)
+
+        return values
+
     def read_device_info(self, init=True, fire_event=True):
         """
         Updates all instance parameters reading them from the XBee device.
@@ -646,10 +1237,14 @@ class AbstractXBeeDevice(object):
                 and is_16bit_init
                 and self._role is not None and self._role != Role.UNKNOWN)
 
-    def _determine_role(self):
+    def _determine_role(self, values=None):
         """
         Determines the role of the device depending on the device protocol.
 
+        Args:
+            values (Dictionary, optional): Parameter (String) -> value (Bytearray) already read
+                from the XBee. Parameters not included are read from the XBee.
+
         Returns:
             :class:`digi.xbee.models.protocol.Role`: The XBee role.
 
@@ -660,8 +1255,14 @@ class AbstractXBeeDevice(object):
                 method only checks the cached value of the operating mode.
             ATCommandException: if the response is not as expected.
         """
+        if values is None:
+            values = {}
+
+        def get_value(param):
+            return values[param] if param in values else self.get_parameter(param)
+
         if self._protocol in [XBeeProtocol.DIGI_MESH, XBeeProtocol.SX, XBeeProtocol.XTEND_DM]:
-            ce = utils.bytes_to_int(self.get_parameter(ATStringCommand.CE.command))
+            ce = utils.bytes_to_int(get_value(ATStringCommand.CE.command))
             if ce == 0:
                 try:
                     # Capture the possible exception because DigiMesh S2C does not have
@@ -684,7 +1285,7 @@ class AbstractXBeeDevice(object):
                 return Role.END_DEVICE
         elif self._protocol in [XBeeProtocol.RAW_802_15_4, XBeeProtocol.DIGI_POINT,
                                 XBeeProtocol.XLR, XBeeProtocol.XLR_DM]:
-            ce = utils.bytes_to_int(self.get_parameter(ATStringCommand.CE.command))
+            ce = utils.bytes_to_int(get_value(ATStringCommand.CE.command))
             if self._protocol == XBeeProtocol.RAW_802_15_4:
                 if ce == 0:
                     return Role.END_DEVICE
@@ -699,11 +1300,11 @@ class AbstractXBeeDevice(object):
                     return Role.END_DEVICE
         elif self._protocol in [XBeeProtocol.ZIGBEE, XBeeProtocol.SMART_ENERGY]:
             try:
-                ce = utils.bytes_to_int(self.get_parameter(ATStringCommand.CE.command))
+                ce = utils.bytes_to_int(get_value(ATStringCommand.CE.command))
                 if ce == 1:
                     return Role.COORDINATOR
 
-                sm = utils.bytes_to_int(self.get_parameter(ATStringCommand.SM.command))
+                sm = utils.bytes_to_int(get_value(ATStringCommand.SM.command))
 
                 return Role.ROUTER if sm == 0 else Role.END_DEVICE
             except ATCommandException:
@@ -842,7 +1443,7 @@ class AbstractXBeeDevice(object):
         Returns:
             Integer: the last used frame ID.
         """
-        return self.__current_frame_id
+        return self._get_frame_id_allocator().last
 
     def enable_apply_changes(self, value):
         """
@@ -862,6 +1463,42 @@ class AbstractXBeeDevice(object):
         """
         return self._apply_changes_flag
 
+    def get_parameter_cache(self):
+        """
+        Returns the AT parameter cache of this XBee.
+
+        Returns:
+            :class:`.ATParameterCache`: The parameter cache, ``None`` if disabled.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice.set_parameter_cache`
+        """
+        return self._parameter_cache
+
+    def set_parameter_cache(self, cache):
+        """
+        Configures the cache of AT parameter values of this XBee. Parameters read with
+        :meth:`.AbstractXBeeDevice.get_parameter` are served from the cache while their value
+        is valid. The cache is disabled by default.
+
+        Args:
+            cache (:class:`.ATParameterCache`): The parameter cache, ``None`` to disable it.
+
+        .. seealso::
+           | :class:`.ATParameterCache`
+        """
+        self._parameter_cache = cache
+        if cache is not None:
+            local = self._local_xbee_device if self.is_remote() else self
+            local._enable_at_response_callback()
+
+    def _enable_at_response_callback(self):
+        """
+        Makes the packet sender track the AT command responses and modem status frames received
+        by this XBee, so cached parameters are refreshed.
+        """
+        pass
+
     @abstractmethod
     def is_remote(self):
         """
@@ -1682,21 +2319,34 @@ class AbstractXBeeDevice(object):
     def _get_next_frame_id(self):
         """
         Returns the next frame ID of the XBee device.
-        
+
+        The returned ID is not in flight (no request using it is waiting for a
+        response). If all frame IDs are in flight, this method waits for one
+        to be released up to the configured timeout.
+
         Returns:
             Integer: The next frame ID of the XBee device.
+
+        Raises:
+            TimeoutException: if no frame ID is released in the configured timeout.
+
+        .. seealso::
+           | :class:`.FrameIdAllocator`
         """
-        if self.is_remote():
-            fid = self._local_xbee_device._get_next_frame_id()
+        return self._get_frame_id_allocator().allocate(timeout=self._timeout)
 
-        else:
-            if self.__current_frame_id == 0xFF:
-                self.__current_frame_id = 1
-            else:
-                self.__current_frame_id += 1
-            fid = self.__current_frame_id
+    def _get_frame_id_allocator(self):
+        """
+        Returns the frame ID allocator of the XBee device. Remote devices use the
+        allocator of their local XBee.
+
+        Returns:
+            :class:`.FrameIdAllocator`: The frame ID allocator.
+        """
+        if self.is_remote():
+            return self._local_xbee_device._get_frame_id_allocator()
 
-        return fid
+        return self._frame_id_allocator
 
     def _get_operating_mode(self):
         """
@@ -1734,13 +2384,25 @@ class AbstractXBeeDevice(object):
         @wraps(func)
         def dec_function(*args, **kwargs):
             response = func(*args, **kwargs)
-            if (response.transmit_status != TransmitStatus.SUCCESS
-                    and response.transmit_status != TransmitStatus.SELF_ADDRESSED):
-                raise TransmitException(transmit_status=response.transmit_status)
+            AbstractXBeeDevice._check_transmit_status(response.transmit_status)
             return response
         return dec_function
 
-    def _get_packet_by_id(self, frame_id):
+    @staticmethod
+    def _check_transmit_status(status):
+        """
+        Checks the status of a transmission throwing a :class:`.TransmitException` if it failed.
+
+        Args:
+            status (:class:`.TransmitStatus`): The transmit status to check.
+
+        Raises:
+            TransmitException: if ``status`` is not ``SUCCESS`` or ``SELF_ADDRESSED``.
+        """
+        if status not in (TransmitStatus.SUCCESS, TransmitStatus.SELF_ADDRESSED):
+            raise TransmitException(transmit_status=status)
+
+    def _get_packet_by_id(self, frame_id):
         """
         Reads packets until there is one packet found with the provided frame ID.
         
@@ -1805,27 +2467,16 @@ class AbstractXBeeDevice(object):
 
     def _send_packet_sync_and_get_response(self, packet_to_send, timeout=None):
         """
-        Perform all operations needed for a synchronous operation when the packet
-        listener is online. This operations are:
+        Sends the provided packet and waits for its response.
 
-            1. Puts "_sync_packet" to ``None``, to discard the last sync. packet read.
-            2. Refresh "_sync_packet" to be used by the thread in charge of the synchronous read.
-            3. Tells the packet listener that this XBee device is waiting for a packet with a determined frame ID.
-            4. Sends the ``packet_to_send``.
-            5. Waits the configured timeout for synchronous operations.
-            6. Returns all attributes to a consistent state (except _sync_packet)
-                | 6.1. _sync_packet to ``None``.
-                | 6.2. notify the listener that we are no longer waiting for any packet.
-            7. Returns the received packet if it has arrived, ``None`` otherwise.
+        The packet is registered in the pending requests table of the packet
+        listener before sending it. The listener resolves the request as soon
+        as it receives the packet that answers it (same frame ID, expected
+        frame type and, depending on the request, same AT command, socket ID
+        or remote address).
 
         This method must be only used when the packet listener is online.
 
-        At the end of this method, the class attribute ``_sync_packet`` will be
-        the packet read by this method, or ``None`` if the previous was not possible.
-        Note that ``_sync_packet`` will remain being "the last packet read in a
-        synchronous operation" until you call this method again.
-        Then,  ``_sync_packet`` will be refreshed.
-
         Args:
             packet_to_send (:class:`.XBeePacket`): the packet to send.
             timeout (Integer, optional): timeout to wait. If no timeout is provided, the default one is used. To wait
@@ -1839,92 +2490,32 @@ class AbstractXBeeDevice(object):
 
         .. seealso::
            | :class:`.XBeePacket`
+           | :class:`.PendingRequests`
         """
-        lock = threading.Condition()
-        response_list = list()
-
-        # Create a packet received callback for the packet to be sent.
-        def packet_received_callback(received_packet):
-            # Check if it is the packet we are waiting for.
-            if received_packet.needs_id() and received_packet.frame_id == packet_to_send.frame_id:
-                if not isinstance(packet_to_send, XBeeAPIPacket) or not isinstance(received_packet, XBeeAPIPacket):
-                    return
-                # If the packet sent is an AT command, verify that the received one is an AT command response and
-                # the command matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.AT_COMMAND \
-                        and (received_packet.get_frame_type() != ApiFrameType.AT_COMMAND_RESPONSE
-                             or packet_to_send.command.upper() != received_packet.command.upper()):
-                    return
-                # If the packet sent is a remote AT command, verify that the received one is a remote AT command
-                # response and the command matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.REMOTE_AT_COMMAND_REQUEST \
-                        and (received_packet.get_frame_type() != ApiFrameType.REMOTE_AT_COMMAND_RESPONSE
-                             or packet_to_send.command.upper() != received_packet.command.upper()
-                             or (XBee64BitAddress.is_known_node_addr(packet_to_send.x64bit_dest_addr)
-                                 and packet_to_send.x64bit_dest_addr != received_packet.x64bit_source_addr)
-                             or (XBee16BitAddress.is_known_node_addr(packet_to_send.x16bit_dest_addr)
-                                 and packet_to_send.x16bit_dest_addr != received_packet.x16bit_source_addr)):
-                    return
-                # If the packet sent is a Socket Create, verify that the received one is a Socket Create Response.
-                if packet_to_send.get_frame_type() == ApiFrameType.SOCKET_CREATE \
-                        and received_packet.get_frame_type() != ApiFrameType.SOCKET_CREATE_RESPONSE:
-                    return
-                # If the packet sent is a Socket Option Request, verify that the received one is a Socket Option
-                # Response and the socket ID matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.SOCKET_OPTION_REQUEST \
-                        and (received_packet.get_frame_type() != ApiFrameType.SOCKET_OPTION_RESPONSE
-                             or packet_to_send.socket_id != received_packet.socket_id):
-                    return
-                # If the packet sent is a Socket Connect, verify that the received one is a Socket Connect Response
-                # and the socket ID matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.SOCKET_CONNECT \
-                        and (received_packet.get_frame_type() != ApiFrameType.SOCKET_CONNECT_RESPONSE
-                             or packet_to_send.socket_id != received_packet.socket_id):
-                    return
-                # If the packet sent is a Socket Close, verify that the received one is a Socket Close Response
-                # and the socket ID matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.SOCKET_CLOSE \
-                        and (received_packet.get_frame_type() != ApiFrameType.SOCKET_CLOSE_RESPONSE
-                             or packet_to_send.socket_id != received_packet.socket_id):
-                    return
-                # If the packet sent is a Socket Bind, verify that the received one is a Socket Listen Response
-                # and the socket ID matches in both packets.
-                if packet_to_send.get_frame_type() == ApiFrameType.SOCKET_BIND \
-                        and (received_packet.get_frame_type() != ApiFrameType.SOCKET_LISTEN_RESPONSE
-                             or packet_to_send.socket_id != received_packet.socket_id):
-                    return
-                # Verify that the sent packet is not the received one! This can happen when the echo mode is enabled
-                # in the serial port.
-                if packet_to_send == received_packet:
-                    return
-
-                # Add the received packet to the list and notify the lock.
-                response_list.append(received_packet)
-                lock.acquire()
-                lock.notify()
-                lock.release()
-
-        # Add the packet received callback.
-        self._add_packet_received_callback(packet_received_callback)
+        listener = self._packet_listener
+        future = listener.add_pending_request(packet_to_send)
+        # Keep the frame ID in flight while waiting, whatever the timeout.
+        frame_ids = self._get_frame_id_allocator()
+        frame_id = packet_to_send.frame_id if packet_to_send.needs_id() else 0
+        frame_ids.hold(frame_id)
 
         try:
             # Send the packet.
             self._send_packet(packet_to_send)
             # Wait for response or timeout.
-            lock.acquire()
             if timeout == -1:
-                lock.wait()
-            else:
-                lock.wait(self._timeout if timeout is None else timeout)
-            lock.release()
-            # After the wait check if we received any response, if not throw timeout exception.
-            if not response_list:
+                timeout = None
+            elif timeout is None:
+                timeout = self._timeout
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
                 raise TimeoutException(message="Response not received in the configured timeout.")
-            # Return the received packet.
-            return response_list[0]
         finally:
-            # Always remove the packet listener from the list.
-            self._del_packet_received_callback(packet_received_callback)
+            # Always remove the request from the pending requests. If it timed
+            # out, keep its frame ID out of use until the late response.
+            listener.del_pending_request(packet_to_send, future)
+            frame_ids.release(frame_id, quarantine=not future.done())
 
     def _send_packet(self, packet, sync=False):
         """
@@ -2178,11 +2769,17 @@ class XBeeDevice(AbstractXBeeDevice):
 
         self.__modem_status_received = False
 
+        self.__api_callbacks = None
+        self.__at_response_cb_enabled = False
+
         self.__tmp_dm_routes_to = {}
         self.__tmp_dm_to_insert = []
         self.__tmp_dm_routes_lock = threading.Lock()
         self.__route_received = RouteReceived()
 
+        self.__tx_pipeline = TransmitPipeline(self)
+        self.__callback_dispatcher = None
+
     @classmethod
     def create_xbee_device(cls, comm_port_data):
         """
@@ -2304,6 +2901,8 @@ class XBeeDevice(AbstractXBeeDevice):
         if self._packet_listener is not None:
             self._packet_listener.stop()
 
+        self.__tx_pipeline.cancel_all()
+
         if self._comm_iface is not None and self._comm_iface.is_interface_open:
             self._comm_iface.close()
             self._log.info("%s closed", self._comm_iface)
@@ -2775,6 +3374,196 @@ class XBeeDevice(AbstractXBeeDevice):
             self._send_data_async_64(remote_xbee_device.get_64bit_addr(), data,
                                      transmit_options=transmit_options)
 
+    @AbstractXBeeDevice._before_send_method
+    def send_data_pipelined(self, remote_xbee_device, data, transmit_options=TransmitOptions.NONE.value,
+                            timeout=None):
+        """
+        Sends data to a remote XBee device without waiting for the transmit status of the previously sent data.
+
+        This method only blocks while the transmit window is full, that is, while there are
+        :meth:`.get_transmit_window` transmissions waiting for their transmit status. It returns a future that is
+        resolved when the transmit status of this transmission is received.
+
+        Futures are resolved in order by the callback dispatcher of this XBee (see
+        :meth:`.set_callback_dispatcher`), not by the thread that reads frames, so their done callbacks may send
+        more data. A done callback must not wait for the result of another future returned by this method, as
+        that blocks the resolution of the following ones.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (String or Bytearray): the raw data to send.
+            transmit_options (Integer, optional): transmit options, bitfield of :class:`.TransmitOptions`. Default to
+                ``TransmitOptions.NONE.value``.
+            timeout (Float, optional): maximum time in seconds to wait for room in the transmit window and for the
+                transmit status. If not provided, the default timeout is used.
+
+        Returns:
+            :class:`concurrent.futures.Future`: future of the transmit status packet. Its result raises a
+                :class:`.TransmitException` if the status is not OK, or a :class:`.TimeoutException` if the status
+                is not received in the configured timeout.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or ``data`` is ``None``.
+            TimeoutException: if there is no room in the transmit window in the configured timeout.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's communication interface is closed.
+
+        .. seealso::
+           | :class:`.RemoteXBeeDevice`
+           | :meth:`.send_many`
+           | :meth:`.set_transmit_window`
+        """
+        packet = self.__create_transmit_packet(remote_xbee_device, data, transmit_options)
+        return self.__tx_pipeline.send(packet, self._timeout if timeout is None else timeout)
+
+    def send_many(self, remote_xbee_device, data_list, transmit_options=TransmitOptions.NONE.value, timeout=None):
+        """
+        Sends each data of the provided list to a remote XBee device, keeping up to :meth:`.get_transmit_window`
+        transmissions waiting for their transmit status.
+
+        If sending any data fails, the ``futures`` attribute of the raised exception is the list of futures of the
+        data sent before, so their transmit status can still be waited for.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data_list (List): list of data (String or Bytearray) to send.
+            transmit_options (Integer, optional): transmit options, bitfield of :class:`.TransmitOptions`. Default to
+                ``TransmitOptions.NONE.value``.
+            timeout (Float, optional): maximum time in seconds to wait for room in the transmit window and for each
+                transmit status. If not provided, the default timeout is used.
+
+        Returns:
+            List: :class:`concurrent.futures.Future` of the transmit status of each data, in the same order.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or any data is ``None``.
+            TimeoutException: if there is no room in the transmit window in the configured timeout.
+            InvalidOperatingModeException: if the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: if the XBee device's communication interface is closed.
+
+        .. seealso::
+           | :meth:`.send_data_pipelined`
+        """
+        futures = []
+        try:
+            for data in data_list:
+                futures.append(self.send_data_pipelined(remote_xbee_device, data,
+                                                        transmit_options=transmit_options, timeout=timeout))
+        except Exception as exc:
+            exc.futures = futures
+            raise
+
+        return futures
+
+    def get_transmit_window(self):
+        """
+        Returns the maximum number of transmissions sent with :meth:`.send_data_pipelined` that can be waiting for
+        their transmit status.
+
+        Returns:
+            Integer: the transmit window size.
+        """
+        return self.__tx_pipeline.window
+
+    def set_transmit_window(self, window):
+        """
+        Sets the maximum number of transmissions sent with :meth:`.send_data_pipelined` that can be waiting for
+        their transmit status.
+
+        Args:
+            window (Integer): the new transmit window size.
+
+        Raises:
+            ValueError: if ``window`` is less than 1.
+        """
+        self.__tx_pipeline.window = window
+
+    def get_callback_dispatcher(self):
+        """
+        Returns the dispatcher that runs the callbacks of the events of this XBee.
+
+        Returns:
+            :class:`.CallbackDispatcher`: The callback dispatcher, `None` if the default one is used.
+
+        .. seealso::
+           | :class:`.CallbackDispatcher`
+        """
+        return self.__callback_dispatcher
+
+    def set_callback_dispatcher(self, dispatcher):
+        """
+        Sets the dispatcher that runs the callbacks of the events of this XBee, for example to bound their queues,
+        to run them with a specific executor, or to isolate them from the callbacks of other XBee devices.
+
+        Args:
+            dispatcher (:class:`.CallbackDispatcher`): The callback dispatcher, `None` to use the default one.
+
+        .. seealso::
+           | :class:`.CallbackDispatcher`
+           | :func:`digi.xbee.reader.set_default_dispatcher`
+        """
+        self.__callback_dispatcher = dispatcher
+        if self._packet_listener:
+            self._packet_listener.set_callback_dispatcher(dispatcher)
+
+    def __create_transmit_packet(self, remote_xbee_device, data, transmit_options):
+        """
+        Creates the transmit request to send the provided data to a remote XBee device, depending on the protocol
+        and the known addresses of the remote.
+
+        Args:
+            remote_xbee_device (:class:`.RemoteXBeeDevice`): the remote XBee device to send data to.
+            data (String or Bytearray): the raw data to send.
+            transmit_options (Integer): transmit options, bitfield of :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeeAPIPacket`: the transmit request packet.
+
+        Raises:
+            ValueError: if ``remote_xbee_device`` or ``data`` is ``None``.
+        """
+        if remote_xbee_device is None:
+            raise ValueError("Remote XBee device cannot be None")
+        if data is None:
+            raise ValueError("Data cannot be None")
+
+        if isinstance(data, str):
+            data = data.encode("utf8")
+
+        return self._build_transmit_packet(
+            self.get_protocol(), self.get_next_frame_id(), remote_xbee_device.get_64bit_addr(),
+            remote_xbee_device.get_16bit_addr(), data, transmit_options)
+
+    @staticmethod
+    def _build_transmit_packet(protocol, frame_id, x64addr, x16addr, data, transmit_options):
+        """
+        Builds the transmit request to send data to the provided addresses, depending on the protocol and
+        the known addresses.
+
+        Args:
+            protocol (:class:`.XBeeProtocol`): the protocol of the local XBee.
+            frame_id (Integer): the frame ID of the request.
+            x64addr (:class:`.XBee64BitAddress`): the destination 64-bit address, ``None`` if unknown.
+            x16addr (:class:`.XBee16BitAddress`): the destination 16-bit address, ``None`` if unknown.
+            data (Bytearray): the raw data to send.
+            transmit_options (Integer): transmit options, bitfield of :class:`.TransmitOptions`.
+
+        Returns:
+            :class:`.XBeeAPIPacket`: the transmit request packet.
+        """
+        if protocol == XBeeProtocol.RAW_802_15_4:
+            if x64addr is not None:
+                return TX64Packet(frame_id, x64addr, transmit_options, rf_data=data)
+            return TX16Packet(frame_id, x16addr, transmit_options, rf_data=data)
+
+        if x64addr is None:
+            x64addr = XBee64BitAddress.UNKNOWN_ADDRESS
+        if x16addr is None or protocol not in (XBeeProtocol.ZIGBEE, XBeeProtocol.DIGI_POINT):
+            x16addr = XBee16BitAddress.UNKNOWN_ADDRESS
+        return TransmitPacket(frame_id, x64addr, x16addr, 0, transmit_options, rf_data=data)
+
     def send_data_broadcast(self, data, transmit_options=TransmitOptions.NONE.value):
         """
         Sends the provided data to all the XBee nodes of the network (broadcast).
@@ -2986,6 +3775,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.PacketReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two arguments.
 
@@ -2998,6 +3791,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.DataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3010,6 +3807,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.ModemStatusReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3022,6 +3823,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.IOSampleReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives three arguments.
 
@@ -3036,6 +3841,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.ExplicitDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3049,6 +3858,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.RelayDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3061,6 +3874,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.BluetoothDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3073,6 +3890,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.MicroPythonDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -3085,6 +3906,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.SocketStateReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two arguments.
 
@@ -3098,6 +3923,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.SocketDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two arguments.
 
@@ -3111,6 +3940,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.SocketDataReceivedFrom`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives three arguments.
 
@@ -3127,6 +3960,10 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.FileSystemFrameReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives four arguments.
 
@@ -3331,8 +4168,9 @@ class XBeeDevice(AbstractXBeeDevice):
             :class:`.PacketReceived`
         """
         api_callbacks = PacketReceived()
+        self.__api_callbacks = api_callbacks
 
-        if self.serial_port:
+        if self.serial_port or self.__at_response_cb_enabled:
             api_callbacks.append(self._packet_sender.at_response_received_cb)
 
         if not self._network:
@@ -3343,6 +4181,18 @@ class XBeeDevice(AbstractXBeeDevice):
 
         return api_callbacks
 
+    def _enable_at_response_callback(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice._enable_at_response_callback`
+        """
+        self.__at_response_cb_enabled = True
+        if (self.__api_callbacks is not None and self._packet_sender
+                and self._packet_sender.at_response_received_cb not in self.__api_callbacks):
+            self.__api_callbacks.append(self._packet_sender.at_response_received_cb)
+
     def __get_operating_mode(self):
         """
         Returns this XBee device's operating mode.
@@ -3913,11 +4763,29 @@ class XBeeDevice(AbstractXBeeDevice):
         """
         return self._get_next_frame_id()
 
+    def get_frame_id_allocator(self):
+        """
+        Returns the frame ID allocator of the XBee device. Use it to check how
+        many frame IDs are in flight (occupancy), the peak occupancy, or how
+        many times a sender had to wait for a free frame ID.
+
+        Returns:
+            :class:`.FrameIdAllocator`: The frame ID allocator.
+
+        .. seealso::
+           | :class:`.FrameIdAllocator`
+        """
+        return self._get_frame_id_allocator()
+
     def add_route_received_callback(self, callback):
         """
         Adds a callback for the event :class:`.RouteReceived`.
         This works for Zigbee and Digimesh devices.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives three arguments.
 
@@ -4723,107 +5591,337 @@ class DigiPointDevice(XBeeDevice):
                                       transmit_options=transmit_options)
 
 
-class ZigBeeDevice(XBeeDevice):
+class SourceRouteCache(object):
     """
-    This class represents a local Zigbee XBee device.
+    This class represents a cache of the source routes to the nodes of a Zigbee network.
+
+    Routes are learned from the route record indicators (0xA1) received by a local Zigbee
+    XBee working as a many-to-one concentrator. Each route expires after a configurable
+    time, and the least recently used one is evicted when the cache is full.
+
+    .. seealso::
+       | :meth:`.ZigBeeDevice.set_source_route_cache`
     """
 
-    def __init__(self, port=None, baud_rate=None, data_bits=serial.EIGHTBITS, stop_bits=serial.STOPBITS_ONE,
-                 parity=serial.PARITY_NONE, flow_control=FlowControl.NONE,
-                 _sync_ops_timeout=AbstractXBeeDevice._DEFAULT_TIMEOUT_SYNC_OPERATIONS, comm_iface=None):
+    DEFAULT_MAX_SIZE = 256
+    """
+    Default maximum number of routes in the cache.
+    """
+
+    DEFAULT_TTL = 600
+    """
+    Default time (in seconds) a route is kept in the cache since it was learned.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
         """
-        Class constructor. Instantiates a new :class:`.ZigBeeDevice` with the provided parameters.
+        Class constructor. Instantiates a new :class:`.SourceRouteCache` object.
 
         Args:
-            port (Integer or String): serial port identifier.
-                Integer: number of XBee device, numbering starts at zero.
-                Device name: depending on operating system. e.g. '/dev/ttyUSB0' on 'GNU/Linux' or
-                'COM3' on Windows.
-            baud_rate (Integer): the serial port baud rate.
-            data_bits (Integer, default: :attr:`.serial.EIGHTBITS`): comm port bitsize.
-            stop_bits (Integer, default: :attr:`.serial.STOPBITS_ONE`): comm port stop bits.
-            parity (Character, default: :attr:`.serial.PARITY_NONE`): comm port parity.
-            flow_control (Integer, default: :attr:`.FlowControl.NONE`): comm port flow control.
-           _sync_ops_timeout (Integer, default: 3): the read timeout (in seconds).
-            comm_iface (:class:`.XBeeCommunicationInterface`): the communication interface.
+            max_size (Integer, optional, default=`DEFAULT_MAX_SIZE`): Maximum number of routes to keep.
+            ttl (Float, optional, default=`DEFAULT_TTL`): Time in seconds a route is valid since it was
+                learned. ``None`` to never expire routes.
 
         Raises:
-            All exceptions raised by :meth:`.XBeeDevice.__init__` constructor.
-
-        .. seealso::
-           | :class:`.XBeeDevice`
-           | :meth:`.XBeeDevice.__init__`
+            ValueError: If ``max_size`` is lower than 1 or ``ttl`` is not greater than 0.
         """
-        super().__init__(port, baud_rate, data_bits=data_bits, stop_bits=stop_bits, parity=parity,
-                         flow_control=flow_control, _sync_ops_timeout=_sync_ops_timeout, comm_iface=comm_iface)
+        if max_size is None or max_size < 1:
+            raise ValueError("Maximum size must be greater than 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("TTL must be greater than 0")
 
-    def open(self, force_settings=False):
+        self.__max_size = max_size
+        self.__ttl = ttl
+        # 64-bit address (str) -> [16-bit address, hops (tuple), learn time, created in XBee]
+        self.__routes = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__routes)
+
+    def update(self, x64addr, x16addr, hops):
         """
-        Override.
+        Stores the route to the node with the provided addresses.
 
-        Raises:
-            TimeoutException: If there is any problem with the communication.
-            InvalidOperatingModeException: If the XBee device's operating mode is not API or ESCAPED API. This
-                method only checks the cached value of the operating mode.
-            XBeeException: If the protocol is invalid or if the XBee device is already open.
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+            x16addr (:class:`.XBee16BitAddress`): 16-bit address of the destination node.
+            hops (List): List of :class:`.XBee16BitAddress` of the intermediate nodes, starting with
+                the neighbor of the destination node and finishing with the neighbor of the local node.
+                This is the order of the hops in a create source route (0x21) frame, the reverse of a
+                route record indicator (0xA1) frame.
 
-        .. seealso::
-           | :meth:`.XBeeDevice.open`
+        Returns:
+            Boolean: ``True`` if the route is new or different from the cached one, ``False`` otherwise.
         """
-        super().open(force_settings=force_settings)
-        if self._protocol != XBeeProtocol.ZIGBEE:
-            self.close()
-            raise XBeeException(_ERROR_INCOMPATIBLE_PROTOCOL % (self.get_protocol(), XBeeProtocol.ZIGBEE))
+        key = str(x64addr)
+        hops = tuple(hops)
+        with self.__lock:
+            entry = self.__routes.get(key)
+            changed = not entry or entry[0] != x16addr or entry[1] != hops
+            if changed:
+                self.__routes[key] = [x16addr, hops, time.time(), False]
+            else:
+                entry[2] = time.time()
+            self.__routes.move_to_end(key)
+            while len(self.__routes) > self.__max_size:
+                self.__routes.popitem(last=False)
+                self.__evictions += 1
+            return changed
 
-    def get_protocol(self):
+    def get_route(self, x64addr):
         """
-        Override.
+        Returns the cached route to the node with the provided 64-bit address.
 
-        .. seealso::
-           | :meth:`.XBeeDevice.get_protocol`
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+
+        Returns:
+            Tuple (:class:`.XBee16BitAddress`, List): The 16-bit address of the destination node and the
+                16-bit addresses of the intermediate nodes in the order of :meth:`.update`, ``None`` if
+                there is no valid route.
         """
-        if not self._protocol or self._protocol == XBeeProtocol.UNKNOWN:
-            return XBeeProtocol.ZIGBEE
+        with self.__lock:
+            entry = self.__lookup(str(x64addr))
+            return (entry[0], list(entry[1])) if entry else None
 
-        return self._protocol
+    def remove(self, x64addr):
+        """
+        Removes the cached route to the node with the provided 64-bit address.
 
-    def _init_network(self):
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
         """
-        Override.
+        with self.__lock:
+            self.__routes.pop(str(x64addr), None)
 
-        .. seealso::
-           | :meth:`.XBeeDevice.get_network`
+    def clear(self):
         """
-        return ZigBeeNetwork(self)
+        Removes all cached routes and resets the counters.
+        """
+        with self.__lock:
+            self.__routes.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
 
-    def get_ai_status(self):
+    def _get_route_to_create(self, x64addr):
         """
-        Override.
+        Returns the cached route to the node with the provided 64-bit address if it has not been
+        created in the XBee yet. Once created, mark it with :meth:`._set_route_created`.
 
-        .. seealso::
-           | :meth:`.AbstractXBeeDevice._get_ai_status`
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+
+        Returns:
+            Tuple (:class:`.XBee16BitAddress`, List): The 16-bit address of the destination node and the
+                16-bit addresses of the intermediate nodes, ``None`` if there is no valid route or it is
+                already created.
         """
-        return super()._get_ai_status()
+        with self.__lock:
+            entry = self.__lookup(str(x64addr))
+            if not entry or entry[3]:
+                return None
+            return entry[0], list(entry[1])
 
-    def force_disassociate(self):
+    def _set_route_created(self, x64addr, x16addr, hops):
         """
-        Override.
+        Marks the cached route to the node with the provided 64-bit address as created in the XBee,
+        unless it has changed since it was returned by :meth:`._get_route_to_create`.
 
-        .. seealso::
-           | :meth:`.AbstractXBeeDevice._force_disassociate`
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+            x16addr (:class:`.XBee16BitAddress`): 16-bit address of the destination node.
+            hops (List): List of :class:`.XBee16BitAddress` of the intermediate nodes.
         """
-        super()._force_disassociate()
+        with self.__lock:
+            entry = self.__routes.get(str(x64addr))
+            if entry and entry[0] == x16addr and entry[1] == tuple(hops):
+                entry[3] = True
 
-    def get_many_to_one_broadcasting_time(self):
+    def __lookup(self, key):
         """
-        Returns the time between aggregation route broadcast in tenths of a
-        second.
+        Returns the valid cache entry for the provided key and updates the counters. Must be called
+        with the lock held.
 
-        Returns:
-            Integer: The number of tenths of a second between aggregation route
-                broadcasts. -1 if it is disabled.
+        Args:
+            key (String): 64-bit address of the destination node.
 
-        Raises:
+        Returns:
+            List: The cache entry, ``None`` if not found or expired.
+        """
+        entry = self.__routes.get(key)
+        if entry and self.__ttl is not None and time.time() - entry[2] > self.__ttl:
+            del self.__routes[key]
+            entry = None
+        if not entry:
+            self.__misses += 1
+            return None
+
+        self.__hits += 1
+        self.__routes.move_to_end(key)
+        return entry
+
+    @property
+    def max_size(self):
+        """
+        Returns the maximum number of routes in the cache.
+
+        Returns:
+            Integer: Maximum number of routes.
+        """
+        return self.__max_size
+
+    @property
+    def ttl(self):
+        """
+        Returns the time in seconds a route is valid since it was learned.
+
+        Returns:
+            Float: Route time to live, ``None`` if routes never expire.
+        """
+        return self.__ttl
+
+    @property
+    def hits(self):
+        """
+        Returns the number of lookups that found a valid route.
+
+        Returns:
+            Integer: Number of cache hits.
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        Returns the number of lookups that did not find a valid route.
+
+        Returns:
+            Integer: Number of cache misses.
+        """
+        return self.__misses
+
+    @property
+    def evictions(self):
+        """
+        Returns the number of routes removed to make room for new ones.
+
+        Returns:
+            Integer: Number of evicted routes.
+        """
+        return self.__evictions
+
+
+class ZigBeeDevice(XBeeDevice):
+    """
+    This class represents a local Zigbee XBee device.
+    """
+
+    def __init__(self, port=None, baud_rate=None, data_bits=serial.EIGHTBITS, stop_bits=serial.STOPBITS_ONE,
+                 parity=serial.PARITY_NONE, flow_control=FlowControl.NONE,
+                 _sync_ops_timeout=AbstractXBeeDevice._DEFAULT_TIMEOUT_SYNC_OPERATIONS, comm_iface=None):
+        """
+        Class constructor. Instantiates a new :class:`.ZigBeeDevice` with the provided parameters.
+
+        Args:
+            port (Integer or String): serial port identifier.
+                Integer: number of XBee device, numbering starts at zero.
+                Device name: depending on operating system. e.g. '/dev/ttyUSB0' on 'GNU/Linux' or
+                'COM3' on Windows.
+            baud_rate (Integer): the serial port baud rate.
+            data_bits (Integer, default: :attr:`.serial.EIGHTBITS`): comm port bitsize.
+            stop_bits (Integer, default: :attr:`.serial.STOPBITS_ONE`): comm port stop bits.
+            parity (Character, default: :attr:`.serial.PARITY_NONE`): comm port parity.
+            flow_control (Integer, default: :attr:`.FlowControl.NONE`): comm port flow control.
+           _sync_ops_timeout (Integer, default: 3): the read timeout (in seconds).
+            comm_iface (:class:`.XBeeCommunicationInterface`): the communication interface.
+
+        Raises:
+            All exceptions raised by :meth:`.XBeeDevice.__init__` constructor.
+
+        .. seealso::
+           | :class:`.XBeeDevice`
+           | :meth:`.XBeeDevice.__init__`
+        """
+        super().__init__(port, baud_rate, data_bits=data_bits, stop_bits=stop_bits, parity=parity,
+                         flow_control=flow_control, _sync_ops_timeout=_sync_ops_timeout, comm_iface=comm_iface)
+
+        self.__route_cache = None
+
+    def open(self, force_settings=False):
+        """
+        Override.
+
+        Raises:
+            TimeoutException: If there is any problem with the communication.
+            InvalidOperatingModeException: If the XBee device's operating mode is not API or ESCAPED API. This
+                method only checks the cached value of the operating mode.
+            XBeeException: If the protocol is invalid or if the XBee device is already open.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.open`
+        """
+        super().open(force_settings=force_settings)
+        if self._protocol != XBeeProtocol.ZIGBEE:
+            self.close()
+            raise XBeeException(_ERROR_INCOMPATIBLE_PROTOCOL % (self.get_protocol(), XBeeProtocol.ZIGBEE))
+
+        self.__register_route_cache_callback()
+
+    def get_protocol(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.get_protocol`
+        """
+        if not self._protocol or self._protocol == XBeeProtocol.UNKNOWN:
+            return XBeeProtocol.ZIGBEE
+
+        return self._protocol
+
+    def _init_network(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice.get_network`
+        """
+        return ZigBeeNetwork(self)
+
+    def get_ai_status(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice._get_ai_status`
+        """
+        return super()._get_ai_status()
+
+    def force_disassociate(self):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.AbstractXBeeDevice._force_disassociate`
+        """
+        super()._force_disassociate()
+
+    def get_many_to_one_broadcasting_time(self):
+        """
+        Returns the time between aggregation route broadcast in tenths of a
+        second.
+
+        Returns:
+            Integer: The number of tenths of a second between aggregation route
+                broadcasts. -1 if it is disabled.
+
+        Raises:
             TimeoutException: If the response is not received before the read
                 timeout expires.
             XBeeException: If the XBee device's communication interface is closed.
@@ -4877,7 +5975,7 @@ class ZigBeeDevice(XBeeDevice):
         .. seealso::
            | :meth:`.XBeeDevice.send_data_64_16`
         """
-        return super()._send_data_64_16(x64addr, x16addr, data, transmit_options=transmit_options)
+        return self._send_data_64_16(x64addr, x16addr, data, transmit_options=transmit_options)
 
     def send_data_async_64_16(self, x64addr, x16addr, data, transmit_options=TransmitOptions.NONE.value):
         """
@@ -4886,8 +5984,160 @@ class ZigBeeDevice(XBeeDevice):
         .. seealso::
            | :meth:`.XBeeDevice.send_data_async_64_16`
         """
+        self._send_data_async_64_16(x64addr, x16addr, data, transmit_options=transmit_options)
+
+    def _send_data_64_16(self, x64addr, x16addr, data, transmit_options=TransmitOptions.NONE.value):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice._send_data_64_16`
+        """
+        self.__create_cached_source_route(x64addr)
+        try:
+            return super()._send_data_64_16(x64addr, x16addr, data, transmit_options=transmit_options)
+        except TransmitException:
+            self.__discard_cached_source_route(x64addr)
+            raise
+
+    def _send_data_64(self, x64addr, data, transmit_options=TransmitOptions.NONE.value):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice._send_data_64`
+        """
+        self.__create_cached_source_route(x64addr)
+        try:
+            return super()._send_data_64(x64addr, data, transmit_options=transmit_options)
+        except TransmitException:
+            self.__discard_cached_source_route(x64addr)
+            raise
+
+    def _send_data_async_64_16(self, x64addr, x16addr, data, transmit_options=TransmitOptions.NONE.value):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice._send_data_async_64_16`
+        """
+        self.__create_cached_source_route(x64addr)
         super()._send_data_async_64_16(x64addr, x16addr, data, transmit_options=transmit_options)
 
+    def _send_data_async_64(self, x64addr, data, transmit_options=TransmitOptions.NONE.value):
+        """
+        Override.
+
+        .. seealso::
+           | :meth:`.XBeeDevice._send_data_async_64`
+        """
+        self.__create_cached_source_route(x64addr)
+        super()._send_data_async_64(x64addr, data, transmit_options=transmit_options)
+
+    def get_source_route_cache(self):
+        """
+        Returns the source route cache used by this XBee.
+
+        Returns:
+            :class:`.SourceRouteCache`: The source route cache, ``None`` if disabled.
+
+        .. seealso::
+           | :meth:`.ZigBeeDevice.set_source_route_cache`
+        """
+        return self.__route_cache
+
+    def set_source_route_cache(self, cache):
+        """
+        Configures the cache of source routes used when sending data.
+
+        Routes are learned from the received route record indicators, so the XBee should be
+        configured as a many-to-one concentrator (see
+        :meth:`.ZigBeeDevice.set_many_to_one_broadcasting_time`). Before sending data to a node
+        with a cached route, a source route is created in the XBee only if that route has changed
+        since it was last created, so the XBee does not have to discover it.
+
+        Args:
+            cache (:class:`.SourceRouteCache`): The source route cache, ``None`` to disable it.
+
+        .. seealso::
+           | :class:`.SourceRouteCache`
+           | :meth:`.ZigBeeDevice.create_source_route`
+        """
+        if self.__route_cache is cache:
+            return
+
+        self.__route_cache = cache
+        if cache is not None:
+            self.__register_route_cache_callback()
+        elif (self._packet_listener
+              and self.__route_cache_callback in self._packet_listener.get_route_record_received_callbacks()):
+            self._packet_listener.del_route_record_received_callback(self.__route_cache_callback)
+
+    def __register_route_cache_callback(self):
+        """
+        Registers the callback that feeds the source route cache, if any, in the packet listener.
+        """
+        if (self.__route_cache is not None and self._packet_listener
+                and self.__route_cache_callback not in self._packet_listener.get_route_record_received_callbacks()):
+            self._packet_listener.add_route_record_received_callback(self.__route_cache_callback)
+
+    def __route_cache_callback(self, src, hops):
+        """
+        Callback method to store in the source route cache the routes of the received route record
+        indicator (0xA1) frames.
+
+        Args:
+            src (:class:`.RemoteXBeeDevice`): The remote device that sent the route record indicator frame.
+            hops (List): List of 16-bit addresses (:class:`.XBee16BitAddress`) of the intermediate hops
+                as received in the frame, starting with the neighbor of the local XBee and finishing with
+                the neighbor of ``src``.
+        """
+        cache = self.__route_cache
+        if cache is None or not src:
+            return
+
+        x64 = src.get_64bit_addr()
+        x16 = src.get_16bit_addr()
+        if not XBee64BitAddress.is_known_node_addr(x64) or not XBee16BitAddress.is_known_node_addr(x16):
+            return
+
+        # Route record hops start with the neighbor of the local XBee, while source routes start
+        # with the neighbor of the destination (the source of the record): reverse them
+        if cache.update(x64, x16, list(reversed(hops))):
+            self._log.debug("Source route to %s changed: %s hops", x64, len(hops) + 1)
+
+    def __create_cached_source_route(self, x64addr):
+        """
+        Creates in the XBee the cached source route to the provided node if it has changed since it
+        was last created.
+
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+        """
+        cache = self.__route_cache
+        if cache is None or not XBee64BitAddress.is_known_node_addr(x64addr):
+            return
+
+        route = cache._get_route_to_create(x64addr)
+        if not route:
+            return
+
+        x16, hops = route
+        self._log.debug("Create cached source route for %s (hops: %s)", x64addr, len(hops) + 1)
+        self.send_packet(CreateSourceRoutePacket(0x00, x64addr, x16, route_options=0, hops=hops), sync=False)
+        # Not marked before, so the route is created again if sending fails
+        cache._set_route_created(x64addr, x16, hops)
+
+    def __discard_cached_source_route(self, x64addr):
+        """
+        Removes the cached source route to the provided node after a failed transmission.
+
+        Args:
+            x64addr (:class:`.XBee64BitAddress`): 64-bit address of the destination node.
+        """
+        if self.__route_cache is not None:
+            self.__route_cache.remove(x64addr)
+
     def read_expl_data(self, timeout=None):
         """
         Override.
@@ -5410,6 +6660,10 @@ class IPDevice(XBeeDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.IPDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -5762,6 +7016,10 @@ class IPDevice(XBeeDevice):
         """
         Deprecated.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Operation not supported in this protocol.
         This method will raise an :class:`.AttributeError`.
         """
@@ -5780,6 +7038,10 @@ class IPDevice(XBeeDevice):
         """
         Deprecated.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Operation not supported in this protocol.
         This method will raise an :class:`.AttributeError`.
         """
@@ -5839,6 +7101,21 @@ class IPDevice(XBeeDevice):
         """
         raise AttributeError(self.__OPERATION_EXCEPTION)
 
+    def send_data_pipelined(self, remote_xbee_device, data, transmit_options=TransmitOptions.NONE.value,
+                            timeout=None):
+        """
+        Operation not supported in this protocol.
+        This method will raise an :class:`.AttributeError`.
+        """
+        raise AttributeError(self.__OPERATION_EXCEPTION)
+
+    def send_many(self, remote_xbee_device, data_list, transmit_options=TransmitOptions.NONE.value, timeout=None):
+        """
+        Operation not supported in this protocol.
+        This method will raise an :class:`.AttributeError`.
+        """
+        raise AttributeError(self.__OPERATION_EXCEPTION)
+
 
 class CellularDevice(IPDevice):
     """
@@ -5874,6 +7151,8 @@ class CellularDevice(IPDevice):
         super().__init__(port, baud_rate, data_bits=data_bits, stop_bits=stop_bits, parity=parity,
                          flow_control=flow_control, _sync_ops_timeout=_sync_ops_timeout, comm_iface=comm_iface)
         self._imei_addr = None
+        # Socket frames demultiplexer, created by the first socket.
+        self._socket_demux = None
 
     def open(self, force_settings=False):
         """
@@ -5953,6 +7232,10 @@ class CellularDevice(IPDevice):
         """
         Adds a callback for the event :class:`digi.xbee.reader.SMSReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -6105,6 +7388,10 @@ class CellularDevice(IPDevice):
         """
         Deprecated.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Operation not supported in this protocol.
         This method will raise an :class:`.AttributeError`.
         """
@@ -6268,6 +7555,10 @@ class LPWANDevice(CellularDevice):
         """
         Deprecated.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Operation not supported in this protocol.
         This method will raise an :class:`.AttributeError`.
         """
@@ -7496,42 +8787,484 @@ class RemoteZigBeeDevice(RemoteXBeeDevice):
             timeout=timeout if timeout else NeighborTableReader.DEFAULT_TIMEOUT)
 
 
-class XBeeNetwork(object):
-    """
-    This class represents an XBee Network.
-
-    The network allows the discovery of remote devices in the same network
-    as the local one and stores them.
+class _NodeRegistry(object):
     """
+    Remote nodes of an :class:`.XBeeNetwork` indexed by 64-bit address, 16-bit address and node identifier, so
+    they are found in constant time whatever the size of the network.
 
-    ND_PACKET_FINISH = 0x01
-    """
-    Flag that indicates a "discovery process finish" packet.
+    Nodes in the registry update the indexes themselves when any of these attributes changes.
     """
 
-    ND_PACKET_REMOTE = 0x02
-    """
-    Flag that indicates a discovery process packet with info about a remote XBee device.
-    """
+    X64 = 0
+    X16 = 1
+    NI = 2
 
-    # Default timeout for discovering process in case of
-    # the real timeout can't be determined.
-    _DEFAULT_DISCOVERY_TIMEOUT = 20
+    __NOT_INDEXED = frozenset((None, XBee64BitAddress.UNKNOWN_ADDRESS, XBee64BitAddress.BROADCAST_ADDRESS,
+                               XBee16BitAddress.UNKNOWN_ADDRESS, XBee16BitAddress.BROADCAST_ADDRESS))
 
-    # Correction values for the timeout for determined devices.
-    # It has been tested and work 'fine'
-    __DIGI_POINT_TIMEOUT_CORRECTION = 8
+    def __init__(self):
+        self.__nodes = []
+        # Each index maps a key to the nodes with that key, in insertion order
+        self.__indexes = ({}, {}, {})
+        self.__lock = threading.RLock()
 
-    __TIME_FOR_NEW_NODES_IN_FIFO = 1  # seconds
-    __TIME_WHILE_FINISH_PREVIOUS_PROCESS = 1  # seconds, for 'Cascade' mode
+    def __len__(self):
+        return len(self.__nodes)
 
-    __DEFAULT_QUEUE_MAX_SIZE = 300
-    """
-    Default max. size that the queue has.
-    """
+    def get_nodes(self):
+        """
+        Returns a copy of the list of nodes, in the order they were added.
+
+        Returns:
+            List: the nodes in the registry.
+        """
+        with self.__lock:
+            return self.__nodes[:]
+
+    def get(self, index, key):
+        """
+        Returns the first node added to the registry with the given key.
+
+        Args:
+            index (Integer): the index to look up: ``X64``, ``X16`` or ``NI``.
+            key: the 64-bit address, 16-bit address or node identifier.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the node, ``None`` if not found.
+        """
+        with self.__lock:
+            nodes = self.__indexes[index].get(key)
+            return next(iter(nodes.values())) if nodes else None
+
+    def find(self, node):
+        """
+        Returns the node of the registry equal to the given one.
+
+        Args:
+            node (:class:`.RemoteXBeeDevice`): the node to look for.
+
+        Returns:
+            :class:`.RemoteXBeeDevice`: the node in the registry, ``None`` if not found.
+        """
+        x64 = node.get_64bit_addr()
+        if x64 not in self.__NOT_INDEXED:
+            return self.get(self.X64, x64)
+        with self.__lock:
+            for item in self.__nodes:
+                if item == node:
+                    return item
+        return None
+
+    def add(self, node):
+        """
+        Adds a node to the registry.
+
+        Args:
+            node (:class:`.RemoteXBeeDevice`): the node to add.
+        """
+        with self.__lock:
+            self.__nodes.append(node)
+            for index, key in enumerate((node._64bit_addr, node._16bit_addr, node._node_id)):
+                self.__index(index, key, node)
+            node._registry = self
+
+    def remove(self, node):
+        """
+        Removes a node from the registry.
+
+        Args:
+            node (:class:`.RemoteXBeeDevice`): the node to remove.
+        """
+        with self.__lock:
+            for i, item in enumerate(self.__nodes):
+                if item is node:
+                    del self.__nodes[i]
+                    break
+            else:
+                return
+            for index, key in enumerate((node._64bit_addr, node._16bit_addr, node._node_id)):
+                self.__unindex(index, key, node)
+            node._registry = None
+
+    def clear(self):
+        """
+        Removes all nodes from the registry.
+        """
+        with self.__lock:
+            for node in self.__nodes:
+                node._registry = None
+            self.__nodes.clear()
+            for index in self.__indexes:
+                index.clear()
+
+    def reindex(self, node, index, old_key, new_key):
+        """
+        Moves a node of the registry from one key to another in the given index.
+
+        Args:
+            node (:class:`.RemoteXBeeDevice`): the node whose attribute changed.
+            index (Integer): the index to update: ``X64``, ``X16`` or ``NI``.
+            old_key: the previous value of the attribute.
+            new_key: the new value of the attribute.
+        """
+        with self.__lock:
+            if node._registry is not self:
+                return
+            self.__unindex(index, old_key, node)
+            self.__index(index, new_key, node)
+
+    def __index(self, index, key, node):
+        if key in self.__NOT_INDEXED:
+            return
+        self.__indexes[index].setdefault(key, {})[id(node)] = node
+
+    def __unindex(self, index, key, node):
+        if key in self.__NOT_INDEXED:
+            return
+        nodes = self.__indexes[index].get(key)
+        if nodes is None:
+            return
+        nodes.pop(id(node), None)
+        if not nodes:
+            del self.__indexes[index][key]
+
+
+class _ConnectionGraph(object):
+    """
+    Connections of an :class:`.XBeeNetwork` stored as an adjacency map keyed by the 64-bit addresses of their
+    end nodes, so a connection is found, added or removed in constant time and the connections of a node are
+    iterated without scanning the whole network.
+    """
+
+    def __init__(self):
+        # Connections keyed by the (node_a, node_b) 64-bit address pair, in insertion order
+        self.__edges = {}
+        # For every node, the connections with that node as one of their ends
+        self.__adjacency = {}
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.__edges)
+
+    def get_connections(self):
+        """
+        Returns a copy of the list of connections, in the order they were added.
+
+        Returns:
+            List: the list of :class:`.Connection`.
+        """
+        with self.__lock:
+            return list(self.__edges.values())
+
+    def get(self, node_a, node_b):
+        """
+        Returns the connection from ``node_a`` to ``node_b``.
+
+        Args:
+            node_a (:class:`.AbstractXBeeDevice`): "node_a" end of the connection.
+            node_b (:class:`.AbstractXBeeDevice`): "node_b" end of the connection.
+
+        Returns:
+            :class:`.Connection`: the connection, ``None`` if not found.
+        """
+        with self.__lock:
+            return self.__edges.get((node_a.get_64bit_addr(), node_b.get_64bit_addr()))
+
+    def get_node_connections(self, node, node_a=None):
+        """
+        Returns the connections with ``node`` as one of their ends.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`): the node to get its connections.
+            node_a (Boolean, optional, default=``None``): ``True`` to only get connections with ``node`` as
+                "node_a", ``False`` to only get those with ``node`` as "node_b", ``None`` to get all.
+
+        Returns:
+            List: the list of :class:`.Connection`.
+        """
+        x64 = node.get_64bit_addr()
+        with self.__lock:
+            connections = list(self.__adjacency.get(x64, {}).values())
+        if node_a is None:
+            return connections
+        return [c for c in connections if (c.node_a.get_64bit_addr() == x64) == node_a]
+
+    def add(self, connection):
+        """
+        Adds a connection, replacing the one with the same ends if any.
+
+        Args:
+            connection (:class:`.Connection`): the connection to add.
+        """
+        x64_a = connection.node_a.get_64bit_addr()
+        x64_b = connection.node_b.get_64bit_addr()
+        key = (x64_a, x64_b)
+        with self.__lock:
+            self.__edges[key] = connection
+            self.__adjacency.setdefault(x64_a, {})[key] = connection
+            self.__adjacency.setdefault(x64_b, {})[key] = connection
+
+    def remove(self, connection):
+        """
+        Removes a connection.
+
+        Args:
+            connection (:class:`.Connection`): the connection to remove.
+        """
+        x64_a = connection.node_a.get_64bit_addr()
+        x64_b = connection.node_b.get_64bit_addr()
+        key = (x64_a, x64_b)
+        with self.__lock:
+            if self.__edges.pop(key, None) is None:
+                return
+            for x64 in (x64_a, x64_b):
+                edges = self.__adjacency.get(x64)
+                if edges is not None:
+                    edges.pop(key, None)
+                    if not edges:
+                        del self.__adjacency[x64]
+
+    def clear(self):
+        """
+        Removes all connections.
+        """
+        with self.__lock:
+            self.__edges.clear()
+            self.__adjacency.clear()
+
+    def degree(self, node):
+        """
+        Returns the number of connections with ``node`` as one of their ends.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`): the node.
+
+        Returns:
+            Integer: the degree of the node.
+        """
+        with self.__lock:
+            return len(self.__adjacency.get(node.get_64bit_addr(), ()))
+
+    def shortest_path(self, src, dst):
+        """
+        Returns the path with the lowest accumulated link cost between two nodes.
+
+        Args:
+            src (:class:`.AbstractXBeeDevice`): the node the path starts from.
+            dst (:class:`.AbstractXBeeDevice`): the node the path ends in.
+
+        Returns:
+            Tuple (List, Integer): the nodes of the path, including both ends, and its cost. ``(None, None)``
+                if there is no path.
+
+        .. seealso::
+           | :attr:`.Connection.cost_a2b`
+           | :attr:`.Connection.cost_b2a`
+        """
+        src_x64 = src.get_64bit_addr()
+        dst_x64 = dst.get_64bit_addr()
+        if src_x64 == dst_x64:
+            return [src], 0
+
+        with self.__lock:
+            adjacency = {x64: list(edges.values()) for x64, edges in self.__adjacency.items()}
+
+        costs = {src_x64: 0}
+        previous = {src_x64: (None, src)}
+        seq = itertools.count()
+        heap = [(0, next(seq), src_x64)]
+        while heap:
+            cost, _, x64 = heapq.heappop(heap)
+            if x64 == dst_x64:
+                path = []
+                while x64 is not None:
+                    x64, node = previous[x64]
+                    path.append(node)
+                return path[::-1], cost
+            if cost > costs[x64]:
+                continue
+            for c in adjacency.get(x64, ()):
+                a_is_src = c.node_a.get_64bit_addr() == x64
+                neighbor = c.node_b if a_is_src else c.node_a
+                n_x64 = neighbor.get_64bit_addr()
+                n_cost = cost + (c.cost_a2b if a_is_src else c.cost_b2a)
+                if n_x64 not in costs or n_cost < costs[n_x64]:
+                    costs[n_x64] = n_cost
+                    previous[n_x64] = (x64, neighbor)
+                    heapq.heappush(heap, (n_cost, next(seq), n_x64))
+
+        return None, None
+
+    def articulation_points(self):
+        """
+        Returns the nodes whose failure splits the network, considering connections in both directions.
+
+        Returns:
+            List: the list of articulation nodes.
+        """
+        with self.__lock:
+            nodes = {}
+            neighbors = {}
+            for x64, edges in self.__adjacency.items():
+                neighbors[x64] = set()
+                for c in edges.values():
+                    for node in (c.node_a, c.node_b):
+                        n_x64 = node.get_64bit_addr()
+                        nodes.setdefault(n_x64, node)
+                        if n_x64 != x64:
+                            neighbors[x64].add(n_x64)
+
+        # Iterative Hopcroft-Tarjan algorithm
+        order = {}
+        low = {}
+        result = []
+        found = set()
+        counter = itertools.count()
+        for root in neighbors:
+            if root in order:
+                continue
+            order[root] = low[root] = next(counter)
+            root_children = 0
+            stack = [(root, None, iter(neighbors[root]))]
+            while stack:
+                x64, parent, it = stack[-1]
+                child = next(it, None)
+                if child is None:
+                    stack.pop()
+                    if parent is not None:
+                        low[parent] = min(low[parent], low[x64])
+                        if parent != root and low[x64] >= order[parent] and parent not in found:
+                            found.add(parent)
+                            result.append(nodes[parent])
+                    continue
+                if child == parent:
+                    continue
+                if child in order:
+                    low[x64] = min(low[x64], order[child])
+                    continue
+                order[child] = low[child] = next(counter)
+                if x64 == root:
+                    root_children += 1
+                stack.append((child, x64, iter(neighbors.get(child, ()))))
+            if root_children > 1:
+                result.append(nodes[root])
+
+        return result
+
+
+class _DiscoveryQueue(Queue):
+    """
+    Queue of the nodes pending to be asked for their neighbors during a deep discovery.
+
+    Nodes are returned by priority instead of in insertion order: the lower the value given by the
+    ``priority`` callable, the sooner the node is returned. Nodes with the same priority are returned
+    in insertion order. A node already in the queue is not added again.
+    """
+
+    def __init__(self, priority, wake_event=None, maxsize=0):
+        """
+        Class constructor. Instantiates a new :class:`._DiscoveryQueue` with the provided parameters.
+
+        Args:
+            priority (Function): Callable that receives a node and returns its priority.
+            wake_event (:class:`threading.Event`, optional, default=``None``): Event to set every
+                time a node is added.
+            maxsize (Integer, optional, default=0): Maximum size of the queue, 0 for no limit.
+        """
+        self.__priority = priority
+        self.__wake_event = wake_event
+        Queue.__init__(self, maxsize)
+
+    def _init(self, maxsize):
+        """
+        Override method.
+        """
+        self.queue = []
+        self.__queued = set()
+        self.__seq = itertools.count()
+
+    def _qsize(self):
+        """
+        Override method.
+        """
+        return len(self.queue)
+
+    def _put(self, item):
+        """
+        Override method.
+        """
+        key = str(item.get_64bit_addr())
+        if key not in self.__queued:
+            self.__queued.add(key)
+            heapq.heappush(self.queue, (self.__priority(item), next(self.__seq), item))
+        if self.__wake_event:
+            self.__wake_event.set()
+
+    def _get(self):
+        """
+        Override method.
+        """
+        item = heapq.heappop(self.queue)[2]
+        self.__queued.discard(str(item.get_64bit_addr()))
+        return item
+
+
+class XBeeNetwork(object):
+    """
+    This class represents an XBee Network.
+
+    The network allows the discovery of remote devices in the same network
+    as the local one and stores them.
+    """
+
+    ND_PACKET_FINISH = 0x01
+    """
+    Flag that indicates a "discovery process finish" packet.
+    """
+
+    ND_PACKET_REMOTE = 0x02
+    """
+    Flag that indicates a discovery process packet with info about a remote XBee device.
+    """
+
+    # Default timeout for discovering process in case of
+    # the real timeout can't be determined.
+    _DEFAULT_DISCOVERY_TIMEOUT = 20
+
+    # Correction values for the timeout for determined devices.
+    # It has been tested and work 'fine'
+    __DIGI_POINT_TIMEOUT_CORRECTION = 8
+
+    # Maximum time to wait for a completion or a new node to request before checking again
+    # the state of the deep discovery process
+    __MAX_TIME_WITHOUT_EVENTS = 5  # seconds
+
+    # Shortest non-zero time between requests in 'Flood' mode
+    __MIN_SPACING = 0.1  # seconds
+
+    # Network snapshot file format (big endian):
+    #     * Header: magic, version, protocol, scan counter, number of nodes and connections
+    #     * Nodes, the local one first: 64-bit and 16-bit addresses, role, hardware version,
+    #       flags (bit 0: reachable), scan counter, index of the parent node (-1 if none), date
+    #       of the last successful neighbors request (0 if never), firmware version length and
+    #       node identifier length, followed by the firmware version and the node identifier
+    #       (UTF-8) bytes
+    #     * Connections: indexes of node A and node B, link quality A -> B and B -> A, status
+    #       A -> B and B -> A, flags (bit 0: A -> B link quality is RSSI, bit 1: B -> A link
+    #       quality is RSSI) and scan counters A -> B and B -> A
+    __SNAPSHOT_MAGIC = b"XBNS"
+    __SNAPSHOT_VERSION = 1
+    __SNAPSHOT_HEADER = struct.Struct(">4sBBIII")
+    __SNAPSHOT_NODE = struct.Struct(">8s2sBBBIidBH")
+    __SNAPSHOT_CONNECTION = struct.Struct(">IIhhbbBII")
+    __SNAPSHOT_NO_HW = 0xFF
 
     __MAX_SCAN_COUNTER = 10000
 
+    # Scan counter of the connection directions not discovered in the last scan of the previous
+    # incremental discovery, out of the range of the scan counter
+    __NOT_SCANNED = __MAX_SCAN_COUNTER + 1
+
     DEFAULT_TIME_BETWEEN_SCANS = 10  # seconds
     """
     Default time (in seconds) to wait before starting a new scan.
@@ -7562,6 +9295,50 @@ class XBeeNetwork(object):
     High limit for the time (in seconds) to wait between node neighbors requests.
     """
 
+    DEFAULT_STALE_TIME = 60 * 60  # seconds
+    """
+    Default time (in seconds) without a successful neighbors request nor a received frame after
+    which a node is requested again in an incremental deep discovery.
+    """
+
+    MIN_STALE_TIME = 0  # seconds
+    """
+    Low limit for the time (in seconds) after which a node is requested again in an incremental
+    deep discovery.
+    """
+
+    MAX_STALE_TIME = 30 * 24 * 60 * 60  # seconds
+    """
+    High limit for the time (in seconds) after which a node is requested again in an incremental
+    deep discovery.
+    """
+
+    DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+    """
+    Default maximum number of node neighbors requests running at the same time in 'Flood' mode.
+    """
+
+    MIN_MAX_CONCURRENT_REQUESTS = 1
+    """
+    Low limit for the maximum number of node neighbors requests running at the same time.
+    """
+
+    MAX_MAX_CONCURRENT_REQUESTS = 64
+    """
+    High limit for the maximum number of node neighbors requests running at the same time.
+    """
+
+    DEFAULT_BULK_CONCURRENCY = 8
+    """
+    Default maximum number of remote AT commands waiting for their response in bulk operations.
+    """
+
+    DEFAULT_BULK_RETRIES = 1
+    """
+    Default number of times a remote AT command of a bulk operation is sent again after a timeout
+    or a transmission failure.
+    """
+
     SCAN_TIL_CANCEL = 0  # 0 for not stopping
     """
     The neighbor discovery process continues until is manually stopped.
@@ -7592,7 +9369,7 @@ class XBeeNetwork(object):
             raise ValueError("Local XBee device cannot be None")
 
         self._local_xbee = xbee_device
-        self.__devices_list = []
+        self.__registry = _NodeRegistry()
         self.__last_search_dev_list = []
         self.__lock = threading.Lock()
         self.__discovering = False
@@ -7605,21 +9382,64 @@ class XBeeNetwork(object):
         self.__sought_device_id = None
         self.__discovered_device = None
 
-        # FIFO to store the nodes to ask for their neighbors
-        self._nodes_queue = Queue(self.__class__.__DEFAULT_QUEUE_MAX_SIZE)
+        # Event set when the deep discovery loop has something to do: a node was added to the
+        # FIFO, a request process finished or the discovery was stopped
+        self.__wake_event = threading.Event()
+
+        # Date of the last successful neighbors request per node (64-bit address string), so
+        # nodes not asked recently are requested first
+        self.__last_scan_dates = {}
+
+        # Incremental deep discovery state:
+        #     * Date of the last frame received from every node (64-bit address string)
+        #     * Nodes whose neighborhood probably changed since their last request
+        #     * Last route record received from every node, to detect route changes
+        #     * Whether the next scan must request all nodes
+        self.__incremental = False
+        self.__stale_time = self.__class__.DEFAULT_STALE_TIME
+        self.__last_seen_dates = {}
+        self.__dirty_nodes = set()
+        self.__route_records = {}
+        self.__full_scan = False
+        self.__change_listener = None
+
+        # Packet listener where the passive learning callback is registered, if enabled
+        self.__learning_listener = None
+
+        # FIFO to store the nodes to ask for their neighbors, sorted by the date of their last
+        # successful request (local node first, then never asked nodes)
+        self._nodes_queue = _DiscoveryQueue(self.__get_node_priority, wake_event=self.__wake_event)
 
         # List with the MAC address (string format) of the still active request processes
         self.__active_processes = []
 
-        # Last date of a sent request. Used to wait certain time between requests:
-        #     * In 'Flood' mode to satisfy the minimum time to wait between node requests
-        #     * For 'Cascade', the time to wait is applied after finishing the previous request
-        #       process
-        self.__last_request_date = 0
+        # Start date of every active request process (key: 64-bit address string)
+        self.__request_dates = {}
+
+        # Nodes popped from the FIFO while a previous request for them was still running. They
+        # are added again to the FIFO if that request fails
+        self.__deferred_nodes = {}
+
+        # Request scheduler state:
+        #     * Window: maximum number of request processes running at the same time. In 'Flood'
+        #       mode it grows by one with every request finished in time, up to the configured
+        #       maximum, and it is halved with every failed request. 'Cascade' uses always 1.
+        #     * Spacing: time to wait between the start of two requests in 'Flood' mode. It is
+        #       halved with every request finished in time and doubled with every failed one,
+        #       never above the configured time between requests.
+        #     * Smoothed response time of the finished requests.
+        #     * Date to send the next request. For 'Cascade', the time to wait is applied after
+        #       finishing the previous request process.
+        self.__sched_lock = threading.Lock()
+        self.__max_requests = self.__class__.DEFAULT_MAX_CONCURRENT_REQUESTS
+        self.__window = 1
+        self.__spacing = 0
+        self.__srtt = None
+        self.__next_request_date = 0
 
         self.__scan_counter = 0
 
-        self.__connections = []
+        self.__graph = _ConnectionGraph()
         self.__conn_lock = threading.Lock()
 
         # Dictionary to store the route and node discovery processes per node, so they can be
@@ -7730,6 +9550,7 @@ class XBeeNetwork(object):
         exception.
         """
         self._stop_event.set()
+        self.__wake_event.set()
 
         if self.__discovery_thread and self.__discovering:
             self.__discovery_thread.join()
@@ -7804,10 +9625,7 @@ class XBeeNetwork(object):
         Returns:
             List: a copy of the XBee devices list of the network.
         """
-        with self.__lock:
-            dl_copy = [len(self.__devices_list)]
-            dl_copy[:] = self.__devices_list[:]
-            return dl_copy
+        return self.__registry.get_nodes()
 
     def has_devices(self):
         """
@@ -7816,7 +9634,7 @@ class XBeeNetwork(object):
         Returns:
             Boolean: ``True`` if there is at least one device in the network, ``False`` otherwise.
         """
-        return len(self.__devices_list) > 0
+        return len(self.__registry) > 0
 
     def get_number_devices(self):
         """
@@ -7825,12 +9643,16 @@ class XBeeNetwork(object):
         Returns:
             Integer: the number of devices in the network.
         """
-        return len(self.__devices_list)
+        return len(self.__registry)
 
     def add_network_modified_callback(self, callback):
         """
         Adds a callback for the event :class:`digi.xbee.reader.NetworkModified`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -7848,6 +9670,10 @@ class XBeeNetwork(object):
         """
         Adds a callback for the event :class:`.DeviceDiscovered`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives one argument.
 
@@ -7864,6 +9690,10 @@ class XBeeNetwork(object):
         """
         Adds a callback for the event :class:`.InitDiscoveryScan`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two arguments.
 
@@ -7879,6 +9709,10 @@ class XBeeNetwork(object):
         """
         Adds a callback for the event :class:`.EndDiscoveryScan`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two arguments.
 
@@ -7894,6 +9728,10 @@ class XBeeNetwork(object):
         """
         Adds a callback for the event :class:`.DiscoveryProcessFinished`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function): the callback. Receives two argument.
 
@@ -7911,6 +9749,10 @@ class XBeeNetwork(object):
         """
         Adds a callback to listen to any received packet from the provided node.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             node (:class:`.RemoteXBeeDevice`): The node to listen for frames.
             callback (Function): The callback. Receives one argument.
@@ -7947,6 +9789,167 @@ class XBeeNetwork(object):
 
         cbs(packet, remote)
 
+    def is_passive_learning_enabled(self):
+        """
+        Returns whether the network is learned from the traffic received by the local XBee.
+
+        Returns:
+            Boolean: ``True`` if passive learning is enabled, ``False`` otherwise.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_passive_learning`
+        """
+        return self.__learning_listener is not None
+
+    def set_passive_learning(self, enable):
+        """
+        Enables or disables learning the network from the traffic received by the local XBee,
+        without sending anything:
+
+            .. hlist::
+               :columns: 1
+
+               * Route record indicators (Zigbee) add the connections of the route from the
+                 source node to the local XBee.
+               * Route information packets (DigiMesh) add the connection from the responder
+                 node to the successor node.
+               * 802.15.4 received packets add the connection from the source node to the
+                 local XBee with the RSSI of the packet as link quality.
+
+        Nodes with a known 64-bit address are added to the network, and the nodes of a learned
+        connection are considered reachable and seen at that moment (see
+        :meth:`.XBeeNetwork.set_deep_discovery_options`). Learned connections are marked as
+        discovered in the current scan.
+
+        The local XBee must be open and this must be enabled again if it is reopened.
+
+        Args:
+            enable (Boolean): ``True`` to enable passive learning, ``False`` to disable it.
+
+        Raises:
+            XBeeException: if ``enable`` is ``True`` and the local XBee is not open.
+        """
+        if not enable:
+            if self.__learning_listener:
+                self.__learning_listener.del_packet_received_callback(self.__learn_from_packet)
+                self.__learning_listener = None
+            return
+
+        listener = self._local_xbee._packet_listener
+        if not listener:
+            raise XBeeException("The local XBee must be open to learn from its traffic")
+
+        if self.__learning_listener is listener:
+            return
+        if self.__learning_listener:
+            self.__learning_listener.del_packet_received_callback(self.__learn_from_packet)
+
+        listener.add_packet_received_callback(self.__learn_from_packet)
+        self.__learning_listener = listener
+
+    def __learn_from_packet(self, packet):
+        """
+        Callback to learn the network from received packets.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The received packet.
+        """
+        frame_type = packet.get_frame_type()
+
+        if frame_type == ApiFrameType.ROUTE_RECORD_INDICATOR:
+            # Hops go from the closest to the local XBee (the destination of the record) to the
+            # closest to the source: reverse them to chain the route from the source
+            route = [self.__get_learned_node(x64=packet.x64bit_source_addr,
+                                             x16=packet.x16bit_source_addr)]
+            route.extend(self.__get_learned_node(x16=hop) for hop in reversed(packet.hops))
+            route.append(self._local_xbee)
+            for node_a, node_b in zip(route, route[1:]):
+                self.__learn_connection(node_a, node_b)
+
+        elif frame_type == ApiFrameType.DIGIMESH_ROUTE_INFORMATION:
+            self.__learn_connection(self.__get_learned_node(x64=packet.responder_addr),
+                                    self.__get_learned_node(x64=packet.successor_addr))
+
+        elif frame_type in (ApiFrameType.RX_64, ApiFrameType.RX_IO_64):
+            self.__learn_connection(self.__get_learned_node(x64=packet.x64bit_source_addr),
+                                    self._local_xbee, lq=packet.rssi)
+
+        elif frame_type in (ApiFrameType.RX_16, ApiFrameType.RX_IO_16):
+            self.__learn_connection(self.__get_learned_node(x16=packet.x16bit_source_addr),
+                                    self._local_xbee, lq=packet.rssi)
+
+    def __get_learned_node(self, x64=None, x16=None):
+        """
+        Returns the node with the given addresses, adding it to the network if it is not
+        included yet and its 64-bit address is known. Nodes known only by their 16-bit address
+        are not added, since that would require asking for their 64-bit address.
+
+        Args:
+            x64 (:class:`.XBee64BitAddress`, optional, default=``None``): 64-bit address.
+            x16 (:class:`.XBee16BitAddress`, optional, default=``None``): 16-bit address.
+
+        Returns:
+            :class:`.AbstractXBeeDevice`: The node, ``None`` if it is unknown.
+        """
+        if XBee64BitAddress.is_known_node_addr(x64):
+            if x64 == self._local_xbee.get_64bit_addr():
+                return self._local_xbee
+            node = self.__registry.get(_NodeRegistry.X64, x64)
+            if node:
+                return node
+            node = self._add_remote_from_attr(NetworkEventReason.ROUTE, x64bit_addr=x64,
+                                              x16bit_addr=x16)
+            return node or self.__registry.get(_NodeRegistry.X64, x64)
+
+        if XBee16BitAddress.is_known_node_addr(x16):
+            if x16 == self._local_xbee.get_16bit_addr():
+                return self._local_xbee
+            return self.__registry.get(_NodeRegistry.X16, x16)
+
+        return None
+
+    def __learn_connection(self, node_a, node_b, lq=None):
+        """
+        Adds or updates the connection from ``node_a`` to ``node_b`` with the given link quality.
+        Both nodes are marked as reachable and seen now.
+
+        Args:
+            node_a (:class:`.AbstractXBeeDevice`): Source of the connection.
+            node_b (:class:`.AbstractXBeeDevice`): Destination of the connection.
+            lq (Integer, optional, default=``None``): RSSI of the connection, ``None`` if unknown.
+        """
+        if not node_a or not node_b or node_a is node_b:
+            return
+
+        now = time.time()
+        for node in (node_a, node_b):
+            if node.is_remote():
+                self.__last_seen_dates[str(node.get_64bit_addr())] = now
+                self._set_node_reachable(node, True)
+
+        from digi.xbee.models.zdo import RouteStatus
+        link_quality = LinkQuality(lq=lq, is_rssi=True) if lq is not None else None
+        with self.__conn_lock:
+            conn = self.__graph.get(node_a, node_b)
+            if conn:
+                if link_quality:
+                    conn.lq_a2b = link_quality
+                conn.status_a2b = RouteStatus.ACTIVE
+                conn.scan_counter_a2b = self.__scan_counter
+                return
+
+            conn = self.__graph.get(node_b, node_a)
+            if conn:
+                if link_quality:
+                    conn.lq_b2a = link_quality
+                conn.status_b2a = RouteStatus.ACTIVE
+                conn.scan_counter_b2a = self.__scan_counter
+                return
+
+            conn = Connection(node_a, node_b, lq_a2b=link_quality, status_a2b=RouteStatus.ACTIVE)
+            conn.scan_counter_a2b = self.__scan_counter
+            self.__graph.add(conn)
+
     def del_network_modified_callback(self, callback):
         """
         Deletes a callback for the callback list of :class:`digi.xbee.reader.NetworkModified`.
@@ -8069,15 +10072,17 @@ class XBeeNetwork(object):
         Args:
             reason (:class:`.NetworkEventReason`): the reason of the clear event.
         """
-        with self.__lock:
-            for node in self.__devices_list:
-                self._del_all_packet_received_callbacks(node)
+        for node in self.__registry.get_nodes():
+            self._del_all_packet_received_callbacks(node)
 
-        with self.__lock:
-            self.__devices_list.clear()
+        self.__registry.clear()
 
-        with self.__conn_lock:
-            self.__connections.clear()
+        self.__graph.clear()
+
+        self.__last_scan_dates.clear()
+        self.__last_seen_dates.clear()
+        self.__dirty_nodes.clear()
+        self.__route_records.clear()
 
         self._network_modified(NetworkEventType.CLEAR, reason, None)
 
@@ -8139,8 +10144,55 @@ class XBeeNetwork(object):
         """
         return self.__mode, self.__rm_not_discovered_in_last_scan
 
+    def get_max_concurrent_requests(self):
+        """
+        Returns the maximum number of node neighbors requests running at the same time during a
+        deep discovery in 'Flood' mode.
+
+        Returns:
+            Integer: The maximum number of concurrent neighbors requests.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_deep_discovery_options`
+        """
+        return self.__max_requests
+
+    def get_incremental_discovery_options(self):
+        """
+        Returns the incremental deep discovery options.
+
+        Returns:
+            Tuple (Boolean, Float): Tuple containing:
+                - incremental (Boolean): ``True`` if deep discovery scans only request the nodes
+                    whose neighborhood probably changed, ``False`` if they request all nodes.
+                - stale_time (Float): Time (in seconds) without a successful neighbors request
+                    nor a received frame after which a node is requested again.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_deep_discovery_options`
+        """
+        return self.__incremental, self.__stale_time
+
+    def request_full_scan(self, node=None):
+        """
+        Forces the next scan of an incremental deep discovery to request the neighbors of the
+        given node, or of all nodes if no node is provided.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`, optional, default=``None``): The node to request
+                again, ``None`` to request all nodes.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.set_deep_discovery_options`
+        """
+        if node is None:
+            self.__full_scan = True
+        else:
+            self.__dirty_nodes.add(str(node.get_64bit_addr()))
+
     def set_deep_discovery_options(self, deep_mode=NeighborDiscoveryMode.CASCADE,
-                                   del_not_discovered_nodes_in_last_scan=False):
+                                   del_not_discovered_nodes_in_last_scan=False,
+                                   max_concurrent_requests=None, incremental=False, stale_time=None):
         """
         Configures the deep discovery options with the given values.
         These options are only applicable for "deep" discovery
@@ -8151,6 +10203,28 @@ class XBeeNetwork(object):
                 discovery mode, the way to perform the network discovery process.
             del_not_discovered_nodes_in_last_scan (Boolean, optional, default=``False``): ``True`` to
                 remove nodes from the network if they were not discovered in the last scan,
+            max_concurrent_requests (Integer, optional, default=`DEFAULT_MAX_CONCURRENT_REQUESTS`): Maximum
+                number of node neighbors requests running at the same time in 'Flood' mode. The
+                number of running requests starts at 1 and grows while requests finish in time,
+                up to this value. It must be between :const:`MIN_MAX_CONCURRENT_REQUESTS` and
+                :const:`MAX_MAX_CONCURRENT_REQUESTS` inclusive.
+            incremental (Boolean, optional, default=``False``): ``True`` to only request, in every
+                scan, the nodes whose neighborhood probably changed: nodes never requested,
+                nodes not reachable, nodes in a changed route (route record indicators), nodes
+                marked with :meth:`.XBeeNetwork.request_full_scan`, and nodes without a
+                successful request nor a received frame for ``stale_time`` seconds. The rest
+                of nodes and their connections are kept as discovered in the scan without any
+                request. All nodes are requested when the local XBee joins or leaves the
+                network or after :meth:`.XBeeNetwork.request_full_scan`. ``False`` to request
+                all nodes in every scan.
+            stale_time (Float, optional, default=`DEFAULT_STALE_TIME`): Time (in seconds) without
+                a successful neighbors request nor a received frame after which a node is
+                requested again in an incremental scan. It must be between
+                :const:`MIN_STALE_TIME` and :const:`MAX_STALE_TIME` inclusive.
+
+        Raises:
+            ValueError: if ``max_concurrent_requests`` or ``stale_time`` are not between their
+                limits.
 
         .. seealso::
            | :class:`digi.xbee.models.mode.NeighborDiscoveryMode`
@@ -8161,10 +10235,30 @@ class XBeeNetwork(object):
             raise TypeError("Deep mode must be NeighborDiscoveryMode not {!r}".format(
                 deep_mode.__class__.__name__))
 
+        if max_concurrent_requests is not None \
+                and (max_concurrent_requests < self.__class__.MIN_MAX_CONCURRENT_REQUESTS
+                     or max_concurrent_requests > self.__class__.MAX_MAX_CONCURRENT_REQUESTS):
+            raise ValueError("Maximum concurrent requests must be between %d and %d" %
+                             (self.__class__.MIN_MAX_CONCURRENT_REQUESTS,
+                              self.__class__.MAX_MAX_CONCURRENT_REQUESTS))
+
+        if stale_time is not None \
+                and (stale_time < self.__class__.MIN_STALE_TIME
+                     or stale_time > self.__class__.MAX_STALE_TIME):
+            raise ValueError("Stale time must be between %d and %d" %
+                             (self.__class__.MIN_STALE_TIME, self.__class__.MAX_STALE_TIME))
+
         self.__mode = deep_mode if deep_mode is not None else NeighborDiscoveryMode.CASCADE
 
         self.__rm_not_discovered_in_last_scan = del_not_discovered_nodes_in_last_scan
 
+        self.__incremental = bool(incremental)
+        self.__stale_time = stale_time if stale_time is not None \
+            else self.__class__.DEFAULT_STALE_TIME
+
+        self.__max_requests = max_concurrent_requests if max_concurrent_requests is not None \
+            else self.__class__.DEFAULT_MAX_CONCURRENT_REQUESTS
+
     def get_discovery_timeout(self):
         """
         Returns the network discovery timeout.
@@ -8270,7 +10364,9 @@ class XBeeNetwork(object):
 
                    * For 'Cascade' the number of seconds to wait after completion of the
                      neighbor discovery process of the previous node.
-                   * For 'Flood' the minimum time to wait between each node's neighbor requests.
+                   * For 'Flood' the maximum time to wait between each node's neighbor requests.
+                     The wait is shortened while requests finish in time and lengthened again,
+                     up to this value, when they fail.
 
         time_bw_scans (Float, optional, default=`DEFAULT_TIME_BETWEEN_SCANS`): Time to wait
             before starting a new network scan.
@@ -8382,12 +10478,7 @@ class XBeeNetwork(object):
         if self._local_xbee.get_64bit_addr() == x64bit_addr:
             return self._local_xbee
 
-        with self.__lock:
-            for device in self.__devices_list:
-                if device.get_64bit_addr() is not None and device.get_64bit_addr() == x64bit_addr:
-                    return device
-
-        return None
+        return self.__registry.get(_NodeRegistry.X64, x64bit_addr)
 
     def get_device_by_16(self, x16bit_addr):
         """
@@ -8414,12 +10505,7 @@ class XBeeNetwork(object):
         if self._local_xbee.get_16bit_addr() == x16bit_addr:
             return self._local_xbee
 
-        with self.__lock:
-            for device in self.__devices_list:
-                if device.get_16bit_addr() is not None and device.get_16bit_addr() == x16bit_addr:
-                    return device
-
-        return None
+        return self.__registry.get(_NodeRegistry.X16, x16bit_addr)
 
     def get_device_by_node_id(self, node_id):
         """
@@ -8440,12 +10526,7 @@ class XBeeNetwork(object):
         if self._local_xbee.get_node_id() == node_id:
             return self._local_xbee
 
-        with self.__lock:
-            for device in self.__devices_list:
-                if device.get_node_id() is not None and device.get_node_id() == node_id:
-                    return device
-
-        return None
+        return self.__registry.get(_NodeRegistry.NI, node_id)
 
     def add_if_not_exist(self, x64bit_addr=None, x16bit_addr=None, node_id=None):
         """
@@ -8506,6 +10587,11 @@ class XBeeNetwork(object):
         if not remote_xbee:
             return remote_xbee
 
+        if reason == NetworkEventReason.RECEIVED_MSG:
+            x64 = remote_xbee.get_64bit_addr()
+            if XBee64BitAddress.is_known_node_addr(x64):
+                self.__last_seen_dates[str(x64)] = time.time()
+
         found = None
 
         # Check if it is the local device
@@ -8550,9 +10636,7 @@ class XBeeNetwork(object):
 
             # Look for the node in the cache by its 64-bit address
             if is_x64_known_addr:
-                with self.__lock:
-                    if remote_xbee in self.__devices_list:
-                        found = self.__devices_list[self.__devices_list.index(remote_xbee)]
+                found = self.__registry.get(_NodeRegistry.X64, x64)
 
             # If not found, look for the node in the cache by its 16-bit address
             if not found:
@@ -8590,7 +10674,7 @@ class XBeeNetwork(object):
         if reason in (NetworkEventReason.NEIGHBOR, NetworkEventReason.DISCOVERED):
             remote_xbee._scan_counter = self.__scan_counter
 
-        self.__devices_list.append(remote_xbee)
+        self.__registry.add(remote_xbee)
         self._network_modified(NetworkEventType.ADD, reason, node=remote_xbee)
 
         return remote_xbee
@@ -8667,13 +10751,12 @@ class XBeeNetwork(object):
             return
 
         with self.__lock:
-            if remote_xbee_device not in self.__devices_list:
+            found_node = self.__registry.find(remote_xbee_device)
+            if not found_node:
                 return
 
-            i = self.__devices_list.index(remote_xbee_device)
-            found_node = self.__devices_list[i]
             if force:
-                self.__devices_list.remove(found_node)
+                self.__registry.remove(found_node)
                 if found_node.reachable:
                     self._network_modified(NetworkEventType.DEL, reason, node=remote_xbee_device)
 
@@ -8910,6 +10993,7 @@ class XBeeNetwork(object):
 
             return code
         finally:
+            self.__set_change_listeners(False)
             self._discovery_done(self.__active_processes)
 
     def __init_discovery(self, nodes_queue):
@@ -8928,17 +11012,23 @@ class XBeeNetwork(object):
                 the discovery process.
         """
         # Initialize the scan number
+        last_scan = self.__scan_counter
         self.__scan_counter = 0
 
         # Initialize all nodes/connections scan counter
         with self.__lock:
-            for xb in self.__devices_list:
+            for xb in self.__registry.get_nodes():
                 xb._scan_counter = self.__scan_counter
 
+        # An incremental discovery keeps which connection directions were discovered in the last
+        # scan, so they are only kept as discovered for nodes not requested again
+        not_scanned = self.__class__.__NOT_SCANNED if self.__incremental else self.__scan_counter
         with self.__conn_lock:
-            for c in self.__connections:
-                c.scan_counter_a2b = self.__scan_counter
-                c.scan_counter_b2a = self.__scan_counter
+            for c in self.__graph.get_connections():
+                c.scan_counter_a2b = self.__scan_counter \
+                    if c.scan_counter_a2b == last_scan else not_scanned
+                c.scan_counter_b2a = self.__scan_counter \
+                    if c.scan_counter_b2a == last_scan else not_scanned
 
         # Clear the nodes FIFO
         while not nodes_queue.empty():
@@ -8948,7 +11038,11 @@ class XBeeNetwork(object):
                 continue
             nodes_queue.task_done()
 
-        self.__purge(force=self.__rm_not_discovered_in_last_scan)
+        # An incremental discovery keeps the known nodes
+        if not self.__incremental:
+            self.__purge(force=self.__rm_not_discovered_in_last_scan)
+
+        self.__set_change_listeners(True)
 
         try:
             self._prepare_network_discovery()
@@ -8987,7 +11081,11 @@ class XBeeNetwork(object):
         self.__increment_scan_counter()
         self._local_xbee._scan_counter = self.__scan_counter
 
-        self.__last_request_date = 0
+        with self.__sched_lock:
+            self.__window = 1
+            self.__spacing = self.__time_bw_nodes
+            self.__next_request_date = 0
+            self.__deferred_nodes.clear()
 
         # Notify start scan
         self.__init_scan_cbs(self.__scan_counter, self.__stop_scan)
@@ -9005,6 +11103,10 @@ class XBeeNetwork(object):
         """
         Discovers the network of the local node.
 
+        Requests are sent while the FIFO has nodes and the number of active processes is below
+        the scheduler window, spaced by the scheduler spacing. The process waits for a request to
+        finish or a new node to be added to the FIFO instead of polling.
+
         Args:
             nodes_queue (:class:`queue.Queue`): FIFO where the nodes to discover their
                 neighbors are stored.
@@ -9017,26 +11119,19 @@ class XBeeNetwork(object):
         """
         code = NetworkDiscoveryStatus.SUCCESS
 
-        # Add local node to the FIFO
-        nodes_queue.put(self._local_xbee)
+        # Add local node, or the changed nodes for an incremental scan, to the FIFO
+        self.__queue_scan_nodes(nodes_queue)
 
         while True:
-            # Wait to have items in the nodes FIFO while some nodes are being discovered,
-            # because them can fill the FIFO with new nodes to ask
-            while nodes_queue.empty() and active_processes:
-                self._log.debug("")
-                self._log.debug(
-                    " [*] Waiting for more nodes to request or finishing active processes (%d)\n",
-                    len(active_processes))
-                [self._log.debug("     Waiting for %s", p) for p in active_processes]
-
-                code = self.__wait_checking(self.__class__.__TIME_FOR_NEW_NODES_IN_FIFO)
-                if code == NetworkDiscoveryStatus.CANCEL:
-                    return code
-
-            # Check if there are more nodes in the FIFO
-            while not nodes_queue.empty():
-                # Process the next node
+            # Clear the event before checking the state, so no event is lost meanwhile
+            self.__wake_event.clear()
+
+            # Process as many nodes of the FIFO as the scheduler allows
+            time_to_wait = 0
+            while not nodes_queue.empty() and len(active_processes) < self.__get_window():
+                time_to_wait = self.__next_request_date - time.time()
+                if time_to_wait > 0:
+                    break
                 code = self.__discover_next_node_neighbors(nodes_queue, active_processes,
                                                            node_timeout)
                 # Only stop if the process has been cancelled, otherwise continue with the
@@ -9044,21 +11139,30 @@ class XBeeNetwork(object):
                 if code == NetworkDiscoveryStatus.CANCEL:
                     return code
 
-                # For cascade, wait until previous processes finish
-                if self.__mode == NeighborDiscoveryMode.CASCADE:
-                    while active_processes:
-                        code = self.__wait_checking(
-                            self.__class__.__TIME_WHILE_FINISH_PREVIOUS_PROCESS)
-                        if code == NetworkDiscoveryStatus.CANCEL:
-                            return code
-
             # Check if all processes finish
-            if not active_processes:
-                self._check_not_discovered_nodes(self.__devices_list, nodes_queue)
+            if not active_processes and nodes_queue.empty():
+                self._check_not_discovered_nodes(self.__registry.get_nodes(), nodes_queue)
                 if not nodes_queue.empty():
                     continue
                 break
 
+            if time_to_wait > 0:
+                self._log.debug("")
+                self._log.debug(" [*] Waiting %f before sending next request", time_to_wait)
+            else:
+                self._log.debug("")
+                self._log.debug(
+                    " [*] Waiting for more nodes to request or finishing active processes (%d)\n",
+                    len(active_processes))
+                [self._log.debug("     Waiting for %s", p) for p in active_processes[:]]
+                time_to_wait = self.__class__.__MAX_TIME_WITHOUT_EVENTS
+
+            # Check for cancel
+            if self._stop_event.is_set():
+                return NetworkDiscoveryStatus.CANCEL
+
+            self.__wake_event.wait(min(time_to_wait, self.__class__.__MAX_TIME_WITHOUT_EVENTS))
+
         return code
 
     def __discover_next_node_neighbors(self, nodes_queue, active_processes, node_timeout):
@@ -9082,31 +11186,209 @@ class XBeeNetwork(object):
             return NetworkDiscoveryStatus.CANCEL
 
         requester = nodes_queue.get()
+        key = str(requester.get_64bit_addr())
 
-        # Wait between nodes but not for the local one
-        if requester != self._local_xbee:
-            time_to_wait = self.__time_bw_nodes
-            if self.__mode != NeighborDiscoveryMode.CASCADE:
-                time_to_wait = self.__time_bw_nodes + (time.time() - self.__last_request_date)
-            self._log.debug("")
-            self._log.debug(" [*] Waiting %f before sending next request to %s",
-                            time_to_wait if time_to_wait > 0 else 0.0, requester)
-            code = self.__wait_checking(time_to_wait)
-            if code != NetworkDiscoveryStatus.SUCCESS:
+        with self.__sched_lock:
+            # If the previous request did not finish, ask again only if it fails
+            if key in active_processes:
+                self._log.debug("")
+                self._log.debug(" [*] Previous request for %s did not finish...", requester)
+                self.__deferred_nodes[key] = requester
                 return code
 
-        # If the previous request finished, discover node neighbors
-        if not requester.get_64bit_addr() in active_processes:
-            self._log.debug("")
-            self._log.debug(" [*] Discovering neighbors of %s", requester)
-            self.__last_request_date = time.time()
-            return self._discover_neighbors(requester, nodes_queue, active_processes, node_timeout)
+            now = time.time()
+            self.__request_dates[key] = now
+            if self.__mode != NeighborDiscoveryMode.CASCADE:
+                self.__next_request_date = now + self.__spacing
 
         self._log.debug("")
-        self._log.debug(" [*] Previous request for %s did not finish...", requester)
-        nodes_queue.put(requester)
+        self._log.debug(" [*] Discovering neighbors of %s", requester)
+        return self._discover_neighbors(requester, nodes_queue, active_processes, node_timeout)
 
-        return code
+    def __get_window(self):
+        """
+        Returns the maximum number of request processes that can be running at the same time.
+
+        Returns:
+            Integer: The current scheduler window.
+        """
+        if self.__mode == NeighborDiscoveryMode.CASCADE:
+            return 1
+
+        return self.__window
+
+    def __get_node_priority(self, node):
+        """
+        Returns the priority of the given node in the FIFO of nodes to request. The lower the
+        value, the sooner the node is requested.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`): The node to get its priority.
+
+        Returns:
+            Float: The priority of the node.
+        """
+        # Local node first, then the ones never requested, then the oldest requested
+        if node == self._local_xbee:
+            return -1
+
+        return self.__last_scan_dates.get(str(node.get_64bit_addr()), 0)
+
+    def __queue_scan_nodes(self, nodes_queue):
+        """
+        Adds to the FIFO the nodes to start a scan with. The local node for a full scan. For an
+        incremental scan, the nodes whose neighborhood probably changed: the rest of nodes and
+        their connections are marked as discovered in this scan without requesting them.
+
+        Args:
+            nodes_queue (:class:`queue.Queue`): FIFO where the nodes to discover their
+                neighbors are stored.
+        """
+        if not self.__incremental or self.__full_scan:
+            self.__full_scan = False
+            self.__dirty_nodes.clear()
+            nodes_queue.put(self._local_xbee)
+            return
+
+        now = time.time()
+        changed = 0
+        for node in [self._local_xbee] + self.__registry.get_nodes():
+            key = str(node.get_64bit_addr())
+            last_date = max(self.__last_scan_dates.get(key, 0),
+                            self.__last_seen_dates.get(key, 0))
+            if key not in self.__last_scan_dates or key in self.__dirty_nodes \
+                    or not node.reachable or now - last_date > self.__stale_time:
+                nodes_queue.put(node)
+                changed += 1
+            else:
+                self.__refresh_node(node)
+
+        self._log.debug(" [*] Incremental scan: %d changed nodes", changed)
+
+    def __refresh_node(self, node):
+        """
+        Marks the given node and the connections discovered with it as discovered in the
+        current scan.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`): The node to refresh.
+        """
+        node._scan_counter = self.__scan_counter
+
+        # Connection directions from the node are discovered when requesting it: keep those it
+        # discovered in the previous scan
+        previous = self.__scan_counter - 1 if self.__scan_counter > 0 \
+            else self.__class__.__MAX_SCAN_COUNTER
+        conns_a = self.__get_connections_for_node_a_b(node, node_a=True)
+        conns_b = self.__get_connections_for_node_a_b(node, node_a=False)
+        with self.__conn_lock:
+            for c in conns_a:
+                if c.scan_counter_a2b == previous:
+                    c.scan_counter_a2b = self.__scan_counter
+            for c in conns_b:
+                if c.scan_counter_b2a == previous:
+                    c.scan_counter_b2a = self.__scan_counter
+
+    def __set_change_listeners(self, enable):
+        """
+        Registers or unregisters the callbacks that detect network changes for an incremental
+        discovery.
+
+        Args:
+            enable (Boolean): ``True`` to register the callbacks, ``False`` to unregister them.
+        """
+        if not enable:
+            if self.__change_listener:
+                self.__change_listener.del_route_record_received_callback(
+                    self.__route_record_callback)
+                self.__change_listener.del_modem_status_received_callback(
+                    self.__modem_status_callback)
+                self.__change_listener = None
+            return
+
+        listener = self._local_xbee._packet_listener
+        if self.__incremental and listener and not self.__change_listener:
+            listener.add_route_record_received_callback(self.__route_record_callback)
+            listener.add_modem_status_received_callback(self.__modem_status_callback)
+            self.__change_listener = listener
+
+    def __route_record_callback(self, src, hops):
+        """
+        Callback to receive route record indicators. If the route of the source node changed,
+        the nodes in the previous and the new route are requested in the next incremental scan.
+
+        Args:
+            src (:class:`.RemoteXBeeDevice`): The node that sent the route record.
+            hops (List): List of intermediate hops 16-bit addresses.
+        """
+        if not src:
+            return
+
+        key = str(src.get_64bit_addr())
+        route = tuple(str(hop) for hop in hops)
+        previous = self.__route_records.get(key)
+        self.__route_records[key] = route
+        if previous is None or previous == route:
+            return
+
+        self._log.debug(" [*] Route changed for %s", src)
+        self.__dirty_nodes.add(key)
+        for x16 in set(previous) | set(route):
+            node = self.get_device_by_16(XBee16BitAddress.from_hex_string(x16))
+            if node:
+                self.__dirty_nodes.add(str(node.get_64bit_addr()))
+
+    def __modem_status_callback(self, modem_status):
+        """
+        Callback to receive modem status frames. If the local XBee joins or leaves the network,
+        all nodes are requested in the next scan.
+
+        Args:
+            modem_status (:class:`digi.xbee.models.status.ModemStatus`): The modem status.
+        """
+        if modem_status in (ModemStatus.JOINED_NETWORK, ModemStatus.DISASSOCIATED,
+                            ModemStatus.COORDINATOR_STARTED):
+            self._log.debug(" [*] Local XBee network changed (%s): full scan",
+                            modem_status.description)
+            self.__full_scan = True
+
+    def __update_scheduler(self, key, failed):
+        """
+        Updates the request scheduler state with the result of a finished request process.
+        Must be called with the scheduler lock acquired.
+
+        Args:
+            key (String): 64-bit address of the node whose request finished.
+            failed (Boolean): ``True`` if the request failed, ``False`` otherwise.
+        """
+        now = time.time()
+        start = self.__request_dates.pop(key, None)
+
+        if self.__mode == NeighborDiscoveryMode.CASCADE:
+            self.__next_request_date = now + self.__time_bw_nodes
+            return
+
+        if start is None:
+            return
+
+        # A response much slower than the previous ones may be a sign of congestion:
+        # do not increase the window with it
+        rtt = now - start
+        slow = self.__srtt is not None and rtt > 2 * self.__srtt
+        self.__srtt = rtt if self.__srtt is None else 0.875 * self.__srtt + 0.125 * rtt
+
+        if failed:
+            self.__window = max(1, self.__window // 2)
+            self.__spacing = min(self.__time_bw_nodes,
+                                 max(2 * self.__spacing, self.__class__.__MIN_SPACING))
+            self.__next_request_date = max(self.__next_request_date, now + self.__spacing)
+        elif not slow:
+            self.__window = min(self.__max_requests, self.__window + 1)
+            self.__spacing = self.__spacing / 2 \
+                if self.__spacing / 2 >= self.__class__.__MIN_SPACING else 0
+
+        self._log.debug("     Scheduler: response %f s (avg %f s), window %d, spacing %f s",
+                        rtt, self.__srtt, self.__window, self.__spacing)
 
     def _check_not_discovered_nodes(self, devices_list, nodes_queue):
         """
@@ -9224,10 +11506,31 @@ class XBeeNetwork(object):
             for c in purged:
                 self._log.debug("     o Removed connection: %s", c)
 
-        # Remove the discovery process from the active processes list
-        self.__active_processes.remove(str(requester.get_64bit_addr()))
+        failed = bool(code and code not in (NetworkDiscoveryStatus.SUCCESS, NetworkDiscoveryStatus.CANCEL)
+                      or error)
+        key = str(requester.get_64bit_addr())
 
-        if code and code not in (NetworkDiscoveryStatus.SUCCESS, NetworkDiscoveryStatus.CANCEL) or error:
+        # Remove the discovery process from the active processes list and update the scheduler
+        with self.__sched_lock:
+            self.__active_processes.remove(key)
+            if code != NetworkDiscoveryStatus.CANCEL:
+                self.__update_scheduler(key, failed)
+            else:
+                self.__request_dates.pop(key, None)
+            if not failed and code != NetworkDiscoveryStatus.CANCEL:
+                self.__last_scan_dates[key] = time.time()
+                self.__dirty_nodes.discard(key)
+                # In an incremental scan, changed nodes are requested without being discovered
+                # as neighbors of other nodes: answering is enough to be in the network
+                if self.__incremental:
+                    requester._scan_counter = self.__scan_counter
+            deferred = self.__deferred_nodes.pop(key, None)
+
+        # A successful request already got the neighbors of a node found again meanwhile
+        if deferred is not None and failed:
+            self._nodes_queue.put(deferred)
+
+        if failed:
             self._log.debug("[***** ERROR] During neighbors scan of %s", requester)
             if error:
                 self._log.debug("        %s", error)
@@ -9239,6 +11542,8 @@ class XBeeNetwork(object):
             self._log.debug("[!!!] Process finishes for %s  - Remaining: %d",
                             requester, len(self.__active_processes))
 
+        self.__wake_event.set()
+
     def _handle_special_errors(self, requester, error):
         """
         Process some special errors.
@@ -9530,8 +11835,7 @@ class XBeeNetwork(object):
         Returns:
             List: A copy of the list of :class:`.Connection` for the network.
         """
-        with self.__conn_lock:
-            return self.__connections.copy()
+        return self.__graph.get_connections()
 
     def get_node_connections(self, node):
         """
@@ -9543,13 +11847,506 @@ class XBeeNetwork(object):
         Returns:
             List: List of :class:`.Connection` with ``node`` end.
         """
-        connections = []
+        return self.__graph.get_node_connections(node)
+
+    def get_node_degree(self, node):
+        """
+        Returns the number of network connections with one of their ends ``node``.
+
+        Args:
+            node (:class:`.AbstractXBeeDevice`): The node to get its degree.
+
+        Returns:
+            Integer: The number of connections of the node.
+        """
+        return self.__graph.degree(node)
+
+    def get_shortest_path(self, node_a, node_b):
+        """
+        Returns the best known path between two nodes according to the link quality of the network
+        connections. The cost of each hop goes from 1 (best link quality) to 256 (unknown link quality),
+        see :attr:`.Connection.cost_a2b`.
+
+        Args:
+            node_a (:class:`.AbstractXBeeDevice`): The node the path starts from.
+            node_b (:class:`.AbstractXBeeDevice`): The node the path ends in.
+
+        Returns:
+            Tuple (List, Integer): The list of nodes of the path, including both ends, and its accumulated
+                cost. ``(None, None)`` if the nodes are not connected.
+
+        Raises:
+            ValueError: If ``node_a`` or ``node_b`` are ``None``.
+        """
+        if not node_a:
+            raise ValueError("Node A cannot be None")
+        if not node_b:
+            raise ValueError("Node B cannot be None")
+
+        return self.__graph.shortest_path(node_a, node_b)
+
+    def get_articulation_points(self):
+        """
+        Returns the nodes whose failure would split the network in disconnected parts, according to the
+        network connections.
+
+        Returns:
+            List: List of :class:`.AbstractXBeeDevice` that are articulation points of the network.
+        """
+        return self.__graph.articulation_points()
+
+    def save_snapshot(self, path):
+        """
+        Saves the nodes and connections of the network to the given file, so they can be
+        restored with :meth:`.XBeeNetwork.load_snapshot`, for example, after a restart.
+
+        For every node it stores its 64-bit and 16-bit addresses, node identifier, role,
+        hardware and firmware versions, reachability, scan counter and the date of its last
+        successful neighbors request. For every connection it stores its link qualities,
+        status and scan counters.
+
+        The file is replaced atomically.
+
+        Args:
+            path (String): Path of the file to write.
+
+        Raises:
+            OSError: if the file cannot be written.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.load_snapshot`
+        """
+        nodes = [self._local_xbee]
+        nodes.extend(self.__registry.get_nodes())
+        indexes = {id(node): i for i, node in enumerate(nodes)}
+        connections = [c for c in self.__graph.get_connections()
+                       if id(c.node_a) in indexes and id(c.node_b) in indexes]
+
+        data = bytearray(self.__class__.__SNAPSHOT_HEADER.pack(
+            self.__class__.__SNAPSHOT_MAGIC, self.__class__.__SNAPSHOT_VERSION,
+            self._local_xbee.get_protocol().code, self.__scan_counter, len(nodes),
+            len(connections)))
+
+        for node in nodes:
+            x64 = node.get_64bit_addr() or XBee64BitAddress.UNKNOWN_ADDRESS
+            x16 = node.get_16bit_addr() or XBee16BitAddress.UNKNOWN_ADDRESS
+            role = node.get_role() or Role.UNKNOWN
+            hw_version = node.get_hardware_version()
+            fw_version = node.get_firmware_version() or b""
+            node_id = (node.get_node_id() or "").encode("utf8")
+            parent = getattr(node, "parent", None)
+            data += self.__class__.__SNAPSHOT_NODE.pack(
+                bytes(x64.address), bytes(x16.address), role.id,
+                hw_version.code if hw_version else self.__class__.__SNAPSHOT_NO_HW,
+                1 if node.reachable else 0, node.scan_counter or 0,
+                indexes.get(id(parent), -1) if parent else -1,
+                self.__last_scan_dates.get(str(x64), 0), len(fw_version), len(node_id))
+            data += fw_version
+            data += node_id
+
+        def lq_value(link_quality):
+            if link_quality is None or link_quality.lq is None:
+                return LinkQuality.UNKNOWN_VALUE
+            return link_quality.lq
+
+        def status_id(status):
+            return status.id if status is not None else -1
+
+        for conn in connections:
+            data += self.__class__.__SNAPSHOT_CONNECTION.pack(
+                indexes[id(conn.node_a)], indexes[id(conn.node_b)],
+                lq_value(conn.lq_a2b), lq_value(conn.lq_b2a),
+                status_id(conn.status_a2b), status_id(conn.status_b2a),
+                (1 if conn.lq_a2b and conn.lq_a2b.is_rssi else 0)
+                | (2 if conn.lq_b2a and conn.lq_b2a.is_rssi else 0),
+                conn.scan_counter_a2b, conn.scan_counter_b2a)
+
+        tmp_path = "%s.tmp" % path
+        try:
+            with open(tmp_path, "wb") as snapshot:
+                snapshot.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load_snapshot(self, path):
+        """
+        Restores the nodes and connections saved with :meth:`.XBeeNetwork.save_snapshot`, so
+        the network can be used without a previous discovery.
+
+        Nodes and connections already in the network are not modified with the snapshot data.
+        Nodes are added with :attr:`.NetworkEventReason.MANUAL` as reason. The dates of the last
+        successful neighbors requests are also restored, so a later deep discovery requests
+        first the nodes not asked for longer.
+
+        Args:
+            path (String): Path of the file to read.
+
+        Returns:
+            Integer: The number of nodes added to the network.
+
+        Raises:
+            OSError: if the file cannot be read.
+            XBeeException: if the file is not a valid network snapshot, or it was saved with a
+                local XBee of a different protocol or 64-bit address.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.save_snapshot`
+        """
+        with open(path, "rb") as snapshot:
+            data = snapshot.read()
+
+        try:
+            return self.__load_snapshot_data(data)
+        except (struct.error, UnicodeDecodeError, IndexError) as exc:
+            raise XBeeException("Invalid network snapshot '%s': %s" % (path, str(exc)))
+
+    def bulk_get_parameters(self, nodes, commands, concurrency=DEFAULT_BULK_CONCURRENCY,
+                            retries=DEFAULT_BULK_RETRIES, timeout=None, progress_callback=None):
+        """
+        Reads the provided parameters from several remote nodes.
+
+        Remote AT commands to different nodes are sent without waiting for the responses of the
+        previous ones, keeping at most ``concurrency`` commands waiting for their response. The
+        commands of every node are sent one after another in the given order. Commands that time
+        out or fail to be transmitted are sent again up to ``retries`` times.
+
+        The progress callback receives the node, the command, its result (value or exception), the
+        number of finished commands and the total number of commands.
+
+        Args:
+            nodes (List): List of :class:`.RemoteXBeeDevice` to read from.
+            commands (List): List of AT commands (String) to read.
+            concurrency (Integer, optional, default=`DEFAULT_BULK_CONCURRENCY`): Maximum number of
+                commands waiting for their response.
+            retries (Integer, optional, default=`DEFAULT_BULK_RETRIES`): Number of times a command
+                is sent again after a timeout or a transmission failure.
+            timeout (Float, optional): Time in seconds to wait for every response. ``None`` to use
+                the synchronous operations timeout of the local XBee.
+            progress_callback (Function, optional): Function called when a command finishes.
+
+        Returns:
+            Dictionary: Node (:class:`.RemoteXBeeDevice`) -> dictionary with the value (Bytearray)
+                of each command, or the exception if it failed (:class:`.TimeoutException`,
+                :class:`.ATCommandException` or :class:`.OperationNotSupportedException`).
+
+        Raises:
+            ValueError: If any command is not valid, any node is not remote, ``concurrency`` is
+                lower than 1 or ``retries`` is negative.
+            InvalidOperatingModeException: If the local XBee operating mode is not API or ESCAPED
+                API. This method only checks the cached value of the operating mode.
+            XBeeException: If the local XBee communication interface is closed.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.bulk_set_parameters`
+           | :meth:`.AbstractXBeeDevice.get_parameter`
+        """
+        return self.__run_bulk_at_commands(nodes, [(command, None) for command in commands],
+                                           concurrency, retries, timeout, progress_callback)
+
+    def bulk_set_parameters(self, nodes, parameters, concurrency=DEFAULT_BULK_CONCURRENCY,
+                            retries=DEFAULT_BULK_RETRIES, timeout=None, progress_callback=None):
+        """
+        Sets the provided parameters in several remote nodes.
+
+        Commands are sent as in :meth:`.XBeeNetwork.bulk_get_parameters`. Changes are applied
+        depending on the apply changes flag of every node
+        (see :meth:`.AbstractXBeeDevice.enable_apply_changes`).
+
+        Args:
+            nodes (List): List of :class:`.RemoteXBeeDevice` to configure.
+            parameters (Dictionary or List): AT command (String) -> value (Bytearray) to set, or a
+                list of (command, value) tuples to keep their order.
+            concurrency (Integer, optional, default=`DEFAULT_BULK_CONCURRENCY`): Maximum number of
+                commands waiting for their response.
+            retries (Integer, optional, default=`DEFAULT_BULK_RETRIES`): Number of times a command
+                is sent again after a timeout or a transmission failure.
+            timeout (Float, optional): Time in seconds to wait for every response. ``None`` to use
+                the synchronous operations timeout of the local XBee.
+            progress_callback (Function, optional): Function called when a command finishes.
+
+        Returns:
+            Dictionary: Node (:class:`.RemoteXBeeDevice`) -> dictionary with ``None`` for each
+                successful command, or the exception if it failed (:class:`.TimeoutException` or
+                :class:`.ATCommandException`).
+
+        Raises:
+            ValueError: If any command or value is not valid, any node is not remote,
+                ``concurrency`` is lower than 1 or ``retries`` is negative.
+            InvalidOperatingModeException: If the local XBee operating mode is not API or ESCAPED
+                API. This method only checks the cached value of the operating mode.
+            XBeeException: If the local XBee communication interface is closed.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.bulk_get_parameters`
+           | :meth:`.AbstractXBeeDevice.set_parameter`
+        """
+        if isinstance(parameters, dict):
+            parameters = parameters.items()
+        requests = list(parameters)
+        if any(value is None for _, value in requests):
+            raise ValueError("Value of the parameter cannot be None.")
+
+        return self.__run_bulk_at_commands(nodes, requests, concurrency, retries, timeout,
+                                           progress_callback)
+
+    def __run_bulk_at_commands(self, nodes, requests, concurrency, retries, timeout, progress_callback):
+        """
+        Sends the provided AT commands to every given node keeping a bounded number of them
+        waiting for their response.
+
+        Args:
+            nodes (List): List of :class:`.RemoteXBeeDevice`.
+            requests (List): List of (command, value) tuples. Value is ``None`` to read the
+                parameter.
+            concurrency (Integer): Maximum number of commands waiting for their response.
+            retries (Integer): Number of times a command is sent again after a timeout or a
+                transmission failure.
+            timeout (Float): Time in seconds to wait for every response, ``None`` for the default.
+            progress_callback (Function): Function called when a command finishes, or ``None``.
+
+        Returns:
+            Dictionary: Node -> dictionary of command -> result.
+
+        .. seealso::
+           | :meth:`.XBeeNetwork.bulk_get_parameters`
+        """
+        for command, _ in requests:
+            if command is None or len(command) != 2:
+                raise ValueError("Parameter must contain exactly 2 characters.")
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        if retries < 0:
+            raise ValueError("Retries cannot be negative")
+
+        local = self._local_xbee
+        unique_nodes = []
+        node_keys = set()
+        for node in nodes:
+            if not node.is_remote():
+                raise ValueError("Nodes must be remote")
+            # A node without 64-bit address is only equal to itself
+            x64addr = node.get_64bit_addr()
+            key = str(x64addr) if x64addr is not None else id(node)
+            if key not in node_keys:
+                node_keys.add(key)
+                unique_nodes.append(node)
+
+        results = {node: {} for node in unique_nodes}
+        if not requests or not unique_nodes:
+            return results
+
+        if not local.is_open():
+            raise XBeeException("Local XBee device's communication interface closed.")
+        op_mode = local._get_operating_mode()
+        if op_mode not in (OperatingMode.API_MODE, OperatingMode.ESCAPED_API_MODE):
+            raise InvalidOperatingModeException(op_mode=op_mode)
+
+        if timeout is None:
+            timeout = local.get_sync_ops_timeout()
+
+        listener = local._packet_listener
+        frame_ids = local._get_frame_id_allocator()
+        total = len(unique_nodes) * len(requests)
+        finished = 0
+        # Nodes ready to send a command: [node, index of the command, attempt]
+        ready = deque([node, 0, 0] for node in unique_nodes)
+        # Response future -> (node state, request packet, expiration time)
+        in_flight = {}
+        responses = deque()
+        cond = threading.Condition()
+
+        def response_received(future):
+            with cond:
+                responses.append(future)
+                cond.notify()
+
+        try:
+            while ready or in_flight:
+                while ready and len(in_flight) < concurrency:
+                    state = ready.popleft()
+                    node = state[0]
+                    command, value = requests[state[1]]
+                    options = RemoteATCmdOptions.NONE.value
+                    if node.is_apply_changes_enabled():
+                        options |= RemoteATCmdOptions.APPLY_CHANGES.value
+                    packet = RemoteATCommandPacket(
+                        local._get_next_frame_id(), node.get_64bit_addr(),
+                        node.get_16bit_addr() or XBee16BitAddress.UNKNOWN_ADDRESS,
+                        options, command, parameter=value)
+                    future = listener.add_pending_request(packet)
+                    frame_ids.hold(packet.frame_id)
+                    in_flight[future] = (state, packet, time.monotonic() + timeout)
+                    future.add_done_callback(response_received)
+                    local._send_packet(packet)
+
+                with cond:
+                    if not responses:
+                        next_exp = min(entry[2] for entry in in_flight.values())
+                        cond.wait(max(0, next_exp - time.monotonic()))
+                    done = list(responses)
+                    responses.clear()
+
+                now = time.monotonic()
+                outcomes = [(future, in_flight.pop(future), future.result())
+                            for future in done if future in in_flight]
+                outcomes.extend((future, in_flight.pop(future), None)
+                                for future in [f for f, entry in in_flight.items() if entry[2] <= now])
+
+                for future, (state, packet, _), response in outcomes:
+                    listener.del_pending_request(packet, future)
+                    frame_ids.release(packet.frame_id, quarantine=response is None)
+                    if response is None:
+                        result = TimeoutException(message="Response not received in the configured timeout.")
+                    elif response.status != ATCommandStatus.OK:
+                        result = ATCommandException(cmd_status=response.status)
+                    elif packet.parameter is None and response.command_value is None:
+                        result = OperationNotSupportedException(
+                            message="Could not get the %s value." % packet.command)
+                    else:
+                        result = response.command_value if packet.parameter is None else None
+
+                    if ((response is None or response.status == ATCommandStatus.TX_FAILURE)
+                            and state[2] < retries):
+                        state[2] += 1
+                        ready.append(state)
+                        continue
+
+                    node = state[0]
+                    # Discard the cached values changed by the command here, the packet sender
+                    # hook might run after this method returns
+                    cache = node.get_parameter_cache()
+                    if (cache is not None and response is not None
+                            and response.status == ATCommandStatus.OK):
+                        cache._command_executed(packet.command, packet.parameter is not None)
+
+                    results[node][packet.command] = result
+                    finished += 1
+                    state[1] += 1
+                    state[2] = 0
+                    if state[1] < len(requests):
+                        ready.appendleft(state)
+                    if progress_callback:
+                        progress_callback(node, packet.command, result, finished, total)
+        finally:
+            for future, (_, packet, _) in in_flight.items():
+                listener.del_pending_request(packet, future)
+                frame_ids.release(packet.frame_id, quarantine=not future.done())
+
+        return results
+
+    def __load_snapshot_data(self, data):
+        """
+        Restores the nodes and connections from the given network snapshot data.
+
+        Args:
+            data (Bytearray or bytes): The snapshot data.
+
+        Returns:
+            Integer: The number of nodes added to the network.
+
+        Raises:
+            XBeeException: if the data is not a valid network snapshot, or it was saved with a
+                local XBee of a different protocol or 64-bit address.
+            struct.error: if the data is truncated.
+        """
+        header = self.__class__.__SNAPSHOT_HEADER
+        node_st = self.__class__.__SNAPSHOT_NODE
+        conn_st = self.__class__.__SNAPSHOT_CONNECTION
+
+        magic, version, protocol, scan_counter, n_nodes, n_conns = header.unpack_from(data, 0)
+        if magic != self.__class__.__SNAPSHOT_MAGIC \
+                or version != self.__class__.__SNAPSHOT_VERSION:
+            raise XBeeException("Not a network snapshot or unsupported version")
+        if protocol != self._local_xbee.get_protocol().code:
+            raise XBeeException("Snapshot protocol (%d) does not match local XBee protocol (%s)"
+                                % (protocol, self._local_xbee.get_protocol().description))
+        offset = header.size
+
+        nodes = []
+        parents = []
+        added = 0
+        for i in range(n_nodes):
+            x64, x16, role, hw_version, flags, node_scan, parent, last_scan, fw_len, ni_len = \
+                node_st.unpack_from(data, offset)
+            offset += node_st.size
+            fw_version = bytearray(data[offset:offset + fw_len])
+            offset += fw_len
+            node_id = bytes(data[offset:offset + ni_len]).decode("utf8")
+            offset += ni_len
+            if len(node_id.encode("utf8")) != ni_len:
+                raise struct.error("truncated node data")
+
+            x64 = XBee64BitAddress(x64)
+            if i == 0:
+                local_x64 = self._local_xbee.get_64bit_addr()
+                if XBee64BitAddress.is_known_node_addr(local_x64) \
+                        and XBee64BitAddress.is_known_node_addr(x64) and x64 != local_x64:
+                    raise XBeeException("Snapshot saved for local XBee %s, not %s"
+                                        % (x64, local_x64))
+                nodes.append(self._local_xbee)
+                continue
+
+            remote = self.__create_remote(
+                x64bit_addr=x64, x16bit_addr=XBee16BitAddress(x16), node_id=node_id or None,
+                role=Role.get(role) or Role.UNKNOWN,
+                hw_version=HardwareVersion.get(hw_version), fw_version=fw_version or None)
+            if not remote:
+                nodes.append(None)
+                continue
+
+            # Keep the nodes already in the network as they are
+            if XBee64BitAddress.is_known_node_addr(x64):
+                node = self.__registry.get(_NodeRegistry.X64, x64)
+            else:
+                node = self.get_device_by_16(remote.get_16bit_addr())
+            if node:
+                nodes.append(node)
+                continue
+
+            remote._reachable = bool(flags & 0x01)
+            remote._scan_counter = node_scan
+            if last_scan:
+                self.__last_scan_dates[str(x64)] = last_scan
+            if parent >= 0:
+                parents.append((remote, parent))
+
+            self.__registry.add(remote)
+            self._network_modified(NetworkEventType.ADD, NetworkEventReason.MANUAL, node=remote)
+            nodes.append(remote)
+            added += 1
+
+        for node, parent in parents:
+            if parent < len(nodes) and nodes[parent]:
+                node.parent = nodes[parent]
+
+        from digi.xbee.models.zdo import RouteStatus
         with self.__conn_lock:
-            for c in self.__connections:
-                if c.node_a == node or c.node_b == node:
-                    connections.append(c)
+            for _ in range(n_conns):
+                idx_a, idx_b, lq_a2b, lq_b2a, st_a2b, st_b2a, flags, scan_a2b, scan_b2a = \
+                    conn_st.unpack_from(data, offset)
+                offset += conn_st.size
+                node_a, node_b = nodes[idx_a], nodes[idx_b]
+                if not node_a or not node_b \
+                        or self.__graph.get(node_a, node_b) or self.__graph.get(node_b, node_a):
+                    continue
+
+                conn = Connection(node_a, node_b,
+                                  lq_a2b=LinkQuality(lq=lq_a2b, is_rssi=bool(flags & 0x01)),
+                                  lq_b2a=LinkQuality(lq=lq_b2a, is_rssi=bool(flags & 0x02)),
+                                  status_a2b=RouteStatus.get(st_a2b),
+                                  status_b2a=RouteStatus.get(st_b2a))
+                conn.scan_counter_a2b = scan_a2b
+                conn.scan_counter_b2a = scan_b2a
+                self.__graph.add(conn)
 
-        return connections
+        self.__scan_counter = max(self.__scan_counter, scan_counter)
+
+        return added
 
     def __get_connections_for_node_a_b(self, node, node_a=True):
         """
@@ -9563,14 +12360,7 @@ class XBeeNetwork(object):
         Returns:
             List: List of :class:`.Connection` with ``node`` as "node_a" end.
         """
-        connections = []
-        with self.__conn_lock:
-            for c in self.__connections:
-                if (node_a and c.node_a == node) \
-                        or (not node_a and c.node_b == node):
-                    connections.append(c)
-
-        return connections
+        return self.__graph.get_node_connections(node, node_a=node_a)
 
     def __get_connection(self, node_a, node_b):
         """
@@ -9592,15 +12382,7 @@ class XBeeNetwork(object):
         if not node_b:
             raise ValueError("Node B cannot be None")
 
-        c = Connection(node_a, node_b)
-
-        with self.__conn_lock:
-            if c not in self.__connections:
-                return None
-
-            index = self.__connections.index(c)
-
-            return self.__connections[index]
+        return self.__graph.get(node_a, node_b)
 
     def __append_connection(self, connection):
         """
@@ -9615,8 +12397,7 @@ class XBeeNetwork(object):
         if not connection:
             raise ValueError("Connection cannot be None")
 
-        with self.__conn_lock:
-            self.__connections.append(connection)
+        self.__graph.add(connection)
 
     def __del_connection(self, connection):
         """
@@ -9631,9 +12412,7 @@ class XBeeNetwork(object):
         if not connection:
             raise ValueError("Connection cannot be None")
 
-        with self.__conn_lock:
-            if connection in self.__connections:
-                self.__connections.remove(connection)
+        self.__graph.remove(connection)
 
     def _add_connection(self, connection):
         """
@@ -9714,7 +12493,7 @@ class XBeeNetwork(object):
             c_removed[:] = node_conn[:]
             for c in node_conn:
                 if force:
-                    self.__connections.remove(c)
+                    self.__graph.remove(c)
                 else:
                     c.lq_a2b = LinkQuality.UNKNOWN
 
@@ -9750,7 +12529,7 @@ class XBeeNetwork(object):
         """
         nodes_to_remove = []
         with self.__lock:
-            for n in self.__devices_list:
+            for n in self.__registry.get_nodes():
                 if not n.scan_counter or n.scan_counter != self.__scan_counter or not n.reachable:
                     nodes_to_remove.append(n)
 
@@ -9771,7 +12550,7 @@ class XBeeNetwork(object):
         """
         connections_to_remove = []
         with self.__conn_lock:
-            for c in self.__connections:
+            for c in self.__graph.get_connections():
                 if c.scan_counter_a2b != self.__scan_counter \
                         and c.scan_counter_b2a != self.__scan_counter:
                     c.lq_a2b = LinkQuality.UNKNOWN
@@ -9836,15 +12615,8 @@ class XBeeNetwork(object):
         if seconds <= 0:
             return NetworkDiscoveryStatus.SUCCESS
 
-        def current_ms_time():
-            return int(round(time.time() * 1000))
-
-        dead_line = current_ms_time() + seconds*1000
-        while current_ms_time() < dead_line:
-            time.sleep(0.25)
-            # Check for cancel
-            if self._stop_event.is_set():
-                return NetworkDiscoveryStatus.CANCEL
+        if self._stop_event.wait(seconds):
+            return NetworkDiscoveryStatus.CANCEL
 
         return NetworkDiscoveryStatus.SUCCESS
 
@@ -10802,7 +13574,7 @@ class LinkQuality(object):
         Returns:
              Boolean: ``True`` if this is an RSSI value, ``False`` for LQI.
         """
-        return self.__lq
+        return self.__is_rssi
 
 
 LinkQuality.UNKNOWN = LinkQuality(lq=LinkQuality.UNKNOWN_VALUE)
@@ -10815,6 +13587,8 @@ class Connection(object):
     its status.
     """
 
+    __MAX_COST = 256
+
     def __init__(self, node_a, node_b, lq_a2b=None, lq_b2a=None, status_a2b=None, status_b2a=None):
         """
         Class constructor. Instantiates a new ``Connection``.
@@ -11075,3 +13849,46 @@ class Connection(object):
                 B node.
         """
         self.__scan_counter_b2a = new_scan_counter_b2a
+
+    @property
+    def cost_a2b(self):
+        """
+        Returns the cost of going through this connection from node A to node B: the better the link quality,
+        the lower the cost. If the A -> B link quality is unknown, the B -> A one is used.
+
+        Returns:
+             Integer: The cost of the connection A -> B, from 1 to 256 (unknown link quality).
+        """
+        return Connection.__get_cost(self.__lq_a2b, self.__lq_b2a)
+
+    @property
+    def cost_b2a(self):
+        """
+        Returns the cost of going through this connection from node B to node A: the better the link quality,
+        the lower the cost. If the B -> A link quality is unknown, the A -> B one is used.
+
+        Returns:
+             Integer: The cost of the connection B -> A, from 1 to 256 (unknown link quality).
+        """
+        return Connection.__get_cost(self.__lq_b2a, self.__lq_a2b)
+
+    @staticmethod
+    def __get_cost(lq, reverse_lq):
+        """
+        Returns the cost of a link from its link quality.
+
+        Args:
+            lq (:class:`.LinkQuality`): The link quality in the direction of the link.
+            reverse_lq (:class:`.LinkQuality`): The link quality in the opposite direction.
+
+        Returns:
+             Integer: The link cost.
+        """
+        for value in (lq, reverse_lq):
+            if value is None or value.lq in (None, LinkQuality.UNKNOWN_VALUE):
+                continue
+            # RSSI values are the magnitude of the dBm value (lower is better), LQI values go from
+            # 0 to 255 (higher is better)
+            cost = value.lq if value.is_rssi else Connection.__MAX_COST - value.lq
+            return min(max(cost, 1), Connection.__MAX_COST)
+        return Connection.__MAX_COST
@@ -102,6 +102,8 @@ _DEFAULT_BLOCK_SIZE = 64
 
 _TRANSFER_TIMEOUT = 5  # Seconds.
 
+_TRANSFER_STEP_BLOCKS = 32
+
 _log = logging.getLogger(__name__)
 _printable_ascii_bytes = string.printable.encode()
 
@@ -470,6 +472,241 @@ class _FSFrameSender:
         raise FileSystemException(exc_msg_fmt % msg, fs_status=status)
 
 
+class _FSWindowSender:
+    """
+    Helper class used to send a sequence of file system frames keeping a
+    window of them waiting for their response, instead of waiting for each
+    response before sending the next frame.
+
+    Responses are handed over in the order of the commands, whatever the
+    order they arrive in. A frame whose response does not arrive in the
+    retransmission time (estimated from the response times) is sent again, so
+    only missing blocks are retransmitted. Retransmission can be disabled for
+    commands that are not idempotent, such as writes to a file opened to
+    append, which would be written twice if only their response was lost.
+    """
+
+    _MIN_RETRY_TIME = 0.5  # Seconds.
+
+    def __init__(self, xbee, window, timeout, retransmit=True):
+        """
+        Class constructor. Instantiates a new :class:`._FSWindowSender` with
+        the given parameters.
+
+        Args:
+            xbee (:class:`.AbstractXBeeDevice`): Destination XBee.
+            window (Integer): Maximum number of frames waiting for response.
+            timeout (Float): Maximum number of seconds to wait for the
+                response of each command, including retransmissions.
+            retransmit (Boolean, optional, default=`True`): `False` to send
+                each command only once.
+        """
+        self.__xbee = xbee
+        self.__window = max(1, window)
+        self.__timeout = timeout
+        self.__retransmit = retransmit
+        self.__cond = threading.Condition()
+        self.__cmd_type = None
+        self.__frame_ids = None
+        # Frame id -> index of the command, index -> frame id of its last
+        # send, and index -> (response, time).
+        self.__waiting = {}
+        self.__sent_ids = {}
+        self.__responses = {}
+        self.__rtt = None
+
+    def __str__(self):
+        return "File system window sender (dst: %s)" % self.__xbee
+
+    def _fs_frame_cb(self, xbee, frame_id, cmd, _receive_opts):
+        """
+        Callback to execute when a new file system frame is received.
+
+        Args:
+            xbee (:class:`.AbstractXBeeDevice`): The node that sent the file
+                system frame.
+            frame_id (Integer): The received frame id.
+            cmd (:class:`.FSCmd`): The file system command.
+            _receive_opts (Integer): Bitfield indicating receive options.
+        """
+        if cmd.type != self.__cmd_type or xbee != self.__xbee:
+            return
+
+        with self.__cond:
+            idx = self.__waiting.pop(frame_id, None)
+            if idx is None:
+                return
+            del self.__sent_ids[idx]
+            self.__frame_ids.release(frame_id)
+            if idx in self.__responses:
+                return
+            self.__responses[idx] = (cmd, time.monotonic())
+            self.__cond.notify()
+
+    def send(self, commands, response_cb):
+        """
+        Sends the provided file system commands and hands their responses to
+        the given callback in the order of the commands.
+
+        Args:
+            commands (List): The :class:`.FSCmd` to send, all of the same type.
+            response_cb (Function): Called with the index of the command and
+                its successful response. It returns `False` to stop sending
+                the rest of commands.
+
+        Returns:
+            Integer: Status of the first command that failed (see
+                :class:`.FSCommandStatus`), or `FSCommandStatus.SUCCESS` code
+                if all of them succeeded or the callback stopped the sending.
+
+        Raises:
+            FileSystemException: If the response of a command is not received
+                in the configured timeout.
+        """
+        if not commands:
+            return FSCommandStatus.SUCCESS.code
+
+        local_xb = self.__xbee
+        if self.__xbee.is_remote():
+            local_xb = self.__xbee.get_local_xbee_device()
+
+        self.__cmd_type = commands[0].type
+        self.__frame_ids = local_xb._get_frame_id_allocator()
+        self.__waiting.clear()
+        self.__sent_ids.clear()
+        self.__responses.clear()
+        # Index -> [first send time, last send time, number of sends].
+        sent = {}
+        next_idx = 0
+        delivered = 0
+
+        local_xb.add_fs_frame_received_callback(self._fs_frame_cb)
+        try:
+            while delivered < len(commands):
+                # Fill the window.
+                while (next_idx < len(commands)
+                       and next_idx - delivered < self.__window):
+                    now = time.monotonic()
+                    sent[next_idx] = [now, now, 1]
+                    self.__send(commands[next_idx], next_idx)
+                    next_idx += 1
+
+                # Retransmit the expired commands.
+                now = time.monotonic()
+                retry_time = self.__get_retry_time()
+                next_expiry = None
+                for idx in range(delivered, next_idx):
+                    if idx in self.__responses:
+                        continue
+                    times = sent[idx]
+                    if now - times[0] >= self.__timeout:
+                        self._throw_fs_exc(commands[idx],
+                                           "Response not received in timeout")
+                    if self.__retransmit and now - times[1] >= retry_time:
+                        _log.debug("%s: %s: Retransmitting block %d", str(self),
+                                   commands[idx].type.description, idx)
+                        times[1] = now
+                        times[2] += 1
+                        self.__send(commands[idx], idx)
+                    expiry = times[0] + self.__timeout
+                    if self.__retransmit:
+                        expiry = min(expiry, times[1] + retry_time)
+                    if next_expiry is None or expiry < next_expiry:
+                        next_expiry = expiry
+
+                with self.__cond:
+                    if delivered not in self.__responses and next_expiry:
+                        self.__cond.wait(max(0, next_expiry - time.monotonic()))
+                    ready = []
+                    while delivered + len(ready) in self.__responses:
+                        ready.append(self.__responses.pop(delivered + len(ready)))
+
+                for cmd, rec_time in ready:
+                    times = sent.pop(delivered)
+                    if times[2] == 1:
+                        self.__update_rtt(rec_time - times[0])
+                    status = cmd.status_value
+                    if status != FSCommandStatus.SUCCESS.code:
+                        fs_status = FSCommandStatus.get(status)
+                        msg = str(fs_status) if fs_status else \
+                            "Unknown file system status (0x%0.2X)" % status
+                        _log.error("%s: %s: %s", str(self),
+                                   cmd.type.description, msg)
+                        return status
+                    if response_cb(delivered, cmd) is False:
+                        return FSCommandStatus.SUCCESS.code
+                    delivered += 1
+        finally:
+            local_xb.del_fs_frame_received_callback(self._fs_frame_cb)
+            # Keep the frame ids of the unanswered frames out of use until
+            # their late responses.
+            with self.__cond:
+                for frame_id in self.__waiting:
+                    self.__frame_ids.release(frame_id, quarantine=True)
+                self.__waiting.clear()
+                self.__sent_ids.clear()
+
+        return FSCommandStatus.SUCCESS.code
+
+    def __send(self, cmd, idx):
+        """
+        Sends a new frame with the given command.
+
+        Args:
+            cmd (:class:`.FSCmd`): The command to send.
+            idx (Integer): Index of the command.
+        """
+        local_xb = self.__xbee
+        if self.__xbee.is_remote():
+            local_xb = self.__xbee.get_local_xbee_device()
+
+        frame = FileSystemManager._create_fs_frame(self.__xbee, cmd)
+        with self.__cond:
+            # The frame id of a previous send of the command may still get a
+            # late response, so it is not reused until then.
+            old_id = self.__sent_ids.pop(idx, None)
+            if old_id is not None:
+                del self.__waiting[old_id]
+                self.__frame_ids.release(old_id, quarantine=True)
+            self.__frame_ids.hold(frame.frame_id)
+            self.__waiting[frame.frame_id] = idx
+            self.__sent_ids[idx] = frame.frame_id
+        try:
+            local_xb.send_packet(frame)
+        except XBeeException as exc:
+            self._throw_fs_exc(cmd, str(exc))
+
+    def __update_rtt(self, rtt):
+        """
+        Updates the smoothed response time with a new sample.
+
+        Args:
+            rtt (Float): Time in seconds a response took.
+        """
+        if self.__rtt is None:
+            self.__rtt = rtt
+        else:
+            self.__rtt = 0.875 * self.__rtt + 0.125 * rtt
+
+    def __get_retry_time(self):
+        """
+        Returns the time to wait for a response before retransmitting.
+
+        Returns:
+            Float: Time in seconds.
+        """
+        if self.__rtt is None:
+            return max(self._MIN_RETRY_TIME, _TRANSFER_TIMEOUT)
+        return max(self._MIN_RETRY_TIME, 3 * self.__rtt)
+
+    def _throw_fs_exc(self, cmd, msg, status=None):
+        exc_msg_fmt = "%s error: %s" % (cmd.type.description, "%s")
+        log_msg_fmt = "%s: %s: %s" % (str(self), cmd.type.description, "%s")
+
+        _log.error(log_msg_fmt, msg)
+        raise FileSystemException(exc_msg_fmt % msg, fs_status=status)
+
+
 class FileProcess(metaclass=ABCMeta):
     """
     This class represents a file process.
@@ -770,35 +1007,45 @@ class _ReadFileProcess(FileProcess):
         if remain_to_read == -1:
             remain_to_read = remain_in_file
 
-        # Calculate chunk length
-        chunk_len = min(self.block_size, remain_to_read)
-        _log.debug(self._log_str("Block size: %d", chunk_len))
+        block_size = self.block_size
+        _log.debug(self._log_str("Block size: %d", block_size))
 
-        while (chunk_len and len(self.__data) < remain_to_read
-               and self.__l_off < self._fsize):
-            _log.debug(self._log_str("Reading, offset: %d, size: %d",
-                                     self.__l_off, chunk_len))
-            self._status, _fid, _offst, chunk = self._f_mng.pread_file(
-                self._fid, offset=self.__l_off, size=chunk_len,
-                timeout=self._timeout)
+        sender = _FSWindowSender(self._f_mng.xbee,
+                                 self._f_mng.transfer_window, self._timeout)
 
-            if self._status != FSCommandStatus.SUCCESS.code:
-                return True
+        def read_cb(idx, r_cmd):
+            self.__data += r_cmd.data
 
-            self.__data += chunk
-
-            _log.debug(self._log_str("Read %d (%d/%d)", len(chunk),
+            _log.debug(self._log_str("Read %d (%d/%d)", len(r_cmd.data),
                                      len(self.__data), remain_to_read))
 
             if self._cb:
-                self._cb(chunk, len(self.__data) * 100 / remain_to_read,
+                self._cb(r_cmd.data, len(self.__data) * 100 / remain_to_read,
                          self._fsize, self._status)
 
             # Recalculate offset
-            self.__l_off += len(chunk)
-
-            # Recalculate chunk length
-            chunk_len = min(chunk_len, remain_to_read - len(self.__data))
+            self.__l_off += len(r_cmd.data)
+            # A short block leaves a gap: request again from the new offset.
+            return len(r_cmd.data) == cmds_len[idx]
+
+        while len(self.__data) < remain_to_read and self.__l_off < self._fsize:
+            # Request the remaining data in blocks at consecutive offsets.
+            start = self.__l_off
+            end = start + remain_to_read - len(self.__data)
+            cmds = []
+            cmds_len = []
+            for offset in range(start, end, block_size):
+                cmds_len.append(min(block_size, end - offset))
+                cmds.append(ReadFileCmdRequest(self._fid, offset, cmds_len[-1]))
+            _log.debug(self._log_str("Reading, offset: %d, size: %d, blocks: %d",
+                                     start, end - start, len(cmds)))
+
+            self._status = sender.send(cmds, read_cb)
+            if self._status != FSCommandStatus.SUCCESS.code:
+                return True
+            if self.__l_off == start:
+                # Nothing read.
+                break
 
         return self.__l_off >= self._fsize
 
@@ -914,32 +1161,38 @@ class _WriteFileProcess(FileProcess):
         if not self.__data or self.__offset + 1 >= self._fsize:
             return True
 
-        last_offset = self.__offset
-        data_offset = 0
-
-        # Calculate chunk length
-        chunk_len = min(self.block_size, len(self.__data))
-        _log.debug(self._log_str("Block size: %d", chunk_len))
+        block_size = self.block_size
+        _log.debug(self._log_str("Block size: %d", block_size))
 
-        while chunk_len and data_offset < len(self.__data):
-            _log.debug(self._log_str("Writing, offset: %d, size: %d",
-                                     last_offset, chunk_len))
-            self._status, _fid, last_offset = self._f_mng.pwrite_file(
-                self._fid, data=self.__data[data_offset:data_offset + chunk_len],
-                offset=last_offset, timeout=self._timeout)
+        # Write the data in blocks at consecutive offsets.
+        cmds = []
+        for data_offset in range(0, len(self.__data), block_size):
+            cmds.append(WriteFileCmdRequest(
+                self._fid, self.__offset + data_offset,
+                data=bytearray(self.__data[data_offset:data_offset + block_size])))
+        _log.debug(self._log_str("Writing, offset: %d, size: %d, blocks: %d",
+                                 self.__offset, len(self.__data), len(cmds)))
 
-            if self._status != FSCommandStatus.SUCCESS.code:
-                return True
+        last_offset = self.__offset
 
-            data_offset += chunk_len
+        def write_cb(idx, r_cmd):
+            nonlocal last_offset
+            chunk_len = len(cmds[idx].data)
+            last_offset = r_cmd.actual_offset
             self.__n_bytes += chunk_len
 
             if self._cb:
                 self._cb(chunk_len, self.__n_bytes * 100 / len(self.__data),
                          self._status)
 
-            # Recalculate chunk length
-            chunk_len = min(chunk_len, len(self.__data) - data_offset)
+        # The XBee ignores the offset of the writes to a file opened to
+        # append: a block sent again would be appended twice.
+        sender = _FSWindowSender(
+            self._f_mng.xbee, self._f_mng.transfer_window, self._timeout,
+            retransmit=not self.__options & FileOpenRequestOption.APPEND)
+        self._status = sender.send(cmds, write_cb)
+        if self._status != FSCommandStatus.SUCCESS.code:
+            return True
 
         self.__offset = last_offset
         self.__n_bytes = 0
@@ -964,6 +1217,7 @@ class FileSystemManager:
 
     DEFAULT_TIMEOUT = 20
     DEFAULT_FORMAT_TIMEOUT = 30
+    DEFAULT_TRANSFER_WINDOW = 4
 
     _LOCAL_READ_CHUNK = 1024
 
@@ -988,6 +1242,7 @@ class FileSystemManager:
 
         self.__xbee = xbee
         self.__np_val = None
+        self.__window = self.DEFAULT_TRANSFER_WINDOW
         self.__root = FileSystemElement(name="/", path="/", is_dir=True,
                                         size=0, is_secure=False)
 
@@ -1014,6 +1269,34 @@ class FileSystemManager:
         """
         return self._get_np()
 
+    @property
+    def transfer_window(self):
+        """
+        Returns the maximum number of file blocks waiting for the response
+        of the XBee while reading or writing a file.
+
+        Returns:
+            Integer: The transfer window.
+        """
+        return self.__window
+
+    @transfer_window.setter
+    def transfer_window(self, window):
+        """
+        Sets the maximum number of file blocks waiting for the response of the
+        XBee while reading or writing a file. `1` waits for the response of
+        each block before sending the next one.
+
+        Args:
+            window (Integer): The transfer window.
+
+        Raises:
+            ValueError: If `window` is less than 1.
+        """
+        if not isinstance(window, int) or window < 1:
+            raise ValueError("Transfer window must be at least 1")
+        self.__window = window
+
     def get_root(self):
         """
         Returns the root directory.
@@ -1360,7 +1643,7 @@ class FileSystemManager:
 
         with open(dest, "wb+") as dst_file:
             r_proc = self.read_file(src, offset=0, progress_cb=p_cb)
-            size = r_proc.block_size
+            size = r_proc.block_size * _TRANSFER_STEP_BLOCKS
             while True:
                 try:
                     data = r_proc.next(size=size, last=False)
@@ -1431,7 +1714,7 @@ class FileSystemManager:
             w_proc = self.write_file(dest, offset=0, secure=secure,
                                      options=wr_opts, progress_cb=p_cb)
             try:
-                size = w_proc.block_size
+                size = w_proc.block_size * _TRANSFER_STEP_BLOCKS
                 data = src_file.read(size)
                 while data:
                     try:
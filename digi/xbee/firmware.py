@@ -4871,16 +4871,15 @@ class _RemoteEmberFirmwareUpdater(_RemoteFirmwareUpdater):
             List: the list of possible XBee updater devices.
         """
         xbee_network = self._local_device.get_network()
-        connections = xbee_network.get_connections()
+        # Only use connections that have remote device as 'node b'.
+        connections = [conn for conn in xbee_network.get_node_connections(self._remote_device)
+                       if conn.node_b == self._remote_device]
         if not connections:
             return None
-        # Sort the connections list by link quality from 'node a' to 'node b'.
-        connections.sort(key=lambda conn: conn.lq_a2b)
+        # Sort the connections list by link quality from 'node a' to 'node b', best first.
+        connections.sort(key=lambda conn: conn.cost_a2b)
         updater_candidates = []
         for connection in connections:
-            # Only use connections that have remote device as 'node b'.
-            if not connection.node_b == self._remote_device:
-                continue
             # Do not use connections that have 'node a' as end devices.
             if connection.node_a.get_role() == Role.END_DEVICE:
                 continue
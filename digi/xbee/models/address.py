@@ -204,10 +204,7 @@ class XBee16BitAddress:
         Returns:
             Integer: hash code value for the object.
         """
-        res = 23
-        for byte in self.__address:
-            res = 31 * (res + byte)
-        return res
+        return hash((23, bytes(self.__address)))
 
     def __eq__(self, other):
         """
@@ -427,10 +424,7 @@ class XBee64BitAddress:
         Returns:
             Integer: hash code value for the object.
         """
-        res = 23
-        for byte in self.__address:
-            res = 31 * (res + byte)
-        return res
+        return hash((23, bytes(self.__address)))
 
     def __eq__(self, other):
         """
@@ -585,10 +579,7 @@ class XBeeIMEIAddress:
         Returns:
             Integer: hash code value for the object.
         """
-        res = 23
-        for byte in self.__address:
-            res = 31 * (res + byte)
-        return res
+        return hash((23, bytes(self.__address)))
 
     def __eq__(self, other):
         """
@@ -247,6 +247,49 @@ class SpecialByte(Enum):
 SpecialByte.__doc__ += utils.doc_enum(SpecialByte)
 
 
+@unique
+class ATParameterClass(Enum):
+    """
+    Enumerates the classes of AT parameters depending on how often their
+    value changes. It determines how long a parameter value is cached.
+
+    | Inherited properties:
+    |     **name** (String): name (ID) of this ATParameterClass.
+    |     **value** (String): value of this ATParameterClass.
+    """
+
+    IMMUTABLE = (0x00, "Never changes (hardware, firmware, serial number)")
+    CONFIG = (0x01, "Changes only when configured")
+    VOLATILE = (0x02, "Changes at any time (status, signal strength)")
+
+    def __init__(self, code, description):
+        self.__code = code
+        self.__description = description
+
+    @property
+    def code(self):
+        """
+        Returns the code of the ATParameterClass element.
+
+        Returns:
+            Integer: the code of the ATParameterClass element.
+        """
+        return self.__code
+
+    @property
+    def description(self):
+        """
+        Returns the description of the ATParameterClass element.
+
+        Returns:
+            String: the description of the ATParameterClass element.
+        """
+        return self.__description
+
+
+ATParameterClass.__doc__ += utils.doc_enum(ATParameterClass)
+
+
 class ATCommand:
     """
     This class represents an AT command used to read or set different
@@ -129,17 +129,24 @@ class XBeePacket:
     performed here.
     """
 
-    __HASH_SEED = 23
-
     __metaclass__ = ABCMeta
     __ESCAPE_BYTES = [i.value for i in SpecialByte]
     __ESCAPE_FACTOR = 0x20
+    # Escape sequence of every special byte. The escape byte itself must be
+    # replaced first so the escape bytes that are inserted are not escaped.
+    __ESCAPE_SEQUENCES = tuple(
+        (bytes([i]), bytes([SpecialByte.ESCAPE_BYTE.code, i ^ 0x20]))
+        for i in sorted(__ESCAPE_BYTES,
+                        key=lambda i: i != SpecialByte.ESCAPE_BYTE.code))
     ESCAPE_BYTE = SpecialByte.ESCAPE_BYTE.code
 
     def __init__(self):
         """
         Class constructor. Instantiates a new :class:`.XBeePacket` object.
         """
+        # Serialized frame and the field values it was generated from. The
+        # list is updated in place, so it is part of the snapshot as itself.
+        self.__frame = [None, None]
 
     def __len__(self):
         """
@@ -152,7 +159,7 @@ class XBeePacket:
         .. seealso::
            | :mod:`.factory`
         """
-        return len(self.get_frame_spec_data())
+        return len(self._get_frame()) - 4
 
     def __str__(self):
         """
@@ -175,7 +182,7 @@ class XBeePacket:
         """
         if not isinstance(other, XBeePacket):
             return False
-        return other.output() == self.output()
+        return other._get_frame() == self._get_frame()
 
     def __hash__(self):
         """
@@ -184,10 +191,7 @@ class XBeePacket:
         Returns:
             Integer: hash code value for the object.
         """
-        res = self.__HASH_SEED
-        for byte in self.output():
-            res = 31 * (res + byte)
-        return res
+        return hash(self._get_frame())
 
     def get_checksum(self):
         """
@@ -201,7 +205,7 @@ class XBeePacket:
         .. seealso::
            | :mod:`.factory`
         """
-        return 0xFF - (sum(self.get_frame_spec_data()) & 0xFF)
+        return self._get_frame()[-1]
 
     def output(self, escaped=False):
         """
@@ -214,11 +218,12 @@ class XBeePacket:
         Returns:
             Bytearray: raw bytearray of the XBeePacket.
         """
-        frame = self.__build_complete_frame_without_header(self.get_frame_spec_data())
-        if escaped:
-            frame = self._escape_data(frame)
-        frame.insert(0, SpecialByte.HEADER_BYTE.code)
-        return frame
+        frame = self._get_frame()
+        if not escaped:
+            return bytearray(frame)
+        esc_frame = self._escape_data(frame[1:])
+        esc_frame.insert(0, SpecialByte.HEADER_BYTE.code)
+        return esc_frame
 
     def to_dict(self):
         """
@@ -294,14 +299,11 @@ class XBeePacket:
         Returns:
             Bytearray: 'data' escaped.
         """
-        esc_data = bytearray()
-        for i in data:
-            if i in XBeePacket.__ESCAPE_BYTES:
-                esc_data.append(SpecialByte.ESCAPE_BYTE.code)
-                esc_data.append(i ^ XBeePacket.__ESCAPE_FACTOR)
-            else:
-                esc_data.append(i)
-        return esc_data
+        esc_data = bytes(data)
+        for byte, sequence in XBeePacket.__ESCAPE_SEQUENCES:
+            if byte in esc_data:
+                esc_data = esc_data.replace(byte, sequence)
+        return bytearray(esc_data)
 
     @staticmethod
     def unescape_data(data):
@@ -314,31 +316,48 @@ class XBeePacket:
         Returns:
             Bytearray: `data` unescaped.
         """
-        new_data = bytearray(0)
-        des_escape = False
-        for byte in data:
-            if byte == XBeePacket.ESCAPE_BYTE:
-                des_escape = True
-            else:
-                new_data.append(byte ^ 0x20 if des_escape else byte)
-                des_escape = False
+        if XBeePacket.ESCAPE_BYTE not in data:
+            return bytearray(data)
+        chunks = bytes(data).split(bytes([XBeePacket.ESCAPE_BYTE]))
+        new_data = bytearray(chunks[0])
+        for chunk in chunks[1:]:
+            # An empty chunk comes from consecutive escape bytes: the next
+            # byte is still the escaped one.
+            if chunk:
+                new_data.append(chunk[0] ^ XBeePacket.__ESCAPE_FACTOR)
+                new_data += chunk[1:]
         return new_data
 
-    def __build_complete_frame_without_header(self, frame_spec_data):
+    def _get_frame(self):
         """
-        Builds a complete non-escaped frame from the given frame specific data.
-        Complete frame is:
+        Returns the complete non-escaped frame of this packet:
             Start delimiter + length + frame specific data + checksum.
 
-        Args:
-            frame_spec_data (Bytearray): the frame specific data.
+        The frame is cached and only generated again if the value of any
+        attribute of the packet changes. Bytearray and list attributes are
+        compared by content, so data modified in place (for example, the
+        buffer given as `rf_data` or a list of hops) is also detected. Their
+        values are only copied when the frame is generated.
 
         Returns:
-            Bytearray: the complete frame as bytearray.
-        """
-        frame = utils.int_to_length(len(frame_spec_data)) + frame_spec_data
-        frame.append(self.get_checksum())
-        return frame
+            Bytes: the complete non-escaped frame.
+        """
+        cache = self.__frame
+        # References only: bytearrays and lists are compared with the
+        # copies of the snapshot by content.
+        fields = list(self.__dict__.values())
+        if cache[0] != fields:
+            frame_spec_data = self.get_frame_spec_data()
+            frame = bytearray((SpecialByte.HEADER_BYTE.code,))
+            frame += utils.int_to_length(len(frame_spec_data))
+            frame += frame_spec_data
+            frame.append(0xFF - (sum(frame_spec_data) & 0xFF))
+            cache[0] = [value if value is cache
+                        else bytes(value) if isinstance(value, bytearray)
+                        else list(value) if isinstance(value, list)
+                        else value for value in fields]
+            cache[1] = bytes(frame)
+        return cache[1]
 
 
 class XBeeAPIPacket(XBeePacket):
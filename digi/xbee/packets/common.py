@@ -619,14 +619,20 @@ class ReceivePacket(XBeeAPIPacket):
         self.__x16bit_addr = x16bit_addr
         self.__receive_options = receive_options
         self.__rf_data = rf_data
+        # Received frame the packet was created from, while not modified.
+        # Fields are decoded from it on first access.
+        self.__raw = None
 
     @staticmethod
     def create_packet(raw, operating_mode):
         """
         Override method.
 
+        The packet keeps a copy of `raw` and decodes the source addresses and
+        the RF data from it on first access.
+
         Returns:
-            :class:`.ATCommResponsePacket`
+            :class:`.ReceivePacket`
 
         Raises:
             InvalidPacketException: if the bytearray length is less than 16.
@@ -654,10 +660,9 @@ class ReceivePacket(XBeeAPIPacket):
 
         if raw[3] != ApiFrameType.RECEIVE_PACKET.code:
             raise InvalidPacketException(message="This packet is not a receive packet.")
-        return ReceivePacket(XBee64BitAddress(raw[4:12]),
-                             XBee16BitAddress(raw[12:14]),
-                             raw[14],
-                             rf_data=raw[15:-1] if len(raw) > ReceivePacket.__MIN_PACKET_LENGTH else None)
+        packet = ReceivePacket(None, None, raw[14])
+        packet.__raw = bytes(raw)
+        return packet
 
     def needs_id(self):
         """
@@ -684,6 +689,8 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
+        if self.__raw is not None:
+            return bytearray(self.__raw[4:-1])
         ret = self.__x64bit_addr.address
         ret += self.__x16bit_addr.address
         ret.append(self.__receive_options)
@@ -698,10 +705,11 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
         """
-        return {DictKeys.X64BIT_ADDR:     self.__x64bit_addr.address,
-                DictKeys.X16BIT_ADDR:     self.__x16bit_addr.address,
+        rf_data = self.rf_data
+        return {DictKeys.X64BIT_ADDR:     self.x64bit_source_addr.address,
+                DictKeys.X16BIT_ADDR:     self.x16bit_source_addr.address,
                 DictKeys.RECEIVE_OPTIONS: self.__receive_options,
-                DictKeys.RF_DATA:         list(self.__rf_data) if self.__rf_data is not None else None}
+                DictKeys.RF_DATA:         list(rf_data) if rf_data is not None else None}
 
     @property
     def x64bit_source_addr(self):
@@ -714,6 +722,8 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        if self.__x64bit_addr is None and self.__raw is not None:
+            self.__x64bit_addr = XBee64BitAddress(self.__raw[4:12])
         return self.__x64bit_addr
 
     @x64bit_source_addr.setter
@@ -727,6 +737,7 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        self.__decode()
         self.__x64bit_addr = x64bit_addr
 
     @property
@@ -740,6 +751,8 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        if self.__x16bit_addr is None and self.__raw is not None:
+            self.__x16bit_addr = XBee16BitAddress(bytearray(self.__raw[12:14]))
         return self.__x16bit_addr
 
     @x16bit_source_addr.setter
@@ -753,6 +766,7 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        self.__decode()
         self.__x16bit_addr = x16bit_addr
 
     @property
@@ -779,6 +793,7 @@ class ReceivePacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.ReceiveOptions`
         """
+        self.__decode()
         self.__receive_options = receive_options
 
     @property
@@ -789,6 +804,10 @@ class ReceivePacket(XBeeAPIPacket):
         Returns:
             Bytearray: the received RF data.
         """
+        if self.__raw is not None:
+            if len(self.__raw) > ReceivePacket.__MIN_PACKET_LENGTH:
+                return bytearray(self.__raw[15:-1])
+            return None
         if self.__rf_data is None:
             return None
         return self.__rf_data.copy()
@@ -801,11 +820,24 @@ class ReceivePacket(XBeeAPIPacket):
         Args:
             rf_data (Bytearray): the new received RF data.
         """
+        self.__decode()
         if rf_data is None:
             self.__rf_data = None
         else:
             self.__rf_data = rf_data.copy()
 
+    def __decode(self):
+        """
+        Decodes all the fields still in the received frame, so they can be
+        modified, and releases the frame.
+        """
+        if self.__raw is None:
+            return
+        self.__x64bit_addr = self.x64bit_source_addr
+        self.__x16bit_addr = self.x16bit_source_addr
+        self.__rf_data = self.rf_data
+        self.__raw = None
+
 
 class RemoteATCommandPacket(XBeeAPIPacket):
     """
@@ -2018,12 +2050,18 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         self.__receive_options = receive_options
         self.__rf_data = rf_data
         self.__io_sample = IOSample(rf_data) if rf_data is not None and len(rf_data) >= 5 else None
+        # Received frame the packet was created from, while not modified.
+        # Fields are decoded from it on first access.
+        self.__raw = None
 
     @staticmethod
     def create_packet(raw, operating_mode):
         """
         Override method.
 
+        The packet keeps a copy of `raw` and decodes the source addresses, the
+        RF data and the IO sample from it on first access.
+
         Returns:
             :class:`.IODataSampleRxIndicatorPacket`.
 
@@ -2054,9 +2092,9 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR.code:
             raise InvalidPacketException(message="This packet is not an IO data sample RX indicator packet.")
 
-        return IODataSampleRxIndicatorPacket(
-            XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]),
-            raw[14], rf_data=raw[15:-1])
+        packet = IODataSampleRxIndicatorPacket(None, None, raw[14])
+        packet.__raw = bytes(raw)
+        return packet
 
     def needs_id(self):
         """
@@ -2074,6 +2112,8 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
+        if self.__raw is not None:
+            return bytearray(self.__raw[4:-1])
         ret = self.__x64bit_addr.address
         ret += self.__x16bit_addr.address
         ret.append(self.__receive_options)
@@ -2088,6 +2128,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
         """
+        self.__decode()
         base = {DictKeys.X64BIT_ADDR: self.__x64bit_addr.address,
                 DictKeys.X16BIT_ADDR: self.__x16bit_addr.address,
                 DictKeys.RECEIVE_OPTIONS: self.__receive_options}
@@ -2138,6 +2179,8 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        if self.__x64bit_addr is None and self.__raw is not None:
+            self.__x64bit_addr = XBee64BitAddress(self.__raw[4:12])
         return self.__x64bit_addr
 
     @x64bit_source_addr.setter
@@ -2151,6 +2194,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        self.__decode()
         self.__x64bit_addr = x64bit_addr
 
     @property
@@ -2164,6 +2208,8 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        if self.__x16bit_addr is None and self.__raw is not None:
+            self.__x16bit_addr = XBee16BitAddress(bytearray(self.__raw[12:14]))
         return self.__x16bit_addr
 
     @x16bit_source_addr.setter
@@ -2177,6 +2223,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        self.__decode()
         self.__x16bit_addr = x16bit_addr
 
     @property
@@ -2203,6 +2250,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.ReceiveOptions`
         """
+        self.__decode()
         self.__receive_options = receive_options
 
     @property
@@ -2213,6 +2261,8 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         Returns:
             Bytearray: the received RF data.
         """
+        if self.__raw is not None:
+            return bytearray(self.__raw[15:-1])
         if self.__rf_data is None:
             return None
         return self.__rf_data.copy()
@@ -2225,6 +2275,7 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         Args:
             rf_data (Bytearray): the new received RF data.
         """
+        self.__decode()
         if rf_data is None:
             self.__rf_data = None
         else:
@@ -2249,6 +2300,10 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.IOSample`
         """
+        if self.__io_sample is None and self.__raw is not None:
+            rf_data = self.rf_data
+            if len(rf_data) >= 5:
+                self.__io_sample = IOSample(rf_data)
         return self.__io_sample
 
     @io_sample.setter
@@ -2262,8 +2317,22 @@ class IODataSampleRxIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.IOSample`
         """
+        self.__decode()
         self.__io_sample = io_sample
 
+    def __decode(self):
+        """
+        Decodes all the fields still in the received frame, so they can be
+        modified, and releases the frame.
+        """
+        if self.__raw is None:
+            return
+        self.__x64bit_addr = self.x64bit_source_addr
+        self.__x16bit_addr = self.x16bit_source_addr
+        self.__io_sample = self.io_sample
+        self.__rf_data = self.rf_data
+        self.__raw = None
+
 
 class ExplicitAddressingPacket(XBeeAPIPacket):
     """
@@ -2729,12 +2798,18 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         self.__profile_id = profile_id
         self.__receive_options = receive_options
         self.__rf_data = rf_data
+        # Received frame the packet was created from, while not modified.
+        # Fields are decoded from it on first access.
+        self.__raw = None
 
     @staticmethod
     def create_packet(raw, operating_mode):
         """
         Override method.
 
+        The packet keeps a copy of `raw` and decodes the source addresses and
+        the RF data from it on first access.
+
         Returns:
             :class:`.ExplicitRXIndicatorPacket`.
 
@@ -2767,10 +2842,11 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         if raw[3] != ApiFrameType.EXPLICIT_RX_INDICATOR.code:
             raise InvalidPacketException(message="This packet is not an explicit RX indicator packet.")
 
-        return ExplicitRXIndicatorPacket(
-            XBee64BitAddress(raw[4:12]), XBee16BitAddress(raw[12:14]), raw[14], raw[15],
-            utils.bytes_to_int(raw[16:18]), utils.bytes_to_int(raw[18:20]), raw[20],
-            rf_data=raw[21:-1] if len(raw) > ExplicitRXIndicatorPacket.__MIN_PACKET_LENGTH else None)
+        packet = ExplicitRXIndicatorPacket(
+            None, None, raw[14], raw[15], (raw[16] << 8) | raw[17],
+            (raw[18] << 8) | raw[19], raw[20])
+        packet.__raw = bytes(raw)
+        return packet
 
     def needs_id(self):
         """
@@ -2797,6 +2873,8 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data`
         """
+        if self.__raw is not None:
+            return bytearray(self.__raw[4:-1])
         raw = self.__x64bit_addr.address
         raw += self.__x16bit_addr.address
         raw.append(self.__source_endpoint)
@@ -2815,6 +2893,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :meth:`.XBeeAPIPacket._get_api_packet_spec_data_dict`
         """
+        self.__decode()
         return {DictKeys.X64BIT_ADDR:     self.__x64bit_addr.address,
                 DictKeys.X16BIT_ADDR:     self.__x16bit_addr.address,
                 DictKeys.SOURCE_ENDPOINT: self.__source_endpoint,
@@ -2835,6 +2914,8 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        if self.__x64bit_addr is None and self.__raw is not None:
+            self.__x64bit_addr = XBee64BitAddress(self.__raw[4:12])
         return self.__x64bit_addr
 
     @x64bit_source_addr.setter
@@ -2848,6 +2929,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee64BitAddress`
         """
+        self.__decode()
         self.__x64bit_addr = x64bit_addr
 
     @property
@@ -2861,6 +2943,8 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        if self.__x16bit_addr is None and self.__raw is not None:
+            self.__x16bit_addr = XBee16BitAddress(bytearray(self.__raw[12:14]))
         return self.__x16bit_addr
 
     @x16bit_source_addr.setter
@@ -2874,6 +2958,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.XBee16BitAddress`
         """
+        self.__decode()
         self.__x16bit_addr = x16bit_addr
 
     @property
@@ -2894,6 +2979,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Args:
             source_endpoint (Integer): the new source endpoint of the transmission.
         """
+        self.__decode()
         self.__source_endpoint = source_endpoint
 
     @property
@@ -2914,6 +3000,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Args:
             dest_endpoint (Integer): the new destination endpoint of the transmission.
         """
+        self.__decode()
         self.__dest_endpoint = dest_endpoint
 
     @property
@@ -2934,6 +3021,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Args:
             cluster_id (Integer): the new cluster ID of the transmission.
         """
+        self.__decode()
         self.__cluster_id = cluster_id
 
     @property
@@ -2954,6 +3042,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Args
             profile_id (Integer): the new profile ID of the transmission.
         """
+        self.__decode()
         self.__profile_id = profile_id
 
     @property
@@ -2980,6 +3069,7 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         .. seealso::
            | :class:`.ReceiveOptions`
         """
+        self.__decode()
         self.__receive_options = receive_options
 
     @property
@@ -2990,6 +3080,10 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Returns:
             Bytearray: the received RF data.
         """
+        if self.__raw is not None:
+            if len(self.__raw) > ExplicitRXIndicatorPacket.__MIN_PACKET_LENGTH:
+                return bytearray(self.__raw[21:-1])
+            return None
         if self.__rf_data is None:
             return None
         return self.__rf_data.copy()
@@ -3002,7 +3096,20 @@ class ExplicitRXIndicatorPacket(XBeeAPIPacket):
         Args:
             rf_data (Bytearray): the new received RF data.
         """
+        self.__decode()
         if rf_data is None:
             self.__rf_data = None
         else:
             self.__rf_data = rf_data.copy()
+
+    def __decode(self):
+        """
+        Decodes all the fields still in the received frame, so they can be
+        modified, and releases the frame.
+        """
+        if self.__raw is None:
+            return
+        self.__x64bit_addr = self.x64bit_source_addr
+        self.__x16bit_addr = self.x16bit_source_addr
+        self.__rf_data = self.rf_data
+        self.__raw = None
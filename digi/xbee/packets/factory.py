@@ -120,199 +120,169 @@ from digi.xbee.packets.zigbee import RegisterJoiningDevicePacket,\
     RegisterDeviceStatusPacket, RouteRecordIndicatorPacket, OTAFirmwareUpdateStatusPacket
 
 
-def build_frame(packet_bytearray, operating_mode=OperatingMode.API_MODE):
-    """
-    Creates a packet from raw data.
-
-    Args:
-        packet_bytearray (Bytearray): the raw data of the packet to build.
-        operating_mode (:class:`.OperatingMode`): the operating mode in which
-            the raw data has been captured.
-
-    .. seealso::
-       | :class:`.OperatingMode`
-    """
-    if len(packet_bytearray) < 5:
-        raise InvalidPacketException(
-            message="Bytearray must have, at least, 5 bytes (header, length, "
-                    "frameType, checksum)")
-
-    frame_type = ApiFrameType.get(packet_bytearray[3])
-
-    if frame_type == ApiFrameType.GENERIC:
-        return GenericXBeePacket.create_packet(packet_bytearray,
-                                               operating_mode=operating_mode)
-
-    if frame_type == ApiFrameType.AT_COMMAND:
-        return ATCommPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.AT_COMMAND_QUEUE:
-        return ATCommQueuePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.AT_COMMAND_RESPONSE:
-        return ATCommResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RECEIVE_PACKET:
-        return ReceivePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_64:
-        return RX64Packet.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_16:
-        return RX16Packet.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
-        return RemoteATCommandPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REMOTE_AT_COMMAND_RESPONSE:
-        return RemoteATCommandResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.TRANSMIT_REQUEST:
-        return TransmitPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.TRANSMIT_STATUS:
-        return TransmitStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.MODEM_STATUS:
-        return ModemStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.TX_STATUS:
-        return TXStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_IO_16:
-        return RX16IOPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_IO_64:
-        return RX64IOPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR:
-        return IODataSampleRxIndicatorPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.EXPLICIT_ADDRESSING:
-        return ExplicitAddressingPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.EXPLICIT_RX_INDICATOR:
-        return ExplicitRXIndicatorPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.TX_SMS:
-        return TXSMSPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.TX_IPV4:
-        return TXIPv4Packet.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_SMS:
-        return RXSMSPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.USER_DATA_RELAY_OUTPUT:
-        return UserDataRelayOutputPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.RX_IPV4:
-        return RXIPv4Packet.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST_WIFI:
-        return RemoteATCommandWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.SEND_DATA_REQUEST:
-        return SendDataRequestPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.DEVICE_RESPONSE:
-        return DeviceResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.USER_DATA_RELAY_REQUEST:
-        return UserDataRelayPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REMOTE_AT_COMMAND_RESPONSE_WIFI:
-        return RemoteATCommandResponseWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI:
-        return IODataSampleRxIndicatorWifiPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.SEND_DATA_RESPONSE:
-        return SendDataResponsePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.DEVICE_REQUEST:
-        return DeviceRequestPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.DEVICE_RESPONSE_STATUS:
-        return DeviceResponseStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.FRAME_ERROR:
-        return FrameErrorPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REGISTER_JOINING_DEVICE:
-        return RegisterJoiningDevicePacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.REGISTER_JOINING_DEVICE_STATUS:
-        return RegisterDeviceStatusPacket.create_packet(packet_bytearray, operating_mode)
-
-    if frame_type == ApiFrameType.ROUTE_RECORD_INDICATOR:
-        return RouteRecordIndicatorPacket.create_packet(packet_bytearray, operating_mode)
+_PACKET_CLASSES = {
+    frame_type.code: packet_class for frame_type, packet_class in (
+        (ApiFrameType.GENERIC, GenericXBeePacket),
+        (ApiFrameType.AT_COMMAND, ATCommPacket),
+        (ApiFrameType.AT_COMMAND_QUEUE, ATCommQueuePacket),
+        (ApiFrameType.AT_COMMAND_RESPONSE, ATCommResponsePacket),
+        (ApiFrameType.RECEIVE_PACKET, ReceivePacket),
+        (ApiFrameType.RX_64, RX64Packet),
+        (ApiFrameType.RX_16, RX16Packet),
+        (ApiFrameType.REMOTE_AT_COMMAND_REQUEST, RemoteATCommandPacket),
+        (ApiFrameType.REMOTE_AT_COMMAND_RESPONSE, RemoteATCommandResponsePacket),
+        (ApiFrameType.TRANSMIT_REQUEST, TransmitPacket),
+        (ApiFrameType.TRANSMIT_STATUS, TransmitStatusPacket),
+        (ApiFrameType.MODEM_STATUS, ModemStatusPacket),
+        (ApiFrameType.TX_STATUS, TXStatusPacket),
+        (ApiFrameType.RX_IO_16, RX16IOPacket),
+        (ApiFrameType.RX_IO_64, RX64IOPacket),
+        (ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR, IODataSampleRxIndicatorPacket),
+        (ApiFrameType.EXPLICIT_ADDRESSING, ExplicitAddressingPacket),
+        (ApiFrameType.EXPLICIT_RX_INDICATOR, ExplicitRXIndicatorPacket),
+        (ApiFrameType.TX_SMS, TXSMSPacket),
+        (ApiFrameType.TX_IPV4, TXIPv4Packet),
+        (ApiFrameType.RX_SMS, RXSMSPacket),
+        (ApiFrameType.USER_DATA_RELAY_OUTPUT, UserDataRelayOutputPacket),
+        (ApiFrameType.RX_IPV4, RXIPv4Packet),
+        (ApiFrameType.REMOTE_AT_COMMAND_REQUEST_WIFI, RemoteATCommandWifiPacket),
+        (ApiFrameType.SEND_DATA_REQUEST, SendDataRequestPacket),
+        (ApiFrameType.DEVICE_RESPONSE, DeviceResponsePacket),
+        (ApiFrameType.USER_DATA_RELAY_REQUEST, UserDataRelayPacket),
+        (ApiFrameType.REMOTE_AT_COMMAND_RESPONSE_WIFI, RemoteATCommandResponseWifiPacket),
+        (ApiFrameType.IO_DATA_SAMPLE_RX_INDICATOR_WIFI, IODataSampleRxIndicatorWifiPacket),
+        (ApiFrameType.SEND_DATA_RESPONSE, SendDataResponsePacket),
+        (ApiFrameType.DEVICE_REQUEST, DeviceRequestPacket),
+        (ApiFrameType.DEVICE_RESPONSE_STATUS, DeviceResponseStatusPacket),
+        (ApiFrameType.FRAME_ERROR, FrameErrorPacket),
+        (ApiFrameType.REGISTER_JOINING_DEVICE, RegisterJoiningDevicePacket),
+        (ApiFrameType.REGISTER_JOINING_DEVICE_STATUS, RegisterDeviceStatusPacket),
+        (ApiFrameType.ROUTE_RECORD_INDICATOR, RouteRecordIndicatorPacket),
+        (ApiFrameType.SOCKET_CREATE, SocketCreatePacket),
+        (ApiFrameType.SOCKET_CREATE_RESPONSE, SocketCreateResponsePacket),
+        (ApiFrameType.SOCKET_OPTION_REQUEST, SocketOptionRequestPacket),
+        (ApiFrameType.SOCKET_OPTION_RESPONSE, SocketOptionResponsePacket),
+        (ApiFrameType.SOCKET_CONNECT, SocketConnectPacket),
+        (ApiFrameType.SOCKET_CONNECT_RESPONSE, SocketConnectResponsePacket),
+        (ApiFrameType.SOCKET_CLOSE, SocketClosePacket),
+        (ApiFrameType.SOCKET_CLOSE_RESPONSE, SocketCloseResponsePacket),
+        (ApiFrameType.SOCKET_SEND, SocketSendPacket),
+        (ApiFrameType.SOCKET_SENDTO, SocketSendToPacket),
+        (ApiFrameType.SOCKET_BIND, SocketBindListenPacket),
+        (ApiFrameType.SOCKET_LISTEN_RESPONSE, SocketListenResponsePacket),
+        (ApiFrameType.SOCKET_NEW_IPV4_CLIENT, SocketNewIPv4ClientPacket),
+        (ApiFrameType.SOCKET_RECEIVE, SocketReceivePacket),
+        (ApiFrameType.SOCKET_RECEIVE_FROM, SocketReceiveFromPacket),
+        (ApiFrameType.SOCKET_STATE, SocketStatePacket),
+        (ApiFrameType.DIGIMESH_ROUTE_INFORMATION, RouteInformationPacket),
+        (ApiFrameType.FILE_SYSTEM_REQUEST, FSRequestPacket),
+        (ApiFrameType.FILE_SYSTEM_RESPONSE, FSResponsePacket),
+        (ApiFrameType.REMOTE_FILE_SYSTEM_REQUEST, RemoteFSRequestPacket),
+        (ApiFrameType.REMOTE_FILE_SYSTEM_RESPONSE, RemoteFSResponsePacket),
+        (ApiFrameType.OTA_FIRMWARE_UPDATE_STATUS, OTAFirmwareUpdateStatusPacket),
+    )
+}
+"""
+Built-in packet classes indexed by the code of their frame type.
+"""
 
-    if frame_type == ApiFrameType.SOCKET_CREATE:
-        return SocketCreatePacket.create_packet(packet_bytearray, operating_mode)
+_BUILDERS = [UnknownXBeePacket.create_packet] * 256
+"""
+Function that creates the packet of each frame type code (the byte after the
+length). Frame types without a packet class create an
+:class:`.UnknownXBeePacket`.
+"""
 
-    if frame_type == ApiFrameType.SOCKET_CREATE_RESPONSE:
-        return SocketCreateResponsePacket.create_packet(packet_bytearray, operating_mode)
+for _code, _packet_class in _PACKET_CLASSES.items():
+    _BUILDERS[_code] = _packet_class.create_packet
 
-    if frame_type == ApiFrameType.SOCKET_OPTION_REQUEST:
-        return SocketOptionRequestPacket.create_packet(packet_bytearray, operating_mode)
 
-    if frame_type == ApiFrameType.SOCKET_OPTION_RESPONSE:
-        return SocketOptionResponsePacket.create_packet(packet_bytearray, operating_mode)
+def register_packet_class(frame_type, packet_class):
+    """
+    Registers the class used to build the packets of the provided frame type.
+    It allows to parse new or custom frame types, or to replace the built-in
+    class of a frame type.
 
-    if frame_type == ApiFrameType.SOCKET_CONNECT:
-        return SocketConnectPacket.create_packet(packet_bytearray, operating_mode)
+    The class must provide a `create_packet(raw, operating_mode)` class
+    method, like any :class:`.XBeeAPIPacket`.
 
-    if frame_type == ApiFrameType.SOCKET_CONNECT_RESPONSE:
-        return SocketConnectResponsePacket.create_packet(packet_bytearray, operating_mode)
+    Args:
+        frame_type (:class:`.ApiFrameType` or Integer): The frame type or its
+            code (0 to 255).
+        packet_class (Class): The class to build the packets with.
 
-    if frame_type == ApiFrameType.SOCKET_CLOSE:
-        return SocketClosePacket.create_packet(packet_bytearray, operating_mode)
+    Raises:
+        ValueError: If the frame type code is not between 0 and 255 or the
+            class does not provide a `create_packet` method.
 
-    if frame_type == ApiFrameType.SOCKET_CLOSE_RESPONSE:
-        return SocketCloseResponsePacket.create_packet(packet_bytearray, operating_mode)
+    .. seealso::
+       | :meth:`.unregister_packet_class`
+    """
+    code = _get_frame_type_code(frame_type)
+    if not callable(getattr(packet_class, "create_packet", None)):
+        raise ValueError("Packet class must provide a 'create_packet' method")
+    _BUILDERS[code] = packet_class.create_packet
 
-    if frame_type == ApiFrameType.SOCKET_SEND:
-        return SocketSendPacket.create_packet(packet_bytearray, operating_mode)
 
-    if frame_type == ApiFrameType.SOCKET_SENDTO:
-        return SocketSendToPacket.create_packet(packet_bytearray, operating_mode)
+def unregister_packet_class(frame_type):
+    """
+    Removes the class registered for the provided frame type, restoring the
+    built-in one (or :class:`.UnknownXBeePacket` if there is not).
 
-    if frame_type == ApiFrameType.SOCKET_BIND:
-        return SocketBindListenPacket.create_packet(packet_bytearray, operating_mode)
+    Args:
+        frame_type (:class:`.ApiFrameType` or Integer): The frame type or its
+            code (0 to 255).
 
-    if frame_type == ApiFrameType.SOCKET_LISTEN_RESPONSE:
-        return SocketListenResponsePacket.create_packet(packet_bytearray, operating_mode)
+    Raises:
+        ValueError: If the frame type code is not between 0 and 255.
 
-    if frame_type == ApiFrameType.SOCKET_NEW_IPV4_CLIENT:
-        return SocketNewIPv4ClientPacket.create_packet(packet_bytearray, operating_mode)
+    .. seealso::
+       | :meth:`.register_packet_class`
+    """
+    code = _get_frame_type_code(frame_type)
+    packet_class = _PACKET_CLASSES.get(code, UnknownXBeePacket)
+    _BUILDERS[code] = packet_class.create_packet
 
-    if frame_type == ApiFrameType.SOCKET_RECEIVE:
-        return SocketReceivePacket.create_packet(packet_bytearray, operating_mode)
 
-    if frame_type == ApiFrameType.SOCKET_RECEIVE_FROM:
-        return SocketReceiveFromPacket.create_packet(packet_bytearray, operating_mode)
+def _get_frame_type_code(frame_type):
+    """
+    Returns the code of the provided frame type.
 
-    if frame_type == ApiFrameType.SOCKET_STATE:
-        return SocketStatePacket.create_packet(packet_bytearray, operating_mode)
+    Args:
+        frame_type (:class:`.ApiFrameType` or Integer): The frame type or its
+            code.
 
-    if frame_type == ApiFrameType.DIGIMESH_ROUTE_INFORMATION:
-        return RouteInformationPacket.create_packet(packet_bytearray, operating_mode)
+    Returns:
+        Integer: The frame type code.
 
-    if frame_type == ApiFrameType.FILE_SYSTEM_REQUEST:
-        return FSRequestPacket.create_packet(packet_bytearray, operating_mode)
+    Raises:
+        ValueError: If the code is not between 0 and 255.
+    """
+    code = frame_type.code if isinstance(frame_type, ApiFrameType) \
+        else frame_type
+    if not isinstance(code, int) or not 0 <= code <= 0xFF:
+        raise ValueError("Frame type code must be between 0 and 255")
+    return code
 
-    if frame_type == ApiFrameType.FILE_SYSTEM_RESPONSE:
-        return FSResponsePacket.create_packet(packet_bytearray, operating_mode)
 
-    if frame_type == ApiFrameType.REMOTE_FILE_SYSTEM_REQUEST:
-        return RemoteFSRequestPacket.create_packet(packet_bytearray, operating_mode)
+def build_frame(packet_bytearray, operating_mode=OperatingMode.API_MODE):
+    """
+    Creates a packet from raw data.
 
-    if frame_type == ApiFrameType.REMOTE_FILE_SYSTEM_RESPONSE:
-        return RemoteFSResponsePacket.create_packet(packet_bytearray, operating_mode)
+    The packet class is selected with the frame type byte from a precomputed
+    table, see :meth:`.register_packet_class`.
 
-    if frame_type == ApiFrameType.OTA_FIRMWARE_UPDATE_STATUS:
-        return OTAFirmwareUpdateStatusPacket.create_packet(packet_bytearray, operating_mode)
+    Args:
+        packet_bytearray (Bytearray): the raw data of the packet to build.
+        operating_mode (:class:`.OperatingMode`): the operating mode in which
+            the raw data has been captured.
 
-    return UnknownXBeePacket.create_packet(packet_bytearray, operating_mode=operating_mode)
+    .. seealso::
+       | :class:`.OperatingMode`
+    """
+    if len(packet_bytearray) < 5:
+        raise InvalidPacketException(
+            message="Bytearray must have, at least, 5 bytes (header, length, "
+                    "frameType, checksum)")
 
+    return _BUILDERS[packet_bytearray[3]](packet_bytearray, operating_mode)
@@ -1464,6 +1464,40 @@ class _ProfileUpdater:
 
         raise XBeeException("Error setting parameter '%s': %s" % (parameter, msg))
 
+    def _set_parameters_with_retries(self, parameters, retries,
+                                     progress_callback=None):
+        """
+        Sets the given parameters in the XBee, without applying them, sending
+        all the AT commands back-to-back. If any of them fails, all of them
+        are set again one by one within the given number of retries.
+
+        Args:
+            parameters (List): List of (parameter, value) tuples to set.
+            retries (Integer): Number of retries to set every parameter.
+            progress_callback (Function, optional): Function called every time
+                a parameter is set, receiving the number of parameters set so
+                far and the total number of them.
+
+        Raises:
+            XBeeException: If there is any error setting the parameters.
+        """
+        if not parameters:
+            return
+
+        _log.debug("Setting %d parameters", len(parameters))
+        try:
+            self._xbee_device.set_parameters(
+                parameters, apply=False, progress_callback=progress_callback)
+            return
+        except (TimeoutException, ATCommandException) as exc:
+            _log.debug("Error setting parameters, setting them one by one: %s",
+                       str(exc))
+
+        for index, (parameter, value) in enumerate(parameters):
+            self._set_parameter_with_retries(parameter, value, retries)
+            if progress_callback is not None:
+                progress_callback(index + 1, len(parameters))
+
     def _update_firmware(self):
         """
         Updates the XBee device firmware.
@@ -1644,24 +1678,33 @@ class _ProfileUpdater:
                         bytearray([self._xbee_device.operating_mode.code]),
                         _PARAMETER_WRITE_RETRIES)
             # Set settings.
+            settings = []
             for setting in self._xbee_profile.profile_settings.values():
-                percent = setting_index * 100 // num_settings
-                if self._progress_callback is not None and percent != previous_percent:
-                    self._progress_callback(_TASK_UPDATE_SETTINGS, percent)
-                    previous_percent = percent
                 name = setting.name.upper()
                 # Do not apply operating mode until the end of the process
                 if self._is_local and name == ATStringCommand.AP.command:
                     self._xpro_ap = setting.bytearray_value
                 else:
-                    self._set_parameter_with_retries(
-                        name, setting.bytearray_value, _PARAMETER_WRITE_RETRIES)
-                setting_index += 1
+                    settings.append((name, setting.bytearray_value))
                 # Check if the setting was sensitive for network or cache information
                 if name in _PARAMETERS_NETWORK:
                     network_settings_changed = True
                 if name in _PARAMETERS_CACHE:
                     cache_settings_changed = True
+            first_index = setting_index
+
+            def settings_progress(num_set, _total):
+                nonlocal previous_percent
+                percent = (first_index + num_set) * 100 // num_settings
+                # Setting them one by one after an error starts again
+                if self._progress_callback is not None and percent > previous_percent:
+                    self._progress_callback(_TASK_UPDATE_SETTINGS, percent)
+                    previous_percent = percent
+
+            settings_progress(0, len(settings))
+            self._set_parameters_with_retries(settings, _PARAMETER_WRITE_RETRIES,
+                                              progress_callback=settings_progress)
+            setting_index += len(self._xbee_profile.profile_settings)
 
             # Write settings.
             percent = setting_index * 100 // num_settings
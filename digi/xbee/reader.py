@@ -12,9 +12,13 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum, unique
 from queue import Queue, Empty
 from threading import Event
+import heapq
+import itertools
 import logging
 import threading
 import time
@@ -42,6 +46,328 @@ from digi.xbee.io import IOSample
 MAX_PARALLEL_CALLBACKS = 50
 
 EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PARALLEL_CALLBACKS)
+"""
+Executor that runs the callbacks of the default dispatcher when the library
+is loaded.
+
+Deprecated: kept for compatibility only. To run callbacks with a different
+executor, set a :class:`.CallbackDispatcher` with it as the default one (see
+:func:`.set_default_dispatcher`) or as the dispatcher of an XBee.
+"""
+
+
+@unique
+class DispatchPolicy(Enum):
+    """
+    Enumerates what a :class:`.CallbackDispatcher` does when an event is fired
+    and the queue of one of its callbacks is full.
+
+    | Inherited properties:
+    |     **name** (String): The name of this DispatchPolicy.
+    |     **value** (String): The value of this DispatchPolicy.
+    """
+
+    BLOCK = "block"
+    """
+    The thread firing the event waits until there is room in the queue.
+    """
+
+    DROP_NEWEST = "drop_newest"
+    """
+    The new execution is discarded.
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    """
+    The oldest pending execution is discarded to make room for the new one.
+    """
+
+
+class _CallbackLane:
+    """
+    Pending executions of a callback of an event, run one after another.
+    """
+
+    def __init__(self, key, priority):
+        self.key = key
+        self.priority = priority
+        self.pending = deque()
+        self.scheduled = False
+
+
+class CallbackDispatcher:
+    """
+    This class runs the callbacks of the :class:`.XBeeEvent` objects.
+
+    Each callback of each event has its own queue, so executions of the same
+    callback never overlap and run in the order the event was fired, while a
+    slow callback does not delay the others. Queues may be bounded, see
+    :class:`.DispatchPolicy`. When several queues are waiting for a worker,
+    the one with the highest priority (lowest value) of its event runs first.
+
+    There is no ordering between different queues: the callbacks of an event
+    may run before the callbacks of an event fired earlier, even for the same
+    received frame. A callback that must see several kinds of frames in
+    reception order should handle them all from a single event, such as
+    :class:`.PacketReceived`.
+
+    Callbacks are run by an executor, either provided or a thread pool owned
+    by the dispatcher. Events marked as inline run their callbacks in the
+    thread that fires them instead, which suits cheap callbacks.
+
+    .. seealso::
+       | :class:`.XBeeEvent`
+       | :class:`.DispatchPolicy`
+    """
+
+    PRIORITY_HIGH = 0
+    """
+    Priority of API internal callbacks.
+    """
+
+    PRIORITY_NORMAL = 10
+    """
+    Default priority of events.
+    """
+
+    PRIORITY_LOW = 20
+    """
+    Priority for events that may be delayed, such as IO samples.
+    """
+
+    _log = logging.getLogger(__name__)
+    """
+    Logger.
+    """
+
+    def __init__(self, executor=None, max_workers=MAX_PARALLEL_CALLBACKS,
+                 queue_size=0, policy=DispatchPolicy.BLOCK):
+        """
+        Class constructor. Instantiates a new :class:`.CallbackDispatcher`
+        object with the provided parameters.
+
+        Args:
+            executor (:class:`concurrent.futures.Executor`, optional): Executor
+                to run callbacks. If not provided, the dispatcher creates a
+                thread pool when it is first needed.
+            max_workers (Integer, optional): Number of threads of the pool
+                created when no `executor` is provided.
+            queue_size (Integer, optional): Maximum number of pending
+                executions of each callback. 0 means unbounded.
+            policy (:class:`.DispatchPolicy`, optional): What to do when a
+                queue is full.
+
+        Raises:
+            ValueError: If `max_workers` is less than 1 or `queue_size` is
+                negative.
+        """
+        if max_workers < 1:
+            raise ValueError("Number of workers must be greater than 0")
+        if queue_size < 0:
+            raise ValueError("Queue size cannot be negative")
+
+        self.__executor = executor
+        self.__own_executor = executor is None
+        self.__max_workers = max_workers
+        self.__queue_size = queue_size
+        self.__policy = policy
+        self.__lanes = {}
+        self.__ready = []
+        self.__seq = itertools.count()
+        self.__dropped = 0
+        self.__closed = False
+        self.__cond = threading.Condition()
+
+    @property
+    def queue_size(self):
+        """
+        Returns the maximum number of pending executions of each callback.
+
+        Returns:
+            Integer: The queue size, 0 if unbounded.
+        """
+        return self.__queue_size
+
+    @property
+    def policy(self):
+        """
+        Returns what the dispatcher does when a queue is full.
+
+        Returns:
+            :class:`.DispatchPolicy`: The dispatch policy.
+        """
+        return self.__policy
+
+    @property
+    def pending(self):
+        """
+        Returns the number of executions waiting to run.
+
+        Returns:
+            Integer: The number of pending executions.
+        """
+        with self.__cond:
+            return sum(len(lane.pending) for lane in self.__lanes.values())
+
+    @property
+    def dropped(self):
+        """
+        Returns the number of executions discarded because of full queues.
+
+        Returns:
+            Integer: The number of discarded executions.
+        """
+        return self.__dropped
+
+    def dispatch(self, event, *args, **kwargs):
+        """
+        Runs all callbacks of the given event with the provided arguments.
+
+        Args:
+            event (:class:`.XBeeEvent`): The fired event.
+            *args: Positional arguments for the callbacks.
+            **kwargs: Keyword arguments for the callbacks.
+        """
+        if event.inline:
+            for func in tuple(event):
+                self.__run(func, args, kwargs)
+            return
+
+        for func in tuple(event):
+            self.__enqueue((id(event), id(func)), event.priority,
+                           (func, args, kwargs))
+
+    def shutdown(self, wait=True):
+        """
+        Discards pending executions and stops accepting new ones. The executor
+        is also shut down if it was created by the dispatcher.
+
+        Args:
+            wait (Boolean, optional): `True` to wait for running callbacks to
+                finish, `False` otherwise.
+        """
+        with self.__cond:
+            self.__closed = True
+            self.__lanes.clear()
+            self.__ready.clear()
+            self.__cond.notify_all()
+            executor = self.__executor if self.__own_executor else None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def __enqueue(self, key, priority, execution):
+        """
+        Adds an execution to the queue of its callback and schedules the queue
+        if it was idle.
+
+        Args:
+            key (Tuple): Identifier of the queue.
+            priority (Integer): Priority of the queue.
+            execution (Tuple): Callback and its arguments.
+        """
+        with self.__cond:
+            while True:
+                if self.__closed:
+                    return
+                lane = self.__lanes.get(key)
+                if lane is None:
+                    lane = _CallbackLane(key, priority)
+                    self.__lanes[key] = lane
+                if (not self.__queue_size
+                        or len(lane.pending) < self.__queue_size):
+                    break
+                if self.__policy == DispatchPolicy.DROP_NEWEST:
+                    self.__dropped += 1
+                    return
+                if self.__policy == DispatchPolicy.DROP_OLDEST:
+                    lane.pending.popleft()
+                    self.__dropped += 1
+                    break
+                self.__cond.wait()
+
+            lane.pending.append(execution)
+            if lane.scheduled:
+                return
+            lane.scheduled = True
+            heapq.heappush(self.__ready,
+                           (lane.priority, next(self.__seq), lane))
+        self.__submit()
+
+    def __submit(self):
+        """
+        Asks the executor to run the next ready queue.
+        """
+        with self.__cond:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__max_workers)
+            executor = self.__executor
+        try:
+            executor.submit(self.__run_next)
+        except RuntimeError as exc:
+            self._log.error("Cannot run callbacks: %s", str(exc))
+
+    def __run_next(self):
+        """
+        Runs the next execution of the highest priority ready queue.
+        """
+        with self.__cond:
+            if not self.__ready:
+                return
+            lane = heapq.heappop(self.__ready)[2]
+            func, args, kwargs = lane.pending.popleft()
+            self.__cond.notify_all()
+
+        self.__run(func, args, kwargs)
+
+        with self.__cond:
+            if self.__closed:
+                return
+            if not lane.pending:
+                lane.scheduled = False
+                del self.__lanes[lane.key]
+                return
+            heapq.heappush(self.__ready,
+                           (lane.priority, next(self.__seq), lane))
+        self.__submit()
+
+    def __run(self, func, args, kwargs):
+        """
+        Runs a callback, logging any exception it raises.
+
+        Args:
+            func (Function): The callback.
+            args (Tuple): Positional arguments.
+            kwargs (Dictionary): Keyword arguments.
+        """
+        try:
+            func(*args, **kwargs)
+        except Exception as exc:
+            self._log.exception(exc)
+
+
+_DEFAULT_DISPATCHER = CallbackDispatcher(executor=EXECUTOR)
+
+
+def get_default_dispatcher():
+    """
+    Returns the dispatcher used by events that do not have their own.
+
+    Returns:
+        :class:`.CallbackDispatcher`: The default callback dispatcher.
+    """
+    return _DEFAULT_DISPATCHER
+
+
+def set_default_dispatcher(dispatcher):
+    """
+    Sets the dispatcher used by events that do not have their own.
+
+    Args:
+        dispatcher (:class:`.CallbackDispatcher`): The new default dispatcher.
+    """
+    global _DEFAULT_DISPATCHER
+    _DEFAULT_DISPATCHER = dispatcher
 
 
 class XBeeEvent(list):
@@ -55,15 +381,22 @@ class XBeeEvent(list):
         def callback_prototype(*args, **kwargs):
             #do something...
 
-    All of them will be executed when the event is fired.
+    All of them will be executed when the event is fired, by the event
+    dispatcher (see :class:`.CallbackDispatcher`).
 
     .. seealso::
        | list (Python standard class)
     """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.__dispatcher = None
+        self.__priority = CallbackDispatcher.PRIORITY_NORMAL
+        self.__inline = False
+
     def __call__(self, *args, **kwargs):
-        for func in self:
-            future = EXECUTOR.submit(func, *args, **kwargs)
-            future.add_done_callback(self.__execution_finished)
+        if self:
+            self.dispatcher.dispatch(self, *args, **kwargs)
 
     def __repr__(self):
         return "Event(%s)" % list.__repr__(self)
@@ -76,19 +409,68 @@ class XBeeEvent(list):
         self.remove(other)
         return self
 
-    def __execution_finished(self, future):
+    @property
+    def dispatcher(self):
+        """
+        Returns the dispatcher that runs the callbacks of this event.
+
+        Returns:
+            :class:`.CallbackDispatcher`: The event dispatcher.
+        """
+        return self.__dispatcher or get_default_dispatcher()
+
+    @dispatcher.setter
+    def dispatcher(self, dispatcher):
         """
-        Called when the execution of the callable has finished.
+        Sets the dispatcher that runs the callbacks of this event.
 
         Args:
-            future (:class:`.Future`): Future associated to the execution of
-                the callable.
+            dispatcher (:class:`.CallbackDispatcher`): The new dispatcher,
+                `None` to use the default one.
+        """
+        self.__dispatcher = dispatcher
 
-        Raises:
-            Exception: If the execution of the callable raised any exception.
+    @property
+    def priority(self):
+        """
+        Returns the priority of the callbacks of this event. The lower the
+        value, the sooner they run.
+
+        Returns:
+            Integer: The event priority.
         """
-        if future.exception():
-            raise future.exception()
+        return self.__priority
+
+    @priority.setter
+    def priority(self, priority):
+        """
+        Sets the priority of the callbacks of this event.
+
+        Args:
+            priority (Integer): The new priority.
+        """
+        self.__priority = priority
+
+    @property
+    def inline(self):
+        """
+        Returns whether the callbacks run in the thread that fires the event.
+
+        Returns:
+            Boolean: `True` if callbacks run inline, `False` otherwise.
+        """
+        return self.__inline
+
+    @inline.setter
+    def inline(self, inline):
+        """
+        Sets whether the callbacks run in the thread that fires the event.
+        Only use it for callbacks that return quickly and never block.
+
+        Args:
+            inline (Boolean): `True` to run callbacks inline.
+        """
+        self.__inline = inline
 
 
 class PacketReceived(XBeeEvent):
@@ -533,6 +915,9 @@ class PacketListener(threading.Thread):
 
         # API internal callbacks:
         self.__packet_received_api = xbee_device.get_xbee_device_callbacks()
+        self.__packet_received_api.priority = CallbackDispatcher.PRIORITY_HIGH
+
+        self.set_callback_dispatcher(xbee_device.get_callback_dispatcher())
 
         self.__xbee = xbee_device
         self.__comm_iface = comm_iface
@@ -541,6 +926,7 @@ class PacketListener(threading.Thread):
 
         self.__queue_max_size = (queue_max_size if queue_max_size is not None
                                  else self.__DEFAULT_QUEUE_MAX_SIZE)
+        self.__pending_requests = PendingRequests()
         self.__xbee_queue = XBeeQueue(self.__queue_max_size)
         self.__data_xbee_queue = XBeeQueue(self.__queue_max_size)
         self.__explicit_xbee_queue = XBeeQueue(self.__queue_max_size)
@@ -593,6 +979,14 @@ class PacketListener(threading.Thread):
                         event="RECEIVED", opmode=self.__xbee.operating_mode,
                         content=utils.hex_to_string(raw_packet)))
 
+                    # Resolve the synchronous request waiting for it, if any.
+                    self.__pending_requests.resolve(read_packet)
+                    # Its frame ID is no longer in flight, unless a request
+                    # holds it (that request releases it).
+                    if read_packet.needs_id() and read_packet.frame_id:
+                        self.__xbee._get_frame_id_allocator().response_received(
+                            read_packet.frame_id)
+
                     # Add the packet to the queue.
                     self.__add_packet_queue(read_packet)
 
@@ -633,6 +1027,38 @@ class PacketListener(threading.Thread):
         """
         return not self.__stop
 
+    def add_pending_request(self, packet):
+        """
+        Registers the provided packet as a request waiting for its response.
+
+        The returned future is resolved with the response packet as soon as
+        it is received.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The request packet.
+
+        Returns:
+            :class:`concurrent.futures.Future`: Future of the response packet.
+
+        .. seealso::
+           | :meth:`.PacketListener.del_pending_request`
+        """
+        return self.__pending_requests.add(packet)
+
+    def del_pending_request(self, packet, future):
+        """
+        Removes the provided request from the pending requests.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The request packet.
+            future (:class:`concurrent.futures.Future`): Future returned when
+                the request was registered.
+
+        .. seealso::
+           | :meth:`.PacketListener.add_pending_request`
+        """
+        self.__pending_requests.remove(packet, future)
+
     def get_queue(self):
         """
         Returns the packets queue.
@@ -669,10 +1095,39 @@ class PacketListener(threading.Thread):
         """
         return self.__ip_xbee_queue
 
+    def set_callback_dispatcher(self, dispatcher):
+        """
+        Sets the dispatcher that runs the callbacks of all events of this
+        listener.
+
+        Args:
+            dispatcher (:class:`.CallbackDispatcher`): The dispatcher, `None`
+                to use the default one.
+        """
+        for event in (self.__packet_received, self.__packet_received_from,
+                      self.__data_received, self.__modem_status_received,
+                      self.__io_sample_received,
+                      self.__explicit_packet_received,
+                      self.__ip_data_received, self.__sms_received,
+                      self.__relay_data_received,
+                      self.__bluetooth_data_received,
+                      self.__micropython_data_received,
+                      self.__socket_state_received,
+                      self.__socket_data_received,
+                      self.__socket_data_received_from,
+                      self.__route_record_indicator_received_from,
+                      self.__dm_route_information_received_from,
+                      self.__fs_frame_received, self.__packet_received_api):
+            event.dispatcher = dispatcher
+
     def add_packet_received_callback(self, callback):
         """
         Adds a callback for the event :class:`.PacketReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback.
                 Receives one argument.
@@ -688,6 +1143,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.PacketReceivedFrom`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives
                 two arguments.
@@ -705,6 +1164,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.DataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -720,6 +1183,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.ModemStatusReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -735,6 +1202,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.IOSampleReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives three
                 arguments.
@@ -753,6 +1224,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.ExplicitDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -768,6 +1243,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.IPDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -783,6 +1262,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.SMSReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -798,6 +1281,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.RelayDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -813,6 +1300,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.BluetoothDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -828,6 +1319,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.MicroPythonDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives one
                 argument.
@@ -843,6 +1338,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.SocketStateReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives two
                 arguments.
@@ -859,6 +1358,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.SocketDataReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives two
                 arguments.
@@ -875,6 +1378,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.SocketDataReceivedFrom`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives three
                 arguments.
@@ -894,6 +1401,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.RouteRecordIndicatorReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives two
                 arguments.
@@ -913,6 +1424,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.RouteInformationReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives eight
                 arguments.
@@ -945,6 +1460,10 @@ class PacketListener(threading.Thread):
         """
         Adds a callback for the event :class:`.FileSystemFrameReceived`.
 
+        Calls to the callback never overlap and run in the order of the
+        events, but they are not ordered with respect to other callbacks,
+        even of events received earlier. See :class:`.CallbackDispatcher`.
+
         Args:
             callback (Function or List of functions): Callback. Receives four
                 arguments.
@@ -1784,9 +2303,187 @@ class PacketListener(threading.Thread):
                                    broadcast=broadcast)
 
 
+class PendingRequests:
+    """
+    This class represents the table of requests waiting for a response.
+
+    Requests are indexed by their frame ID and the frame type of the expected
+    response, so each received packet is matched against the requests that
+    may be answered by it only.
+    """
+
+    _RESPONSE_TYPES = {
+        ApiFrameType.AT_COMMAND: ApiFrameType.AT_COMMAND_RESPONSE,
+        ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
+            ApiFrameType.REMOTE_AT_COMMAND_RESPONSE,
+        ApiFrameType.SOCKET_CREATE: ApiFrameType.SOCKET_CREATE_RESPONSE,
+        ApiFrameType.SOCKET_OPTION_REQUEST:
+            ApiFrameType.SOCKET_OPTION_RESPONSE,
+        ApiFrameType.SOCKET_CONNECT: ApiFrameType.SOCKET_CONNECT_RESPONSE,
+        ApiFrameType.SOCKET_CLOSE: ApiFrameType.SOCKET_CLOSE_RESPONSE,
+        ApiFrameType.SOCKET_BIND: ApiFrameType.SOCKET_LISTEN_RESPONSE,
+        ApiFrameType.TRANSMIT_REQUEST: ApiFrameType.TRANSMIT_STATUS,
+        ApiFrameType.EXPLICIT_ADDRESSING: ApiFrameType.TRANSMIT_STATUS,
+        ApiFrameType.TX_64: ApiFrameType.TX_STATUS,
+        ApiFrameType.TX_16: ApiFrameType.TX_STATUS,
+    }
+    """
+    Expected response frame type for each request frame type. Requests whose
+    type is not here are answered by any packet with the same frame ID.
+    """
+
+    _SOCKET_REQUESTS = (ApiFrameType.SOCKET_OPTION_REQUEST,
+                        ApiFrameType.SOCKET_CONNECT, ApiFrameType.SOCKET_CLOSE,
+                        ApiFrameType.SOCKET_BIND)
+    """
+    Requests whose response must also match the socket ID.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new :class:`.PendingRequests`
+        object.
+        """
+        self.__requests = {}
+        self.__lock = threading.Lock()
+
+    def add(self, packet):
+        """
+        Adds a request to the table.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The request packet.
+
+        Returns:
+            :class:`concurrent.futures.Future`: Future resolved with the
+                response packet.
+        """
+        future = Future()
+        key = self.__get_key(packet)
+        with self.__lock:
+            self.__requests.setdefault(key, []).append((packet, future))
+        return future
+
+    def remove(self, packet, future):
+        """
+        Removes a request from the table, if it is still there.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The request packet.
+            future (:class:`concurrent.futures.Future`): Future of the request.
+        """
+        key = self.__get_key(packet)
+        with self.__lock:
+            requests = self.__requests.get(key)
+            if not requests:
+                return
+            requests[:] = [req for req in requests if req[1] is not future]
+            if not requests:
+                del self.__requests[key]
+
+    def resolve(self, packet):
+        """
+        Resolves the first pending request answered by the provided packet.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The received packet.
+
+        Returns:
+            Boolean: `True` if a request was resolved, `False` otherwise.
+        """
+        if not self.__requests or not packet.needs_id():
+            return False
+
+        future = None
+        with self.__lock:
+            for key in ((packet.frame_id, packet.get_frame_type()),
+                        (packet.frame_id, None)):
+                requests = self.__requests.get(key)
+                if not requests:
+                    continue
+                for idx, (request, req_future) in enumerate(requests):
+                    if not self.__is_response(request, packet):
+                        continue
+                    del requests[idx]
+                    if not requests:
+                        del self.__requests[key]
+                    future = req_future
+                    break
+                if future is not None:
+                    break
+
+        if future is None:
+            return False
+
+        # Resolve out of the lock: done callbacks may use the table.
+        if not future.done():
+            future.set_result(packet)
+        return True
+
+    @classmethod
+    def __get_key(cls, packet):
+        """
+        Returns the table key of the provided request.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The request packet.
+
+        Returns:
+            Tuple: Frame ID and expected response frame type (or `None`).
+        """
+        return (packet.frame_id,
+                cls._RESPONSE_TYPES.get(packet.get_frame_type()))
+
+    @classmethod
+    def __is_response(cls, request, response):
+        """
+        Returns whether the received packet is the response of the request.
+        The frame ID and response frame type are already verified.
+
+        Args:
+            request (:class:`.XBeeAPIPacket`): The request packet.
+            response (:class:`.XBeeAPIPacket`): The received packet.
+
+        Returns:
+            Boolean: `True` if `response` answers `request`, `False` otherwise.
+        """
+        f_type = request.get_frame_type()
+        if f_type == ApiFrameType.AT_COMMAND:
+            return request.command.upper() == response.command.upper()
+
+        if f_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
+            return (request.command.upper() == response.command.upper()
+                    and (not XBee64BitAddress.is_known_node_addr(request.x64bit_dest_addr)
+                         or request.x64bit_dest_addr == response.x64bit_source_addr)
+                    and (not XBee16BitAddress.is_known_node_addr(request.x16bit_dest_addr)
+                         or request.x16bit_dest_addr == response.x16bit_source_addr))
+
+        if f_type in cls._SOCKET_REQUESTS:
+            return request.socket_id == response.socket_id
+
+        if f_type in cls._RESPONSE_TYPES:
+            return True
+
+        # Verify that the sent packet is not the received one! This can
+        # happen when the echo mode is enabled in the serial port.
+        return request != response
+
+
 class XBeeQueue(Queue):
     """
     This class represents an XBee queue.
+
+    Packets are indexed by frame ID, source address and source IP address, so
+    they can be retrieved without scanning the queue. Threads waiting for a
+    specific packet are woken up as soon as a matching packet is added.
+    """
+
+    __KEY_ID = 0
+    __KEY_64 = 1
+    __KEY_16 = 2
+    __KEY_IP = 3
+    """
+    Types of index keys.
     """
 
     def __init__(self, maxsize=10):
@@ -1799,6 +2496,47 @@ class XBeeQueue(Queue):
         """
         Queue.__init__(self, maxsize)
 
+    def _init(self, maxsize):
+        """
+        Override method.
+
+        Packets are stored by an increasing sequence number to remove any of
+        them in constant time while keeping the insertion order.
+        """
+        self.queue = OrderedDict()
+        self.__seq = 0
+        # Index key -> deque of sequence numbers (oldest first).
+        self.__index = {}
+        # Index key -> deque of conditions of threads waiting for that key.
+        self.__waiters = {}
+
+    def _qsize(self):
+        """
+        Override method.
+        """
+        return len(self.queue)
+
+    def _put(self, item):
+        """
+        Override method.
+        """
+        self.__seq += 1
+        self.queue[self.__seq] = item
+        for key in self.__get_keys(item):
+            self.__index.setdefault(key, deque()).append(self.__seq)
+            waiters = self.__waiters.get(key)
+            # Wake up only one waiter: the packet can only be consumed once.
+            if waiters:
+                waiters.popleft().notify()
+
+    def _get(self):
+        """
+        Override method.
+        """
+        seq, item = self.queue.popitem(last=False)
+        self.__unindex(seq, item)
+        return item
+
     def get(self, block=True, timeout=None):
         """
         Returns the first element of the queue if there is some element ready
@@ -1857,23 +2595,15 @@ class XBeeQueue(Queue):
                 packet available that was sent by `remote` before the timeout
                 expires.
         """
-        if timeout is None:
-            with self.mutex:
-                for packet in self.queue:
-                    if self.__remote_device_match(packet, remote):
-                        self.queue.remove(packet)
-                        return packet
-            return None
+        keys = []
+        if remote.get_64bit_addr() is not None:
+            keys.append((self.__KEY_64, remote.get_64bit_addr()))
+        x16bit_addr = remote.get_16bit_addr()
+        if (x16bit_addr is not None
+                and x16bit_addr != XBee16BitAddress.UNKNOWN_ADDRESS):
+            keys.append((self.__KEY_16, x16bit_addr))
 
-        packet = self.get_by_remote(remote)
-        dead_line = time.time() + timeout
-        while packet is None and dead_line > time.time():
-            time.sleep(0.1)
-            packet = self.get_by_remote(remote)
-        if packet is None:
-            raise TimeoutException()
-
-        return packet
+        return self.__get_by_keys(keys, timeout)
 
     def get_by_ip(self, ip_addr, timeout=None):
         """
@@ -1899,23 +2629,7 @@ class XBeeQueue(Queue):
                 packet available that was sent by `ip_addr` before the timeout
                 expires.
         """
-        if timeout is None:
-            with self.mutex:
-                for packet in self.queue:
-                    if self.__ip_addr_match(packet, ip_addr):
-                        self.queue.remove(packet)
-                        return packet
-            return None
-
-        packet = self.get_by_ip(ip_addr)
-        dead_line = time.time() + timeout
-        while packet is None and dead_line > time.time():
-            time.sleep(0.1)
-            packet = self.get_by_ip(ip_addr)
-        if packet is None:
-            raise TimeoutException()
-
-        return packet
+        return self.__get_by_keys([(self.__KEY_IP, ip_addr)], timeout)
 
     def get_by_id(self, frame_id, timeout=None):
         """
@@ -1941,23 +2655,7 @@ class XBeeQueue(Queue):
                 packet available that matches the provided frame ID before the
                 timeout expires.
         """
-        if timeout is None:
-            with self.mutex:
-                for packet in self.queue:
-                    if packet.needs_id() and packet.frame_id == frame_id:
-                        self.queue.remove(packet)
-                        return packet
-            return None
-
-        packet = self.get_by_id(frame_id)
-        dead_line = time.time() + timeout
-        while packet is None and dead_line > time.time():
-            time.sleep(0.1)
-            packet = self.get_by_id(frame_id)
-        if packet is None:
-            raise TimeoutException()
-
-        return packet
+        return self.__get_by_keys([(self.__KEY_ID, frame_id)], timeout)
 
     def flush(self):
         """
@@ -1965,64 +2663,139 @@ class XBeeQueue(Queue):
         """
         with self.mutex:
             self.queue.clear()
+            self.__index.clear()
+            self.not_full.notify_all()
 
-    @staticmethod
-    def __remote_device_match(packet, remote):
+    def __get_by_keys(self, keys, timeout):
         """
-        Returns whether or not the source address of the provided XBee packet
-        matches the address of the given remote XBee device.
+        Returns and removes the oldest packet of the queue matching any of the
+        given index keys, waiting for it during `timeout` seconds.
 
         Args:
-            packet (:class:`.XBeePacket`): XBee packet to get the address to compare.
-            remote (:class:`.RemoteXBeeDevice`): Remote XBee to get the address
-                to compare.
+            keys (List): List of index keys.
+            timeout (Float): Timeout in seconds, `None` to not block.
 
         Returns:
-            Boolean: `True` if the remote device matches, `False` otherwise.
+            :class:`.XBeeAPIPacket`: The packet, `None` if `timeout` is `None`
+                and there is no matching packet.
+
+        Raises:
+            TimeoutException: If `timeout` is not `None` and there is not any
+                matching packet before the timeout expires.
         """
-        f_type = packet.get_frame_type()
-        if f_type == ApiFrameType.RECEIVE_PACKET:
-            if packet.x64bit_source_addr == remote.get_64bit_addr():
-                return True
-            return (remote.get_16bit_addr() != XBee16BitAddress.UNKNOWN_ADDRESS
-                    and packet.x16bit_source_addr == remote.get_16bit_addr())
+        with self.mutex:
+            packet = self.__pop_first(keys)
+            if packet is not None or timeout is None:
+                return packet
+
+            cond = threading.Condition(self.mutex)
+            dead_line = time.monotonic() + timeout
+            while packet is None:
+                remaining = dead_line - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException()
+                for key in keys:
+                    self.__waiters.setdefault(key, deque()).append(cond)
+                try:
+                    cond.wait(remaining)
+                finally:
+                    self.__remove_waiter(cond, keys)
+                packet = self.__pop_first(keys)
+
+            return packet
+
+    def __pop_first(self, keys):
+        """
+        Returns and removes the oldest packet matching any of the given keys.
+        The lock of the queue must be held.
 
-        if f_type == ApiFrameType.REMOTE_AT_COMMAND_RESPONSE:
-            if packet.x64bit_source_addr == remote.get_64bit_addr():
-                return True
-            return (remote.get_16bit_addr() != XBee16BitAddress.UNKNOWN_ADDRESS
-                    and packet.x16bit_source_addr == remote.get_16bit_addr())
+        Args:
+            keys (List): List of index keys.
 
-        if f_type == ApiFrameType.RX_16:
-            return packet.x16bit_source_addr == remote.get_16bit_addr()
+        Returns:
+            :class:`.XBeeAPIPacket`: The packet, `None` if not found.
+        """
+        seq = None
+        for key in keys:
+            seqs = self.__index.get(key)
+            if seqs and (seq is None or seqs[0] < seq):
+                seq = seqs[0]
+        if seq is None:
+            return None
 
-        if f_type == ApiFrameType.RX_64:
-            return packet.x64bit_source_addr == remote.get_64bit_addr()
+        item = self.queue.pop(seq)
+        self.__unindex(seq, item)
+        self.not_full.notify()
+        return item
 
-        if f_type == ApiFrameType.RX_IO_16:
-            return packet.x16bit_source_addr == remote.get_16bit_addr()
+    def __unindex(self, seq, item):
+        """
+        Removes the given packet from the indexes. The lock of the queue must
+        be held.
 
-        if f_type == ApiFrameType.RX_IO_64:
-            return packet.x64bit_source_addr == remote.get_64bit_addr()
+        Args:
+            seq (Integer): Sequence number of the packet.
+            item (:class:`.XBeeAPIPacket`): The packet.
+        """
+        for key in self.__get_keys(item):
+            seqs = self.__index.get(key)
+            if not seqs:
+                continue
+            if seqs[0] == seq:
+                seqs.popleft()
+            else:
+                seqs.remove(seq)
+            if not seqs:
+                del self.__index[key]
 
-        if f_type == ApiFrameType.EXPLICIT_RX_INDICATOR:
-            return packet.x64bit_source_addr == remote.get_64bit_addr()
+    def __remove_waiter(self, cond, keys):
+        """
+        Removes the given waiter condition from the waiters of the provided
+        keys. The lock of the queue must be held.
 
-        return False
+        Args:
+            cond (:class:`threading.Condition`): The waiter condition.
+            keys (List): List of index keys.
+        """
+        for key in keys:
+            waiters = self.__waiters.get(key)
+            if waiters is None:
+                continue
+            try:
+                waiters.remove(cond)
+            except ValueError:
+                pass
+            if not waiters:
+                del self.__waiters[key]
 
     @staticmethod
-    def __ip_addr_match(packet, ip_addr):
+    def __get_keys(packet):
         """
-        Returns whether or not the IP address of the XBee packet matches the
-        provided one.
+        Returns the index keys of the provided XBee packet: its frame ID, the
+        source addresses to match against a remote XBee and its source IP
+        address, if any.
 
         Args:
-            packet (:class:`.XBeePacket`): XBee packet to get the address to compare.
-            ip_addr (:class:`ipaddress.IPv4Address`): IP address to be compared
-                with the XBee packet's one.
+            packet (:class:`.XBeePacket`): XBee packet to get its keys.
 
         Returns:
-            Boolean: `True` if the IP address matches, `False` otherwise.
+            List: List of index keys.
         """
-        return (packet.get_frame_type() == ApiFrameType.RX_IPV4
-                and packet.source_address == ip_addr)
+        keys = []
+        if packet.needs_id():
+            keys.append((XBeeQueue.__KEY_ID, packet.frame_id))
+
+        f_type = packet.get_frame_type()
+        if f_type in (ApiFrameType.RECEIVE_PACKET,
+                      ApiFrameType.REMOTE_AT_COMMAND_RESPONSE):
+            keys.append((XBeeQueue.__KEY_64, packet.x64bit_source_addr))
+            keys.append((XBeeQueue.__KEY_16, packet.x16bit_source_addr))
+        elif f_type in (ApiFrameType.RX_64, ApiFrameType.RX_IO_64,
+                        ApiFrameType.EXPLICIT_RX_INDICATOR):
+            keys.append((XBeeQueue.__KEY_64, packet.x64bit_source_addr))
+        elif f_type in (ApiFrameType.RX_16, ApiFrameType.RX_IO_16):
+            keys.append((XBeeQueue.__KEY_16, packet.x16bit_source_addr))
+        elif f_type == ApiFrameType.RX_IPV4:
+            keys.append((XBeeQueue.__KEY_IP, packet.source_address))
+
+        return keys
@@ -12,12 +12,18 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 import logging
+import threading
+import time
+from concurrent.futures import Future
 
+from digi.xbee.exception import XBeeException, TimeoutException, \
+    TransmitException
 from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
 from digi.xbee.models.atcomm import ATStringCommand
 from digi.xbee.models.mode import OperatingMode
 from digi.xbee.models.options import RemoteATCmdOptions
-from digi.xbee.models.status import ATCommandStatus
+from digi.xbee.models.status import ATCommandStatus, TransmitStatus, \
+    ModemStatus
 from digi.xbee.packets.aft import ApiFrameType
 from digi.xbee.util import utils
 
@@ -71,17 +77,9 @@ class PacketSender:
                 and not self.is_op_mode_valid(packet.parameter)):
             return
 
-        comm_iface = self.__xbee.comm_iface
-        op_mode = self.__xbee.operating_mode
-
-        out = packet.output(escaped=op_mode == OperatingMode.ESCAPED_API_MODE)
-        comm_iface.write_frame(out)
-        self._log.debug(self._LOG_PATTERN.format(comm_iface=str(comm_iface),
-                                                 event="SENT",
-                                                 opmode=op_mode,
-                                                 content=utils.hex_to_string(out)))
-
         # Refresh cached parameters if this method modifies some of them.
+        # Store the request before writing it, its response may be read
+        # before this method returns.
         if f_type in (ApiFrameType.AT_COMMAND, ApiFrameType.AT_COMMAND_QUEUE,
                       ApiFrameType.REMOTE_AT_COMMAND_REQUEST):
             node = self.__xbee
@@ -98,6 +96,16 @@ class PacketSender:
 
                 self._at_cmds_sent[key].update({packet.frame_id: packet})
 
+        comm_iface = self.__xbee.comm_iface
+        op_mode = self.__xbee.operating_mode
+
+        out = packet.output(escaped=op_mode == OperatingMode.ESCAPED_API_MODE)
+        comm_iface.write_frame(out)
+        self._log.debug(self._LOG_PATTERN.format(comm_iface=str(comm_iface),
+                                                 event="SENT",
+                                                 opmode=op_mode,
+                                                 content=utils.hex_to_string(out)))
+
     def is_op_mode_valid(self, value):
         """
         Returns `True` if the provided value is a valid operating mode for
@@ -123,12 +131,21 @@ class PacketSender:
     def at_response_received_cb(self, response):
         """
         Callback to deal with AT command responses and update the
-        corresponding node. Only for internal use.
+        corresponding node. It also discards the cached parameters of the
+        local XBee when a reset modem status is received. Only for internal
+        use.
 
         Args:
             response (:class: `.XBeeAPIPacket`): The received API packet.
         """
         f_type = response.get_frame_type()
+        if f_type == ApiFrameType.MODEM_STATUS:
+            cache = self.__xbee.get_parameter_cache()
+            if cache is not None and response.modem_status in (
+                    ModemStatus.HARDWARE_RESET, ModemStatus.WATCHDOG_TIMER_RESET):
+                cache._reset()
+            return
+
         if f_type not in (ApiFrameType.AT_COMMAND_RESPONSE,
                           ApiFrameType.REMOTE_AT_COMMAND_RESPONSE):
             return
@@ -149,6 +166,10 @@ class PacketSender:
         if not req or response.status != ATCommandStatus.OK:
             return
 
+        cache = node.get_parameter_cache()
+        if cache is not None:
+            cache._command_executed(req.command, bool(req.parameter))
+
         def is_req_apply(at_req):
             fr_type = at_req.get_frame_type()
             return (at_req.command.upper() == ATStringCommand.AC.command
@@ -306,3 +327,552 @@ class PacketSender:
             node_fut_apply.update({parameter: value})
 
         return False
+
+
+class FrameIdAllocator:
+    """
+    This class hands out the frame IDs of the API frames sent through a local
+    XBee. It keeps track of the IDs still waiting for a response so none of
+    them is reused while its request is in flight.
+
+    An ID is in flight from the moment it is allocated until it is released,
+    either because its response was received or because the request finished.
+    IDs that are never released (for example, requests with no response)
+    expire after a lease time.
+
+    An ID held by a request (see :meth:`.FrameIdAllocator.hold`) is only
+    freed by that request. If the request times out, its ID is quarantined:
+    it is not reused until the late response arrives or the lease expires, so
+    the late response cannot be taken as the answer of a new request.
+    """
+
+    MIN_FRAME_ID = 0x01
+    """
+    Lowest frame ID to hand out (0 means no response is expected).
+    """
+
+    MAX_FRAME_ID = 0xFF
+    """
+    Highest frame ID to hand out.
+    """
+
+    DEFAULT_LEASE = 20
+    """
+    Default time (seconds) an allocated frame ID remains in flight if it is
+    not released.
+    """
+
+    def __init__(self, lease=DEFAULT_LEASE):
+        """
+        Class constructor. Instantiates a new :class:`.FrameIdAllocator`
+        object with the provided parameters.
+
+        Args:
+            lease (Float, optional, default=`DEFAULT_LEASE`): Time in seconds
+                an allocated frame ID is kept in flight until it expires.
+                `None` to never expire.
+        """
+        self.__lease = lease
+        self.__last = 0
+        # Frame ID -> expiration time (`None` if it does not expire).
+        self.__in_flight = {}
+        # Frame IDs held by a request until it releases them.
+        self.__held = set()
+        self.__cond = threading.Condition()
+        self.__peak = 0
+        self.__waits = 0
+        self.__expired = 0
+
+    def allocate(self, block=True, timeout=None):
+        """
+        Returns the next frame ID that is not in flight and marks it as in
+        flight.
+
+        If all frame IDs are in flight and `block` is `True`, waits until one
+        is released or expires.
+
+        Args:
+            block (Boolean, optional, default=`True`): `True` to wait for a
+                free frame ID, `False` to fail immediately.
+            timeout (Float, optional, default=`None`): Maximum time in
+                seconds to wait for a free frame ID. `None` to wait forever.
+
+        Returns:
+            Integer: The allocated frame ID.
+
+        Raises:
+            XBeeException: If `block` is `False` and all frame IDs are in
+                flight.
+            TimeoutException: If no frame ID is freed before the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.__cond:
+            while True:
+                now = time.monotonic()
+                frame_id = self.__find_free(now)
+                if frame_id:
+                    break
+                if not block:
+                    raise XBeeException("All frame IDs are in flight")
+                wait = self.__next_expiration(now)
+                if deadline is not None:
+                    if now >= deadline:
+                        raise TimeoutException(
+                            message="No frame ID released in the configured "
+                                    "timeout.")
+                    wait = deadline - now if wait is None \
+                        else min(wait, deadline - now)
+                self.__waits += 1
+                self.__cond.wait(wait)
+
+            self.__last = frame_id
+            self.__held.discard(frame_id)
+            self.__in_flight[frame_id] = \
+                None if self.__lease is None else now + self.__lease
+            self.__peak = max(self.__peak, len(self.__in_flight))
+
+            return frame_id
+
+    def hold(self, frame_id):
+        """
+        Marks the given frame ID as in flight until it is explicitly released,
+        whether it was allocated or not. Received responses do not free a held
+        frame ID.
+
+        Args:
+            frame_id (Integer): The frame ID to hold.
+        """
+        if not frame_id:
+            return
+        with self.__cond:
+            self.__in_flight[frame_id] = None
+            self.__held.add(frame_id)
+            self.__peak = max(self.__peak, len(self.__in_flight))
+
+    def release(self, frame_id, quarantine=False):
+        """
+        Releases the given frame ID so it can be allocated again. Does nothing
+        if the frame ID is not in flight.
+
+        If `quarantine` is `True` (the request timed out), the frame ID stays
+        in flight until a response with it is received or the lease expires.
+
+        Args:
+            frame_id (Integer): The frame ID to release.
+            quarantine (Boolean, optional, default=`False`): `True` to keep
+                the frame ID in flight waiting for a late response.
+
+        .. seealso::
+           | :meth:`.FrameIdAllocator.response_received`
+        """
+        if not frame_id:
+            return
+        with self.__cond:
+            self.__held.discard(frame_id)
+            if quarantine and self.__lease != 0:
+                self.__in_flight[frame_id] = None if self.__lease is None \
+                    else time.monotonic() + self.__lease
+            elif self.__in_flight.pop(frame_id, False) is not False:
+                self.__cond.notify()
+
+    def response_received(self, frame_id):
+        """
+        Notifies that a response with the given frame ID was received. The
+        frame ID is released unless a request is holding it.
+
+        Args:
+            frame_id (Integer): The frame ID of the received response.
+        """
+        with self.__cond:
+            if frame_id in self.__held:
+                return
+            if self.__in_flight.pop(frame_id, False) is not False:
+                self.__cond.notify()
+
+    @property
+    def last(self):
+        """
+        Returns the last allocated frame ID.
+
+        Returns:
+            Integer: The last allocated frame ID, 0 if none.
+        """
+        return self.__last
+
+    @property
+    def capacity(self):
+        """
+        Returns the number of frame IDs that can be in flight at the same time.
+
+        Returns:
+            Integer: The number of available frame IDs.
+        """
+        return self.MAX_FRAME_ID - self.MIN_FRAME_ID + 1
+
+    @property
+    def in_flight(self):
+        """
+        Returns the number of frame IDs currently in flight.
+
+        Returns:
+            Integer: The number of frame IDs in flight.
+        """
+        with self.__cond:
+            now = time.monotonic()
+            return sum(1 for exp in self.__in_flight.values()
+                       if exp is None or exp > now)
+
+    @property
+    def next_expiration(self):
+        """
+        Returns the time until the first in flight frame ID expires, that is,
+        until a frame ID is freed if none is released before.
+
+        Returns:
+            Float: Seconds until the first expiration, `None` if no frame ID
+                expires.
+        """
+        with self.__cond:
+            return self.__next_expiration(time.monotonic())
+
+    @property
+    def peak_in_flight(self):
+        """
+        Returns the maximum number of frame IDs that were in flight at the same
+        time.
+
+        Returns:
+            Integer: The peak number of frame IDs in flight.
+        """
+        return self.__peak
+
+    @property
+    def wait_count(self):
+        """
+        Returns the number of times an allocation had to wait because all
+        frame IDs were in flight.
+
+        Returns:
+            Integer: The number of waits.
+        """
+        return self.__waits
+
+    @property
+    def expired_count(self):
+        """
+        Returns the number of frame IDs reused after their lease expired
+        without being released.
+
+        Returns:
+            Integer: The number of expired frame IDs.
+        """
+        return self.__expired
+
+    def __find_free(self, now):
+        """
+        Returns the first frame ID after the last allocated one that is not in
+        flight, reclaiming it if its lease expired.
+
+        Args:
+            now (Float): Current monotonic time.
+
+        Returns:
+            Integer: The free frame ID, `None` if all are in flight.
+        """
+        frame_id = self.__last
+        for _ in range(self.capacity):
+            frame_id = self.MIN_FRAME_ID if frame_id >= self.MAX_FRAME_ID \
+                else frame_id + 1
+            if frame_id not in self.__in_flight:
+                return frame_id
+            expiration = self.__in_flight[frame_id]
+            if expiration is not None and expiration <= now:
+                self.__expired += 1
+                return frame_id
+
+        return None
+
+    def __next_expiration(self, now):
+        """
+        Returns the time until the first in flight frame ID expires.
+
+        Args:
+            now (Float): Current monotonic time.
+
+        Returns:
+            Float: Seconds until the first expiration, `None` if no frame ID
+                expires.
+        """
+        expirations = [exp for exp in self.__in_flight.values()
+                       if exp is not None]
+        if not expirations:
+            return None
+
+        return max(0, min(expirations) - now)
+
+
+class TransmitPipeline:
+    """
+    This class sends transmit requests without waiting for the transmit
+    status of the previous ones, keeping at most a window of requests waiting
+    for their status.
+
+    Each request gets a :class:`concurrent.futures.Future` that is resolved
+    when its transmit status is received. Requests whose status is not
+    received in time are failed by a background thread, which only runs while
+    there are requests waiting for their status.
+
+    Futures are resolved, in order, by the callback dispatcher of the XBee
+    (see :class:`.CallbackDispatcher`), so their done callbacks never run in
+    the thread that reads frames and may send again. A done callback must
+    not wait for the result of another future of the pipeline, as it would
+    block the resolution of the rest.
+    """
+
+    DEFAULT_WINDOW = 8
+    """
+    Default maximum number of transmit requests waiting for their status.
+    """
+
+    def __init__(self, xbee, window=DEFAULT_WINDOW):
+        """
+        Class constructor. Instantiates a new :class:`.TransmitPipeline`
+        object with the provided parameters.
+
+        Args:
+            xbee (:class:`.XBeeDevice`): The local XBee to send through.
+            window (Integer, optional, default=`DEFAULT_WINDOW`): Maximum
+                number of transmit requests waiting for their status.
+
+        Raises:
+            ValueError: If `window` is less than 1.
+        """
+        # Imported here: the reader module imports this one through devices.
+        from digi.xbee.reader import XBeeEvent
+
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+
+        self.__xbee = xbee
+        self.__window = window
+        # Listener future -> (packet, user future, listener, expiration time).
+        self.__outstanding = {}
+        self.__cond = threading.Condition()
+        self.__expirer = None
+        self.__resolved = XBeeEvent()
+        self.__resolved += self.__resolve
+
+    @property
+    def window(self):
+        """
+        Returns the maximum number of transmit requests waiting for their
+        status.
+
+        Returns:
+            Integer: The window size.
+        """
+        return self.__window
+
+    @window.setter
+    def window(self, window):
+        """
+        Sets the maximum number of transmit requests waiting for their status.
+
+        Args:
+            window (Integer): The new window size.
+
+        Raises:
+            ValueError: If `window` is less than 1.
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        with self.__cond:
+            self.__window = window
+            self.__cond.notify_all()
+
+    @property
+    def outstanding(self):
+        """
+        Returns the number of transmit requests waiting for their status.
+
+        Returns:
+            Integer: The number of outstanding transmit requests.
+        """
+        return len(self.__outstanding)
+
+    def send(self, packet, timeout):
+        """
+        Sends the provided transmit request once there is room in the window.
+
+        The returned future is resolved with the received transmit status
+        packet. If the transmit status is not successful, the future raises a
+        :class:`.TransmitException`, and if it is not received in `timeout`
+        seconds, a :class:`.TimeoutException`.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The transmit request to send.
+            timeout (Float): Maximum time in seconds to wait for room in the
+                window and for the transmit status.
+
+        Returns:
+            :class:`concurrent.futures.Future`: Future of the transmit status.
+
+        Raises:
+            TimeoutException: If there is no room in the window in `timeout`
+                seconds.
+        """
+        deadline = time.monotonic() + timeout
+        frame_ids = self.__xbee._get_frame_id_allocator()
+        with self.__cond:
+            while len(self.__outstanding) >= self.__window:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TimeoutException(
+                        message="No room in the transmit window in the "
+                                "configured timeout.")
+                self.__cond.wait(deadline - now)
+
+            listener = self.__xbee._packet_listener
+            status_future = listener.add_pending_request(packet)
+            # The frame ID is released when the status is received.
+            frame_ids.hold(packet.frame_id)
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self.__outstanding[status_future] = (
+                packet, future, listener, time.monotonic() + timeout)
+            if self.__expirer is None:
+                self.__expirer = threading.Thread(
+                    target=self.__expire, name="TransmitPipeline",
+                    daemon=True)
+                self.__expirer.start()
+            else:
+                self.__cond.notify_all()
+
+        status_future.add_done_callback(self.__status_received)
+        try:
+            self.__xbee._send_packet(packet)
+        except Exception as exc:
+            if self.__finish(status_future) is not None:
+                future.set_exception(exc)
+            raise
+
+        return future
+
+    def cancel_all(self):
+        """
+        Fails all outstanding transmit requests. Used when the XBee is closed.
+        """
+        with self.__cond:
+            status_futures = list(self.__outstanding)
+        for status_future in status_futures:
+            future = self.__finish(status_future, answered=False)
+            if future is not None:
+                self.__dispatch(future, exception=XBeeException(
+                    "XBee device's communication interface closed."))
+
+    def __status_received(self, status_future):
+        """
+        Callback executed when the transmit status of a request is received.
+
+        Args:
+            status_future (:class:`concurrent.futures.Future`): The resolved
+                listener future.
+        """
+        future = self.__finish(status_future)
+        if future is None:
+            # Already expired or cancelled.
+            return
+
+        response = status_future.result()
+        if response.transmit_status not in (TransmitStatus.SUCCESS,
+                                            TransmitStatus.SELF_ADDRESSED):
+            self.__dispatch(future, exception=TransmitException(
+                transmit_status=response.transmit_status))
+        else:
+            self.__dispatch(future, result=response)
+
+    def __expire(self):
+        """
+        Fails the outstanding transmit requests whose status is not received
+        in time. Runs in its own thread while there are outstanding requests.
+        """
+        while True:
+            with self.__cond:
+                expired = []
+                while not expired:
+                    if not self.__outstanding:
+                        self.__expirer = None
+                        return
+                    now = time.monotonic()
+                    expired = [status_future for status_future, entry
+                               in self.__outstanding.items()
+                               if entry[3] <= now]
+                    if not expired:
+                        self.__cond.wait(
+                            min(entry[3] for entry
+                                in self.__outstanding.values()) - now)
+
+            # Fail them out of the lock: done callbacks may send again.
+            for status_future in expired:
+                future = self.__finish(status_future, answered=False)
+                if future is not None:
+                    self.__dispatch(future, exception=TimeoutException(
+                        message="Transmit status not received in the "
+                                "configured timeout."))
+
+    def __dispatch(self, future, result=None, exception=None):
+        """
+        Resolves the given user future in the callback dispatcher of the XBee.
+
+        Args:
+            future (:class:`concurrent.futures.Future`): The user future.
+            result (optional): The result of the future.
+            exception (:class:`.Exception`, optional): The exception of the
+                future, `None` to set `result`.
+        """
+        self.__resolved.dispatcher = self.__xbee.get_callback_dispatcher()
+        self.__resolved(future, result, exception)
+
+    @staticmethod
+    def __resolve(future, result, exception):
+        """
+        Callback of the resolution event that sets the result or the exception
+        of a user future.
+
+        Args:
+            future (:class:`concurrent.futures.Future`): The user future.
+            result: The result of the future.
+            exception (:class:`.Exception`): The exception of the future,
+                `None` to set `result`.
+        """
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def __finish(self, status_future, answered=True):
+        """
+        Removes the given request from the outstanding ones and releases its
+        frame ID.
+
+        Args:
+            status_future (:class:`concurrent.futures.Future`): The listener
+                future of the request.
+            answered (Boolean, optional, default=`True`): `False` if the
+                transmit status was not received, so the frame ID is kept
+                out of use until it is.
+
+        Returns:
+            :class:`concurrent.futures.Future`: The user future of the
+                request, `None` if it was not outstanding.
+        """
+        with self.__cond:
+            entry = self.__outstanding.pop(status_future, None)
+            if entry is None:
+                return None
+            self.__cond.notify_all()
+
+        entry[2].del_pending_request(entry[0], status_future)
+        self.__xbee._get_frame_id_allocator().release(
+            entry[0].frame_id, quarantine=not answered)
+        return entry[1]
@@ -14,6 +14,7 @@
 
 import enum
 import time
+from collections import deque
 
 from serial import Serial, EIGHTBITS, STOPBITS_ONE, PARITY_NONE
 
@@ -37,6 +38,149 @@ class FlowControl(enum.Enum):
     UNKNOWN = 99
 
 
+class FrameBuffer:
+    """
+    This class splits a stream of bytes read from an XBee into API frames.
+
+    Bytes are fed as they are read, in chunks of any size. Complete frames are
+    kept, unescaped, until they are popped, and incomplete ones remain in the
+    buffer waiting for more data.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new :class:`.FrameBuffer` object.
+        """
+        # Bytes read not yet consumed as part of a frame.
+        self.__buffer = bytearray()
+        # Complete frames already extracted from the buffer.
+        self.__frames = deque()
+
+    def __len__(self):
+        return len(self.__frames)
+
+    def feed(self, data, operating_mode):
+        """
+        Adds the provided bytes to the buffer and extracts the frames they
+        complete.
+
+        Args:
+            data (Bytearray or Bytes): The read bytes.
+            operating_mode (:class:`.OperatingMode`): The operating mode in
+                which the data was read.
+
+        Returns:
+            Integer: The number of complete frames waiting to be popped.
+        """
+        self.__buffer += data
+        self.__extract_frames(operating_mode)
+        return len(self.__frames)
+
+    def pop(self):
+        """
+        Returns the oldest complete frame and removes it from the buffer.
+
+        Returns:
+            Bytearray: The unescaped frame.
+
+        Raises:
+            IndexError: If there is no complete frame.
+        """
+        return self.__frames.popleft()
+
+    def discard_partial(self):
+        """
+        Discards the bytes of the frame being received, if any.
+        """
+        self.__buffer.clear()
+
+    def clear(self):
+        """
+        Discards all buffered bytes and frames.
+        """
+        self.__buffer.clear()
+        self.__frames.clear()
+
+    def __extract_frames(self, operating_mode):
+        """
+        Extracts all complete frames from the read buffer and adds them to the
+        list of pending frames. Returned frames are always unescaped.
+
+        Bytes before a start delimiter are discarded. Incomplete frames remain
+        in the buffer waiting for more data.
+
+        Args:
+            operating_mode (:class:`.OperatingMode`): The operating mode in
+                which the data was read.
+        """
+        buffer = self.__buffer
+        escaped = operating_mode == OperatingMode.ESCAPED_API_MODE
+        header = SpecialByte.HEADER_BYTE.code
+
+        while buffer:
+            start = buffer.find(header)
+            if start == -1:
+                buffer.clear()
+                return
+            if start > 0:
+                del buffer[:start]
+
+            if not escaped:
+                if len(buffer) < 3:
+                    return
+                end = 4 + utils.length_to_int(buffer[1:3])
+                if len(buffer) < end:
+                    return
+                self.__frames.append(buffer[:end])
+                del buffer[:end]
+                continue
+
+            # In escaped mode the start delimiter never appears inside a
+            # frame, so a new one before the end means a corrupted frame.
+            next_start = buffer.find(header, 1)
+            limit = next_start if next_start != -1 else len(buffer)
+
+            end = self.__escaped_span(buffer, 1, 2)
+            if end <= limit:
+                length = utils.length_to_int(
+                    XBeeAPIPacket.unescape_data(buffer[1:end]))
+                # Length field, frame data and checksum.
+                end = self.__escaped_span(buffer, 1, 2 + length + 1)
+            if end <= limit:
+                self.__frames.append(
+                    XBeeAPIPacket.unescape_data(buffer[:end]))
+                del buffer[:end]
+            elif next_start != -1:
+                del buffer[:next_start]
+            else:
+                return
+
+    @staticmethod
+    def __escaped_span(data, start, num_bytes):
+        """
+        Returns the index after the last escaped byte needed to obtain
+        `num_bytes` unescaped bytes from `data` starting at `start`.
+
+        Args:
+            data (Bytearray): Escaped data.
+            start (Integer): Index of the first byte to consider.
+            num_bytes (Integer): Number of unescaped bytes.
+
+        Returns:
+            Integer: The end index (exclusive). It may be greater than the
+                length of `data` if there are not enough bytes.
+        """
+        # Each escape byte adds one extra byte to the span. Since the escaped
+        # byte is never an escape byte, this converges in a few iterations.
+        end = start + num_bytes
+        while True:
+            new_end = start + num_bytes + data.count(XBeePacket.ESCAPE_BYTE,
+                                                     start, end)
+            if new_end == end:
+                return end
+            end = new_end
+
+
 class XBeeSerialPort(Serial, XBeeCommunicationInterface):
     """
     This class extends the functionality of Serial class (PySerial).
@@ -92,6 +236,7 @@ class XBeeSerialPort(Serial, XBeeCommunicationInterface):
                             parity=parity, timeout=timeout)
         self.setPort(port)
         self._is_reading = False
+        self.__rx_frames = FrameBuffer()
 
     def __str__(self):
         return '{name} {p.portstr!r}'.format(name=self.__class__.__name__, p=self)
@@ -154,30 +299,6 @@ class XBeeSerialPort(Serial, XBeeCommunicationInterface):
             raise digi.xbee.exception.TimeoutException()
         return read_bytes
 
-    def __read_next_byte(self, operating_mode=OperatingMode.API_MODE):
-        """
-        Returns the next byte in bytearray format. If the operating mode is
-        OperatingMode.ESCAPED_API_MODE, the bytearray could contain 2 bytes.
-
-        If in escaped API mode and the byte that was read was the escape byte,
-        it will also read the next byte.
-
-        Args:
-            operating_mode (:class:`.OperatingMode`): The operating mode in
-                which the byte should be read.
-
-        Returns:
-            Bytearray: The read byte or bytes as bytearray, `None` otherwise.
-        """
-        read_data = bytearray()
-        read_byte = self.read_byte()
-        read_data.append(read_byte)
-        # Read escaped bytes in API escaped mode.
-        if operating_mode == OperatingMode.ESCAPED_API_MODE and read_byte == XBeePacket.ESCAPE_BYTE:
-            read_data.append(self.read_byte())
-
-        return read_data
-
     def quit_reading(self):
         """
         Makes the thread (if any) blocking on wait_for_frame return.
@@ -199,8 +320,12 @@ class XBeeSerialPort(Serial, XBeeCommunicationInterface):
         Reads the next packet. Starts to read when finds the start delimiter.
         The last byte read is the checksum.
 
-        If there is something in the COM buffer after the
-        start delimiter, this method discards it.
+        All the bytes available in the serial port buffer are read at once and
+        every complete frame found in them is kept, so consecutive calls
+        return already received frames without accessing the port.
+
+        If there is something in the COM buffer before the start delimiter,
+        this method discards it.
 
         If the method can't read a complete and correct packet,
         it will return `None`.
@@ -215,44 +340,23 @@ class XBeeSerialPort(Serial, XBeeCommunicationInterface):
         """
         self._is_reading = True
 
-        try:
-            xbee_packet = bytearray(1)
-            # Add packet delimiter.
-            xbee_packet[0] = self.read_byte()
-            while xbee_packet[0] != SpecialByte.HEADER_BYTE.value:
-                # May be set to false by self.quit_reading() as a stop reading
-                # request.
-                if not self._is_reading:
-                    return None
-                xbee_packet[0] = self.read_byte()
-
-            # Add packet length.
-            packet_length_byte = bytearray()
-            for _ in range(2):
-                packet_length_byte += self.__read_next_byte(operating_mode)
-            xbee_packet += packet_length_byte
-            # Length needs to be un-escaped in API escaped mode to obtain its
-            # integer equivalent.
-            if operating_mode == OperatingMode.ESCAPED_API_MODE:
-                length = utils.length_to_int(
-                    XBeeAPIPacket.unescape_data(packet_length_byte))
-            else:
-                length = utils.length_to_int(packet_length_byte)
-
-            # Add packet payload.
-            for _ in range(length):
-                xbee_packet += self.__read_next_byte(operating_mode)
+        while not self.__rx_frames:
+            # May be set to false by self.quit_reading() as a stop reading
+            # request.
+            if not self._is_reading:
+                return None
 
-            # Add packet checksum.
-            xbee_packet += self.__read_next_byte(operating_mode)
+            # Block (for a maximum of 'timeout' seconds) only when there is
+            # nothing waiting in the port.
+            data = self.read(self.in_waiting or 1)
+            if not data:
+                # Discard incomplete frames: no byte received for a timeout.
+                self.__rx_frames.discard_partial()
+                return None
 
-            # Return the packet unescaped.
-            if operating_mode == OperatingMode.ESCAPED_API_MODE:
-                return XBeeAPIPacket.unescape_data(xbee_packet)
+            self.__rx_frames.feed(data, operating_mode)
 
-            return xbee_packet
-        except digi.xbee.exception.TimeoutException:
-            return None
+        return self.__rx_frames.pop()
 
     def read_existing(self):
         """
@@ -302,3 +406,4 @@ class XBeeSerialPort(Serial, XBeeCommunicationInterface):
 
         self.reset_input_buffer()
         self.reset_output_buffer()
+        self.__rx_frames.clear()
@@ -12,19 +12,42 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+import logging
+import selectors
 import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from ipaddress import IPv4Address
 
 from digi.xbee.devices import CellularDevice
-from digi.xbee.exception import TimeoutException, XBeeSocketException, XBeeException
+from digi.xbee.exception import TimeoutException, TransmitException, \
+    XBeeSocketException, XBeeException
 from digi.xbee.models.protocol import IPProtocol
 from digi.xbee.models.status import SocketState, SocketStatus, TransmitStatus
+from digi.xbee.packets.aft import ApiFrameType
 from digi.xbee.packets.raw import TXStatusPacket
 from digi.xbee.packets.socket import SocketConnectPacket, SocketCreatePacket, \
     SocketSendPacket, SocketClosePacket, SocketBindListenPacket, \
-    SocketNewIPv4ClientPacket, SocketOptionRequestPacket, SocketSendToPacket
+    SocketOptionRequestPacket, SocketSendToPacket
+from digi.xbee.sender import TransmitPipeline
+
+
+EVENT_READ = selectors.EVENT_READ
+"""
+Readiness event of a socket with received data, a connection to accept or
+closed.
+"""
+
+EVENT_WRITE = selectors.EVENT_WRITE
+"""
+Readiness event of a socket that can send data.
+"""
+
+EVENT_CLOSE = 1 << 2
+"""
+Readiness event of a closed socket.
+"""
 
 
 class socket:
@@ -35,6 +58,29 @@ class socket:
 
     __DEFAULT_TIMEOUT = 5
     __MAX_PAYLOAD_BYTES = 1500
+    __MAX_SEND_RETRIES = 5
+
+    DEFAULT_RECEIVE_WARNING = 256 * 1024
+    """
+    Default number of received bytes not read yet above which the socket
+    warns that the application is not reading fast enough.
+    """
+
+    DEFAULT_SEND_WINDOW = 4
+    """
+    Initial number of data packets sent without waiting for their status.
+    """
+
+    MAX_SEND_WINDOW = 8
+    """
+    Default maximum number of data packets sent without waiting for their
+    status.
+    """
+
+    _log = logging.getLogger(__name__)
+    """
+    Logger.
+    """
 
     def __init__(self, xbee_device, ip_protocol=IPProtocol.TCP):
         """
@@ -69,14 +115,29 @@ class socket:
         self.__is_listening = False
         self.__backlog = None
         self.__timeout = self.__DEFAULT_TIMEOUT
-        self.__data_received = bytearray()
-        self.__data_received_lock = threading.Lock()
+        # Received data, protected by the receive condition, which is
+        # notified when data is stored and when the socket closes.
+        self.__rx_cond = threading.Condition()
+        self.__rx_warning = self.DEFAULT_RECEIVE_WARNING
+        self.__rx_size = 0
+        self.__rx_warned = False
+        self.__rx_closed = False
+        self.__data_received = _ReceiveBuffer()
         self.__data_received_from_dict = OrderedDict()
-        self.__data_received_from_dict_lock = threading.Lock()
+        # Send window, adapted to the delivery latency and buffer errors.
+        self.__tx_pipeline = None
+        self.__tx_window = _SendWindow(self.DEFAULT_SEND_WINDOW,
+                                       self.MAX_SEND_WINDOW)
+        # Clients connected to the listening socket not accepted yet.
+        self.__pending_clients = deque()
+        # Selectors monitoring the socket.
+        self.__selectors = set()
         # Initialize socket callbacks.
         self.__socket_state_callback = None
         self.__data_received_callback = None
         self.__data_received_from_callback = None
+        self.__client_callback = None
+        self.__demux = _SocketDemux.get(xbee_device)
 
     def __enter__(self):
         return self
@@ -132,8 +193,8 @@ class socket:
             lock.release()
 
         # Add the socket state received callback.
-        self.__xbee.add_socket_state_received_callback(
-            socket_state_received_callback)
+        self.__demux.add(_SocketDemux.STATE, self.__socket_id,
+                         socket_state_received_callback)
 
         try:
             # Create, send and check the socket connect packet.
@@ -164,9 +225,10 @@ class socket:
             # Register internal socket state and data reception callbacks.
             self.__register_state_callback()
             self.__register_data_received_callback()
+            self.__notify_selectors()
         finally:
             # Always remove the socket state callback.
-            self.__xbee.del_socket_state_received_callback(socket_state_received_callback)
+            self.__demux.remove(socket_state_received_callback)
 
     def bind(self, address):
         """
@@ -229,6 +291,7 @@ class socket:
 
         self.__is_listening = True
         self.__backlog = backlog
+        self.__register_client_callback()
 
     def accept(self):
         """
@@ -244,48 +307,20 @@ class socket:
         Raises:
             XBeeException: If the connection with the XBee device is not open.
             XBeeSocketException: If the socket is not bound or not listening.
+            XBeeSocketException: If the socket is closed while waiting.
         """
         if self.__source_port is None:
             raise XBeeSocketException(message="Socket must be bound")
         if not self.__is_listening:
             raise XBeeSocketException(message="Socket must be listening")
 
-        lock = threading.Condition()
-        received_packet = list()
-
-        # Define the IPv4 client callback.
-        def ipv4_client_callback(packet):
-            if (not isinstance(packet, SocketNewIPv4ClientPacket)
-                    or packet.socket_id != self.__socket_id):
-                return
-
-            # Add the packet to the list and notify the lock.
-            received_packet.append(packet)
-            lock.acquire()
-            lock.notify()
-            lock.release()
-
-        # Add the socket IPv4 client callback.
-        self.__xbee.add_packet_received_callback(ipv4_client_callback)
-
-        try:
-            # Wait until an IPv4 client packet is received.
-            lock.acquire()
-            lock.wait()
-            lock.release()
-
-            conn = socket(self.__xbee, self.__ip_protocol)
-            conn.__socket_id = received_packet[0].client_socket_id
-            conn.__connected = True
-
-            # Register internal socket state and data reception callbacks.
-            conn.__register_state_callback()
-            conn.__register_data_received_callback()
-
-            return conn, (received_packet[0].remote_address, received_packet[0].remote_port)
-        finally:
-            # Always remove the socket IPv4 client callback.
-            self.__xbee.del_packet_received_callback(ipv4_client_callback)
+        # Wait until a client connects.
+        with self.__rx_cond:
+            while not self.__pending_clients and not self.__rx_closed:
+                self.__rx_cond.wait()
+            if not self.__pending_clients:
+                raise XBeeSocketException(message="Socket is closed")
+            return self.__pending_clients.popleft()
 
     def gettimeout(self):
         """
@@ -325,6 +360,66 @@ class socket:
         """
         self.settimeout(None if flag else self.__DEFAULT_TIMEOUT)
 
+    def get_receive_warning(self):
+        """
+        Returns the number of received bytes not read yet above which the
+        socket warns that the application is not reading fast enough.
+
+        Returns:
+            Integer: The warning threshold in bytes.
+        """
+        return self.__rx_warning
+
+    def set_receive_warning(self, size):
+        """
+        Sets the number of received bytes not read yet above which the socket
+        warns that the application is not reading fast enough.
+
+        This is not a limit: the received data is buffered without bound
+        until it is read. The XBee does not provide flow control for its
+        sockets, and the reception never waits for the application, as that
+        would delay the data of the other sockets of the device. When the
+        threshold is exceeded a warning is logged once, until the application
+        reads the data below the threshold again.
+
+        Args:
+            size (Integer): The new warning threshold in bytes.
+
+        Raises:
+            ValueError: If `size` is less than `1`.
+        """
+        if size < 1:
+            raise ValueError("Receive warning threshold must be greater than 0")
+        with self.__rx_cond:
+            self.__rx_warning = size
+
+    def get_send_window(self):
+        """
+        Returns the current number of data packets sent without waiting for
+        their status. It is adapted while sending.
+
+        Returns:
+            Integer: The send window in packets.
+        """
+        return self.__tx_window.size
+
+    def set_send_window(self, size, max_size=None):
+        """
+        Sets the number of data packets sent without waiting for their
+        status. The window keeps adapting from this value while sending, up
+        to `max_size`.
+
+        Args:
+            size (Integer): The new send window in packets.
+            max_size (Integer, optional): The maximum send window in packets.
+                If not provided, the current maximum is kept.
+
+        Raises:
+            ValueError: If `size` or `max_size` is less than `1`.
+        """
+        self.__tx_window.set(size, max_size=max_size)
+        self.__update_pipeline_window()
+
     def recv(self, bufsize):
         """
         Receives data from the socket.
@@ -341,25 +436,47 @@ class socket:
         if bufsize < 1:
             raise ValueError("Number of bytes to receive must be grater than 0")
 
-        data_received = bytearray()
-
-        # Wait until data is available or the timeout configured in the socket expires.
-        if self.getblocking():
-            while len(self.__data_received) == 0:
-                time.sleep(0.1)
-        else:
-            dead_line = time.time() + self.__timeout
-            while len(self.__data_received) == 0 and dead_line > time.time():
-                time.sleep(0.1)
-        # Get the number of bytes specified in 'bufsize' from the internal var.
-        if len(self.__data_received) > 0:
-            self.__data_received_lock.acquire()
-            data_received = self.__data_received[0:bufsize].copy()
-            self.__data_received = self.__data_received[bufsize:]
-            self.__data_received_lock.release()
-        # Return the data received.
+        with self.__rx_cond:
+            if not self.__wait_data(lambda: self.__data_received):
+                return bytearray()
+            data_received = self.__data_received.read(bufsize)
+            self.__consumed(len(data_received))
+
         return data_received
 
+    def recv_into(self, buffer, nbytes=0):
+        """
+        Receives data from the socket into the given buffer, without creating
+        intermediate copies.
+
+        Args:
+            buffer (Bytearray or memoryview): Writable buffer to store the
+                received data.
+            nbytes (Integer, optional): The maximum amount of data to be
+                received, `0` to fill the buffer.
+
+        Returns:
+            Integer: The number of bytes received.
+
+        Raises:
+            ValueError: If `nbytes` is negative or greater than the buffer size,
+                or the buffer is empty.
+        """
+        view = memoryview(buffer).cast("B")
+        if nbytes < 0 or nbytes > len(view):
+            raise ValueError("Number of bytes to receive must be between 0 and the buffer size")
+        nbytes = nbytes or len(view)
+        if nbytes < 1:
+            raise ValueError("Number of bytes to receive must be grater than 0")
+
+        with self.__rx_cond:
+            if not self.__wait_data(lambda: self.__data_received):
+                return 0
+            received = self.__data_received.read_into(view, nbytes)
+            self.__consumed(received)
+
+        return received
+
     def recvfrom(self, bufsize):
         """
         Receives data from the socket.
@@ -379,33 +496,59 @@ class socket:
         if bufsize < 1:
             raise ValueError("Number of bytes to receive must be grater than 0")
 
-        data_received = bytearray()
-        address = None
-
-        # Wait until data is received from any address or the timeout
-        # configured in the socket expires.
-        if self.getblocking():
-            while len(self.__data_received_from_dict) == 0:
-                time.sleep(0.1)
-        else:
-            dead_line = time.time() + self.__timeout
-            while len(self.__data_received_from_dict) == 0 and dead_line > time.time():
-                time.sleep(0.1)
-        # Get the number of bytes specified in 'bufsize' from the first address stored.
-        if len(self.__data_received_from_dict) > 0:
-            self.__data_received_from_dict_lock.acquire()
-            # Get 'bufsize' bytes from the first stored address in the internal dict.
-            address = list(self.__data_received_from_dict)[0]
-            data_received = self.__data_received_from_dict[address][0:bufsize].copy()
-            # Update the number of bytes left for 'address' in the dictionary.
-            self.__data_received_from_dict[address] = self.__data_received_from_dict[address][bufsize:]
-            # If the number of bytes left for 'address' is 0, remove it from the dictionary.
-            if len(self.__data_received_from_dict[address]) == 0:
+        with self.__rx_cond:
+            if not self.__wait_data(lambda: self.__data_received_from_dict):
+                return bytearray(), None
+            # Get 'bufsize' bytes from the first stored address.
+            address, buffer = next(iter(self.__data_received_from_dict.items()))
+            data_received = buffer.read(bufsize)
+            # If there are no bytes left for 'address', remove it.
+            if not buffer:
                 self.__data_received_from_dict.pop(address)
-            self.__data_received_from_dict_lock.release()
-        # Return the data received for 'address'.
+            self.__consumed(len(data_received))
+
         return data_received, address
 
+    def recvfrom_into(self, buffer, nbytes=0):
+        """
+        Receives data from the socket into the given buffer, without creating
+        intermediate copies.
+
+        Args:
+            buffer (Bytearray or memoryview): Writable buffer to store the
+                received data.
+            nbytes (Integer, optional): The maximum amount of data to be
+                received, `0` to fill the buffer.
+
+        Returns:
+            Tuple (Integer, Tuple): Pair containing the number of bytes
+                received and the address of the socket sending the data.
+
+        Raises:
+            ValueError: If `nbytes` is negative or greater than the buffer size,
+                or the buffer is empty.
+
+        .. seealso::
+           | :meth:`.socket.recvfrom`
+        """
+        view = memoryview(buffer).cast("B")
+        if nbytes < 0 or nbytes > len(view):
+            raise ValueError("Number of bytes to receive must be between 0 and the buffer size")
+        nbytes = nbytes or len(view)
+        if nbytes < 1:
+            raise ValueError("Number of bytes to receive must be grater than 0")
+
+        with self.__rx_cond:
+            if not self.__wait_data(lambda: self.__data_received_from_dict):
+                return 0, None
+            address, rx_buffer = next(iter(self.__data_received_from_dict.items()))
+            received = rx_buffer.read_into(view, nbytes)
+            if not rx_buffer:
+                self.__data_received_from_dict.pop(address)
+            self.__consumed(received)
+
+        return received, address
+
     def send(self, data):
         """
         Sends data to the socket and returns the number of bytes sent. The
@@ -414,6 +557,11 @@ class socket:
         the data was transmitted, the application needs to attempt delivery of
         the remaining data.
 
+        Several data packets are sent without waiting for the status of the
+        previous ones. If a packet fails after a later one was accepted, or
+        while later ones may still be delivered, the number of bytes sent is
+        not known and an exception is raised instead.
+
         Args:
             data (Bytearray): The data to send.
 
@@ -421,24 +569,34 @@ class socket:
             Integer: The number of bytes sent.
 
         Raises:
+            TimeoutException: If the send status response of a data packet
+                is not received in the configured timeout while later packets
+                were sent.
+            XBeeSocketException: If a data packet is rejected after a later
+                one was sent.
             ValueError: If the data to send is `None`.
             ValueError: If the number of bytes to send is `0`.
             XBeeException: If the connection with the XBee device is not open.
             XBeeSocketException: If the socket is not valid.
             XBeeSocketException: If the socket is not open.
         """
-        self.__send(data, False)
+        return self.__send(data, False)
 
-    def sendall(self, data):
+    def sendall(self, data, progress_callback=None):
         """
         Sends data to the socket. The socket must be connected to a remote
         socket. Unlike `send()`, this method continues to send data from bytes
         until either all data has been sent or an error occurs. `None` is
-        returned on success. On error, an exception is raised, and there is no
-        way to determine how much data, if any, was successfully sent.
+        returned on success. On error, an exception is raised; use
+        `progress_callback` to know how much data was successfully sent.
 
         Args:
             data (Bytearray): The data to send.
+            progress_callback (Function, optional): Function called every time
+                a data packet is delivered. It receives two arguments:
+
+                    * The number of bytes delivered so far as integer.
+                    * The total number of bytes to send as integer.
 
         Raises:
             TimeoutException: If the send status response is not received in
@@ -450,7 +608,7 @@ class socket:
             XBeeSocketException: If the send status is not `SUCCESS`.
             XBeeSocketException: If the socket is not open.
         """
-        self.__send(data)
+        self.__send(data, progress_callback=progress_callback)
 
     def sendto(self, data, address):
         """
@@ -524,11 +682,13 @@ class socket:
         self.__connected = False
         self.__socket_id = None
         self.__source_port = None
-        self.__data_received = bytearray()
-        self.__data_received_from_dict = OrderedDict()
+        if self.__tx_pipeline is not None:
+            self.__tx_pipeline.cancel_all()
+        self.__clear_received_data()
         self.__unregister_state_callback()
         self.__unregister_data_received_callback()
         self.__unregister_data_received_from_callback()
+        self.__unregister_client_callback()
 
     def setsocketopt(self, option, value):
         """
@@ -678,14 +838,14 @@ class socket:
                 self.__connected = False
                 self.__socket_id = None
                 self.__source_port = None
-                self.__data_received = bytearray()
-                self.__data_received_from_dict = OrderedDict()
+                self.__clear_received_data()
                 self.__unregister_state_callback()
                 self.__unregister_data_received_callback()
                 self.__unregister_data_received_from_callback()
 
         self.__socket_state_callback = socket_state_callback
-        self.__xbee.add_socket_state_received_callback(socket_state_callback)
+        self.__demux.add(_SocketDemux.STATE, self.__socket_id,
+                         socket_state_callback)
 
     def __unregister_state_callback(self):
         """
@@ -694,7 +854,7 @@ class socket:
         if self.__socket_state_callback is None:
             return
 
-        self.__xbee.del_socket_state_received_callback(self.__socket_state_callback)
+        self.__demux.remove(self.__socket_state_callback)
         self.__socket_state_callback = None
 
     def __register_data_received_callback(self):
@@ -709,12 +869,16 @@ class socket:
             if self.__socket_id != socket_id:
                 return
 
-            self.__data_received_lock.acquire()
-            self.__data_received += payload
-            self.__data_received_lock.release()
+            with self.__rx_cond:
+                self.__data_received.append(payload)
+                self.__stored(len(payload))
+            self.__notify_selectors()
 
+        with self.__rx_cond:
+            self.__rx_closed = False
         self.__data_received_callback = data_received_callback
-        self.__xbee.add_socket_data_received_callback(data_received_callback)
+        self.__demux.add(_SocketDemux.DATA, self.__socket_id,
+                         data_received_callback)
 
     def __unregister_data_received_callback(self):
         """
@@ -723,7 +887,7 @@ class socket:
         if self.__data_received_callback is None:
             return
 
-        self.__xbee.del_socket_data_received_callback(self.__data_received_callback)
+        self.__demux.remove(self.__data_received_callback)
         self.__data_received_callback = None
 
     def __register_data_received_from_callback(self):
@@ -738,21 +902,22 @@ class socket:
             if self.__socket_id != socket_id:
                 return
 
-            payload_added = False
-            # Check if the address already exists in the dictionary to append
-            # the payload or insert a new entry.
-            self.__data_received_from_dict_lock.acquire()
-            for addr in self.__data_received_from_dict.keys():
-                if addr[0] == address[0] and addr[1] == address[1]:
-                    self.__data_received_from_dict[addr] += payload
-                    payload_added = True
-                    break
-            if not payload_added:
-                self.__data_received_from_dict[address] = payload
-            self.__data_received_from_dict_lock.release()
-
+            with self.__rx_cond:
+                # Append the payload to the data of the address, or insert a
+                # new entry if there is no data from it.
+                buffer = self.__data_received_from_dict.get(address)
+                if buffer is None:
+                    buffer = _ReceiveBuffer()
+                    self.__data_received_from_dict[address] = buffer
+                buffer.append(payload)
+                self.__stored(len(payload))
+            self.__notify_selectors()
+
+        with self.__rx_cond:
+            self.__rx_closed = False
         self.__data_received_from_callback = data_received_from_callback
-        self.__xbee.add_socket_data_received_from_callback(data_received_from_callback)
+        self.__demux.add(_SocketDemux.DATA_FROM, self.__socket_id,
+                         data_received_from_callback)
 
     def __unregister_data_received_from_callback(self):
         """
@@ -761,21 +926,190 @@ class socket:
         if self.__data_received_from_callback is None:
             return
 
-        self.__xbee.del_socket_data_received_from_callback(self.__data_received_from_callback)
+        self.__demux.remove(self.__data_received_from_callback)
         self.__data_received_from_callback = None
 
-    def __send(self, data, send_all=True):
+    def __register_client_callback(self):
+        """
+        Registers the client callback to queue the clients connected to the
+        listening socket until they are accepted.
+        """
+        if self.__client_callback is not None:
+            return
+
+        def client_callback(packet):
+            if packet.socket_id != self.__socket_id:
+                return
+
+            # Create the socket of the client right away, so no data
+            # received before accepting it is lost.
+            conn = socket(self.__xbee, self.__ip_protocol)
+            conn.__socket_id = packet.client_socket_id
+            conn.__connected = True
+            conn.__register_state_callback()
+            conn.__register_data_received_callback()
+
+            with self.__rx_cond:
+                self.__pending_clients.append(
+                    (conn, (packet.remote_address, packet.remote_port)))
+                self.__rx_cond.notify_all()
+            self.__notify_selectors()
+
+        self.__client_callback = client_callback
+        self.__demux.add(_SocketDemux.CLIENT, self.__socket_id, client_callback)
+
+    def __unregister_client_callback(self):
+        """
+        Unregisters the client callback and closes the clients not accepted.
+        """
+        if self.__client_callback is None:
+            return
+
+        self.__demux.remove(self.__client_callback)
+        self.__client_callback = None
+        self.__is_listening = False
+        while self.__pending_clients:
+            conn = self.__pending_clients.popleft()[0]
+            try:
+                conn.close()
+            except XBeeException:
+                pass
+
+    def __wait_data(self, has_data):
+        """
+        Waits until there is received data, the socket timeout expires or the
+        socket is closed. Must be called with the receive condition held.
+
+        Args:
+            has_data (Function): Returns whether there is data to read.
+
+        Returns:
+            Boolean: `True` if there is data to read, `False` otherwise.
+        """
+        deadline = None if self.getblocking() else time.monotonic() + self.__timeout
+        while not has_data() and not self.__rx_closed:
+            if deadline is None:
+                self.__rx_cond.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.__rx_cond.wait(remaining)
+
+        return bool(has_data())
+
+    def __stored(self, size):
+        """
+        Accounts the given number of received bytes and wakes up the readers.
+        Warns when the buffered data reaches the warning threshold. Must be
+        called with the receive condition held.
+
+        Args:
+            size (Integer): Number of bytes stored.
+        """
+        self.__rx_size += size
+        if self.__rx_size >= self.__rx_warning and not self.__rx_warned:
+            self.__rx_warned = True
+            self._log.warning("Socket %s: %d received bytes not read yet",
+                              self.__socket_id, self.__rx_size)
+        self.__rx_cond.notify_all()
+
+    def __consumed(self, size):
+        """
+        Accounts the given number of read bytes. Must be called with the
+        receive condition held.
+
+        Args:
+            size (Integer): Number of bytes read.
+        """
+        self.__rx_size -= size
+        if self.__rx_size < self.__rx_warning:
+            self.__rx_warned = False
+
+    def __clear_received_data(self):
+        """
+        Discards the received data and wakes up the waiting readers.
+        """
+        with self.__rx_cond:
+            self.__data_received = _ReceiveBuffer()
+            self.__data_received_from_dict = OrderedDict()
+            self.__rx_size = 0
+            self.__rx_warned = False
+            self.__rx_closed = True
+            self.__rx_cond.notify_all()
+        self.__notify_selectors()
+
+    def __notify_selectors(self):
+        """
+        Wakes up the selectors monitoring the socket, as its readiness may
+        have changed. Must be called without the receive condition held.
+        """
+        for selector in list(self.__selectors):
+            selector._socket_changed(self)
+
+    def _add_selector(self, selector):
+        """
+        Adds a selector to be woken up when the readiness of the socket
+        changes.
+
+        Args:
+            selector (:class:`.XBeeSocketSelector`): The selector.
+        """
+        self.__selectors.add(selector)
+
+    def _del_selector(self, selector):
+        """
+        Removes a selector added with :meth:`._add_selector`.
+
+        Args:
+            selector (:class:`.XBeeSocketSelector`): The selector.
+        """
+        self.__selectors.discard(selector)
+
+    def _get_ready_events(self):
+        """
+        Returns the events the socket is ready for.
+
+        Returns:
+            Integer: Bitmask of `EVENT_READ`, `EVENT_WRITE` and `EVENT_CLOSE`.
+        """
+        events = 0
+        with self.__rx_cond:
+            if (self.__data_received or self.__data_received_from_dict
+                    or self.__pending_clients or self.__rx_closed):
+                events |= EVENT_READ
+            if self.__rx_closed:
+                events |= EVENT_CLOSE
+            elif self.__connected or self.__ip_protocol == IPProtocol.UDP:
+                events |= EVENT_WRITE
+        return events
+
+    def __send(self, data, send_all=True, progress_callback=None):
         """
         Sends data to the socket. The socket must be connected to a remote
         socket. Depending on the value of `send_all`, the method will raise an
         exception or return the number of bytes sent when there is an error
         sending a data packet.
 
+        Data packets are sent without waiting for the status of the previous
+        ones, keeping at most the send window of them in flight. The window
+        grows while the status latency stays close to the lowest observed one
+        and shrinks when the latency increases or the XBee runs out of
+        buffers. A packet rejected for lack of buffers is sent again if no
+        later packet was accepted, so the data is never reordered.
+
         Args:
             data (Bytearray): The data to send.
             send_all (Boolean): `True` to raise an exception when there is an
                 error sending a data packet. `False` to return the number of
-                bytes sent when there is an error sending a data packet.
+                bytes sent when there is an error sending a data packet, if
+                no later packet was accepted or is still in flight.
+            progress_callback (Function, optional): Function called every time
+                a data packet is delivered, receiving the number of bytes
+                delivered so far and the total number of bytes to send.
+
+        Returns:
+            Integer: The number of bytes sent, `None` if `send_all` is `True`.
 
         Raises:
             TimeoutException: If the send status response is not received in
@@ -798,27 +1132,133 @@ class socket:
         if not self.__connected:
             raise XBeeSocketException(message="Socket is not connected")
 
-        sent_bytes = None if send_all else 0
+        if self.__tx_pipeline is None:
+            self.__tx_pipeline = TransmitPipeline(
+                self.__xbee, window=self.__tx_window.size)
+        timeout = self.__get_timeout()
+        if timeout < 0:
+            timeout = threading.TIMEOUT_MAX
+
+        chunks = list(self.__split_payload(data))
+        total = len(data)
+        sent_bytes = 0
+        next_chunk = 0
+        retries = 0
+        # In-flight packets as [chunk index, future, send time, status time].
+        in_flight = deque()
+        # Whether a packet after the first not delivered one was accepted.
+        later_accepted = False
+
+        try:
+            while next_chunk < len(chunks) or in_flight:
+                # Fill the window, unless a packet in flight was rejected:
+                # later packets could be accepted before it is sent again.
+                while (next_chunk < len(chunks)
+                       and len(in_flight) < self.__tx_window.size
+                       and not self.__any_rejected(in_flight)):
+                    send_packet = SocketSendPacket(
+                        self.__xbee.get_next_frame_id(), self.__socket_id,
+                        chunks[next_chunk])
+                    entry = [next_chunk, None, time.monotonic(), None]
+                    entry[1] = self.__tx_pipeline.send(send_packet, timeout)
+                    entry[1].add_done_callback(
+                        lambda _f, e=entry: e.__setitem__(3, time.monotonic()))
+                    in_flight.append(entry)
+                    next_chunk += 1
+
+                # Wait for the oldest packet, data is delivered in order.
+                entry = in_flight.popleft()
+                status = self.__wait_send_status(entry[1], timeout)
+                if status is None:
+                    self.__tx_window.delivered(
+                        (entry[3] or time.monotonic()) - entry[2])
+                    self.__update_pipeline_window()
+                    sent_bytes += len(chunks[entry[0]])
+                    retries = 0
+                    if progress_callback is not None:
+                        progress_callback(sent_bytes, total)
+                    continue
+
+                if (status not in (TransmitStatus.NO_BUFFERS,
+                                   TransmitStatus.RESOURCE_ERROR)
+                        or retries >= self.__MAX_SEND_RETRIES):
+                    raise XBeeSocketException(status=status)
+
+                # The XBee ran out of buffers: shrink the window and, once
+                # the packets in flight are resolved, send again from the
+                # rejected one if none of them was accepted.
+                self.__tx_window.congested()
+                self.__update_pipeline_window()
+                while in_flight:
+                    if self.__wait_send_status(
+                            in_flight.popleft()[1], timeout) is None:
+                        later_accepted = True
+                if later_accepted:
+                    raise XBeeSocketException(status=status)
+                retries += 1
+                next_chunk = entry[0]
+                time.sleep(self.__tx_window.min_rtt or 0)
+        except (TimeoutException, XBeeSocketException) as exc:
+            # Raise the exception only if 'send_all' flag is set, otherwise
+            # return the number of bytes sent. The count is only exact if no
+            # later packet was accepted or may still be delivered, as
+            # sending the remaining data again would duplicate them.
+            if send_all or later_accepted or in_flight:
+                raise exc
+            return sent_bytes
 
-        # Send as many packets as needed to deliver all the provided data.
-        for chunk in self.__split_payload(data):
-            send_packet = SocketSendPacket(self.__xbee.get_next_frame_id(),
-                                           self.__socket_id, chunk)
-            try:
-                response_packet = self.__xbee.send_packet_sync_and_get_response(
-                    send_packet, timeout=self.__get_timeout())
-                self.__check_response(response_packet)
-            except (TimeoutException, XBeeSocketException) as exc:
-                # Raise the exception only if 'send_all' flag is set, otherwise
-                # return the number of bytes sent.
-                if send_all:
-                    raise exc
-                return sent_bytes
-            # Increase the number of bytes sent.
-            if not send_all:
-                sent_bytes += len(chunk)
         # Return the number of bytes sent.
-        return sent_bytes
+        return None if send_all else sent_bytes
+
+    @staticmethod
+    def __any_rejected(in_flight):
+        """
+        Returns whether the transmit status of any data packet in flight
+        was already received and is not successful.
+
+        Args:
+            in_flight (Iterable): In-flight packets as [chunk index, future,
+                send time, status time].
+
+        Returns:
+            Boolean: `True` if any packet was rejected, `False` otherwise.
+        """
+        return any(entry[1].done() and entry[1].exception() is not None
+                   for entry in in_flight)
+
+    @staticmethod
+    def __wait_send_status(future, timeout):
+        """
+        Waits for the transmit status of a data packet.
+
+        Args:
+            future (:class:`concurrent.futures.Future`): Future of the
+                transmit status.
+            timeout (Float): Maximum time in seconds to wait.
+
+        Returns:
+            :class:`.TransmitStatus`: The transmit status if it is not
+                successful, `None` otherwise.
+
+        Raises:
+            TimeoutException: If the status is not received in `timeout`
+                seconds.
+        """
+        try:
+            future.result(timeout)
+        except FutureTimeoutError:
+            raise TimeoutException(message="Send status not received in the "
+                                           "configured timeout.")
+        except TransmitException as exc:
+            return exc.status
+        return None
+
+    def __update_pipeline_window(self):
+        """
+        Sets the window of the transmit pipeline to the send window.
+        """
+        if self.__tx_pipeline is not None:
+            self.__tx_pipeline.window = self.__tx_window.size
 
     @property
     def is_connected(self):
@@ -872,3 +1312,473 @@ class socket:
                 to be non blocking or `-1` if the socket is configured to be blocking.
         """
         return -1 if self.getblocking() else self.__timeout
+
+
+class _SendWindow:
+    """
+    This class keeps the number of data packets of a socket sent without
+    waiting for their transmit status, adapted to the delivery latency and
+    the buffer errors of the XBee.
+
+    The window grows by one packet per window while the status latency stays
+    close to the lowest observed one, and shrinks when the latency doubles,
+    as the extra packets are only waiting in the XBee buffers. When the XBee
+    runs out of buffers, the window is halved and kept below the window that
+    filled them from then on.
+
+    It is not thread safe.
+    """
+
+    def __init__(self, size, max_size):
+        """
+        Class constructor. Instantiates a new :class:`._SendWindow`.
+
+        Args:
+            size (Integer): The initial window in packets.
+            max_size (Integer): The maximum window in packets.
+
+        Raises:
+            ValueError: If `size` or `max_size` is less than `1`.
+        """
+        self.__size = None
+        self.__max_size = None
+        self.__min_rtt = None
+        self.set(size, max_size=max_size)
+
+    @property
+    def size(self):
+        """
+        Returns the current window.
+
+        Returns:
+            Integer: The window in packets.
+        """
+        return int(self.__size)
+
+    @property
+    def min_rtt(self):
+        """
+        Returns the lowest delivery latency observed.
+
+        Returns:
+            Float: The latency in seconds, `None` if no packet was delivered.
+        """
+        return self.__min_rtt
+
+    def set(self, size, max_size=None):
+        """
+        Sets the window and, optionally, its maximum.
+
+        Args:
+            size (Integer): The new window in packets.
+            max_size (Integer, optional): The new maximum window in packets.
+                If not provided, the current maximum is kept.
+
+        Raises:
+            ValueError: If `size` or `max_size` is less than `1`.
+        """
+        if size < 1 or (max_size is not None and max_size < 1):
+            raise ValueError("Send window must be greater than 0")
+        if max_size is not None:
+            self.__max_size = max_size
+        self.__resize(size)
+
+    def delivered(self, rtt):
+        """
+        Adapts the window after a data packet is delivered.
+
+        Args:
+            rtt (Float): Time in seconds the packet took to be delivered.
+        """
+        if self.__min_rtt is None or rtt < self.__min_rtt:
+            self.__min_rtt = rtt
+        if rtt <= 1.1 * self.__min_rtt:
+            self.__resize(self.__size + 1 / self.__size)
+        elif rtt > 2 * self.__min_rtt:
+            self.__resize(self.__size - 1 / self.__size)
+
+    def congested(self):
+        """
+        Adapts the window after the XBee rejects a data packet for lack of
+        buffers.
+        """
+        self.__max_size = max(1, int(self.__size) - 1)
+        self.__resize(self.__size / 2)
+
+    def __resize(self, size):
+        """
+        Sets the window, limiting it to the valid range.
+
+        Args:
+            size (Float): The new window in packets.
+        """
+        self.__size = max(1, min(self.__max_size, size))
+
+
+class _ReceiveBuffer:
+    """
+    This class stores the data received in a socket as the list of received
+    payloads. Reading consumes them without moving the remaining data, so
+    reading a large amount of data in small pieces takes linear time.
+
+    It is not thread safe.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new empty :class:`._ReceiveBuffer`.
+        """
+        self.__chunks = deque()
+        # Number of bytes already read from the first chunk.
+        self.__offset = 0
+        self.__size = 0
+
+    def __len__(self):
+        return self.__size
+
+    def append(self, data):
+        """
+        Stores the given received data. The data must not be modified later.
+
+        Args:
+            data (Bytearray or Bytes): The received data.
+        """
+        if data:
+            self.__chunks.append(data)
+            self.__size += len(data)
+
+    def read(self, nbytes):
+        """
+        Reads and consumes up to the given number of bytes.
+
+        Args:
+            nbytes (Integer): Maximum number of bytes to read.
+
+        Returns:
+            Bytearray: The read data.
+        """
+        data = bytearray(min(nbytes, self.__size))
+        self.read_into(memoryview(data), len(data))
+        return data
+
+    def read_into(self, view, nbytes):
+        """
+        Reads and consumes up to the given number of bytes into the provided
+        buffer.
+
+        Args:
+            view (memoryview): Writable byte buffer to store the data.
+            nbytes (Integer): Maximum number of bytes to read.
+
+        Returns:
+            Integer: The number of bytes read.
+        """
+        nbytes = min(nbytes, self.__size)
+        copied = 0
+        while copied < nbytes:
+            chunk = self.__chunks[0]
+            size = min(len(chunk) - self.__offset, nbytes - copied)
+            with memoryview(chunk) as chunk_view:
+                view[copied:copied + size] = chunk_view[self.__offset:self.__offset + size]
+            copied += size
+            self.__offset += size
+            if self.__offset == len(chunk):
+                self.__chunks.popleft()
+                self.__offset = 0
+
+        self.__size -= copied
+        return copied
+
+
+class _SocketDemux:
+    """
+    This class routes the socket frames received by a Cellular device to the
+    callbacks of the socket they belong to. It registers a single packet
+    callback in the device, so the cost of dispatching a frame does not
+    depend on the number of open sockets, and all socket frames are handled
+    in the order they are received: the socket of a new client is routed
+    before the data it sends is handled.
+    """
+
+    STATE = 0
+    DATA = 1
+    DATA_FROM = 2
+    CLIENT = 3
+
+    __lock = threading.Lock()
+
+    def __init__(self, xbee):
+        """
+        Class constructor. Instantiates a new :class:`._SocketDemux` object
+        and registers its callbacks in the given device.
+
+        Args:
+            xbee (:class:`.CellularDevice`): The Cellular device.
+        """
+        self.__routes_lock = threading.Lock()
+        # Kind -> socket ID -> callbacks, and callback -> (kind, socket ID).
+        self.__routes = {self.STATE: {}, self.DATA: {}, self.DATA_FROM: {},
+                         self.CLIENT: {}}
+        self.__callbacks = {}
+
+        xbee.add_packet_received_callback(self.__packet_received)
+
+    @classmethod
+    def get(cls, xbee):
+        """
+        Returns the demultiplexer of the given device, creating it if needed.
+
+        Args:
+            xbee (:class:`.CellularDevice`): The Cellular device.
+
+        Returns:
+            :class:`._SocketDemux`: The demultiplexer of the device.
+        """
+        with cls.__lock:
+            if xbee._socket_demux is None:
+                xbee._socket_demux = cls(xbee)
+            return xbee._socket_demux
+
+    def add(self, kind, socket_id, callback):
+        """
+        Routes the frames of the given kind and socket ID to a callback.
+
+        Args:
+            kind (Integer): `STATE`, `DATA`, `DATA_FROM` or `CLIENT`.
+            socket_id (Integer): The socket ID.
+            callback (Function): The callback, it receives the same arguments
+                as the callbacks of the device for that kind of frame.
+        """
+        with self.__routes_lock:
+            self.__routes[kind].setdefault(socket_id, []).append(callback)
+            self.__callbacks[callback] = (kind, socket_id)
+
+    def remove(self, callback):
+        """
+        Removes a callback added with :meth:`.add`.
+
+        Args:
+            callback (Function): The callback to remove.
+        """
+        with self.__routes_lock:
+            route = self.__callbacks.pop(callback, None)
+            if route is None:
+                return
+            callbacks = self.__routes[route[0]][route[1]]
+            callbacks.remove(callback)
+            if not callbacks:
+                del self.__routes[route[0]][route[1]]
+
+    def __get_callbacks(self, kind, socket_id):
+        """
+        Returns the callbacks of the given kind and socket ID.
+
+        Args:
+            kind (Integer): The kind of frame.
+            socket_id (Integer): The socket ID.
+
+        Returns:
+            Tuple: The callbacks.
+        """
+        with self.__routes_lock:
+            return tuple(self.__routes[kind].get(socket_id, ()))
+
+    def __packet_received(self, packet):
+        f_type = packet.get_frame_type()
+        if f_type == ApiFrameType.SOCKET_RECEIVE:
+            for callback in self.__get_callbacks(self.DATA, packet.socket_id):
+                callback(packet.socket_id, packet.payload)
+        elif f_type == ApiFrameType.SOCKET_RECEIVE_FROM:
+            address = (str(packet.source_address), packet.source_port)
+            for callback in self.__get_callbacks(self.DATA_FROM,
+                                                 packet.socket_id):
+                callback(packet.socket_id, address, packet.payload)
+        elif f_type == ApiFrameType.SOCKET_STATE:
+            for callback in self.__get_callbacks(self.STATE, packet.socket_id):
+                callback(packet.socket_id, packet.state)
+        elif f_type == ApiFrameType.SOCKET_NEW_IPV4_CLIENT:
+            for callback in self.__get_callbacks(self.CLIENT,
+                                                 packet.socket_id):
+                callback(packet)
+
+
+class XBeeSocketSelector(selectors.BaseSelector):
+    """
+    This class waits for several XBee sockets to be ready for I/O with the
+    interface of the standard :class:`selectors.BaseSelector`.
+
+    Sockets can be registered for `EVENT_READ` (received data, a client to
+    accept or closed), `EVENT_WRITE` (able to send) and `EVENT_CLOSE`. As
+    XBee sockets have no file descriptor, the `fd` of the returned keys is
+    the identity of the socket object.
+
+    Readiness is level-triggered: a socket is returned by :meth:`.select` as
+    long as it is ready. Only the sockets whose state changed or that were
+    ready in the previous call are checked, so a call takes time proportional
+    to the active sockets, not to the registered ones.
+    """
+
+    def __init__(self):
+        """
+        Class constructor. Instantiates a new :class:`.XBeeSocketSelector`
+        object.
+        """
+        self.__cond = threading.Condition()
+        self.__keys = {}
+        self.__candidates = set()
+
+    def register(self, fileobj, events, data=None):
+        """
+        Registers a socket to be monitored for the given events.
+
+        Args:
+            fileobj (:class:`.socket`): The XBee socket.
+            events (Integer): Bitmask of `EVENT_READ`, `EVENT_WRITE` and
+                `EVENT_CLOSE`.
+            data (Object, optional): Data attached to the socket key.
+
+        Returns:
+            :class:`selectors.SelectorKey`: The key of the socket.
+
+        Raises:
+            ValueError: If `fileobj` is not an XBee socket or `events` is not
+                valid.
+            KeyError: If the socket is already registered.
+        """
+        if not isinstance(fileobj, socket):
+            raise ValueError("Object must be an XBee socket")
+        if not events or events & ~(EVENT_READ | EVENT_WRITE | EVENT_CLOSE):
+            raise ValueError("Invalid events: %r" % events)
+
+        key = selectors.SelectorKey(fileobj, id(fileobj), events, data)
+        with self.__cond:
+            if fileobj in self.__keys:
+                raise KeyError("%r is already registered" % fileobj)
+            self.__keys[fileobj] = key
+            self.__candidates.add(fileobj)
+            self.__cond.notify_all()
+        fileobj._add_selector(self)
+
+        return key
+
+    def unregister(self, fileobj):
+        """
+        Stops monitoring a socket.
+
+        Args:
+            fileobj (:class:`.socket`): The XBee socket.
+
+        Returns:
+            :class:`selectors.SelectorKey`: The key of the socket.
+
+        Raises:
+            KeyError: If the socket is not registered.
+        """
+        with self.__cond:
+            key = self.__keys.pop(fileobj, None)
+            if key is None:
+                raise KeyError("%r is not registered" % fileobj)
+            self.__candidates.discard(fileobj)
+        fileobj._del_selector(self)
+
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        """
+        Changes the monitored events or the attached data of a socket.
+
+        Args:
+            fileobj (:class:`.socket`): The XBee socket.
+            events (Integer): Bitmask of `EVENT_READ`, `EVENT_WRITE` and
+                `EVENT_CLOSE`.
+            data (Object, optional): Data attached to the socket key.
+
+        Returns:
+            :class:`selectors.SelectorKey`: The new key of the socket.
+
+        Raises:
+            ValueError: If `events` is not valid.
+            KeyError: If the socket is not registered.
+        """
+        if not events or events & ~(EVENT_READ | EVENT_WRITE | EVENT_CLOSE):
+            raise ValueError("Invalid events: %r" % events)
+
+        with self.__cond:
+            if fileobj not in self.__keys:
+                raise KeyError("%r is not registered" % fileobj)
+            key = selectors.SelectorKey(fileobj, id(fileobj), events, data)
+            self.__keys[fileobj] = key
+            self.__candidates.add(fileobj)
+            self.__cond.notify_all()
+
+        return key
+
+    def select(self, timeout=None):
+        """
+        Waits until some registered sockets are ready or the timeout expires.
+
+        Args:
+            timeout (Float, optional): Maximum time to wait in seconds, `None`
+                to wait until a socket is ready, `0` or less to poll.
+
+        Returns:
+            List: List of `(key, events)` pairs, one per ready socket, where
+                `events` is the bitmask of ready events of the socket. Empty
+                if the timeout expires.
+        """
+        deadline = None if timeout is None else time.monotonic() + max(timeout, 0)
+        with self.__cond:
+            while True:
+                ready = []
+                for sock in self.__candidates:
+                    key = self.__keys.get(sock)
+                    if key is None:
+                        continue
+                    events = sock._get_ready_events() & key.events
+                    if events:
+                        ready.append((key, events))
+                # Ready sockets are checked again in the next call.
+                self.__candidates = {key.fileobj for key, _ in ready}
+                if ready:
+                    return ready
+
+                if deadline is None:
+                    self.__cond.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return ready
+                self.__cond.wait(remaining)
+
+    def close(self):
+        """
+        Unregisters all the sockets.
+        """
+        with self.__cond:
+            sockets = list(self.__keys)
+            self.__keys.clear()
+            self.__candidates.clear()
+        for sock in sockets:
+            sock._del_selector(self)
+
+    def get_map(self):
+        """
+        Returns a mapping of the registered sockets to their keys.
+
+        Returns:
+            Dictionary: Socket to :class:`selectors.SelectorKey` mapping.
+        """
+        with self.__cond:
+            return dict(self.__keys)
+
+    def _socket_changed(self, sock):
+        """
+        Notifies that the readiness of a socket may have changed.
+
+        Args:
+            sock (:class:`.socket`): The XBee socket.
+        """
+        with self.__cond:
+            if sock in self.__keys:
+                self.__candidates.add(sock)
+                self.__cond.notify_all()
@@ -0,0 +1,142 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import queue
+import threading
+
+from digi.xbee.comm_interface import XBeeCommunicationInterface
+from digi.xbee.models.address import XBee16BitAddress
+from digi.xbee.models.status import ATCommandStatus, TransmitStatus
+from digi.xbee.packets import factory
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.common import ATCommResponsePacket, \
+    RemoteATCommandResponsePacket, TransmitStatusPacket
+
+
+LOCAL_INFO = (1, 0x42, 0x1009, "0013A20040AAAAAA", "0000", "LOCAL", 1)
+"""
+Local XBee information returned by :class:`.FakeInterface`: API mode, XBee3
+Zigbee, coordinator.
+"""
+
+
+class FakeInterface(XBeeCommunicationInterface):
+    """
+    Communication interface that answers the sent frames with a responder
+    function instead of a real XBee.
+
+    The responder receives each sent packet and returns the packets to
+    answer with (or `None`). They are read after `delay` seconds, without
+    blocking the sender, to simulate the round trip time of the radio.
+    Tests may also inject packets at any time.
+    """
+
+    def __init__(self, responder=None, info=LOCAL_INFO, delay=0):
+        self.responder = responder
+        self.info = info
+        self.delay = delay
+        self.sent = []
+        self.__frames = queue.Queue()
+        self.__open = False
+        self.__timeout = 0.1
+
+    def open(self):
+        self.__open = True
+
+    def close(self):
+        self.__open = False
+
+    @property
+    def is_interface_open(self):
+        return self.__open
+
+    def wait_for_frame(self, operating_mode):
+        try:
+            return self.__frames.get(timeout=0.05)
+        except queue.Empty:
+            return None
+
+    def quit_reading(self):
+        pass
+
+    def write_frame(self, frame):
+        packet = factory.build_frame(frame)
+        self.sent.append(packet)
+        if not self.responder:
+            return
+        responses = self.responder(packet) or ()
+        if not self.delay:
+            for response in responses:
+                self.inject(response)
+        elif responses:
+            timer = threading.Timer(
+                self.delay, lambda: [self.inject(r) for r in responses])
+            timer.daemon = True
+            timer.start()
+
+    def inject(self, packet):
+        """
+        Makes the interface read the given packet.
+
+        Args:
+            packet (:class:`.XBeeAPIPacket`): The packet to read.
+        """
+        self.__frames.put(packet.output())
+
+    def get_local_xbee_info(self):
+        return self.info
+
+    @property
+    def timeout(self):
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, timeout):
+        self.__timeout = timeout
+
+
+def at_responder(values, transmit_status=TransmitStatus.SUCCESS):
+    """
+    Returns a responder that answers local and remote AT commands with the
+    given values and transmit requests with the given status.
+
+    Args:
+        values (Dictionary): AT command -> value (Bytes).
+        transmit_status (:class:`.TransmitStatus`, optional): Status of the
+            transmit requests, `None` to not answer them.
+
+    Returns:
+        Function: The responder.
+    """
+    def respond(packet):
+        f_type = packet.get_frame_type()
+        if f_type in (ApiFrameType.AT_COMMAND, ApiFrameType.AT_COMMAND_QUEUE):
+            value = None if packet.parameter else \
+                bytearray(values.get(packet.command.upper(), b"\x00"))
+            return [ATCommResponsePacket(packet.frame_id, packet.command,
+                                         ATCommandStatus.OK,
+                                         comm_value=value)]
+        if f_type == ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
+            value = None if packet.parameter else \
+                bytearray(values.get(packet.command.upper(), b"\x00"))
+            return [RemoteATCommandResponsePacket(
+                packet.frame_id, packet.x64bit_dest_addr,
+                packet.x16bit_dest_addr, packet.command, ATCommandStatus.OK,
+                comm_value=value)]
+        if f_type == ApiFrameType.TRANSMIT_REQUEST and transmit_status:
+            return [TransmitStatusPacket(
+                packet.frame_id, XBee16BitAddress.from_hex_string("1234"), 0,
+                transmit_status)]
+        return None
+
+    return respond
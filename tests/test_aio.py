@@ -0,0 +1,162 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import asyncio
+import os
+from ipaddress import IPv4Address
+import sys
+import threading
+import unittest
+
+from digi.xbee.exception import TransmitException
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.protocol import XBeeProtocol
+from digi.xbee.models.status import SocketState, SocketStatus, \
+    TransmitStatus
+from digi.xbee.packets import factory
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.socket import SocketCreateResponsePacket, \
+    SocketListenResponsePacket, SocketNewIPv4ClientPacket, \
+    SocketReceivePacket, SocketStatePacket
+from digi.xbee.serial import FrameBuffer
+
+from tests.fakes import at_responder
+
+tty = None
+# The tests use asyncio.run(), added in Python 3.7.
+if sys.version_info >= (3, 7):
+    try:
+        import tty
+        from digi.xbee.aio import AsyncXBeeDevice, AsyncRemoteXBeeDevice, \
+            start_server
+    except ImportError:
+        tty = None
+
+
+VALUES = {"HV": b"\x42", "VR": b"\x10\x09", "SH": b"\x00\x13\xA2\x00",
+          "SL": b"\x40\xAA\xAA\xAA", "NI": b"LOCAL", "MY": b"\x00\x00"}
+
+CELLULAR_VALUES = dict(VALUES, HV=b"\x4B", VR=b"\x01\x14\x10")
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "Requires Python 3.7")
+@unittest.skipIf(tty is None or os.name != "posix", "Requires a POSIX pty")
+class AsyncXBeeDeviceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.master, slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(slave)
+        self.port = os.ttyname(slave)
+        self.slave = slave
+        self.values = VALUES
+        self.status = TransmitStatus.SUCCESS
+        self.radio = threading.Thread(target=self.__radio, daemon=True)
+        self.radio.start()
+
+    def tearDown(self):
+        # Stop the radio before closing the master: the next test may get
+        # the same descriptor number.
+        os.close(self.slave)
+        self.radio.join(1)
+        os.close(self.master)
+
+    def __radio(self):
+        frames = FrameBuffer()
+        while True:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            frames.feed(data, OperatingMode.API_MODE)
+            while frames:
+                packet = factory.build_frame(frames.pop())
+                if packet.get_frame_type() == ApiFrameType.SOCKET_CREATE:
+                    responses = [SocketCreateResponsePacket(
+                        packet.frame_id, 0, SocketStatus.SUCCESS)]
+                elif packet.get_frame_type() == ApiFrameType.SOCKET_BIND:
+                    responses = [SocketListenResponsePacket(
+                        packet.frame_id, packet.socket_id,
+                        SocketStatus.SUCCESS)]
+                else:
+                    responses = at_responder(self.values,
+                                             self.status)(packet) or ()
+                for response in responses:
+                    self.__inject(response)
+
+    def __inject(self, packet):
+        os.write(self.master, packet.output())
+
+    def __run(self, coro_func):
+        async def run():
+            xbee = AsyncXBeeDevice(self.port, 9600)
+            await xbee.open()
+            try:
+                return await coro_func(xbee)
+            finally:
+                await xbee.close()
+
+        return asyncio.run(run())
+
+    def test_device_info(self):
+        async def check(xbee):
+            self.assertEqual(xbee.get_protocol(), XBeeProtocol.ZIGBEE)
+            self.assertEqual(str(xbee.get_64bit_addr()), "0013A20040AAAAAA")
+            self.assertEqual(xbee.get_node_id(), "LOCAL")
+            self.assertEqual(str(xbee.get_16bit_addr()), "0000")
+
+        self.__run(check)
+
+    def test_more_requests_than_frame_ids(self):
+        async def check(xbee):
+            values = await asyncio.gather(
+                *[xbee.get_parameter("NI") for _ in range(400)])
+            self.assertEqual(set(map(bytes, values)), {b"LOCAL"})
+            self.assertEqual(xbee.get_frame_id_allocator().in_flight, 0)
+
+        self.__run(check)
+
+    def test_transmit_failure(self):
+        self.status = TransmitStatus.NO_ACK
+
+        async def check(xbee):
+            remote = AsyncRemoteXBeeDevice(xbee, xbee.get_64bit_addr())
+            with self.assertRaises(TransmitException):
+                await xbee.send_data(remote, "data")
+
+        self.__run(check)
+
+    def test_server_client_disconnect(self):
+        self.values = CELLULAR_VALUES
+
+        async def check(xbee):
+            received = asyncio.get_running_loop().create_future()
+
+            async def client_connected(reader, writer):
+                received.set_result(await reader.read())
+                writer.close()
+
+            server = await start_server(client_connected, xbee, 8080)
+            self.__inject(SocketNewIPv4ClientPacket(
+                0, 1, IPv4Address("10.0.0.2"), 5000))
+            self.__inject(SocketReceivePacket(0, 1, b"data"))
+            self.__inject(SocketStatePacket(1, SocketState.TRANSPORT_CLOSED))
+            # The reader reaches EOF when the peer closes the connection.
+            self.assertEqual(await asyncio.wait_for(received, 2), b"data")
+            server.close()
+
+        self.__run(check)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import threading
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice
+from digi.xbee.exception import ATCommandException, TimeoutException
+from digi.xbee.models.status import ATCommandStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.common import ATCommResponsePacket
+
+from tests.fakes import FakeInterface, at_responder
+
+
+class DelayedATResponder(object):
+    """
+    Answers local AT commands after a delay, keeping track of the commands
+    waiting for their answer.
+    """
+
+    def __init__(self, iface, delay=0.02):
+        self.iface = iface
+        self.delay = delay
+        # Command -> delay of its answer, None to not answer
+        self.delays = {}
+        # Command -> status of its answer
+        self.statuses = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, packet):
+        if packet.get_frame_type() not in (ApiFrameType.AT_COMMAND,
+                                           ApiFrameType.AT_COMMAND_QUEUE):
+            return None
+        delay = self.delays.get(packet.command, self.delay)
+        if delay is None:
+            return None
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        response = ATCommResponsePacket(
+            packet.frame_id, packet.command,
+            self.statuses.get(packet.command, ATCommandStatus.OK),
+            comm_value=None if packet.parameter
+            else bytearray(packet.command, "utf8"))
+        threading.Timer(delay, self.__answer, args=(response,)).start()
+        return None
+
+    def __answer(self, response):
+        with self.lock:
+            self.in_flight -= 1
+        self.iface.inject(response)
+
+
+class ATCommandBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface()
+        self.responder = DelayedATResponder(self.iface)
+        self.iface.responder = self.responder
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.xbee.set_sync_ops_timeout(1)
+        self.iface.sent.clear()
+
+    def __sent(self):
+        return [(packet.get_frame_type(), packet.command)
+                for packet in self.iface.sent]
+
+    def test_get_parameters_back_to_back(self):
+        params = ["HV", "VR", "SH", "SL", "NI", "MY", "CE", "SM"]
+        self.responder.delay = 0.05
+        values = self.xbee.get_parameters(params)
+        self.assertEqual(list(values), params)
+        self.assertEqual(values, {param: bytearray(param, "utf8")
+                                  for param in params})
+        self.assertEqual(self.responder.max_in_flight, len(params))
+
+    def test_responses_in_any_order(self):
+        params = ["NI", "VR", "HV", "DB"]
+        # The last command is answered first.
+        for idx, param in enumerate(params):
+            self.responder.delays[param] = 0.08 - 0.02 * idx
+        self.assertEqual(self.xbee.get_parameters(params),
+                         {param: bytearray(param, "utf8") for param in params})
+
+    def test_commands_in_flight_are_bounded(self):
+        params = ["%s%d" % (chr(ord("A") + idx // 10), idx % 10)
+                  for idx in range(40)]
+        values = self.xbee.get_parameters(params)
+        self.assertEqual(len(values), 40)
+        self.assertEqual(self.responder.max_in_flight, 32)
+
+    def test_error_status(self):
+        self.responder.statuses["VR"] = ATCommandStatus.INVALID_PARAMETER
+        with self.assertRaises(ATCommandException):
+            self.xbee.get_parameters(["NI", "VR"])
+
+    def test_timeout(self):
+        self.xbee.set_sync_ops_timeout(0.2)
+        self.responder.delays["VR"] = None
+        with self.assertRaises(TimeoutException):
+            self.xbee.get_parameters(["NI", "VR", "HV"])
+        # The commands after the one not answered were sent anyway.
+        self.assertEqual([command for _, command in self.__sent()],
+                         ["NI", "VR", "HV"])
+
+    def test_set_parameters_applied_once(self):
+        self.xbee.set_parameters([("NI", bytearray(b"NODE")),
+                                  ("ID", bytearray(b"\x01"))], write=True)
+        queue = ApiFrameType.AT_COMMAND_QUEUE
+        self.assertEqual(self.__sent(), [(queue, "NI"), (queue, "ID"),
+                                         (queue, "WR"), (queue, "AC")])
+
+    def test_set_parameters_progress(self):
+        params = [("%s%d" % (chr(ord("A") + idx // 10), idx % 10),
+                   bytearray(b"\x01")) for idx in range(40)]
+        progress = []
+        self.xbee.set_parameters(params, progress_callback=lambda *args:
+                                 progress.append(args))
+        # Reported for each response, not only for each batch.
+        self.assertEqual(progress, [(idx, 40) for idx in range(1, 41)])
+
+    def test_failed_set_parameters_not_applied(self):
+        self.responder.statuses["ID"] = ATCommandStatus.INVALID_PARAMETER
+        with self.assertRaises(ATCommandException):
+            self.xbee.set_parameters({"NI": bytearray(b"NODE"),
+                                      "ID": bytearray(b"\x01")}, write=True)
+        self.assertEqual([command for _, command in self.__sent()],
+                         ["NI", "ID"])
+
+    def test_read_device_info_in_one_batch(self):
+        self.iface.responder = at_responder({
+            "HV": b"\x42", "VR": b"\x10\x09", "SH": b"\x00\x13\xA2\x00",
+            "SL": b"\x40\xAA\xAA\xAA", "NI": b"LOCAL", "MY": b"\x00\x00",
+            "CE": b"\x01", "SM": b"\x00"})
+        self.xbee.read_device_info()
+        self.assertEqual(
+            sorted(command for _, command in self.__sent()),
+            sorted(["HV", "VR", "SH", "SL", "NI", "MY", "CE", "SM"]))
+        self.assertEqual(self.xbee.get_node_id(), "LOCAL")
+
+
+if __name__ == "__main__":
+    unittest.main()
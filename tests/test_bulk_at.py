@@ -0,0 +1,188 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import threading
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice
+from digi.xbee.exception import ATCommandException, TimeoutException
+from digi.xbee.models.options import RemoteATCmdOptions
+from digi.xbee.models.status import ATCommandStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.common import RemoteATCommandResponsePacket
+
+from tests.fakes import FakeInterface, at_responder
+from tests.test_network import x64, x16
+
+
+class RemoteNodes(object):
+    """
+    Answers remote AT commands after a delay, keeping track of the commands
+    waiting for their answer.
+    """
+
+    def __init__(self, iface, delay=0.02):
+        self.iface = iface
+        self.delay = delay
+        self.local = at_responder({})
+        # (64-bit address string, command) -> statuses of the next answers,
+        # None to not answer
+        self.answers = {}
+        self.sent = []
+        self.in_flight = set()
+        self.max_in_flight = 0
+        self.overlapped = False
+        self.lock = threading.Lock()
+
+    def __call__(self, packet):
+        if packet.get_frame_type() != ApiFrameType.REMOTE_AT_COMMAND_REQUEST:
+            return self.local(packet)
+        x64addr = str(packet.x64bit_dest_addr)
+        key = (x64addr, packet.command)
+        with self.lock:
+            self.sent.append((key, packet))
+            statuses = self.answers.get(key)
+            status = statuses.pop(0) if statuses else ATCommandStatus.OK
+            if status is None:
+                return None
+            self.overlapped |= any(addr == x64addr
+                                   for addr, _ in self.in_flight)
+            self.in_flight.add(key)
+            self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+        value = None if packet.parameter \
+            else bytearray(packet.command + x64addr[-2:], "utf8")
+        response = RemoteATCommandResponsePacket(
+            packet.frame_id, packet.x64bit_dest_addr, packet.x16bit_dest_addr,
+            packet.command, status, comm_value=value)
+        threading.Timer(self.delay, self.__answer, args=(key, response)).start()
+        return None
+
+    def __answer(self, key, response):
+        with self.lock:
+            self.in_flight.discard(key)
+        self.iface.inject(response)
+
+    def count(self, key):
+        return len([1 for sent, _ in self.sent if sent == key])
+
+
+class BulkATCommandsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface()
+        self.remotes = RemoteNodes(self.iface)
+        self.iface.responder = self.remotes
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.network = self.xbee.get_network()
+        self.nodes = [RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx))
+                      for idx in range(10)]
+
+    def __value(self, node, command):
+        return bytearray(command + str(node.get_64bit_addr())[-2:], "utf8")
+
+    def test_reads_with_bounded_concurrency(self):
+        commands = ["NI", "VR", "DB"]
+        progress = []
+        results = self.network.bulk_get_parameters(
+            self.nodes, commands, concurrency=4,
+            progress_callback=lambda *args: progress.append(args[3:]))
+        self.assertEqual(results, {node: {command: self.__value(node, command)
+                                          for command in commands}
+                                   for node in self.nodes})
+        self.assertEqual(self.remotes.max_in_flight, 4)
+        # Commands of a node are sent one after another, in order.
+        self.assertFalse(self.remotes.overlapped)
+        for node in self.nodes:
+            self.assertEqual(
+                [packet.command for (addr, _), packet in self.remotes.sent
+                 if addr == str(node.get_64bit_addr())], commands)
+        self.assertEqual(progress, [(idx, 30) for idx in range(1, 31)])
+
+    def test_timeout_is_retried(self):
+        key = (str(x64(0)), "NI")
+        self.remotes.answers[key] = [None]
+        results = self.network.bulk_get_parameters(
+            self.nodes[:2], ["NI"], retries=1, timeout=0.2)
+        self.assertEqual(results[self.nodes[0]]["NI"],
+                         self.__value(self.nodes[0], "NI"))
+        self.assertEqual(self.remotes.count(key), 2)
+
+    def test_timeout_after_retries(self):
+        key = (str(x64(0)), "NI")
+        self.remotes.answers[key] = [None, None]
+        results = self.network.bulk_get_parameters(
+            self.nodes[:2], ["NI", "VR"], retries=1, timeout=0.2)
+        self.assertIsInstance(results[self.nodes[0]]["NI"], TimeoutException)
+        # The next commands of the node are still sent.
+        self.assertEqual(results[self.nodes[0]]["VR"],
+                         self.__value(self.nodes[0], "VR"))
+        self.assertEqual(results[self.nodes[1]]["NI"],
+                         self.__value(self.nodes[1], "NI"))
+        self.assertEqual(self.remotes.count(key), 2)
+
+    def test_transmit_failure_is_retried(self):
+        key = (str(x64(0)), "NI")
+        self.remotes.answers[key] = [ATCommandStatus.TX_FAILURE]
+        results = self.network.bulk_get_parameters(self.nodes[:1], ["NI"],
+                                                   retries=1)
+        self.assertEqual(results[self.nodes[0]]["NI"],
+                         self.__value(self.nodes[0], "NI"))
+        self.assertEqual(self.remotes.count(key), 2)
+
+    def test_command_error_is_not_retried(self):
+        key = (str(x64(0)), "NI")
+        self.remotes.answers[key] = [ATCommandStatus.INVALID_COMMAND]
+        results = self.network.bulk_get_parameters(self.nodes[:1], ["NI"],
+                                                   retries=2)
+        self.assertIsInstance(results[self.nodes[0]]["NI"], ATCommandException)
+        self.assertEqual(self.remotes.count(key), 1)
+
+    def test_set_parameters_in_order(self):
+        self.nodes[1].enable_apply_changes(False)
+        parameters = [("NI", bytearray(b"NODE")), ("ID", bytearray(b"\x01"))]
+        results = self.network.bulk_set_parameters(self.nodes[:2], parameters)
+        self.assertEqual(results, {node: {"NI": None, "ID": None}
+                                   for node in self.nodes[:2]})
+        for node, apply_changes in zip(self.nodes[:2], (True, False)):
+            packets = [packet for (addr, _), packet in self.remotes.sent
+                       if addr == str(node.get_64bit_addr())]
+            self.assertEqual([(p.command, p.parameter) for p in packets],
+                             parameters)
+            self.assertEqual(
+                [bool(p.transmit_options
+                      & RemoteATCmdOptions.APPLY_CHANGES.value)
+                 for p in packets], [apply_changes] * 2)
+
+    def test_duplicated_nodes_are_requested_once(self):
+        copy = RemoteZigBeeDevice(self.xbee, x64(0), x16(0))
+        results = self.network.bulk_get_parameters(
+            self.nodes[:2] + [copy, self.nodes[1]], ["NI"])
+        self.assertEqual(list(results), self.nodes[:2])
+        self.assertEqual(len(self.remotes.sent), 2)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.network.bulk_get_parameters(self.nodes, ["NIX"])
+        with self.assertRaises(ValueError):
+            self.network.bulk_get_parameters(self.nodes, ["NI"], concurrency=0)
+        with self.assertRaises(ValueError):
+            self.network.bulk_get_parameters([self.xbee], ["NI"])
+        with self.assertRaises(ValueError):
+            self.network.bulk_set_parameters(self.nodes, {"NI": None})
+        self.assertEqual(self.remotes.sent, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice, \
+    NetworkEventReason, Connection, LinkQuality, _ConnectionGraph
+
+from tests.fakes import FakeInterface, at_responder
+from tests.test_network import x64, x16
+
+
+class ConnectionGraphTest(unittest.TestCase):
+
+    def setUp(self):
+        self.xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({})))
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.nodes = [RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx))
+                      for idx in range(6)]
+        self.graph = _ConnectionGraph()
+
+    def __connect(self, idx_a, idx_b, lq_a2b=None, lq_b2a=None):
+        conn = Connection(
+            self.nodes[idx_a], self.nodes[idx_b],
+            lq_a2b=LinkQuality(lq=lq_a2b) if lq_a2b is not None else None,
+            lq_b2a=LinkQuality(lq=lq_b2a) if lq_b2a is not None else None)
+        self.graph.add(conn)
+        return conn
+
+    def __indexes(self, nodes):
+        return [self.nodes.index(node) for node in nodes]
+
+    def test_add_get_and_replace(self):
+        conn = self.__connect(0, 1)
+        self.assertIs(self.graph.get(self.nodes[0], self.nodes[1]), conn)
+        self.assertIsNone(self.graph.get(self.nodes[1], self.nodes[0]))
+        # A connection with the same ends replaces the previous one.
+        new_conn = self.__connect(0, 1)
+        self.assertEqual(len(self.graph), 1)
+        self.assertIs(self.graph.get(self.nodes[0], self.nodes[1]), new_conn)
+        self.assertEqual(self.graph.get_node_connections(self.nodes[1]),
+                         [new_conn])
+
+    def test_node_connections_and_degree(self):
+        c_01 = self.__connect(0, 1)
+        c_20 = self.__connect(2, 0)
+        self.__connect(1, 2)
+        self.assertEqual(self.graph.get_node_connections(self.nodes[0]),
+                         [c_01, c_20])
+        self.assertEqual(
+            self.graph.get_node_connections(self.nodes[0], node_a=True),
+            [c_01])
+        self.assertEqual(
+            self.graph.get_node_connections(self.nodes[0], node_a=False),
+            [c_20])
+        self.assertEqual(self.graph.degree(self.nodes[0]), 2)
+        self.assertEqual(self.graph.degree(self.nodes[5]), 0)
+        self.assertEqual(self.graph.get_node_connections(self.nodes[5]), [])
+
+    def test_remove_and_clear(self):
+        c_01 = self.__connect(0, 1)
+        c_12 = self.__connect(1, 2)
+        self.graph.remove(c_01)
+        # Removing twice is harmless.
+        self.graph.remove(c_01)
+        self.assertEqual(self.graph.get_connections(), [c_12])
+        self.assertEqual(self.graph.degree(self.nodes[0]), 0)
+        self.assertEqual(self.graph.degree(self.nodes[1]), 1)
+        self.graph.clear()
+        self.assertEqual(len(self.graph), 0)
+        self.assertEqual(self.graph.get_node_connections(self.nodes[1]), [])
+
+    def test_shortest_path_prefers_best_links(self):
+        # 0 -> 1 -> 2 over good links is cheaper than the direct bad link.
+        self.__connect(0, 1, lq_a2b=250)
+        self.__connect(1, 2, lq_a2b=250)
+        self.__connect(0, 2, lq_a2b=10)
+        path, cost = self.graph.shortest_path(self.nodes[0], self.nodes[2])
+        self.assertEqual(self.__indexes(path), [0, 1, 2])
+        self.assertEqual(cost, 2 * (256 - 250))
+
+    def test_shortest_path_reverse_direction(self):
+        self.__connect(0, 1, lq_a2b=250, lq_b2a=200)
+        self.__connect(1, 2, lq_a2b=255)
+        path, cost = self.graph.shortest_path(self.nodes[2], self.nodes[0])
+        self.assertEqual(self.__indexes(path), [2, 1, 0])
+        # 2 -> 1 uses the known 1 -> 2 quality, 1 -> 0 its own one.
+        self.assertEqual(cost, (256 - 255) + (256 - 200))
+
+    def test_shortest_path_unknown_quality_and_no_path(self):
+        self.__connect(0, 1)
+        self.__connect(2, 3)
+        self.assertEqual(
+            self.graph.shortest_path(self.nodes[0], self.nodes[1])[1], 256)
+        self.assertEqual(self.graph.shortest_path(self.nodes[0], self.nodes[3]),
+                         (None, None))
+        self.assertEqual(self.graph.shortest_path(self.nodes[4], self.nodes[4]),
+                         ([self.nodes[4]], 0))
+
+    def test_articulation_points(self):
+        # Chain 0 - 1 - 2 - 3 with a 3 - 4 - 5 - 3 cycle.
+        for idx_a, idx_b in ((0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (5, 3)):
+            self.__connect(idx_a, idx_b)
+        self.assertEqual(
+            sorted(self.__indexes(self.graph.articulation_points())),
+            [1, 2, 3])
+
+    def test_articulation_points_root_and_cycle(self):
+        # Star with 0 at the center: only the center splits the network.
+        for idx in (1, 2, 3):
+            self.__connect(0, idx)
+        self.assertEqual(self.__indexes(self.graph.articulation_points()), [0])
+        # Closing the cycle 1 - 2 - 3 - 0 leaves no articulation points.
+        self.__connect(1, 2)
+        self.__connect(2, 3)
+        self.assertEqual(self.graph.articulation_points(), [])
+
+
+class NetworkConnectionQueriesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({})))
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.network = self.xbee.get_network()
+        self.nodes = [self.network._add_remote(
+            RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx)),
+            NetworkEventReason.MANUAL) for idx in range(3)]
+        for node_a, node_b in ((self.xbee, self.nodes[0]),
+                               (self.nodes[0], self.nodes[1]),
+                               (self.nodes[1], self.nodes[2])):
+            self.network._add_connection(Connection(
+                node_a, node_b, lq_a2b=LinkQuality(lq=200)))
+
+    def test_queries(self):
+        self.assertEqual(len(self.network.get_connections()), 3)
+        self.assertEqual(self.network.get_node_degree(self.nodes[1]), 2)
+        path, cost = self.network.get_shortest_path(self.xbee, self.nodes[2])
+        self.assertEqual(path, [self.xbee] + self.nodes)
+        self.assertEqual(cost, 3 * (256 - 200))
+        self.assertEqual(
+            sorted(str(node.get_64bit_addr())
+                   for node in self.network.get_articulation_points()),
+            sorted(str(node.get_64bit_addr()) for node in self.nodes[:2]))
+        with self.assertRaises(ValueError):
+            self.network.get_shortest_path(None, self.nodes[0])
+
+    def test_existing_connection_is_not_duplicated(self):
+        for node_a, node_b in ((self.nodes[0], self.nodes[1]),
+                               (self.nodes[2], self.nodes[1])):
+            self.assertFalse(self.network._add_connection(
+                Connection(node_a, node_b)))
+        self.assertEqual(len(self.network.get_connections()), 3)
+        self.assertEqual(self.network.get_node_degree(self.nodes[2]), 1)
+
+    def test_removed_node_loses_its_connections(self):
+        # Connections from the removed node go away with it.
+        self.network.remove_device(self.nodes[1])
+        self.assertEqual(self.network.get_node_degree(self.nodes[2]), 0)
+        self.assertEqual(
+            [conn.node_a for conn
+             in self.network.get_node_connections(self.nodes[1])],
+            [self.nodes[0]])
@@ -0,0 +1,285 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import threading
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice, XBeeNetwork, \
+    NetworkEventReason, Connection, _DiscoveryQueue
+from digi.xbee.models.mode import NeighborDiscoveryMode
+from digi.xbee.models.status import NetworkDiscoveryStatus, ModemStatus
+from digi.xbee.packets.common import ModemStatusPacket
+from digi.xbee.packets.zigbee import RouteRecordIndicatorPacket
+
+from tests.fakes import FakeInterface, at_responder
+from tests.test_network import x64, x16
+
+
+class SimulatedNetwork(XBeeNetwork):
+    """
+    Network whose neighbors requests are answered from a fixed topology after
+    a delay instead of asking the nodes.
+    """
+
+    def __init__(self, xbee, topology, delay=0.02, failing=()):
+        super().__init__(xbee)
+        # 64-bit address string -> neighbors of the node
+        self.topology = topology
+        # None to never answer
+        self.delay = delay
+        # 64-bit address string -> delay of the node
+        self.delays = {}
+        self.failing = set(failing)
+        self.requested = []
+        # Scan counter -> requested nodes
+        self.scan_requests = {}
+        # Date, active requests and failures so far at every request start
+        self.starts = []
+        self.active = 0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def _discover_neighbors(self, requester, nodes_queue, active_processes,
+                            node_timeout):
+        key = str(requester.get_64bit_addr())
+        active_processes.append(key)
+        with self.lock:
+            self.active += 1
+            self.requested.append(key)
+            self.scan_requests.setdefault(self.scan_counter, []).append(key)
+            self.starts.append((time.monotonic(), self.active, self.failures))
+        delay = self.delays.get(key, self.delay)
+        if delay is not None:
+            threading.Timer(delay, self.__answer,
+                            args=(requester, nodes_queue)).start()
+        return NetworkDiscoveryStatus.SUCCESS
+
+    def __answer(self, requester, nodes_queue):
+        key = str(requester.get_64bit_addr())
+        error = "Simulated failure" if key in self.failing else None
+        if not error:
+            for neighbor in self.topology.get(key, ()):
+                node = self._add_remote(neighbor, NetworkEventReason.NEIGHBOR)
+                if node:
+                    nodes_queue.put(node)
+                self._add_connection(Connection(
+                    requester,
+                    self.get_device_by_64(neighbor.get_64bit_addr())))
+        with self.lock:
+            self.active -= 1
+            self.failures += 1 if error else 0
+        self._node_discovery_process_finished(requester, error=error)
+
+
+class DiscoveryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface(at_responder({}))
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.local = str(self.xbee.get_64bit_addr())
+
+    def _node(self, idx):
+        return RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx))
+
+    def _network(self, topology, mode=NeighborDiscoveryMode.FLOOD,
+                 max_requests=None, time_bw_requests=0, **kwargs):
+        network = SimulatedNetwork(self.xbee, topology, **kwargs)
+        network.set_deep_discovery_options(
+            deep_mode=mode, max_concurrent_requests=max_requests)
+        network.set_deep_discovery_timeouts(time_bw_requests=time_bw_requests)
+        self.addCleanup(network.stop_discovery_process)
+        return network
+
+    def _discover(self, network, n_deep_scans=1):
+        finished = threading.Event()
+        statuses = []
+
+        def callback(status, *_):
+            statuses.append(status)
+            finished.set()
+
+        network.add_discovery_process_finished_callback(callback)
+        network.start_discovery_process(deep=True, n_deep_scans=n_deep_scans)
+        self.assertTrue(finished.wait(10))
+        return statuses[0]
+
+
+class DiscoverySchedulerTest(DiscoveryTestCase):
+
+    def __star(self, size):
+        return {self.local: [self._node(idx) for idx in range(size)]}
+
+    def test_flood_window_grows_up_to_maximum(self):
+        network = self._network(self.__star(12), max_requests=4, delay=0.05)
+        self.assertEqual(self._discover(network),
+                         NetworkDiscoveryStatus.SUCCESS)
+        self.assertEqual(sorted(network.requested),
+                         sorted([self.local] + [str(x64(idx))
+                                                for idx in range(12)]))
+        self.assertEqual(max(active for _, active, _ in network.starts), 4)
+
+    def test_cascade_requests_one_node_at_a_time(self):
+        network = self._network(self.__star(6),
+                                 mode=NeighborDiscoveryMode.CASCADE,
+                                 max_requests=4)
+        self._discover(network)
+        self.assertEqual(len(network.requested), 7)
+        self.assertEqual(max(active for _, active, _ in network.starts), 1)
+
+    def test_failures_shrink_window(self):
+        network = self._network(
+            self.__star(8), max_requests=4,
+            failing=[str(x64(idx)) for idx in range(8)])
+        self._discover(network)
+        self.assertEqual(len(network.requested), 9)
+        # After the first failure, a request only starts when no other runs.
+        self.assertTrue(network.failures)
+        self.assertTrue(all(active == 1 for _, active, failures
+                            in network.starts if failures))
+
+    def test_spacing_shrinks_while_requests_succeed(self):
+        network = self._network(self.__star(6), max_requests=1,
+                                time_bw_requests=0.2, delay=0.01)
+        self._discover(network)
+        dates = [date for date, _, _ in network.starts]
+        gaps = [end - start for start, end in zip(dates, dates[1:])]
+        self.assertGreaterEqual(gaps[0], 0.18)
+        self.assertLess(max(gaps[2:]), 0.08)
+
+    def test_stop_wakes_waiting_discovery(self):
+        network = self._network({}, delay=None)
+        network.start_discovery_process(deep=True, n_deep_scans=1)
+        while not network.requested:
+            time.sleep(0.01)
+        # The simulated node never answers: stopping must not wait for it.
+        stopper = threading.Thread(target=network.stop_discovery_process,
+                                   daemon=True)
+        stopper.start()
+        stopper.join(10)
+        self.assertFalse(stopper.is_alive())
+        self.assertFalse(network.is_discovery_running())
+
+
+class IncrementalDiscoveryTest(DiscoveryTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Local XBee -> 0, 1, 2 and 0 -> 3
+        self.topology = {self.local: [self._node(idx) for idx in range(3)],
+                         str(x64(0)): [self._node(3)]}
+        self.all_nodes = sorted([self.local] + [str(x64(idx))
+                                                for idx in range(4)])
+
+    def __network(self, incremental=True, stale_time=None, between_scans=None,
+                  delays=None):
+        network = self._network(self.topology)
+        network.delays = delays or {}
+        network.set_deep_discovery_options(
+            deep_mode=NeighborDiscoveryMode.FLOOD,
+            del_not_discovered_nodes_in_last_scan=True,
+            incremental=incremental, stale_time=stale_time)
+        network.set_deep_discovery_timeouts(time_bw_requests=0,
+                                            time_bw_scans=0.3)
+        if between_scans:
+            network.add_end_discovery_scan_callback(
+                lambda scan, *_: between_scans(network) if scan == 1 else None)
+        self._discover(network, n_deep_scans=2)
+        return network
+
+    def test_unchanged_nodes_are_not_requested_again(self):
+        network = self.__network()
+        self.assertEqual(sorted(network.scan_requests[1]), self.all_nodes)
+        self.assertNotIn(2, network.scan_requests)
+        # Nodes and connections not requested are kept.
+        self.assertEqual(len(network.get_devices()), 4)
+        self.assertEqual(len(network.get_connections()), 4)
+
+    def test_new_discovery_keeps_unchanged_nodes(self):
+        network = self.__network()
+        requested = len(network.requested)
+        self._discover(network)
+        self.assertEqual(len(network.requested), requested)
+        self.assertEqual(len(network.get_devices()), 4)
+        self.assertEqual(len(network.get_connections()), 4)
+
+    def test_full_discovery_requests_all_nodes(self):
+        network = self.__network(incremental=False)
+        self.assertEqual(sorted(network.scan_requests[2]), self.all_nodes)
+
+    def test_stale_nodes_are_requested(self):
+        network = self.__network(stale_time=0)
+        self.assertEqual(sorted(network.scan_requests[2]), self.all_nodes)
+
+    def test_marked_node_is_requested(self):
+        network = self.__network(between_scans=lambda network: (
+            network.request_full_scan(network.get_device_by_64(x64(1)))))
+        self.assertEqual(network.scan_requests[2], [str(x64(1))])
+
+    def test_route_change_marks_route_nodes(self):
+        def change_route(_):
+            # 3 reaches the local XBee through 0 and then through 1.
+            for hop in (0, 1):
+                self.iface.inject(RouteRecordIndicatorPacket(
+                    x64(3), x16(3), 0, [x16(hop)]))
+        network = self.__network(between_scans=change_route)
+        self.assertEqual(sorted(network.scan_requests[2]),
+                         sorted(str(x64(idx)) for idx in (0, 1, 3)))
+
+    def test_node_found_while_requested_is_not_requested_again(self):
+        def mark(network):
+            for idx in (0, 2, 3):
+                network.request_full_scan(network.get_device_by_64(x64(idx)))
+        # The second scan requests 2, then 0 and 3 at the same time: 0
+        # reports 3 as neighbor while 3 is being requested.
+        network = self.__network(between_scans=mark,
+                                 delays={str(x64(0)): 0.1, str(x64(3)): 0.3})
+        self.assertEqual(network.scan_requests[2][0], str(x64(2)))
+        self.assertEqual(sorted(network.scan_requests[2]),
+                         sorted(str(x64(idx)) for idx in (0, 2, 3)))
+
+    def test_network_join_requests_all_nodes(self):
+        network = self.__network(between_scans=lambda _: self.iface.inject(
+            ModemStatusPacket(ModemStatus.JOINED_NETWORK)))
+        self.assertEqual(sorted(network.scan_requests[2]), self.all_nodes)
+
+
+class DiscoveryQueueTest(unittest.TestCase):
+
+    def test_priority_order_without_duplicates(self):
+        xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({})))
+        nodes = [RemoteZigBeeDevice(xbee, x64(idx), x16(idx))
+                 for idx in range(4)]
+        priorities = {str(nodes[0].get_64bit_addr()): 5,
+                      str(nodes[1].get_64bit_addr()): 0,
+                      str(nodes[2].get_64bit_addr()): 5,
+                      str(nodes[3].get_64bit_addr()): -1}
+        wake = threading.Event()
+        fifo = _DiscoveryQueue(
+            lambda node: priorities[str(node.get_64bit_addr())],
+            wake_event=wake)
+        for node in nodes + [nodes[0], nodes[3]]:
+            fifo.put(node)
+        self.assertTrue(wake.is_set())
+        self.assertEqual(fifo.qsize(), 4)
+        self.assertEqual([fifo.get() for _ in range(4)],
+                         [nodes[3], nodes[1], nodes[0], nodes[2]])
+        # A returned node can be queued again.
+        fifo.put(nodes[0])
+        self.assertEqual(fifo.get(), nodes[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import threading
+import time
+import unittest
+
+from digi.xbee.reader import CallbackDispatcher, DispatchPolicy, XBeeEvent
+
+
+class CallbackDispatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatcher = None
+        self.gate = threading.Event()
+        self.calls = []
+        self.done = threading.Semaphore(0)
+
+    def tearDown(self):
+        self.gate.set()
+        if self.dispatcher:
+            self.dispatcher.shutdown()
+
+    def __event(self, priority=CallbackDispatcher.PRIORITY_NORMAL, name=""):
+        event = XBeeEvent()
+        event.dispatcher = self.dispatcher
+        event.priority = priority
+
+        def callback(value):
+            # The first call waits for the gate, keeping its worker busy.
+            if value == "gate":
+                self.gate.wait(2)
+            self.calls.append(name + str(value))
+            self.done.release()
+
+        event += callback
+        return event
+
+    def __wait_calls(self, number):
+        for _ in range(number):
+            self.assertTrue(self.done.acquire(timeout=2))
+
+    def test_callback_calls_ordered_and_not_overlapped(self):
+        self.dispatcher = CallbackDispatcher(max_workers=8)
+        running = []
+        overlaps = []
+        event = XBeeEvent()
+        event.dispatcher = self.dispatcher
+
+        def callback(value):
+            if running:
+                overlaps.append(value)
+            running.append(value)
+            time.sleep(0.001)
+            self.calls.append(value)
+            running.remove(value)
+            self.done.release()
+
+        event += callback
+        for value in range(100):
+            event(value)
+        self.__wait_calls(100)
+        self.assertEqual(self.calls, list(range(100)))
+        self.assertEqual(overlaps, [])
+
+    def test_slow_callback_does_not_delay_other_events(self):
+        self.dispatcher = CallbackDispatcher(max_workers=2)
+        slow, fast = self.__event(name="slow "), self.__event(name="fast ")
+        slow("gate")
+        fast(1)
+        self.__wait_calls(1)
+        self.assertEqual(self.calls, ["fast 1"])
+
+    def test_higher_priority_runs_first(self):
+        self.dispatcher = CallbackDispatcher(max_workers=1)
+        blocker = self.__event()
+        low = self.__event(CallbackDispatcher.PRIORITY_LOW, "low ")
+        high = self.__event(CallbackDispatcher.PRIORITY_HIGH, "high ")
+        blocker("gate")
+        low(1)
+        high(1)
+        self.gate.set()
+        self.__wait_calls(3)
+        self.assertEqual(self.calls, ["gate", "high 1", "low 1"])
+
+    def __fill_queue(self, policy):
+        self.dispatcher = CallbackDispatcher(max_workers=1, queue_size=2,
+                                             policy=policy)
+        event = self.__event()
+        event("gate")
+        # Wait for the first call to leave the queue.
+        while self.dispatcher.pending:
+            time.sleep(0.001)
+        for value in range(1, 5):
+            event(value)
+        return event
+
+    def test_full_queue_drops_newest(self):
+        self.__fill_queue(DispatchPolicy.DROP_NEWEST)
+        self.assertEqual(self.dispatcher.dropped, 2)
+        self.gate.set()
+        self.__wait_calls(3)
+        self.assertEqual(self.calls, ["gate", "1", "2"])
+
+    def test_full_queue_drops_oldest(self):
+        self.__fill_queue(DispatchPolicy.DROP_OLDEST)
+        self.assertEqual(self.dispatcher.dropped, 2)
+        self.gate.set()
+        self.__wait_calls(3)
+        self.assertEqual(self.calls, ["gate", "3", "4"])
+
+    def test_full_queue_blocks(self):
+        self.dispatcher = CallbackDispatcher(max_workers=1, queue_size=2)
+        event = self.__event()
+        event("gate")
+        fired = threading.Thread(
+            target=lambda: [event(value) for value in range(1, 5)])
+        fired.start()
+        fired.join(0.2)
+        # The firing thread waits for room instead of dropping calls.
+        self.assertTrue(fired.is_alive())
+        self.assertEqual(self.dispatcher.pending, 2)
+        self.gate.set()
+        fired.join(2)
+        self.__wait_calls(5)
+        self.assertEqual(self.calls, ["gate", "1", "2", "3", "4"])
+        self.assertEqual(self.dispatcher.dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import threading
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice
+from digi.xbee.filesystem import FileSystemManager, _FSWindowSender
+from digi.xbee.models.filesystem import CloseFileCmdResponse, FSCmdType, \
+    OpenFileCmdResponse, WriteFileCmdRequest, WriteFileCmdResponse
+from digi.xbee.models.options import FileOpenRequestOption
+from digi.xbee.models.status import FSCommandStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.filesystem import FSResponsePacket
+from digi.xbee.sender import FrameIdAllocator
+
+from tests.fakes import LOCAL_INFO, FakeInterface, at_responder
+
+
+class FSWindowSenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.delay = 0
+        # Offset -> delay of its response, instead of `self.delay`.
+        self.delays = {}
+        self.drop = set()
+        self.in_flight = []
+        answer_at = at_responder({})
+        self.iface = FakeInterface(
+            lambda pkt: self.__answer(pkt) or answer_at(pkt))
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def __answer(self, packet):
+        if packet.get_frame_type() != ApiFrameType.FILE_SYSTEM_REQUEST:
+            return None
+        offset = packet.command.offset
+        if offset in self.drop:
+            self.drop.discard(offset)
+            return []
+        response = FSResponsePacket(packet.frame_id, WriteFileCmdResponse(
+            FSCommandStatus.SUCCESS.code, fid=1,
+            actual_offset=offset + len(packet.command.data)))
+
+        def answer():
+            self.in_flight.append(
+                self.xbee.get_frame_id_allocator().in_flight)
+            self.iface.inject(response)
+
+        threading.Timer(self.delays.get(offset, self.delay), answer).start()
+        return []
+
+    def __write(self, blocks):
+        commands = [WriteFileCmdRequest(1, 4 * idx, bytearray(b"data"))
+                    for idx in range(blocks)]
+        offsets = []
+        status = _FSWindowSender(self.xbee, 4, 5).send(
+            commands, lambda _idx, cmd: offsets.append(cmd.actual_offset))
+        self.assertEqual(status, FSCommandStatus.SUCCESS.code)
+        self.assertEqual(offsets, [4 * (idx + 1) for idx in range(blocks)])
+
+    def test_frame_ids_held_while_waiting(self):
+        # Responses arrive after the lease of the frame IDs.
+        self.xbee._frame_id_allocator = FrameIdAllocator(lease=0.05)
+        self.delay = 0.2
+        self.__write(8)
+        self.assertNotIn(0, self.in_flight)
+        self.assertEqual(self.xbee.get_frame_id_allocator().in_flight, 0)
+
+    def test_responses_out_of_order(self):
+        # The responses of the first blocks of the window arrive last.
+        self.delays = {0: 0.2, 4: 0.1}
+        self.__write(8)
+        self.assertEqual(self.xbee.get_frame_id_allocator().in_flight, 0)
+
+    def test_retransmitted_frame_id_quarantined(self):
+        self.drop = {8}
+        start = time.monotonic()
+        self.__write(8)
+        self.assertGreater(time.monotonic() - start, 0.4)
+        frame_ids = self.xbee.get_frame_id_allocator()
+        # Only the frame ID of the lost response waits for it, and not
+        # forever.
+        self.assertEqual(frame_ids.in_flight, 1)
+        self.assertIsNotNone(frame_ids.next_expiration)
+
+
+class FSAppendWriteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.content = bytearray(b"head")
+        self.append = False
+        self.late = set()
+        self.writes = []
+        # Zigbee firmware with file system API support.
+        info = LOCAL_INFO[:2] + (0x100D,) + LOCAL_INFO[3:]
+        answer_at = at_responder({"NP": b"\x00\x49"})
+        self.iface = FakeInterface(
+            lambda pkt: self.__answer(pkt) or answer_at(pkt), info=info)
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def __answer(self, packet):
+        if packet.get_frame_type() != ApiFrameType.FILE_SYSTEM_REQUEST:
+            return None
+        cmd = packet.command
+        if cmd.type == FSCmdType.FILE_OPEN:
+            self.append = bool(cmd.options & FileOpenRequestOption.APPEND)
+            response = OpenFileCmdResponse(FSCommandStatus.SUCCESS,
+                                           fid=1, size=0xFFFFFFFF)
+        elif cmd.type == FSCmdType.FILE_CLOSE:
+            response = CloseFileCmdResponse(FSCommandStatus.SUCCESS)
+        else:
+            # Writes to a file opened to append ignore the offset.
+            self.writes.append(cmd.offset)
+            if self.append:
+                self.content += cmd.data
+            else:
+                self.content[cmd.offset:cmd.offset + len(cmd.data)] = cmd.data
+            response = WriteFileCmdResponse(FSCommandStatus.SUCCESS, fid=1,
+                                            actual_offset=len(self.content))
+            if cmd.offset in self.late:
+                # The block is written, but its response is delayed beyond
+                # the retransmission time.
+                self.late.discard(cmd.offset)
+                threading.Timer(1, self.iface.inject, (FSResponsePacket(
+                    packet.frame_id, response),)).start()
+                return []
+        return [FSResponsePacket(packet.frame_id, response)]
+
+    def test_append_blocks_not_retransmitted(self):
+        manager = FileSystemManager(self.xbee)
+        data = bytes(range(200))
+        process = manager.write_file("/flash/file", options=["append"])
+        block_size = process.block_size
+        self.late = {block_size}
+        process.next(data)
+        self.assertEqual(self.content, b"head" + data)
+        self.assertEqual(len(self.writes), len(set(self.writes)))
+
+
+if __name__ == "__main__":
+    unittest.main()
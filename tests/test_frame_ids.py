@@ -0,0 +1,110 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice
+from digi.xbee.exception import TimeoutException
+from digi.xbee.models.status import ATCommandStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.common import ATCommResponsePacket
+from digi.xbee.sender import FrameIdAllocator
+
+from tests.fakes import FakeInterface, at_responder
+
+
+class FrameIdAllocatorTest(unittest.TestCase):
+
+    def test_held_id_not_freed_by_response(self):
+        frame_ids = FrameIdAllocator()
+        frame_id = frame_ids.allocate()
+        frame_ids.hold(frame_id)
+        frame_ids.response_received(frame_id)
+        self.assertEqual(frame_ids.in_flight, 1)
+        frame_ids.release(frame_id)
+        self.assertEqual(frame_ids.in_flight, 0)
+
+    def test_leased_id_freed_by_response(self):
+        frame_ids = FrameIdAllocator()
+        frame_ids.response_received(frame_ids.allocate())
+        self.assertEqual(frame_ids.in_flight, 0)
+
+    def test_quarantined_id_not_reused(self):
+        frame_ids = FrameIdAllocator()
+        frame_id = frame_ids.allocate()
+        frame_ids.hold(frame_id)
+        frame_ids.release(frame_id, quarantine=True)
+        allocated = [frame_ids.allocate() for _ in range(frame_ids.capacity - 1)]
+        self.assertNotIn(frame_id, allocated)
+        with self.assertRaises(TimeoutException):
+            frame_ids.allocate(timeout=0.05)
+
+        # The late response frees it.
+        frame_ids.response_received(frame_id)
+        self.assertEqual(frame_ids.allocate(block=False), frame_id)
+
+    def test_quarantine_expires(self):
+        frame_ids = FrameIdAllocator(lease=0.05)
+        frame_id = frame_ids.allocate()
+        frame_ids.hold(frame_id)
+        frame_ids.release(frame_id, quarantine=True)
+        time.sleep(0.1)
+        self.assertEqual(frame_ids.in_flight, 0)
+
+
+class LateResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.values = {"NI": b"NODE"}
+        self.silent = set()
+        responder = at_responder(self.values)
+
+        def respond(packet):
+            if packet.get_frame_type() == ApiFrameType.AT_COMMAND \
+                    and packet.command in self.silent:
+                return None
+            return responder(packet)
+
+        self.iface = FakeInterface(respond)
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.xbee.set_sync_ops_timeout(0.2)
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def test_late_response_not_taken_by_new_request(self):
+        self.silent.add("NI")
+        with self.assertRaises(TimeoutException):
+            self.xbee.get_parameter("NI")
+        late_id = self.iface.sent[-1].frame_id
+        frame_ids = self.xbee.get_frame_id_allocator()
+        self.assertEqual(frame_ids.in_flight, 1)
+
+        # Requests sent meanwhile do not reuse the frame ID.
+        self.silent.clear()
+        for _ in range(frame_ids.capacity):
+            self.assertEqual(self.xbee.get_parameter("NI"), b"NODE")
+            self.assertNotEqual(self.iface.sent[-1].frame_id, late_id)
+
+        self.iface.inject(ATCommResponsePacket(
+            late_id, "NI", ATCommandStatus.OK, comm_value=bytearray(b"LATE")))
+        deadline = time.monotonic() + 1
+        while frame_ids.in_flight and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(frame_ids.in_flight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
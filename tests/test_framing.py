@@ -0,0 +1,79 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import unittest
+
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.models.status import ATCommandStatus
+from digi.xbee.packets.common import ATCommPacket, ATCommResponsePacket
+from digi.xbee.serial import FrameBuffer
+
+
+API = OperatingMode.API_MODE
+ESCAPED = OperatingMode.ESCAPED_API_MODE
+
+
+class FrameBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = FrameBuffer()
+        self.packets = [
+            ATCommPacket(1, "NI"),
+            # 0x11 and 0x13 (XON/XOFF) and 0x7D must be escaped.
+            ATCommPacket(0x11, "DH", parameter=bytearray(b"\x7D\x13\x7E")),
+            ATCommResponsePacket(0x7E, "NI", ATCommandStatus.OK,
+                                 comm_value=bytearray(b"NODE")),
+        ]
+
+    def __assert_frames(self, expected):
+        self.assertEqual(len(self.frames), len(expected))
+        for packet in expected:
+            self.assertEqual(self.frames.pop(), packet.output())
+
+    def test_unescaped_stream(self):
+        stream = b"".join(p.output() for p in self.packets)
+        self.assertEqual(self.frames.feed(stream, API), 3)
+        self.__assert_frames(self.packets)
+
+    def test_escaped_stream(self):
+        stream = b"".join(p.output(escaped=True) for p in self.packets)
+        self.assertEqual(self.frames.feed(stream, ESCAPED), 3)
+        self.__assert_frames(self.packets)
+
+    def test_split_reads(self):
+        for mode in (API, ESCAPED):
+            stream = b"".join(p.output(escaped=mode == ESCAPED)
+                              for p in self.packets)
+            for idx in range(len(stream)):
+                self.frames.feed(stream[idx:idx + 1], mode)
+            self.__assert_frames(self.packets)
+
+    def test_garbage_before_frame(self):
+        self.frames.feed(b"\x00\x01\x02" + self.packets[0].output(), API)
+        self.__assert_frames(self.packets[:1])
+
+    def test_incomplete_frame(self):
+        frame = self.packets[2].output()
+        self.assertEqual(self.frames.feed(frame[:-1], API), 0)
+        self.frames.discard_partial()
+        self.frames.feed(frame, API)
+        self.__assert_frames(self.packets[2:])
+
+    def test_escaped_resync(self):
+        frame = self.packets[1].output(escaped=True)
+        self.frames.feed(frame[:5] + frame, ESCAPED)
+        self.__assert_frames(self.packets[1:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import os
+import tempfile
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice, \
+    NetworkEventReason, Connection, LinkQuality
+from digi.xbee.exception import XBeeException
+from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
+from digi.xbee.models.protocol import Role
+from digi.xbee.models.zdo import RouteStatus
+from digi.xbee.packets.zigbee import RouteRecordIndicatorPacket
+
+from tests.fakes import LOCAL_INFO, FakeInterface, at_responder
+
+
+def x64(idx):
+    return XBee64BitAddress.from_hex_string("0013A200%08X" % (0x100 + idx))
+
+
+def x16(idx):
+    return XBee16BitAddress.from_hex_string("%04X" % (0x100 + idx))
+
+
+class PassiveLearningTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface(at_responder({}))
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.network = self.xbee.get_network()
+        for idx in (1, 2):
+            self.network._add_remote(
+                RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx)),
+                NetworkEventReason.MANUAL)
+        self.network.set_passive_learning(True)
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def __links(self):
+        return {(str(conn.node_a.get_64bit_addr()),
+                 str(conn.node_b.get_64bit_addr()))
+                for conn in self.network.get_connections()}
+
+    def test_two_hop_route_record(self):
+        # Route: source (9) -> 1 -> 2 -> local. The record lists the hops
+        # from the closest to the local XBee to the closest to the source.
+        self.iface.inject(RouteRecordIndicatorPacket(
+            x64(9), x16(9), 0, [x16(2), x16(1)]))
+        local = str(self.xbee.get_64bit_addr())
+        expected = {(str(x64(9)), str(x64(1))), (str(x64(1)), str(x64(2))),
+                    (str(x64(2)), local)}
+        deadline = time.monotonic() + 1
+        while self.__links() != expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.__links(), expected)
+
+
+class NetworkSnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.xbee = self.__open_local()
+        self.network = self.xbee.get_network()
+        for idx in (1, 2, 3):
+            node = RemoteZigBeeDevice(self.xbee, x64(idx), x16(idx),
+                                      node_id="NODE%d" % idx)
+            node._role = Role.ROUTER
+            self.network._add_remote(node, NetworkEventReason.MANUAL)
+        node_1 = self.network.get_device_by_64(x64(1))
+        node_2 = self.network.get_device_by_64(x64(2))
+        node_2.parent = node_1
+        self.network._add_connection(Connection(
+            node_1, node_2, lq_a2b=LinkQuality(lq=200),
+            lq_b2a=LinkQuality(lq=150), status_a2b=RouteStatus.ACTIVE,
+            status_b2a=RouteStatus.INACTIVE))
+        self.network._add_connection(Connection(self.xbee, node_1))
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dir = tmp_dir.name
+        self.path = os.path.join(self.dir, "network.snap")
+
+    def __open_local(self, info=LOCAL_INFO):
+        xbee = ZigBeeDevice(comm_iface=FakeInterface(at_responder({}), info))
+        xbee.open()
+        self.addCleanup(xbee.close)
+        return xbee
+
+    @staticmethod
+    def __describe(network):
+        nodes = {(str(node.get_64bit_addr()), str(node.get_16bit_addr()),
+                  node.get_node_id(), node.get_role(),
+                  str(node.parent.get_64bit_addr()) if node.parent else None)
+                 for node in network.get_devices()}
+        connections = {(str(conn.node_a.get_64bit_addr()),
+                        str(conn.node_b.get_64bit_addr()), conn.lq_a2b.lq,
+                        conn.lq_b2a.lq, conn.status_a2b, conn.status_b2a)
+                       for conn in network.get_connections()}
+        return nodes, connections
+
+    def __assert_invalid(self, data):
+        with open(self.path, "wb") as snapshot:
+            snapshot.write(data)
+        network = self.__open_local().get_network()
+        with self.assertRaises(XBeeException):
+            network.load_snapshot(self.path)
+
+    def test_round_trip(self):
+        self.network.save_snapshot(self.path)
+        self.assertEqual(os.listdir(self.dir), ["network.snap"])
+        network = self.__open_local().get_network()
+        self.assertEqual(network.load_snapshot(self.path), 3)
+        self.assertEqual(self.__describe(network),
+                         self.__describe(self.network))
+        # Nodes already in the network are kept.
+        self.assertEqual(network.load_snapshot(self.path), 0)
+        self.assertEqual(network.get_number_devices(), 3)
+
+    def test_truncated_file(self):
+        self.network.save_snapshot(self.path)
+        with open(self.path, "rb") as snapshot:
+            data = snapshot.read()
+        for size in (0, 10, len(data) // 2, len(data) - 1):
+            self.__assert_invalid(data[:size])
+
+    def test_not_a_snapshot(self):
+        self.__assert_invalid(b"not a network snapshot" * 10)
+
+    def test_other_local_xbee(self):
+        self.network.save_snapshot(self.path)
+        info = LOCAL_INFO[:3] + ("0013A20040CCCCCC",) + LOCAL_INFO[4:]
+        network = self.__open_local(info).get_network()
+        with self.assertRaises(XBeeException):
+            network.load_snapshot(self.path)
+        self.assertEqual(network.get_number_devices(), 0)
+
+    def test_write_error_removes_temporary_file(self):
+        # The snapshot cannot replace a directory.
+        os.mkdir(self.path)
+        with self.assertRaises(OSError):
+            self.network.save_snapshot(self.path)
+        self.assertEqual(os.listdir(self.dir), ["network.snap"])
+
+
+if __name__ == "__main__":
+    unittest.main()
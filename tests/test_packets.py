@@ -0,0 +1,168 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import unittest
+
+from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
+from digi.xbee.models.mode import OperatingMode
+from digi.xbee.packets import factory
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.base import DictKeys, UnknownXBeePacket
+from digi.xbee.packets.zigbee import CreateSourceRoutePacket
+from digi.xbee.packets.common import ReceivePacket, \
+    IODataSampleRxIndicatorPacket, ExplicitRXIndicatorPacket, ATCommPacket, \
+    TransmitPacket
+
+
+X64 = XBee64BitAddress.from_hex_string("0013A20040BBBBBB")
+X16 = XBee16BitAddress.from_hex_string("1234")
+# One sample with DIO4 enabled and high.
+IO_SAMPLE = bytearray(b"\x01\x00\x10\x00\x00\x10")
+
+
+class ReceivedPacketTest(unittest.TestCase):
+
+    def setUp(self):
+        self.packets = [
+            ReceivePacket(X64, X16, 0, rf_data=bytearray(b"hello")),
+            IODataSampleRxIndicatorPacket(X64, X16, 0, rf_data=IO_SAMPLE),
+            ExplicitRXIndicatorPacket(X64, X16, 0xE8, 0xE8, 0x11, 0xC105, 0,
+                                      rf_data=bytearray(b"hello")),
+        ]
+
+    def test_decoded_fields(self):
+        for packet in self.packets:
+            parsed = factory.build_frame(packet.output())
+            self.assertEqual(parsed.x64bit_source_addr, X64)
+            self.assertEqual(parsed.x16bit_source_addr, X16)
+            self.assertEqual(parsed.rf_data, packet.rf_data)
+            self.assertEqual(parsed.output(), packet.output())
+
+    def test_independent_from_read_buffer(self):
+        for packet in self.packets:
+            raw = packet.output()
+            parsed = factory.build_frame(raw, OperatingMode.API_MODE)
+            # Reading interfaces may reuse their buffer.
+            raw[-2] ^= 0xFF
+            self.assertEqual(parsed.rf_data, packet.rf_data)
+            raw.clear()
+            self.assertEqual(parsed.output(), packet.output())
+            self.assertEqual(parsed.x64bit_source_addr, X64)
+
+    def test_io_packet_without_sample(self):
+        # Shortest IO frame accepted: its data is too short for a sample.
+        packet = IODataSampleRxIndicatorPacket(
+            X64, X16, 0, rf_data=bytearray(b"\x01\x00\x10\x00"))
+        parsed = factory.build_frame(packet.output())
+        self.assertIsNone(parsed.io_sample)
+        self.assertEqual(parsed.rf_data, packet.rf_data)
+        api_data = parsed.to_dict()[DictKeys.FRAME_SPEC_DATA][
+            DictKeys.API_DATA]
+        self.assertEqual(api_data[DictKeys.RF_DATA], "01 00 10 00")
+        parsed.receive_options = 2
+        self.assertIsNone(parsed.io_sample)
+
+
+class FrameCacheTest(unittest.TestCase):
+
+    def test_caller_buffer_modified(self):
+        buffer = bytearray(b"hello")
+        packet = TransmitPacket(1, X64, X16, 0, 0, rf_data=buffer)
+        frame = packet.output()
+        buffer[0] = ord("J")
+        self.assertNotEqual(packet.output(), frame)
+        self.assertEqual(packet.output()[-6:-1], b"Jello")
+        self.assertEqual(packet, TransmitPacket(1, X64, X16, 0, 0,
+                                                rf_data=bytearray(b"Jello")))
+
+    def test_parameter_modified_in_place(self):
+        packet = ATCommPacket(1, "NI", parameter=bytearray(b"A"))
+        checksum = packet.get_checksum()
+        packet.parameter[0] = ord("B")
+        self.assertEqual(packet.output()[-2], ord("B"))
+        self.assertEqual(packet.get_checksum(), checksum - 1)
+
+    def test_frame_reused(self):
+        packet = CreateSourceRoutePacket(1, X64, X16, 0, [X16])
+        frame = packet._get_frame()
+        for _ in range(2000):
+            self.assertIs(packet._get_frame(), frame)
+
+    def test_list_modified_in_place(self):
+        packet = CreateSourceRoutePacket(1, X64, X16, 0, [X16])
+        self.assertEqual(len(packet), len(packet.get_frame_spec_data()))
+        packet.hops.append(XBee16BitAddress.from_hex_string("5678"))
+        self.assertEqual(len(packet), len(packet.get_frame_spec_data()))
+        self.assertEqual(packet.output()[-3:-1], b"\x56\x78")
+
+    def test_attribute_assigned(self):
+        packet = TransmitPacket(1, X64, X16, 0, 0, rf_data=bytearray(b"a"))
+        old_hash = hash(packet)
+        packet.rf_data = bytearray(b"abc")
+        self.assertEqual(len(packet), len(packet.get_frame_spec_data()))
+        self.assertNotEqual(hash(packet), old_hash)
+        packet.frame_id = 2
+        self.assertEqual(packet.output()[4], 2)
+
+
+class CustomPacket(UnknownXBeePacket):
+
+    @staticmethod
+    def create_packet(raw, operating_mode=OperatingMode.API_MODE):
+        return CustomPacket(raw[3], raw[4:-1])
+
+
+class PacketClassRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.custom = UnknownXBeePacket(0xF0, bytearray(b"custom")).output()
+        self.receive = ReceivePacket(X64, X16, 0,
+                                     rf_data=bytearray(b"a")).output()
+
+    def test_unknown_frame_type(self):
+        packet = factory.build_frame(self.custom)
+        self.assertIs(type(packet), UnknownXBeePacket)
+        self.assertEqual(packet.output(), self.custom)
+
+    def test_register_frame_type(self):
+        self.addCleanup(factory.unregister_packet_class, 0xF0)
+        factory.register_packet_class(0xF0, CustomPacket)
+        packet = factory.build_frame(self.custom)
+        self.assertIs(type(packet), CustomPacket)
+        self.assertEqual(packet.output(), self.custom)
+        factory.unregister_packet_class(0xF0)
+        self.assertIs(type(factory.build_frame(self.custom)),
+                      UnknownXBeePacket)
+
+    def test_override_built_in_class(self):
+        frame_type = ApiFrameType.RECEIVE_PACKET
+        self.addCleanup(factory.unregister_packet_class, frame_type)
+        factory.register_packet_class(frame_type, CustomPacket)
+        self.assertIs(type(factory.build_frame(self.receive)), CustomPacket)
+        # Unregistering restores the built-in class.
+        factory.unregister_packet_class(frame_type)
+        self.assertIs(type(factory.build_frame(self.receive)), ReceivePacket)
+
+    def test_invalid_registration(self):
+        with self.assertRaises(ValueError):
+            factory.register_packet_class(0x100, CustomPacket)
+        with self.assertRaises(ValueError):
+            factory.register_packet_class(0xF0, object)
+        with self.assertRaises(ValueError):
+            factory.unregister_packet_class(-1)
+        self.assertIs(type(factory.build_frame(self.custom)),
+                      UnknownXBeePacket)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice, \
+    ATParameterCache, NetworkEventReason
+from digi.xbee.models.atcomm import ATParameterClass
+from digi.xbee.models.options import RemoteATCmdOptions
+from digi.xbee.models.status import ModemStatus
+from digi.xbee.packets.common import ModemStatusPacket, \
+    RemoteATCommandPacket
+
+from tests.fakes import FakeInterface, at_responder
+from tests.test_network import x64, x16
+
+
+class ATParameterCacheTest(unittest.TestCase):
+
+    def test_classes_ttls(self):
+        cache = ATParameterCache(ttls={ATParameterClass.CONFIG: 0.05})
+        for param in ("VR", "NI", "DB", "XX"):
+            cache.put(param, bytearray(param, "utf8"))
+        # Volatile and unclassified parameters are not cached.
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("DB"))
+        self.assertIsNone(cache.get("XX"))
+        self.assertEqual(cache.get("ni"), bytearray(b"NI"))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("NI"))
+        self.assertEqual(cache.get("VR"), bytearray(b"VR"))
+        self.assertEqual(len(cache), 1)
+
+    def test_custom_classes(self):
+        cache = ATParameterCache(ttls={ATParameterClass.VOLATILE: None,
+                                       ATParameterClass.CONFIG: 0})
+        cache.put("DB", bytearray(b"\x28"))
+        cache.put("NI", bytearray(b"NODE"))
+        self.assertEqual(cache.get("DB"), bytearray(b"\x28"))
+        self.assertIsNone(cache.get("NI"))
+        # Changing the class of a parameter discards its value.
+        cache.set_class("DB", ATParameterClass.IMMUTABLE)
+        self.assertEqual(cache.get_class("db"), ATParameterClass.IMMUTABLE)
+        self.assertIsNone(cache.get("DB"))
+
+    def test_values_are_copies(self):
+        cache = ATParameterCache()
+        value = bytearray(b"NODE")
+        cache.put("NI", value)
+        value[0] = 0
+        cached = cache.get("NI")
+        cached[0] = 0
+        self.assertEqual(cache.get("NI"), bytearray(b"NODE"))
+
+    def test_invalidation(self):
+        cache = ATParameterCache()
+        for param in ("VR", "NI", "ID"):
+            cache.put(param, bytearray(b"\x01"))
+        # Reads do not change values, sets only their own parameter.
+        cache._command_executed("NI", False)
+        self.assertEqual(len(cache), 3)
+        cache._command_executed("ni", True)
+        self.assertIsNone(cache.get("NI"))
+        self.assertIsNotNone(cache.get("ID"))
+        # Restoring settings keeps the immutable values only.
+        cache._command_executed("RE", False)
+        self.assertIsNone(cache.get("ID"))
+        self.assertIsNotNone(cache.get("VR"))
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_statistics(self):
+        cache = ATParameterCache()
+        self.assertEqual(cache.hit_rate, 0)
+        cache.get("NI")
+        cache.put("NI", bytearray(b"NODE"))
+        for _ in range(3):
+            cache.get("NI")
+        # Lookups of parameters that are not cached do not count.
+        cache.get("DB")
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+        self.assertEqual(cache.hit_rate, 0.75)
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+
+class DeviceParameterCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface(at_responder({
+            "HV": b"\x42", "VR": b"\x10\x09", "NI": b"NODE", "DB": b"\x28"}))
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.cache = ATParameterCache()
+        self.xbee.set_parameter_cache(self.cache)
+        self.iface.sent.clear()
+
+    def __sent(self):
+        commands = [packet.command for packet in self.iface.sent]
+        self.iface.sent.clear()
+        return commands
+
+    def test_disabled_by_default(self):
+        xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.assertIsNone(xbee.get_parameter_cache())
+
+    def test_get_parameter(self):
+        for _ in range(3):
+            self.assertEqual(self.xbee.get_parameter("NI"), bytearray(b"NODE"))
+            self.assertEqual(self.xbee.get_parameter("DB"), bytearray(b"\x28"))
+        self.assertEqual(self.__sent(), ["NI", "DB", "DB", "DB"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_get_parameters_reads_missing_values(self):
+        self.xbee.get_parameter("NI")
+        self.__sent()
+        values = self.xbee.get_parameters(["VR", "NI", "DB"])
+        self.assertEqual(list(values), ["VR", "NI", "DB"])
+        self.assertEqual(values["NI"], bytearray(b"NODE"))
+        self.assertEqual(self.__sent(), ["VR", "DB"])
+        self.xbee.get_parameters(["VR", "NI"])
+        self.assertEqual(self.__sent(), [])
+
+    def test_set_parameter_invalidates(self):
+        self.xbee.get_parameters(["VR", "NI"])
+        self.xbee.set_parameter("NI", bytearray(b"OTHER"))
+        self.__sent()
+        self.xbee.get_parameters(["VR", "NI"])
+        self.assertEqual(self.__sent(), ["NI"])
+        self.xbee.set_parameters({"NI": bytearray(b"OTHER")})
+        self.assertIsNone(self.cache.get("NI"))
+
+    def test_reset_invalidates(self):
+        self.xbee.get_parameters(["VR", "NI"])
+        self.xbee.execute_command("FR")
+        self.assertIsNone(self.cache.get("NI"))
+        self.assertIsNotNone(self.cache.get("VR"))
+        self.xbee.get_parameter("NI")
+        self.iface.inject(ModemStatusPacket(ModemStatus.HARDWARE_RESET))
+        deadline = time.monotonic() + 1
+        while len(self.cache) > 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNone(self.cache.get("NI"))
+        self.assertIsNotNone(self.cache.get("VR"))
+
+    def test_read_device_info_seeds_cache(self):
+        self.xbee.read_device_info()
+        self.__sent()
+        self.xbee.get_parameters(["VR", "NI"])
+        self.assertEqual(self.__sent(), [])
+
+    def __remote(self):
+        node = self.xbee.get_network()._add_remote(
+            RemoteZigBeeDevice(self.xbee, x64(0), x16(0)),
+            NetworkEventReason.MANUAL)
+        node.set_parameter_cache(ATParameterCache())
+        self.assertEqual(node.get_parameter("NI"), bytearray(b"NODE"))
+        return node
+
+    def test_bulk_set_invalidates(self):
+        node = self.__remote()
+        self.xbee.get_network().bulk_set_parameters([node],
+                                                    {"NI": bytearray(b"NEW")})
+        self.assertIsNone(node.get_parameter_cache().get("NI"))
+
+    def test_set_by_other_path_invalidates(self):
+        node = self.__remote()
+        # The packet sender sees the response of a frame sent directly.
+        self.xbee.send_packet(RemoteATCommandPacket(
+            self.xbee.get_next_frame_id(), x64(0), x16(0),
+            RemoteATCmdOptions.NONE.value, "NI", parameter=bytearray(b"NEW")))
+        cache = node.get_parameter_cache()
+        deadline = time.monotonic() + 1
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIsNone(cache.get("NI"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import time
+import unittest
+
+from digi.xbee.devices import ZigBeeDevice, RemoteZigBeeDevice
+from digi.xbee.exception import TimeoutException, TransmitException
+from digi.xbee.models.address import XBee64BitAddress
+from digi.xbee.models.status import TransmitStatus
+
+from tests.fakes import FakeInterface, at_responder
+
+
+class TransmitPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.status = TransmitStatus.SUCCESS
+
+        def respond(packet):
+            # No transmit status is sent while `self.status` is `None`.
+            return at_responder({}, self.status)(packet)
+
+        self.iface = FakeInterface(respond)
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.remote = RemoteZigBeeDevice(
+            self.xbee, XBee64BitAddress.from_hex_string("0013A20040BBBBBB"))
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def test_status_received(self):
+        futures = [self.xbee.send_data_pipelined(self.remote, "data%d" % i)
+                   for i in range(20)]
+        for future in futures:
+            self.assertEqual(future.result(timeout=1).transmit_status,
+                             TransmitStatus.SUCCESS)
+        self.assertEqual(self.xbee.get_frame_id_allocator().in_flight, 0)
+
+    def test_status_failure(self):
+        self.status = TransmitStatus.NO_ACK
+        future = self.xbee.send_data_pipelined(self.remote, "data")
+        with self.assertRaises(TransmitException) as ctx:
+            future.result(timeout=1)
+        self.assertEqual(ctx.exception.status, TransmitStatus.NO_ACK)
+
+    def test_expires_without_further_sends(self):
+        self.status = None
+        future = self.xbee.send_data_pipelined(self.remote, "data",
+                                               timeout=0.2)
+        # Failed by the pipeline, not by the wait for the result.
+        with self.assertRaises(TimeoutException):
+            future.result(timeout=2)
+
+        # The window slot is free, and the frame ID waits for a late status.
+        frame_ids = self.xbee.get_frame_id_allocator()
+        self.assertEqual(frame_ids.in_flight, 1)
+        self.status = TransmitStatus.SUCCESS
+        self.xbee.set_transmit_window(1)
+        self.assertIsNotNone(
+            self.xbee.send_data_pipelined(self.remote, "data",
+                                          timeout=0.2).result(timeout=1))
+
+    def test_done_callback_sends_with_full_window(self):
+        self.xbee.set_transmit_window(1)
+        futures = []
+
+        def send_twice(_future):
+            # The second send waits for the status of the first one.
+            for _ in range(2):
+                futures.append(self.xbee.send_data_pipelined(
+                    self.remote, "again", timeout=1))
+
+        self.xbee.send_data_pipelined(self.remote, "data").add_done_callback(
+            send_twice)
+        deadline = time.monotonic() + 2
+        while len(futures) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(futures), 2)
+        for future in futures:
+            self.assertIsNotNone(future.result(timeout=1))
+
+    def test_send_many_keeps_sent_futures(self):
+        with self.assertRaises(ValueError) as ctx:
+            self.xbee.send_many(self.remote, ["data", "data", None])
+        self.assertEqual(len(ctx.exception.futures), 2)
+        for future in ctx.exception.futures:
+            self.assertIsNotNone(future.result(timeout=1))
+
+if __name__ == "__main__":
+    unittest.main()
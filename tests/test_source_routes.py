@@ -0,0 +1,139 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+import time
+import unittest
+
+from digi.xbee.devices import SourceRouteCache, ZigBeeDevice, \
+    RemoteZigBeeDevice
+from digi.xbee.exception import XBeeException
+from digi.xbee.models.address import XBee64BitAddress, XBee16BitAddress
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.zigbee import CreateSourceRoutePacket
+
+from tests.fakes import FakeInterface, at_responder
+
+
+def x64(idx):
+    return XBee64BitAddress.from_hex_string("0013A200%08X" % (0x100 + idx))
+
+
+def x16(idx):
+    return XBee16BitAddress.from_hex_string("%04X" % (0x100 + idx))
+
+
+class SourceRouteCacheTest(unittest.TestCase):
+
+    def test_route_changes(self):
+        cache = SourceRouteCache()
+        self.assertTrue(cache.update(x64(1), x16(1), [x16(2)]))
+        self.assertFalse(cache.update(x64(1), x16(1), [x16(2)]))
+        self.assertTrue(cache.update(x64(1), x16(1), [x16(3)]))
+        self.assertTrue(cache.update(x64(1), x16(4), [x16(3)]))
+        self.assertEqual(cache.get_route(x64(1)), (x16(4), [x16(3)]))
+        self.assertEqual(len(cache), 1)
+
+    def test_least_recently_used_evicted(self):
+        cache = SourceRouteCache(max_size=2)
+        cache.update(x64(1), x16(1), [])
+        cache.update(x64(2), x16(2), [])
+        # Using the route to 1 makes the route to 2 the least recently used.
+        self.assertIsNotNone(cache.get_route(x64(1)))
+        cache.update(x64(3), x16(3), [])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get_route(x64(2)))
+        self.assertIsNotNone(cache.get_route(x64(1)))
+        self.assertIsNotNone(cache.get_route(x64(3)))
+
+    def test_routes_expire(self):
+        cache = SourceRouteCache(ttl=0.05)
+        cache.update(x64(1), x16(1), [x16(2)])
+        self.assertIsNotNone(cache.get_route(x64(1)))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get_route(x64(1)))
+        self.assertEqual(len(cache), 0)
+        # Learning the route again renews it.
+        cache.update(x64(1), x16(1), [x16(2)])
+        self.assertIsNotNone(cache.get_route(x64(1)))
+
+    def test_counters(self):
+        cache = SourceRouteCache()
+        cache.update(x64(1), x16(1), [])
+        cache.get_route(x64(1))
+        cache.get_route(x64(1))
+        cache.get_route(x64(2))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            SourceRouteCache(max_size=0)
+        with self.assertRaises(ValueError):
+            SourceRouteCache(ttl=0)
+
+
+class CachedRouteCreationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fail_creation = False
+        answer_at = at_responder({})
+
+        def respond(packet):
+            if packet.get_frame_type() == ApiFrameType.CREATE_SOURCE_ROUTE \
+                    and self.fail_creation:
+                raise XBeeException("Cannot write the frame")
+            return answer_at(packet)
+
+        self.iface = FakeInterface(respond)
+        self.xbee = ZigBeeDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.cache = SourceRouteCache()
+        self.xbee.set_source_route_cache(self.cache)
+        self.remote = RemoteZigBeeDevice(self.xbee, x64(1), x16(1))
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def __created_routes(self):
+        return [packet for packet in self.iface.sent
+                if packet.get_frame_type() == ApiFrameType.CREATE_SOURCE_ROUTE]
+
+    def test_route_created_once(self):
+        self.cache.update(x64(1), x16(1), [x16(2), x16(3)])
+        for _ in range(3):
+            self.xbee.send_data_async(self.remote, "data")
+        routes = self.__created_routes()
+        self.assertEqual(len(routes), 1)
+        self.assertEqual(routes[0].output(), CreateSourceRoutePacket(
+            0, x64(1), x16(1), hops=[x16(2), x16(3)]).output())
+
+        # A new route is created again.
+        self.cache.update(x64(1), x16(1), [x16(4)])
+        self.xbee.send_data_async(self.remote, "data")
+        self.assertEqual(len(self.__created_routes()), 2)
+
+    def test_route_created_again_after_send_failure(self):
+        self.cache.update(x64(1), x16(1), [x16(2)])
+        self.fail_creation = True
+        with self.assertRaises(XBeeException):
+            self.xbee.send_data_async(self.remote, "data")
+        self.fail_creation = False
+        self.xbee.send_data_async(self.remote, "data")
+        self.xbee.send_data_async(self.remote, "data")
+        self.assertEqual(len(self.__created_routes()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,294 @@
+# Copyright 2020, Digi International Inc.
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+from ipaddress import IPv4Address
+import itertools
+import threading
+import time
+import unittest
+
+from digi.xbee import xsocket
+from digi.xbee.devices import CellularDevice
+from digi.xbee.exception import TimeoutException, XBeeSocketException
+from digi.xbee.models.status import SocketState, SocketStatus, \
+    TransmitStatus
+from digi.xbee.packets.aft import ApiFrameType
+from digi.xbee.packets.raw import TXStatusPacket
+from digi.xbee.packets.socket import SocketConnectResponsePacket, \
+    SocketCreateResponsePacket, SocketListenResponsePacket, \
+    SocketNewIPv4ClientPacket, SocketReceivePacket, SocketStatePacket
+
+from tests.fakes import FakeInterface, at_responder
+
+
+CELLULAR_INFO = (1, 0x4B, 0x11410, "0013A20040BBBBBB", "FFFE", "", 0)
+"""
+Local XBee information of the Cellular device: API mode, XBee3 Cellular.
+"""
+
+
+def socket_responder():
+    """
+    Returns a responder that creates and connects sockets, and answers AT
+    commands.
+    """
+    ids = itertools.count()
+    answer_at = at_responder({})
+
+    def respond(packet):
+        f_type = packet.get_frame_type()
+        if f_type == ApiFrameType.SOCKET_CREATE:
+            return [SocketCreateResponsePacket(packet.frame_id, next(ids),
+                                               SocketStatus.SUCCESS)]
+        if f_type == ApiFrameType.SOCKET_CONNECT:
+            return [SocketConnectResponsePacket(packet.frame_id,
+                                                packet.socket_id,
+                                                SocketStatus.SUCCESS),
+                    SocketStatePacket(packet.socket_id,
+                                      SocketState.CONNECTED)]
+        if f_type == ApiFrameType.SOCKET_BIND:
+            return [SocketListenResponsePacket(packet.frame_id,
+                                               packet.socket_id,
+                                               SocketStatus.SUCCESS)]
+        return answer_at(packet)
+
+    return respond
+
+
+class SimulatedModem(object):
+    """
+    Answers the data sent through sockets like a Cellular modem: every frame
+    takes `uplink` seconds to leave the modem, one after another, and its
+    transmit status arrives `latency` seconds later. Frames received while
+    `buffers` frames wait for the uplink are rejected with `NO_BUFFERS`
+    after `reject_latency` seconds.
+    """
+
+    def __init__(self, iface, uplink=0, latency=0.02, buffers=None):
+        self.iface = iface
+        self.uplink = uplink
+        self.latency = latency
+        self.buffers = buffers
+        self.socket = socket_responder()
+        # Frame index -> latency of its status, None to not answer
+        self.latencies = {}
+        self.reject_latency = 0.001
+        # Indexes of the frames to reject
+        self.rejected = set()
+        # Indexes of the frames that fill the buffers: they and the frames
+        # after them are rejected until they are sent again
+        self.full = set()
+        self.frames = 0
+        self.no_buffers = 0
+        # Data accepted by the modem, in order
+        self.received = bytearray()
+        self.__uplink_end = 0
+        self.__uplink_ends = []
+        self.__full_payload = None
+        self.__lock = threading.Lock()
+
+    def __call__(self, packet):
+        if packet.get_frame_type() != ApiFrameType.SOCKET_SEND:
+            return self.socket(packet)
+        now = time.monotonic()
+        with self.__lock:
+            idx = self.frames
+            self.frames += 1
+            self.__uplink_ends = [end for end in self.__uplink_ends
+                                  if end > now]
+            if idx in self.full:
+                self.__full_payload = bytes(packet.payload)
+            elif self.__full_payload == packet.payload:
+                self.__full_payload = None
+            if idx in self.rejected or self.__full_payload is not None or (
+                    self.buffers
+                    and len(self.__uplink_ends) >= self.buffers):
+                self.no_buffers += 1
+                status = TransmitStatus.NO_BUFFERS
+                delay = self.reject_latency
+            else:
+                self.__uplink_end = max(now, self.__uplink_end) + self.uplink
+                self.__uplink_ends.append(self.__uplink_end)
+                self.received += packet.payload
+                status = TransmitStatus.SUCCESS
+                latency = self.latencies.get(idx, self.latency)
+                if latency is None:
+                    return None
+                delay = self.__uplink_end - now + latency
+        timer = threading.Timer(delay, self.iface.inject,
+                                args=(TXStatusPacket(packet.frame_id, status),))
+        timer.daemon = True
+        timer.start()
+        return None
+
+
+class SocketReceptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface(socket_responder(), info=CELLULAR_INFO)
+        self.xbee = CellularDevice(comm_iface=self.iface)
+        self.xbee.open()
+
+    def tearDown(self):
+        self.xbee.close()
+
+    def __connect(self):
+        sock = xsocket.socket(self.xbee)
+        sock.connect(("192.168.1.1", 80))
+        return sock
+
+    def test_frames_routed_by_socket_id(self):
+        sock_a, sock_b = self.__connect(), self.__connect()
+        self.iface.inject(SocketReceivePacket(0, 1, b"to b"))
+        self.iface.inject(SocketReceivePacket(0, 0, b"to a"))
+        self.assertEqual(sock_a.recv(10), b"to a")
+        self.assertEqual(sock_b.recv(10), b"to b")
+
+    def test_unread_data_does_not_delay_other_sockets(self):
+        sock_a, sock_b = self.__connect(), self.__connect()
+        sock_a.set_receive_warning(1)
+        with self.assertLogs(xsocket.socket._log, "WARNING") as logs:
+            for _ in range(3):
+                self.iface.inject(SocketReceivePacket(0, 0, b"a"))
+            self.iface.inject(SocketReceivePacket(0, 1, b"b"))
+            # Raises a timeout if the payload is stuck behind the others.
+            sock_b.settimeout(1)
+            self.assertEqual(sock_b.recv(10), b"b")
+        # Warned once, not for every payload above the threshold.
+        self.assertEqual(len(logs.output), 1)
+        # Data beyond the warning threshold is buffered, not dropped.
+        self.assertEqual(sock_a.recv(10), b"aaa")
+
+    def test_data_received_right_after_new_client(self):
+        server = xsocket.socket(self.xbee)
+        server.bind(("0.0.0.0", 8080))
+        server.listen()
+        # The server is socket 0, clients take the following IDs.
+        for client_id in range(1, 41):
+            self.iface.inject(SocketNewIPv4ClientPacket(
+                0, client_id, IPv4Address("10.0.0.2"), 5000 + client_id))
+            self.iface.inject(SocketReceivePacket(0, client_id,
+                                                  b"hi %d" % client_id))
+        for client_id in range(1, 41):
+            conn, address = server.accept()
+            self.assertEqual(address[1], 5000 + client_id)
+            conn.settimeout(1)
+            self.assertEqual(conn.recv(10), b"hi %d" % client_id)
+
+
+class SocketSendWindowTest(unittest.TestCase):
+
+    def setUp(self):
+        self.iface = FakeInterface(info=CELLULAR_INFO)
+        self.modem = SimulatedModem(self.iface)
+        self.iface.responder = self.modem
+        self.xbee = CellularDevice(comm_iface=self.iface)
+        self.xbee.open()
+        self.addCleanup(self.xbee.close)
+        self.sock = xsocket.socket(self.xbee)
+        self.sock.connect(("192.168.1.1", 80))
+        self.data = bytes(range(256)) * 120
+
+    def test_set_send_window(self):
+        self.assertEqual(self.sock.get_send_window(),
+                         xsocket.socket.DEFAULT_SEND_WINDOW)
+        self.sock.set_send_window(2, max_size=3)
+        self.assertEqual(self.sock.get_send_window(), 2)
+        self.sock.set_send_window(10)
+        self.assertEqual(self.sock.get_send_window(), 3)
+        for size, max_size in ((0, None), (1, 0)):
+            with self.assertRaises(ValueError):
+                self.sock.set_send_window(size, max_size=max_size)
+
+    def test_window_grows_while_latency_is_stable(self):
+        data = self.data * 3
+        progress = []
+        self.sock.sendall(data, progress_callback=lambda *args:
+                          progress.append(args))
+        self.assertEqual(self.modem.received, data)
+        self.assertEqual(self.sock.get_send_window(),
+                         xsocket.socket.MAX_SEND_WINDOW)
+        self.assertEqual(progress[-1], (len(data), len(data)))
+        self.assertEqual(len(progress), self.modem.frames)
+
+    def test_window_shrinks_when_latency_increases(self):
+        self.modem.latency = 0.01
+        self.sock.set_send_window(8)
+        for idx in range(4, 40):
+            self.modem.latencies[idx] = 0.03
+        self.sock.sendall(self.data * 2)
+        self.assertEqual(self.modem.received, self.data * 2)
+        self.assertLess(self.sock.get_send_window(), 4)
+
+    def test_window_halves_without_buffers(self):
+        self.sock.set_send_window(8)
+        # The first 3 frames fill the buffers.
+        self.modem.full.add(3)
+        self.sock.sendall(self.data)
+        # Rejected frames are sent again without reordering the data.
+        self.assertTrue(self.modem.no_buffers)
+        self.assertEqual(self.modem.received, self.data)
+        self.assertEqual(self.modem.frames, 21 + self.modem.no_buffers)
+        # The window that filled the buffers is not reached again.
+        self.sock.set_send_window(8)
+        self.assertEqual(self.sock.get_send_window(), 7)
+
+    def test_no_frame_sent_after_rejected_one(self):
+        # The last frame of the first window is rejected: the window must
+        # not be filled until it is sent again.
+        self.modem.rejected.add(3)
+        self.sock.sendall(self.data)
+        self.assertEqual(self.modem.received, self.data)
+
+    def test_rejected_frame_sent_again(self):
+        self.sock.set_send_window(1, max_size=1)
+        self.modem.rejected.add(1)
+        self.assertEqual(self.sock.send(self.data[:4500]), 4500)
+        self.assertEqual(self.modem.frames, 4)
+        self.assertEqual(self.modem.received, self.data[:4500])
+
+    def test_rejected_frame_after_later_accepted(self):
+        # Frame 2 is rejected while frame 3 is accepted, sending frame 2
+        # again would reorder the data.
+        self.modem.rejected.add(2)
+        self.modem.reject_latency = 0.05
+        progress = []
+        with self.assertRaises(XBeeSocketException):
+            self.sock.sendall(self.data, progress_callback=lambda *args:
+                              progress.append(args[0]))
+        self.assertEqual(progress, [1500, 3000])
+        self.assertEqual(self.sock.send(self.data[:1500]), 1500)
+
+    def test_send_count_is_exact(self):
+        # send() cannot return 3000 bytes sent: the caller would send the
+        # accepted frame 3 again.
+        self.modem.rejected.add(2)
+        self.modem.reject_latency = 0.05
+        with self.assertRaises(XBeeSocketException):
+            self.sock.send(self.data)
+
+    def test_send_timeout_with_later_frames_in_flight(self):
+        self.sock.settimeout(0.2)
+        self.modem.latencies[1] = None
+        with self.assertRaises(TimeoutException):
+            self.sock.send(self.data)
+
+    def test_send_timeout_of_last_frame(self):
+        self.sock.settimeout(0.2)
+        self.sock.set_send_window(1, max_size=1)
+        self.modem.latencies[2] = None
+        self.assertEqual(self.sock.send(self.data), 3000)
+
+
+if __name__ == "__main__":
+    unittest.main()